@@ -0,0 +1,656 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.neuro_cloud_api.sources.path_utils import normalize_path
+
+from .fake_yadisk_server import FakeServerSettings
+
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# Фрагменты возобновляемой загрузки, кроме последнего, кратны 256 КиБ
+_CHUNK_ALIGNMENT = 256 * 1024
+_MAX_BATCH_SIZE = 100
+_CHUNK_SIZE = 64 * 1024
+_STRING = r"'((?:[^'\\]|\\.)*)'"
+
+# Ответ: статус, заголовки, тело
+_Response = Tuple[int, Dict[str, str], bytes]
+
+
+@dataclass
+class _File:
+    id: str
+    name: str
+    mime_type: str
+    parents: List[str]
+    data: bytes = b""
+    trashed: bool = False
+    modified: str = ""
+
+
+@dataclass
+class _Session:
+    file_id: Optional[str]
+    metadata: Dict[str, Any]
+    size: Optional[int]
+    data: bytearray = field(default_factory=bytearray)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+class FakeDriveServer:
+    """
+    Локальная замена Google Drive API v3 для бенчмарков и проверок.
+
+    Реализует запросы, которые выполняют GoogleDriveSource и
+    AsyncGoogleDriveSource: about, files.list (запросы по родителю, имени и
+    типу, постраничная выдача не больше page_limit), files.get (метаданные и
+    содержимое alt=media с поддержкой Range), создание папок, files.copy
+    (только файлы), files.update (имя, корзина, addParents/removeParents),
+    files.delete, загрузку одним multipart-запросом и возобновляемую
+    загрузку фрагментами (с проверкой выравнивания и запросом состояния
+    сессии), а также пакетные запросы /batch/drive/v3 (части ответа
+    возвращаются в обратном порядке, как разрешает API). Файлы хранятся
+    в памяти.
+
+    Используются те же параметры, что и у FakeYadiskServer (FakeServerSettings).
+    Внедренная ошибка фрагмента возобновляемой загрузки принимает половину
+    фрагмента, поэтому клиент должен запросить состояние сессии и продолжить
+    с последнего принятого байта.
+
+    Пример:
+        with FakeDriveServer() as server:
+            server.put_file("/data/a.bin", b"...")
+            source = GoogleDriveSource(server.token, api_url=server.url)
+            source.download_file("/data/a.bin", "a.bin")
+    """
+
+    def __init__(
+        self,
+        settings: Optional[FakeServerSettings] = None,
+        token: str = "bench-token",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            settings: Параметры имитации сети и отказов
+            token: OAuth-токен, который принимает сервер
+            host: Адрес прослушивания
+            port: Порт (0 - любой свободный)
+        """
+        self.settings = settings or FakeServerSettings()
+        self.token = token
+        self.host = host
+        self.port = port
+        self._files: Dict[str, _File] = {}
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.settings.seed)
+        self._requests: Dict[str, int] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.clear()
+
+    @property
+    def url(self) -> str:
+        """Адрес запущенного сервера (api_url источника)."""
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDriveServer":
+        """Запускает сервер в фоновом потоке."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self) -> "FakeDriveServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def put_file(self, path: str, data: bytes) -> str:
+        """Добавляет файл (и недостающие папки); возвращает идентификатор файла."""
+        parent_path, _, name = normalize_path(path).rpartition("/")
+        with self._lock:
+            parent_id = self._make_folders(parent_path)
+            existing = self._child(parent_id, name)
+            if existing is not None:
+                existing.data = bytes(data)
+                existing.modified = _now()
+                return existing.id
+            return self._add(name, "application/octet-stream", parent_id, bytes(data)).id
+
+    def put_directory(self, path: str) -> str:
+        """Добавляет папку (и недостающие родительские); возвращает ее идентификатор."""
+        with self._lock:
+            return self._make_folders(normalize_path(path))
+
+    def file_id(self, path: str) -> Optional[str]:
+        """Идентификатор ресурса по пути или None."""
+        with self._lock:
+            resource = self._lookup(path)
+            return resource.id if resource is not None else None
+
+    def read_file(self, path: str) -> bytes:
+        """Содержимое файла."""
+        with self._lock:
+            resource = self._lookup(path)
+            if resource is None:
+                raise KeyError(path)
+            return resource.data
+
+    def clear(self) -> None:
+        """Удаляет все файлы и сессии загрузки."""
+        with self._lock:
+            self._files = {"root": _File("root", "", FOLDER_MIME_TYPE, [], modified=_now())}
+            self._sessions = {}
+
+    def pending_sessions(self) -> int:
+        """Количество незавершенных сессий возобновляемой загрузки."""
+        with self._lock:
+            return len(self._sessions)
+
+    def request_counts(self) -> Dict[str, int]:
+        """Количество обработанных запросов по видам (включая отказы и части пакетов)."""
+        with self._lock:
+            return dict(self._requests)
+
+    def reset_counts(self) -> None:
+        """Обнуляет счетчики запросов."""
+        with self._lock:
+            self._requests = {}
+
+    # --- Дерево файлов (вызывается под self._lock) ---
+
+    def _add(self, name: str, mime_type: str, parent_id: str, data: bytes = b"") -> _File:
+        resource = _File(uuid.uuid4().hex[:16], name, mime_type, [parent_id], data, modified=_now())
+        self._files[resource.id] = resource
+        return resource
+
+    def _child(self, parent_id: str, name: str) -> Optional[_File]:
+        for resource in self._files.values():
+            if parent_id in resource.parents and resource.name == name and not resource.trashed:
+                return resource
+        return None
+
+    def _lookup(self, path: str) -> Optional[_File]:
+        resource: Optional[_File] = self._files["root"]
+        for name in filter(None, normalize_path(path).split("/")):
+            resource = self._child(resource.id, name)
+            if resource is None:
+                return None
+        return resource
+
+    def _make_folders(self, path: str) -> str:
+        folder_id = "root"
+        for name in filter(None, normalize_path(path).split("/")):
+            child = self._child(folder_id, name)
+            if child is None:
+                child = self._add(name, FOLDER_MIME_TYPE, folder_id)
+            folder_id = child.id
+        return folder_id
+
+    def _remove_tree(self, file_id: str) -> None:
+        for child in [f.id for f in self._files.values() if file_id in f.parents]:
+            self._remove_tree(child)
+        self._files.pop(file_id, None)
+
+    @staticmethod
+    def _describe(resource: _File) -> Dict[str, Any]:
+        result = {
+            "kind": "drive#file",
+            "id": resource.id,
+            "name": resource.name,
+            "mimeType": resource.mime_type,
+            "parents": list(resource.parents),
+            "modifiedTime": resource.modified,
+            "trashed": resource.trashed,
+        }
+        if resource.mime_type != FOLDER_MIME_TYPE:
+            result.update(size=str(len(resource.data)), md5Checksum=hashlib.md5(resource.data).hexdigest())
+        return result
+
+    # --- Отказы ---
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self._requests[kind] = self._requests.get(kind, 0) + 1
+
+    def _random_value(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _injected_fault(self) -> Optional[_Response]:
+        """Внедряемая ошибка для очередного запроса или None."""
+        settings = self.settings
+        if not settings.error_rate and not settings.throttle_rate:
+            return None
+        value = self._random_value()
+        if value < settings.throttle_rate:
+            headers = {}
+            if settings.retry_after is not None:
+                headers["Retry-After"] = f"{settings.retry_after:g}"
+            return self._error(429, "rateLimitExceeded", "Внедренная ошибка", headers)
+        if value < settings.throttle_rate + settings.error_rate:
+            return self._error(settings.error_status, "backendError", "Внедренная ошибка")
+        return None
+
+    def _download_fault(self) -> Optional[str]:
+        """Внедряемый отказ скачивания: "error", "abort" или None."""
+        settings = self.settings
+        if not settings.download_error_rate and not settings.download_abort_rate:
+            return None
+        value = self._random_value()
+        if value < settings.download_error_rate:
+            return "error"
+        if value < settings.download_error_rate + settings.download_abort_rate:
+            return "abort"
+        return None
+
+    @staticmethod
+    def _json(payload: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None) -> _Response:
+        return status, {"Content-Type": "application/json; charset=UTF-8", **(headers or {})}, json.dumps(payload).encode("utf-8")
+
+    @classmethod
+    def _error(cls, status: int, reason: str, message: str, headers: Optional[Dict[str, str]] = None) -> _Response:
+        return cls._json(
+            {"error": {"code": status, "message": message, "errors": [{"reason": reason, "message": message}]}},
+            status, headers,
+        )
+
+    # --- Обработка запросов ---
+
+    def _handle(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> _Response:
+        """Обрабатывает запрос API (в том числе часть пакета) без передачи содержимого файлов."""
+        url = urlsplit(target)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        if headers.get("authorization") != f"Bearer {self.token}":
+            return self._error(401, "authError", "Недействительный токен")
+
+        route = self._route(method, path, query)
+        if route is None:
+            return self._error(400, "badRequest", f"Неизвестный запрос {method} {path}")
+        handler, kind, arg = route
+        self._count(kind)
+        if self.settings.latency:
+            time.sleep(self.settings.latency)
+        fault = self._injected_fault()
+        if fault is not None:
+            return fault
+        return handler(arg, query, headers, body)
+
+    def _route(self, method: str, path: str, query: Dict[str, str]) -> Optional[Tuple[Any, str, Any]]:
+        if (method, path) == ("GET", "/drive/v3/about"):
+            return self._about, "about", None
+        if (method, path) == ("GET", "/drive/v3/files"):
+            return self._list, "list", None
+        if (method, path) == ("POST", "/drive/v3/files"):
+            return self._create, "create", None
+        match = re.fullmatch(r"/drive/v3/files/([^/]+)/copy", path)
+        if match and method == "POST":
+            return self._copy, "copy", unquote(match.group(1))
+        match = re.fullmatch(r"/drive/v3/files/([^/]+)", path)
+        if match:
+            file_id = unquote(match.group(1))
+            if method == "GET":
+                return (self._get, "get", file_id) if query.get("alt") != "media" else None
+            if method == "PATCH":
+                return self._update, "update", file_id
+            if method == "DELETE":
+                return self._delete, "delete", file_id
+        match = re.fullmatch(r"/upload/drive/v3/files(?:/([^/]+))?", path)
+        if match and method in ("POST", "PATCH"):
+            file_id = unquote(match.group(1)) if match.group(1) else None
+            if method == "PATCH" and file_id is None:
+                return None
+            if query.get("uploadType") == "multipart":
+                return self._upload_multipart, "upload_multipart", file_id
+            if query.get("uploadType") == "resumable":
+                return self._upload_start, "upload_start", file_id
+        return None
+
+    def _about(self, arg: Any, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        return self._json({"user": {"displayName": "bench", "emailAddress": "bench@example.com"}})
+
+    def _list(self, arg: Any, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        q = query.get("q", "")
+        parent = re.search(_STRING + r" in parents", q)
+        name = re.search(r"name = " + _STRING, q)
+        mime_type = re.search(r"mimeType = " + _STRING, q)
+        parent_id = _unescape(parent.group(1)) if parent else None
+        with self._lock:
+            items = [
+                f for f in self._files.values()
+                if f.id != "root"
+                and (parent_id is None or parent_id in f.parents)
+                and ("trashed = false" not in q or not f.trashed)
+                and (name is None or f.name == _unescape(name.group(1)))
+                and (mime_type is None or f.mime_type == _unescape(mime_type.group(1)))
+            ]
+            items.sort(key=lambda f: (f.name, f.id))
+            size = min(int(query.get("pageSize", 100)), self.settings.page_limit)
+            start = int(query.get("pageToken") or 0)
+            page = [self._describe(f) for f in items[start:start + size]]
+        result: Dict[str, Any] = {"kind": "drive#fileList", "files": page}
+        if start + size < len(items):
+            result["nextPageToken"] = str(start + size)
+        return self._json(result)
+
+    def _create(self, arg: Any, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        metadata = json.loads(body or b"{}")
+        parents = metadata.get("parents") or ["root"]
+        with self._lock:
+            if parents[0] not in self._files:
+                return self._error(404, "notFound", "Родительская папка не найдена")
+            resource = self._add(metadata.get("name", ""), metadata.get("mimeType", FOLDER_MIME_TYPE), parents[0])
+            return self._json(self._describe(resource))
+
+    def _get(self, file_id: str, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        with self._lock:
+            resource = self._files.get(file_id)
+            if resource is None:
+                return self._error(404, "notFound", "Файл не найден")
+            return self._json(self._describe(resource))
+
+    def _update(self, file_id: str, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        metadata = json.loads(body or b"{}")
+        with self._lock:
+            resource = self._files.get(file_id)
+            if resource is None:
+                return self._error(404, "notFound", "Файл не найден")
+            if query.get("addParents") and query["addParents"] not in self._files:
+                return self._error(404, "notFound", "Родительская папка не найдена")
+            if query.get("removeParents"):
+                resource.parents = [p for p in resource.parents if p not in query["removeParents"].split(",")]
+            if query.get("addParents"):
+                resource.parents.append(query["addParents"])
+            if "name" in metadata:
+                resource.name = metadata["name"]
+            if "trashed" in metadata:
+                resource.trashed = bool(metadata["trashed"])
+            resource.modified = _now()
+            return self._json(self._describe(resource))
+
+    def _copy(self, file_id: str, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        metadata = json.loads(body or b"{}")
+        with self._lock:
+            resource = self._files.get(file_id)
+            if resource is None:
+                return self._error(404, "notFound", "Файл не найден")
+            if resource.mime_type == FOLDER_MIME_TYPE:
+                return self._error(403, "cannotCopyFile", "Папки не копируются")
+            parents = metadata.get("parents") or resource.parents
+            if parents[0] not in self._files:
+                return self._error(404, "notFound", "Родительская папка не найдена")
+            copied = self._add(metadata.get("name", resource.name), resource.mime_type, parents[0], resource.data)
+            return self._json(self._describe(copied))
+
+    def _delete(self, file_id: str, query: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        with self._lock:
+            if file_id not in self._files or file_id == "root":
+                return self._error(404, "notFound", "Файл не найден")
+            self._remove_tree(file_id)
+        return 204, {}, b""
+
+    def _store(self, file_id: Optional[str], metadata: Dict[str, Any], data: bytes) -> _Response:
+        with self._lock:
+            if file_id is not None:
+                resource = self._files.get(file_id)
+                if resource is None:
+                    return self._error(404, "notFound", "Файл не найден")
+                resource.data = bytes(data)
+                resource.modified = _now()
+            else:
+                parents = metadata.get("parents") or ["root"]
+                if parents[0] not in self._files:
+                    return self._error(404, "notFound", "Родительская папка не найдена")
+                resource = self._add(
+                    metadata.get("name", ""), metadata.get("mimeType", "application/octet-stream"),
+                    parents[0], bytes(data),
+                )
+            return self._json(self._describe(resource))
+
+    def _upload_multipart(
+        self, file_id: Optional[str], query: Dict[str, str], headers: Dict[str, str], body: bytes
+    ) -> _Response:
+        match = re.search(r"boundary=([^;\s]+)", headers.get("content-type", ""))
+        if match is None:
+            return self._error(400, "badContent", "Нет границы частей")
+        parts = body.split(b"--" + match.group(1).strip('"').encode("ascii"))
+        if len(parts) < 4:
+            return self._error(400, "badContent", "Ожидаются метаданные и содержимое")
+        metadata = json.loads(parts[1].partition(b"\r\n\r\n")[2].rstrip(b"\r\n") or b"{}")
+        content = parts[2].partition(b"\r\n\r\n")[2]
+        # Часть заканчивается переводом строки перед следующей границей
+        return self._store(file_id, metadata, content[:-2] if content.endswith(b"\r\n") else content)
+
+    def _upload_start(
+        self, file_id: Optional[str], query: Dict[str, str], headers: Dict[str, str], body: bytes
+    ) -> _Response:
+        size = headers.get("x-upload-content-length")
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = _Session(file_id, json.loads(body or b"{}"), int(size) if size else None)
+        return 200, {"Location": f"{self.url}/upload/session/{session_id}", "Content-Length": "0"}, b""
+
+    def _upload_chunk(self, session_id: str, headers: Dict[str, str], body: bytes) -> _Response:
+        """Фрагмент возобновляемой загрузки или запрос состояния сессии (bytes */N)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            return self._error(404, "notFound", "Сессия загрузки не найдена")
+        match = re.fullmatch(r"bytes (\*|(\d+)-(\d+))/(\*|\d+)", headers.get("content-range", ""))
+        if match is None:
+            return self._error(400, "badContentRange", "Неверный Content-Range")
+        total = None if match.group(4) == "*" else int(match.group(4))
+        if match.group(1) == "*":
+            self._count("status")
+        else:
+            self._count("chunk")
+            start, end = int(match.group(2)), int(match.group(3))
+            if end - start + 1 != len(body):
+                return self._error(400, "badContentRange", "Длина фрагмента не совпадает с Content-Range")
+            last = total is not None and end + 1 == total
+            if not last and (end + 1) % _CHUNK_ALIGNMENT:
+                return self._error(400, "badContentRange", "Фрагмент не кратен 256 КиБ")
+            if self.settings.transfer_latency:
+                time.sleep(self.settings.transfer_latency)
+            fault = self._injected_fault()
+            with self._lock:
+                if start != len(session.data):
+                    return self._error(400, "badContentRange", "Фрагмент не продолжает принятые данные")
+                if fault is not None:
+                    # Сервер успел принять часть фрагмента до отказа
+                    session.data += body[:len(body) // 2]
+                    return fault
+                session.data += body
+        with self._lock:
+            if total is not None and len(session.data) == total:
+                self._sessions.pop(session_id, None)
+                complete = True
+            else:
+                complete = False
+        if complete:
+            return self._store(session.file_id, session.metadata, bytes(session.data))
+        range_headers = {"Range": f"bytes=0-{len(session.data) - 1}"} if session.data else {}
+        return 308, range_headers, b""
+
+    def _batch(self, headers: Dict[str, str], body: bytes) -> _Response:
+        """Пакетный запрос: части выполняются по отдельности, ответы - в обратном порядке."""
+        self._count("batch")
+        match = re.search(r"boundary=([^;\s]+)", headers.get("content-type", ""))
+        if match is None:
+            return self._error(400, "badContent", "Нет границы частей")
+        if headers.get("authorization") != f"Bearer {self.token}":
+            return self._error(401, "authError", "Недействительный токен")
+        responses = []
+        for part in body.split(b"--" + match.group(1).strip('"').encode("ascii"))[1:]:
+            if part.startswith(b"--"):
+                break
+            outer, _, inner = part.lstrip(b"\r\n").partition(b"\r\n\r\n")
+            content_id = re.search(rb"Content-ID:\s*<([^>]*)>", outer, re.IGNORECASE)
+            head, _, content = inner.partition(b"\r\n\r\n")
+            lines = head.decode("utf-8").split("\r\n")
+            method, target = lines[0].split(" ")[:2]
+            part_headers = {
+                name.strip().lower(): value.strip()
+                for name, _, value in (line.partition(":") for line in lines[1:])
+            }
+            part_headers.setdefault("authorization", headers.get("authorization", ""))
+            status, response_headers, payload = self._handle(method, target, part_headers, content.rstrip(b"\r\n"))
+            reason = "OK" if status < 400 else "Error"
+            header_lines = "".join(f"{name}: {value}\r\n" for name, value in response_headers.items())
+            responses.append(
+                b"--batch_response\r\nContent-Type: application/http\r\n"
+                + (b"Content-ID: <response-" + content_id.group(1) + b">\r\n" if content_id else b"")
+                + f"\r\nHTTP/1.1 {status} {reason}\r\n{header_lines}\r\n".encode("utf-8")
+                + payload + b"\r\n"
+            )
+        if len(responses) > _MAX_BATCH_SIZE:
+            return self._error(400, "batchSizeTooLarge", "Больше 100 запросов в пакете")
+        return (
+            200, {"Content-Type": "multipart/mixed; boundary=batch_response"},
+            b"".join(reversed(responses)) + b"--batch_response--\r\n",
+        )
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._dispatch()
+
+            def do_POST(self) -> None:
+                self._dispatch()
+
+            def do_PUT(self) -> None:
+                self._dispatch()
+
+            def do_PATCH(self) -> None:
+                self._dispatch()
+
+            def do_DELETE(self) -> None:
+                self._dispatch()
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _dispatch(self) -> None:
+                url = urlsplit(self.path)
+                headers = {name.lower(): value for name, value in self.headers.items()}
+                session = re.fullmatch(r"/upload/session/(\w+)", url.path)
+                body = self._read_body(throttle=session is not None)
+                if self.command == "GET" and "alt=media" in url.query:
+                    return self._download(url, headers)
+                if session is not None and self.command == "PUT":
+                    return self._reply(*server._upload_chunk(session.group(1), headers, body))
+                if (self.command, url.path) == ("POST", "/batch/drive/v3"):
+                    return self._reply(*server._batch(headers, body))
+                self._reply(*server._handle(self.command, self.path, headers, body))
+
+            def _download(self, url: Any, headers: Dict[str, str]) -> None:
+                match = re.fullmatch(r"/drive/v3/files/([^/]+)", url.path)
+                if headers.get("authorization") != f"Bearer {server.token}":
+                    return self._reply(*server._error(401, "authError", "Недействительный токен"))
+                server._count("download")
+                if server.settings.transfer_latency:
+                    time.sleep(server.settings.transfer_latency)
+                with server._lock:
+                    resource = server._files.get(unquote(match.group(1))) if match else None
+                if resource is None or resource.mime_type == FOLDER_MIME_TYPE:
+                    return self._reply(*server._error(404, "notFound", "Файл не найден"))
+                fault = server._download_fault() or server._injected_fault()
+                if fault == "error":
+                    server._count("download_error")
+                    fault = server._error(server.settings.error_status, "backendError", "Внедренная ошибка")
+                if isinstance(fault, tuple):
+                    return self._reply(*fault)
+                data = resource.data
+                status, start, end = 200, 0, len(data) - 1
+                header = headers.get("range")
+                if header and header.startswith("bytes="):
+                    first, _, last = header[len("bytes="):].partition("-")
+                    start = int(first) if first else max(0, len(data) - int(last))
+                    end = min(int(last), len(data) - 1) if first and last else len(data) - 1
+                    if start > end:
+                        return self._reply(*server._error(416, "requestedRangeNotSatisfiable", "Диапазон вне файла"))
+                    status = 206
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(end - start + 1 if data else 0))
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                self.end_headers()
+                view = memoryview(data)[start:end + 1]
+                if fault == "abort":
+                    # Отдается половина тела, затем соединение закрывается
+                    server._count("download_abort")
+                    view = view[:len(view) // 2]
+                    self.close_connection = True
+                for offset in range(0, len(view), _CHUNK_SIZE):
+                    chunk = view[offset:offset + _CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    self._throttle(len(chunk))
+
+            def _throttle(self, size: int) -> None:
+                if server.settings.bandwidth:
+                    time.sleep(size / server.settings.bandwidth)
+
+            def _read_body(self, throttle: bool = False) -> bytes:
+                chunks = []
+                remaining = int(self.headers.get("Content-Length") or 0)
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, _CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                    if throttle:
+                        self._throttle(len(chunk))
+                return b"".join(chunks)
+
+            def _reply(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() != "content-length":
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return _Handler
@@ -0,0 +1,540 @@
+import base64
+import hashlib
+import random
+import re
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from .fake_yadisk_server import FakeServerSettings
+
+
+_CHUNK_SIZE = 64 * 1024
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+@dataclass
+class _Object:
+    data: bytes
+    etag: str
+    modified: datetime
+
+
+class FakeS3Server:
+    """
+    Локальная замена S3-совместимого хранилища для бенчмарков и проверок.
+
+    Реализует запросы, которые выполняют S3Source и AsyncS3Source (адресация
+    бакета в пути URL): HeadBucket, HeadObject, GetObject (с поддержкой Range),
+    PutObject (с If-None-Match: *), CopyObject, составную загрузку (в том
+    числе UploadPartCopy), ListObjectsV2 (с постраничной выдачей не больше
+    page_limit ключей), DeleteObject и DeleteObjects. Подпись запросов не
+    проверяется, но заголовок Authorization и хэш тела x-amz-content-sha256
+    обязательны. Объекты хранятся в памяти.
+
+    Используются те же параметры, что и у FakeYadiskServer (FakeServerSettings):
+    внедренные ошибки отвечают error_status, ограничение частоты - 503 SlowDown.
+
+    Пример:
+        with FakeS3Server() as server:
+            server.put_object("data/a.bin", b"...")
+            source = S3Source(server.bucket, "AK:SK", endpoint_url=server.url)
+            source.download_file("/data/a.bin", "a.bin")
+    """
+
+    def __init__(
+        self,
+        settings: Optional[FakeServerSettings] = None,
+        bucket: str = "bench",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            settings: Параметры имитации сети и отказов
+            bucket: Имя бакета
+            host: Адрес прослушивания
+            port: Порт (0 - любой свободный)
+        """
+        self.settings = settings or FakeServerSettings()
+        self.bucket = bucket
+        self.host = host
+        self.port = port
+        self._objects: Dict[str, _Object] = {}
+        # Идентификатор составной загрузки -> (ключ, номер части -> (данные, ETag))
+        self._uploads: Dict[str, Tuple[str, Dict[int, Tuple[bytes, str]]]] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.settings.seed)
+        self._requests: Dict[str, int] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес запущенного сервера (endpoint_url источника)."""
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeS3Server":
+        """Запускает сервер в фоновом потоке."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self) -> "FakeS3Server":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def put_object(self, key: str, data: bytes) -> None:
+        """Добавляет объект."""
+        with self._lock:
+            self._objects[key] = self._object(data)
+
+    def read_object(self, key: str) -> bytes:
+        """Содержимое объекта."""
+        with self._lock:
+            return self._objects[key].data
+
+    def keys(self) -> List[str]:
+        """Ключи всех объектов по порядку."""
+        with self._lock:
+            return sorted(self._objects)
+
+    def pending_uploads(self) -> int:
+        """Количество незавершенных составных загрузок."""
+        with self._lock:
+            return len(self._uploads)
+
+    def clear(self) -> None:
+        """Удаляет все объекты и незавершенные загрузки."""
+        with self._lock:
+            self._objects = {}
+            self._uploads = {}
+
+    def request_counts(self) -> Dict[str, int]:
+        """Количество обработанных запросов по видам (включая отказы)."""
+        with self._lock:
+            return dict(self._requests)
+
+    def reset_counts(self) -> None:
+        """Обнуляет счетчики запросов."""
+        with self._lock:
+            self._requests = {}
+
+    @staticmethod
+    def _object(data: bytes, parts: int = 0) -> _Object:
+        etag = hashlib.md5(data).hexdigest() + (f"-{parts}" if parts else "")
+        return _Object(data, etag, datetime.now(timezone.utc).replace(microsecond=0))
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self._requests[kind] = self._requests.get(kind, 0) + 1
+
+    def _random_value(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _injected_fault(self) -> Optional[Tuple[int, str]]:
+        """Внедряемая ошибка для очередного запроса или None."""
+        settings = self.settings
+        if not settings.error_rate and not settings.throttle_rate:
+            return None
+        value = self._random_value()
+        if value < settings.throttle_rate:
+            return 503, "SlowDown"
+        if value < settings.throttle_rate + settings.error_rate:
+            return settings.error_status, "InternalError"
+        return None
+
+    def _download_fault(self) -> Optional[str]:
+        """Внедряемый отказ скачивания: "error", "abort" или None."""
+        settings = self.settings
+        if not settings.download_error_rate and not settings.download_abort_rate:
+            return None
+        value = self._random_value()
+        if value < settings.download_error_rate:
+            return "error"
+        if value < settings.download_error_rate + settings.download_abort_rate:
+            return "abort"
+        return None
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_HEAD(self) -> None:
+                self._dispatch()
+
+            def do_GET(self) -> None:
+                self._dispatch()
+
+            def do_PUT(self) -> None:
+                self._dispatch()
+
+            def do_POST(self) -> None:
+                self._dispatch()
+
+            def do_DELETE(self) -> None:
+                self._dispatch()
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _dispatch(self) -> None:
+                url = urlsplit(self.path)
+                bucket, _, key = url.path.lstrip("/").partition("/")
+                key = unquote(key)
+                query = dict(parse_qsl(url.query, keep_blank_values=True))
+                method = self.command
+                transfer = (method == "GET" and key) or (method == "PUT" and key)
+                body = self._read_body(throttle=bool(transfer))
+                if bucket != server.bucket:
+                    return self._error(404, "NoSuchBucket", "Бакет не найден")
+                if not self.headers.get("Authorization", "").startswith("AWS4-HMAC-SHA256"):
+                    return self._error(403, "AccessDenied", "Нет подписи запроса")
+                if self.headers.get("x-amz-content-sha256", _EMPTY_SHA256) != hashlib.sha256(body).hexdigest():
+                    return self._error(400, "XAmzContentSHA256Mismatch", "Хэш тела не совпадает")
+
+                handler, kind = self._route(method, key, query)
+                if handler is None:
+                    return self._error(400, "InvalidRequest", "Неизвестный запрос")
+                server._count(kind)
+                delay = server.settings.transfer_latency if transfer else server.settings.latency
+                if delay:
+                    time.sleep(delay)
+                fault = server._injected_fault()
+                if fault is not None:
+                    status, code = fault
+                    headers = {}
+                    if code == "SlowDown" and server.settings.retry_after is not None:
+                        headers["Retry-After"] = f"{server.settings.retry_after:g}"
+                    return self._error(status, code, "Внедренная ошибка", headers)
+                handler(key, query, body)
+
+            def _route(self, method: str, key: str, query: Dict[str, str]):
+                if not key:
+                    if method == "HEAD":
+                        return self._head_bucket, "head_bucket"
+                    if method == "GET" and query.get("list-type") == "2":
+                        return self._list_objects, "list"
+                    if method == "POST" and "delete" in query:
+                        return self._delete_objects, "delete_objects"
+                    return None, ""
+                routes = {
+                    ("HEAD", False): (self._head_object, "head_object"),
+                    ("GET", False): (self._get_object, "download"),
+                    ("PUT", False): (self._put_object, "upload"),
+                    ("DELETE", False): (self._delete_object, "delete"),
+                    ("PUT", True): (self._upload_part, "upload_part"),
+                    ("POST", True): (self._complete_multipart, "complete_multipart"),
+                    ("DELETE", True): (self._abort_multipart, "abort_multipart"),
+                }
+                if method == "POST" and "uploads" in query:
+                    return self._create_multipart, "create_multipart"
+                if method == "PUT" and self.headers.get("x-amz-copy-source"):
+                    if "uploadId" in query:
+                        return self._upload_part_copy, "upload_part_copy"
+                    return self._copy_object, "copy"
+                return routes.get((method, "uploadId" in query), (None, ""))
+
+            # --- Бакет ---
+
+            def _head_bucket(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                self._send(200)
+
+            def _list_objects(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                prefix = query.get("prefix", "")
+                delimiter = query.get("delimiter")
+                limit = min(int(query.get("max-keys", 1000)), server.settings.page_limit)
+                token = query.get("continuation-token", "")
+                with server._lock:
+                    keys = sorted(k for k in server._objects if k.startswith(prefix))
+                    objects = dict(server._objects)
+                entries: List[Tuple[str, str]] = []
+                for name in keys:
+                    rest = name[len(prefix):]
+                    if delimiter and delimiter in rest:
+                        common = prefix + rest.split(delimiter, 1)[0] + delimiter
+                        if not entries or entries[-1] != ("prefix", common):
+                            entries.append(("prefix", common))
+                    else:
+                        entries.append(("object", name))
+                entries = [entry for entry in entries if entry[1] > token]
+                page, truncated = entries[:limit], len(entries) > limit
+                xml = ['<?xml version="1.0" encoding="UTF-8"?>',
+                       '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">',
+                       f"<Name>{escape(server.bucket)}</Name><Prefix>{escape(prefix)}</Prefix>",
+                       f"<KeyCount>{len(page)}</KeyCount><MaxKeys>{limit}</MaxKeys>"]
+                for kind, name in page:
+                    if kind == "prefix":
+                        xml.append(f"<CommonPrefixes><Prefix>{escape(name)}</Prefix></CommonPrefixes>")
+                        continue
+                    obj = objects[name]
+                    xml.append(
+                        f"<Contents><Key>{escape(name)}</Key>"
+                        f"<LastModified>{obj.modified.strftime('%Y-%m-%dT%H:%M:%S.000Z')}</LastModified>"
+                        f"<ETag>&quot;{obj.etag}&quot;</ETag><Size>{len(obj.data)}</Size></Contents>"
+                    )
+                xml.append(f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>")
+                if truncated:
+                    xml.append(f"<NextContinuationToken>{escape(page[-1][1])}</NextContinuationToken>")
+                xml.append("</ListBucketResult>")
+                self._send(200, "".join(xml).encode("utf-8"), {"Content-Type": "application/xml"})
+
+            def _delete_objects(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                expected = base64.b64encode(hashlib.md5(body).digest()).decode("ascii")
+                if self.headers.get("Content-MD5") != expected:
+                    return self._error(400, "InvalidDigest", "Content-MD5 не совпадает")
+                root = ET.fromstring(body)
+                with server._lock:
+                    for item in root.iter():
+                        if item.tag.rsplit("}", 1)[-1] == "Key" and item.text:
+                            server._objects.pop(item.text, None)
+                self._send(200, b'<?xml version="1.0" encoding="UTF-8"?><DeleteResult/>')
+
+            # --- Объекты ---
+
+            def _head_object(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                with server._lock:
+                    obj = server._objects.get(key)
+                if obj is None:
+                    return self._send(404)
+                self._send(200, headers=self._object_headers(obj), length=len(obj.data))
+
+            def _get_object(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                with server._lock:
+                    obj = server._objects.get(key)
+                if obj is None:
+                    return self._error(404, "NoSuchKey", "Объект не найден")
+                fault = server._download_fault()
+                if fault == "error":
+                    server._count("download_error")
+                    return self._error(server.settings.error_status, "InternalError", "Внедренная ошибка")
+                data = obj.data
+                status, start, end = 200, 0, len(data) - 1
+                header = self.headers.get("Range")
+                if header and header.startswith("bytes="):
+                    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header)
+                    if match is None:
+                        return self._error(400, "InvalidArgument", "Неверный Range")
+                    first, last = match.groups()
+                    start = int(first) if first else max(0, len(data) - int(last))
+                    end = min(int(last), len(data) - 1) if first and last else len(data) - 1
+                    if start > end:
+                        return self._error(416, "InvalidRange", "Диапазон вне объекта")
+                    status = 206
+                headers = self._object_headers(obj)
+                if status == 206:
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                view = memoryview(data)[start:end + 1]
+                self._send_headers(status, headers, len(view))
+                if fault == "abort":
+                    # Отдается половина тела, затем соединение закрывается
+                    server._count("download_abort")
+                    view = view[:len(view) // 2]
+                    self.close_connection = True
+                for offset in range(0, len(view), _CHUNK_SIZE):
+                    chunk = view[offset:offset + _CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    self._throttle(len(chunk))
+
+            def _put_object(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                with server._lock:
+                    if self.headers.get("If-None-Match") == "*" and key in server._objects:
+                        exists = True
+                    else:
+                        exists = False
+                        obj = server._objects[key] = server._object(body)
+                if exists:
+                    return self._error(412, "PreconditionFailed", "Объект уже существует")
+                self._send(200, headers={"ETag": f'"{obj.etag}"'})
+
+            def _copy_object(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                source = self._copy_source()
+                if source is None:
+                    return self._error(404, "NoSuchKey", "Исходный объект не найден")
+                with server._lock:
+                    if self.headers.get("If-None-Match") == "*" and key in server._objects:
+                        exists = True
+                    else:
+                        exists = False
+                        obj = server._objects[key] = server._object(source.data)
+                if exists:
+                    return self._error(412, "PreconditionFailed", "Объект уже существует")
+                self._send(200, (
+                    '<?xml version="1.0" encoding="UTF-8"?><CopyObjectResult>'
+                    f"<LastModified>{obj.modified.strftime('%Y-%m-%dT%H:%M:%S.000Z')}</LastModified>"
+                    f"<ETag>&quot;{obj.etag}&quot;</ETag></CopyObjectResult>"
+                ).encode("utf-8"))
+
+            def _delete_object(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                with server._lock:
+                    server._objects.pop(key, None)
+                self._send(204)
+
+            # --- Составная загрузка ---
+
+            def _create_multipart(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                upload_id = uuid.uuid4().hex
+                with server._lock:
+                    server._uploads[upload_id] = (key, {})
+                self._send(200, (
+                    '<?xml version="1.0" encoding="UTF-8"?><InitiateMultipartUploadResult>'
+                    f"<Bucket>{escape(server.bucket)}</Bucket><Key>{escape(key)}</Key>"
+                    f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+                ).encode("utf-8"))
+
+            def _upload_part(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                etag = hashlib.md5(body).hexdigest()
+                with server._lock:
+                    upload = server._uploads.get(query["uploadId"])
+                    if upload is not None:
+                        upload[1][int(query["partNumber"])] = (body, etag)
+                if upload is None:
+                    return self._error(404, "NoSuchUpload", "Загрузка не найдена")
+                self._send(200, headers={"ETag": f'"{etag}"'})
+
+            def _upload_part_copy(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                source = self._copy_source()
+                if source is None:
+                    return self._error(404, "NoSuchKey", "Исходный объект не найден")
+                data = source.data
+                header = self.headers.get("x-amz-copy-source-range")
+                if header:
+                    match = re.fullmatch(r"bytes=(\d+)-(\d+)", header)
+                    if match is None or int(match.group(2)) >= len(data) or int(match.group(1)) > int(match.group(2)):
+                        return self._error(400, "InvalidArgument", "Неверный x-amz-copy-source-range")
+                    data = data[int(match.group(1)):int(match.group(2)) + 1]
+                etag = hashlib.md5(data).hexdigest()
+                with server._lock:
+                    upload = server._uploads.get(query["uploadId"])
+                    if upload is not None:
+                        upload[1][int(query["partNumber"])] = (data, etag)
+                if upload is None:
+                    return self._error(404, "NoSuchUpload", "Загрузка не найдена")
+                self._send(200, (
+                    '<?xml version="1.0" encoding="UTF-8"?><CopyPartResult>'
+                    f"<ETag>&quot;{etag}&quot;</ETag></CopyPartResult>"
+                ).encode("utf-8"))
+
+            def _complete_multipart(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                parts = []
+                for part in ET.fromstring(body).iter():
+                    if part.tag.rsplit("}", 1)[-1] != "Part":
+                        continue
+                    fields = {child.tag.rsplit("}", 1)[-1]: child.text or "" for child in part}
+                    parts.append((int(fields["PartNumber"]), fields["ETag"].strip('"')))
+                if not parts or [n for n, _ in parts] != sorted({n for n, _ in parts}):
+                    return self._error(400, "InvalidPartOrder", "Части должны идти по возрастанию")
+                with server._lock:
+                    upload = server._uploads.get(query["uploadId"])
+                    if upload is None:
+                        return self._error(404, "NoSuchUpload", "Загрузка не найдена")
+                    stored = upload[1]
+                    if any(stored.get(number, (b"", None))[1] != etag for number, etag in parts):
+                        return self._error(400, "InvalidPart", "Часть не загружена или ETag не совпадает")
+                    if self.headers.get("If-None-Match") == "*" and key in server._objects:
+                        return self._error(412, "PreconditionFailed", "Объект уже существует")
+                    data = b"".join(stored[number][0] for number, _ in parts)
+                    obj = server._objects[key] = server._object(data, len(parts))
+                    del server._uploads[query["uploadId"]]
+                self._send(200, (
+                    '<?xml version="1.0" encoding="UTF-8"?><CompleteMultipartUploadResult>'
+                    f"<Key>{escape(key)}</Key><ETag>&quot;{obj.etag}&quot;</ETag>"
+                    "</CompleteMultipartUploadResult>"
+                ).encode("utf-8"))
+
+            def _abort_multipart(self, key: str, query: Dict[str, str], body: bytes) -> None:
+                with server._lock:
+                    server._uploads.pop(query["uploadId"], None)
+                self._send(204)
+
+            # --- Вспомогательные ---
+
+            def _copy_source(self) -> Optional[_Object]:
+                """Исходный объект из заголовка x-amz-copy-source ("/бакет/ключ")."""
+                bucket, _, key = unquote(self.headers.get("x-amz-copy-source", "")).lstrip("/").partition("/")
+                if bucket != server.bucket:
+                    return None
+                with server._lock:
+                    return server._objects.get(key)
+
+            @staticmethod
+            def _object_headers(obj: _Object) -> Dict[str, str]:
+                return {
+                    "Content-Type": "application/octet-stream",
+                    "ETag": f'"{obj.etag}"',
+                    "Last-Modified": format_datetime(obj.modified, usegmt=True),
+                    "Accept-Ranges": "bytes",
+                }
+
+            def _throttle(self, size: int) -> None:
+                if server.settings.bandwidth:
+                    time.sleep(size / server.settings.bandwidth)
+
+            def _read_body(self, throttle: bool = False) -> bytes:
+                chunks = []
+                remaining = int(self.headers.get("Content-Length") or 0)
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, _CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                    if throttle:
+                        self._throttle(len(chunk))
+                return b"".join(chunks)
+
+            def _send_headers(self, status: int, headers: Dict[str, str], length: int) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(length))
+                self.end_headers()
+
+            def _send(
+                self,
+                status: int,
+                body: bytes = b"",
+                headers: Optional[Dict[str, str]] = None,
+                length: Optional[int] = None,
+            ) -> None:
+                # На HEAD отправляется длина объекта без тела
+                self._send_headers(status, headers or {}, len(body) if length is None else length)
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+                body = (
+                    '<?xml version="1.0" encoding="UTF-8"?>'
+                    f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>"
+                ).encode("utf-8")
+                self._send(status, body, {"Content-Type": "application/xml", **(headers or {})})
+
+        return _Handler
@@ -0,0 +1,586 @@
+import hashlib
+import json
+import random
+import threading
+import time
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+import yadisk
+
+from src.neuro_cloud_api.sources.path_utils import normalize_path, parent_path
+
+
+@dataclass
+class FakeServerSettings:
+    """
+    Параметры имитации сети и отказов.
+
+    latency: float - Задержка ответа на каждый запрос REST API, сек
+    transfer_latency: float - Задержка до первого байта при скачивании и загрузке, сек
+    bandwidth: Optional[float] - Пропускная способность одного соединения, байт/сек (None - без ограничения)
+    error_rate: float - Доля запросов, на которые отвечается error_status
+    error_status: int - Код ответа при внедренной ошибке (5xx повторяется клиентом)
+    throttle_rate: float - Доля запросов, на которые отвечается 429
+    retry_after: Optional[float] - Значение заголовка Retry-After в ответах 429, сек
+    download_error_rate: float - Доля скачиваний, на которые до передачи данных отвечается error_status
+    download_abort_rate: float - Доля скачиваний, обрываемых закрытием соединения на середине тела
+    page_limit: int - Максимальный размер страницы содержимого директории
+    operation_delay: float - Длительность асинхронной операции (копирование, перемещение
+        и удаление директории), сек; 0 - такие операции выполняются синхронно
+    seed: Optional[int] - Зерно генератора внедряемых ошибок
+    """
+    latency: float = 0.0
+    transfer_latency: float = 0.0
+    bandwidth: Optional[float] = None
+    error_rate: float = 0.0
+    error_status: int = 503
+    throttle_rate: float = 0.0
+    retry_after: Optional[float] = None
+    download_error_rate: float = 0.0
+    download_abort_rate: float = 0.0
+    page_limit: int = 1000
+    operation_delay: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class _Resource:
+    type: str
+    data: bytes = b""
+    md5: Optional[str] = None
+    sha256: Optional[str] = None
+    modified: str = ""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _project(value: Any, fields: Optional[str]) -> Any:
+    """Оставляет в ответе только перечисленные поля ("type,_embedded.items.name"), как REST API."""
+    if not fields:
+        return value
+    tree: Dict[str, Any] = {}
+    for field in fields.split(","):
+        node = tree
+        parts = field.strip().split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break
+            node = node.setdefault(part, child)
+        else:
+            # Поле, перечисленное целиком, не ограничивается вложенными полями
+            node[parts[-1]] = None
+
+    def _apply(item: Any, node: Optional[Dict[str, Any]]) -> Any:
+        if node is None:
+            return item
+        if isinstance(item, list):
+            return [_apply(element, node) for element in item]
+        if isinstance(item, dict):
+            return {key: _apply(item[key], child) for key, child in node.items() if key in item}
+        return item
+
+    return _apply(value, tree)
+
+
+class FakeYadiskServer:
+    """
+    Локальная замена REST API Яндекс.Диска для бенчмарков.
+
+    Реализует запросы, которые выполняют YadiskSource и AsyncYadiskSource:
+    проверку токена, метаданные и содержимое директорий (с постраничной
+    выдачей), проверку существования, создание, копирование, перемещение
+    и удаление ресурсов (директории - асинхронными операциями, если задан
+    operation_delay), статус операций, ссылки на скачивание и загрузку,
+    а также сами скачивание (с поддержкой Range) и загрузку. Ресурсы
+    хранятся в памяти. Задержка, пропускная способность и доля отказов
+    (в том числе ошибок и обрывов скачивания) задаются FakeServerSettings
+    и могут меняться между замерами.
+
+    Пример:
+        with FakeYadiskServer(FakeServerSettings(latency=0.02)) as server:
+            server.put_file("/data/a.bin", b"...")
+            source = YadiskSource(token="fake")
+            source.download_file("/data/a.bin", "a.bin")
+
+    Пока сервер запущен, yadisk.settings.BASE_API_URL указывает на него.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[FakeServerSettings] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            settings: Параметры имитации сети и отказов
+            host: Адрес прослушивания
+            port: Порт (0 - любой свободный)
+        """
+        self.settings = settings or FakeServerSettings()
+        self.host = host
+        self.port = port
+        self._resources: Dict[str, _Resource] = {"/": _Resource("dir", modified=_now())}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.settings.seed)
+        self._requests: Dict[str, int] = {}
+        # Идентификатор асинхронной операции -> время ее завершения
+        self._operations: Dict[str, float] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._previous_base_url: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        """Базовый адрес запущенного сервера."""
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeYadiskServer":
+        """Запускает сервер в фоновом потоке и направляет на него yadisk."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self._previous_base_url = yadisk.settings.BASE_API_URL
+        yadisk.settings.BASE_API_URL = self.url
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и возвращает адрес API yadisk."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._previous_base_url is not None:
+            yadisk.settings.BASE_API_URL = self._previous_base_url
+            self._previous_base_url = None
+
+    def __enter__(self) -> "FakeYadiskServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def put_file(self, path: str, data: bytes) -> None:
+        """Добавляет файл (и недостающие родительские директории)."""
+        path = normalize_path(path)
+        with self._lock:
+            self._make_parents(path)
+            self._resources[path] = self._file(data)
+
+    def put_directory(self, path: str) -> None:
+        """Добавляет директорию (и недостающие родительские директории)."""
+        path = normalize_path(path)
+        with self._lock:
+            self._make_parents(path)
+            self._resources.setdefault(path, _Resource("dir", modified=_now()))
+
+    def read_file(self, path: str) -> bytes:
+        """Содержимое файла."""
+        with self._lock:
+            return self._resources[normalize_path(path)].data
+
+    def clear(self) -> None:
+        """Удаляет все ресурсы."""
+        with self._lock:
+            self._resources = {"/": _Resource("dir", modified=_now())}
+
+    def request_counts(self) -> Dict[str, int]:
+        """Количество обработанных запросов по видам (включая отказы)."""
+        with self._lock:
+            return dict(self._requests)
+
+    def reset_counts(self) -> None:
+        """Обнуляет счетчики запросов."""
+        with self._lock:
+            self._requests = {}
+
+    def _make_parents(self, path: str) -> None:
+        parent = parent_path(path)
+        while parent not in self._resources:
+            self._resources[parent] = _Resource("dir", modified=_now())
+            parent = parent_path(parent)
+
+    @staticmethod
+    def _file(data: bytes) -> _Resource:
+        return _Resource(
+            "file", data,
+            md5=hashlib.md5(data).hexdigest(),
+            sha256=hashlib.sha256(data).hexdigest(),
+            modified=_now(),
+        )
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self._requests[kind] = self._requests.get(kind, 0) + 1
+
+    def _injected_fault(self) -> Optional[Tuple[int, str]]:
+        """Внедряемая ошибка для очередного запроса или None."""
+        settings = self.settings
+        if not settings.error_rate and not settings.throttle_rate:
+            return None
+        with self._lock:
+            value = self._random.random()
+        if value < settings.throttle_rate:
+            return 429, "TooManyRequestsError"
+        if value < settings.throttle_rate + settings.error_rate:
+            return settings.error_status, "InjectedError"
+        return None
+
+    def _download_fault(self) -> Optional[str]:
+        """Внедряемый отказ скачивания: "error", "abort" или None."""
+        settings = self.settings
+        if not settings.download_error_rate and not settings.download_abort_rate:
+            return None
+        with self._lock:
+            value = self._random.random()
+        if value < settings.download_error_rate:
+            return "error"
+        if value < settings.download_error_rate + settings.download_abort_rate:
+            return "abort"
+        return None
+
+    def _describe(self, path: str, resource: _Resource) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "name": path.rsplit("/", 1)[-1] or "disk",
+            "path": f"disk:{path}",
+            "type": resource.type,
+            "created": resource.modified,
+            "modified": resource.modified,
+        }
+        if resource.type == "file":
+            result.update(size=len(resource.data), md5=resource.md5, sha256=resource.sha256)
+        return result
+
+    def _subtree(self, path: str) -> list:
+        prefix = path.rstrip("/") + "/"
+        return [p for p in self._resources if p == path or p.startswith(prefix)]
+
+    def _start_operation(self) -> str:
+        """Регистрирует асинхронную операцию (изменения уже применены, статус - по времени)."""
+        with self._lock:
+            operation_id = f"op{len(self._operations) + 1}"
+            self._operations[operation_id] = time.monotonic() + self.settings.operation_delay
+        return operation_id
+
+    def _children(self, path: str) -> list:
+        prefix = path.rstrip("/") + "/"
+        return sorted(
+            p for p in self._resources
+            if p != path and p.startswith(prefix) and "/" not in p[len(prefix):]
+        )
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            # Keep-alive, как у настоящего API: клиенты переиспользуют соединения
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело пишутся отдельно: без TCP_NODELAY задержанное
+            # подтверждение добавляло бы к каждому ответу десятки миллисекунд
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_PUT(self) -> None:
+                self._dispatch("PUT")
+
+            def do_DELETE(self) -> None:
+                self._dispatch("DELETE")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _dispatch(self, method: str) -> None:
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                route = (method, url.path.rstrip("/"))
+                if route == ("GET", "/_data"):
+                    return self._transfer("download", lambda abort=False: self._serve_data(query, abort))
+                if route == ("PUT", "/_data"):
+                    return self._transfer("upload", lambda: self._receive_data(query))
+                self._read_body()
+                handlers = {
+                    ("GET", "/v1/disk"): self._disk_info,
+                    ("GET", "/v1/disk/resources"): self._get_meta,
+                    ("PUT", "/v1/disk/resources"): self._mkdir,
+                    ("DELETE", "/v1/disk/resources"): self._remove,
+                    ("POST", "/v1/disk/resources/copy"): self._copy,
+                    ("POST", "/v1/disk/resources/move"): self._move,
+                    ("GET", "/v1/disk/resources/download"): self._download_link,
+                    ("GET", "/v1/disk/resources/upload"): self._upload_link,
+                }
+                handler = handlers.get(route)
+                if handler is None and route[1].startswith("/v1/disk/operations/"):
+                    handler = self._operation_status
+                if handler is None:
+                    return self._error(404, "NotFoundError", "Неизвестный запрос")
+                server._count(handler.__name__.lstrip("_"))
+                if server.settings.latency:
+                    time.sleep(server.settings.latency)
+                if not self._fault():
+                    handler(query)
+
+            def _transfer(self, kind: str, handler) -> None:
+                server._count(kind)
+                if server.settings.transfer_latency:
+                    time.sleep(server.settings.transfer_latency)
+                if kind == "download":
+                    fault = server._download_fault()
+                    if fault == "error":
+                        server._count("download_error")
+                        self._read_body()
+                        return self._error(server.settings.error_status, "InjectedError", "Внедренная ошибка")
+                    if fault == "abort":
+                        server._count("download_abort")
+                    return handler(abort=fault == "abort")
+                if not self._fault(drain=True):
+                    handler()
+
+            def _fault(self, drain: bool = False) -> bool:
+                fault = server._injected_fault()
+                if fault is None:
+                    return False
+                if drain:
+                    self._read_body()
+                status, name = fault
+                headers = {}
+                if status == 429 and server.settings.retry_after is not None:
+                    headers["Retry-After"] = f"{server.settings.retry_after:g}"
+                self._error(status, name, "Внедренная ошибка", headers)
+                return True
+
+            # --- REST API ---
+
+            def _disk_info(self, query: Dict[str, str]) -> None:
+                with server._lock:
+                    used = sum(len(r.data) for r in server._resources.values())
+                self._json(200, {"total_space": 10 ** 12, "used_space": used, "trash_size": 0})
+
+            def _operation_status(self, query: Dict[str, str]) -> None:
+                # check_token запрашивает статус несуществующей операции
+                operation_id = urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+                with server._lock:
+                    finish = server._operations.get(operation_id)
+                if finish is None:
+                    return self._error(404, "DiskOperationNotFoundError", "Операция не найдена")
+                self._json(200, {"status": "success" if time.monotonic() >= finish else "in-progress"})
+
+            def _get_meta(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                with server._lock:
+                    resource = server._resources.get(path)
+                    if resource is None:
+                        return self._error(404, "DiskNotFoundError", "Ресурс не найден")
+                    result = server._describe(path, resource)
+                    if resource.type == "dir":
+                        limit = min(int(query.get("limit", 20)), server.settings.page_limit)
+                        offset = int(query.get("offset", 0))
+                        children = server._children(path)
+                        result["_embedded"] = {
+                            "items": [
+                                server._describe(p, server._resources[p])
+                                for p in children[offset:offset + limit]
+                            ],
+                            "path": f"disk:{path}",
+                            "limit": limit,
+                            "offset": offset,
+                            "total": len(children),
+                        }
+                self._json(200, _project(result, query.get("fields")))
+
+            def _mkdir(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                with server._lock:
+                    if path in server._resources:
+                        return self._error(409, "DiskResourceAlreadyExistsError", "Ресурс уже существует")
+                    if parent_path(path) not in server._resources:
+                        return self._error(409, "DiskPathDoesntExistsError", "Нет родительской директории")
+                    server._resources[path] = _Resource("dir", modified=_now())
+                self._json(201, self._link("/v1/disk/resources", path))
+
+            def _remove(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                with server._lock:
+                    if path not in server._resources:
+                        return self._error(404, "DiskNotFoundError", "Ресурс не найден")
+                    is_dir = server._resources[path].type == "dir"
+                    for p in server._subtree(path):
+                        del server._resources[p]
+                if is_dir and server.settings.operation_delay:
+                    return self._operation(server._start_operation())
+                self._empty(204)
+
+            def _copy(self, query: Dict[str, str]) -> None:
+                self._relocate(query, keep_source=True)
+
+            def _move(self, query: Dict[str, str]) -> None:
+                self._relocate(query, keep_source=False)
+
+            def _relocate(self, query: Dict[str, str], keep_source: bool) -> None:
+                source = normalize_path(query.get("from", "/"))
+                path = normalize_path(query.get("path", "/"))
+                overwrite = query.get("overwrite", "false").lower() == "true"
+                with server._lock:
+                    resource = server._resources.get(source)
+                    if resource is None:
+                        return self._error(404, "DiskNotFoundError", "Ресурс не найден")
+                    if path in server._resources and not overwrite:
+                        return self._error(409, "DiskResourceAlreadyExistsError", "Ресурс уже существует")
+                    if parent_path(path) not in server._resources:
+                        return self._error(409, "DiskPathDoesntExistsError", "Нет родительской директории")
+                    if path == source or path.startswith(source.rstrip("/") + "/"):
+                        return self._error(409, "DiskResourceAlreadyExistsError", "Нельзя скопировать ресурс в себя")
+                    for p in server._subtree(path):
+                        del server._resources[p]
+                    moved = {path + p[len(source):]: server._resources[p] for p in server._subtree(source)}
+                    if not keep_source:
+                        for p in server._subtree(source):
+                            del server._resources[p]
+                    server._resources.update(moved)
+                if resource.type == "dir" and server.settings.operation_delay:
+                    return self._operation(server._start_operation())
+                self._json(201, self._link("/v1/disk/resources", path))
+
+            def _download_link(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                with server._lock:
+                    resource = server._resources.get(path)
+                if resource is None:
+                    return self._error(404, "DiskNotFoundError", "Ресурс не найден")
+                self._json(200, self._link("/_data", path))
+
+            def _upload_link(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                overwrite = query.get("overwrite", "false").lower() == "true"
+                with server._lock:
+                    exists = path in server._resources
+                    parent_exists = parent_path(path) in server._resources
+                if exists and not overwrite:
+                    return self._error(409, "DiskResourceAlreadyExistsError", "Ресурс уже существует")
+                if not parent_exists:
+                    return self._error(409, "DiskPathDoesntExistsError", "Нет родительской директории")
+                self._json(200, self._link("/_data", path, method="PUT"))
+
+            # --- Передача данных ---
+
+            def _serve_data(self, query: Dict[str, str], abort: bool = False) -> None:
+                self._read_body()
+                path = normalize_path(query.get("path", "/"))
+                with server._lock:
+                    resource = server._resources.get(path)
+                if resource is None or resource.type != "file":
+                    return self._empty(404)
+                data = resource.data
+                status, start, end = 200, 0, len(data) - 1
+                header = self.headers.get("Range")
+                if header and header.startswith("bytes=") and data:
+                    first, _, last = header[len("bytes="):].partition("-")
+                    start = int(first) if first else max(0, len(data) - int(last))
+                    end = min(int(last), len(data) - 1) if first and last else len(data) - 1
+                    if start > end:
+                        return self._empty(416)
+                    status = 206
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(end - start + 1 if data else 0))
+                self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                self.end_headers()
+                view = memoryview(data)[start:end + 1]
+                if abort:
+                    # Отдается половина тела, затем соединение закрывается
+                    view = view[:len(view) // 2]
+                    self.close_connection = True
+                for offset in range(0, len(view), _CHUNK_SIZE):
+                    chunk = view[offset:offset + _CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    self._throttle(len(chunk))
+
+            def _receive_data(self, query: Dict[str, str]) -> None:
+                path = normalize_path(query.get("path", "/"))
+                data = self._read_body(throttle=True)
+                with server._lock:
+                    if parent_path(path) not in server._resources:
+                        return self._empty(409)
+                    server._resources[path] = server._file(data)
+                self._empty(201)
+
+            # --- Вспомогательные ---
+
+            def _throttle(self, size: int) -> None:
+                if server.settings.bandwidth:
+                    time.sleep(size / server.settings.bandwidth)
+
+            def _read_body(self, throttle: bool = False) -> bytes:
+                chunks = []
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    while True:
+                        size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+                        if size == 0:
+                            # Завершающие заголовки и пустая строка
+                            while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                                pass
+                            break
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                        if throttle:
+                            self._throttle(size)
+                else:
+                    remaining = int(self.headers.get("Content-Length") or 0)
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(remaining, _CHUNK_SIZE))
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                        remaining -= len(chunk)
+                        if throttle:
+                            self._throttle(len(chunk))
+                return b"".join(chunks)
+
+            def _operation(self, operation_id: str) -> None:
+                self._json(202, {"href": f"{server.url}/v1/disk/operations/{operation_id}", "method": "GET", "templated": False})
+
+            @staticmethod
+            def _link(endpoint: str, path: str, method: str = "GET") -> Dict[str, Any]:
+                return {"href": f"{server.url}{endpoint}?path={quote(path)}", "method": method, "templated": False}
+
+            def _json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _empty(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _error(self, status: int, name: str, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+                self._json(status, {"error": name, "message": message, "description": message}, headers)
+
+        return _Handler
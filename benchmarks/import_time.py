@@ -0,0 +1,217 @@
+"""
+Бенчмарк времени импорта пакета.
+
+Каждый сценарий выполняется в новом интерпретаторе (как в коротко живущих
+воркерах): замеряется время импорта и проверяется, что тяжелые
+зависимости не загружаются раньше, чем они нужны.
+
+Запуск из корня репозитория:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 50 --top 15
+    python -m benchmarks.import_time --baseline benchmarks/results/import_baseline.json
+
+Процесс завершается с кодом 1, если сценарий загрузил запрещенный модуль
+или (при указании --baseline) замедлился больше чем на --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Модули, загрузку которых проверяют сценарии
+HEAVY_MODULES = ("yadisk", "httpx", "asyncio", "sqlite3", "http.server")
+
+# Сценарий, импортируемый код и модули, которые не должны загружаться
+SCENARIOS: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("package", "import neuro_cloud_api", HEAVY_MODULES),
+    ("factory", "from neuro_cloud_api import SourceFactory", HEAVY_MODULES),
+    ("config", "from neuro_cloud_api.settings.config import NeuroCloudApiConfig", HEAVY_MODULES),
+    ("metrics", "from neuro_cloud_api.metrics import instrumented", HEAVY_MODULES),
+    ("yadisk_sync", "from neuro_cloud_api import YadiskSource", ()),
+    ("yadisk_async", "from neuro_cloud_api import AsyncYadiskSource", ()),
+    ("s3", "from neuro_cloud_api import S3Source", ("yadisk",)),
+    ("google_drive", "from neuro_cloud_api import GoogleDriveSource", ("yadisk",)),
+]
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+@dataclass
+class ImportResult:
+    """
+    Результат сценария.
+
+    scenario: str - Сценарий
+    statement: str - Импортируемый код
+    median_ms: float - Медиана времени импорта, мс
+    min_ms: float - Минимальное время импорта, мс
+    loaded: List[str] - Отслеживаемые модули, загруженные импортом
+    forbidden: List[str] - Загруженные модули, которые сценарий загружать не должен
+    """
+    scenario: str
+    statement: str
+    median_ms: float
+    min_ms: float
+    loaded: List[str]
+    forbidden: List[str]
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    # Без байткода на диске замер включал бы компиляцию
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def run_scenario(name: str, statement: str, absent: Tuple[str, ...], repeat: int) -> ImportResult:
+    """Выполняет импорт repeat раз, каждый раз в новом интерпретаторе."""
+    tracked = tuple(dict.fromkeys(HEAVY_MODULES + absent))
+    code = _PROBE.format(statement=statement, heavy=tracked)
+    env = _environment()
+    # Первый запуск прогревает кэш байткода и файловой системы
+    subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, check=True)
+    timings = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        timings.append(probe["elapsed"] * 1000)
+        loaded = probe["modules"]
+    return ImportResult(
+        scenario=name,
+        statement=statement,
+        median_ms=statistics.median(timings),
+        min_ms=min(timings),
+        loaded=loaded,
+        forbidden=[m for m in loaded if m in absent],
+    )
+
+
+def _importtime(statement: str) -> List[Tuple[str, int]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=_environment(), capture_output=True, text=True, check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+def top_modules(statement: str, count: int) -> List[Tuple[str, int]]:
+    """
+    Самые медленные модули импорта по собственному времени (-X importtime).
+
+    Модули, загружаемые при старте интерпретатора (site и .pth-файлы), не учитываются.
+
+    Returns:
+        Пары (модуль, мкс)
+    """
+    startup = {name for name, _ in _importtime("pass")}
+    modules = [(name, self_us) for name, self_us in _importtime(statement) if name not in startup]
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:count]
+
+
+def compare(results: List[ImportResult], baseline_path: Path, tolerance: float) -> List[str]:
+    """
+    Сравнивает медианы с сохраненным запуском.
+
+    Returns:
+        Описания регрессий (сценарии, ставшие медленнее более чем на tolerance)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.scenario)
+        if previous is None or not previous["median_ms"]:
+            continue
+        slowdown = result.median_ms / previous["median_ms"] - 1
+        if slowdown > tolerance:
+            regressions.append(
+                f"{result.scenario}: {previous['median_ms']:.1f} -> {result.median_ms:.1f} мс (+{slowdown:.0%})"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта пакета")
+    parser.add_argument("--repeat", type=int, default=20, help="Запусков интерпретатора на сценарий")
+    parser.add_argument("--scenarios", help="Сценарии через запятую (по умолчанию все)")
+    parser.add_argument("--top", type=int, default=0, help="Показать N самых медленных модулей каждого сценария")
+    parser.add_argument("--output", type=Path, help="Файл результатов (по умолчанию benchmarks/results/import-<время>.json)")
+    parser.add_argument("--baseline", type=Path, help="Результаты прошлого запуска для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Допустимое замедление (0.3 = 30%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    selected = set(args.scenarios.split(",")) if args.scenarios else None
+    results = []
+    print(f"{'сценарий':<14} {'медиана, мс':>12} {'мин, мс':>9}  загружено")
+    for name, statement, absent in SCENARIOS:
+        if selected is not None and name not in selected:
+            continue
+        result = run_scenario(name, statement, absent, args.repeat)
+        results.append(result)
+        marker = f"  ЗАПРЕЩЕНО: {', '.join(result.forbidden)}" if result.forbidden else ""
+        print(f"{name:<14} {result.median_ms:>12.1f} {result.min_ms:>9.1f}  {', '.join(result.loaded) or '-'}{marker}")
+        for module, self_us in top_modules(statement, args.top) if args.top else []:
+            print(f"    {self_us / 1000:>8.1f} мс  {module}")
+
+    output = args.output or RESULTS_DIR / f"import-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [asdict(result) for result in results],
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты записаны в {output}")
+
+    status = 0
+    if any(result.forbidden for result in results):
+        print("Сценарии загрузили лишние модули")
+        status = 1
+    if args.baseline is not None:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("Регрессии времени импорта:")
+            for line in regressions:
+                print(" -", line)
+            status = 1
+        else:
+            print("Регрессий нет")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""
+Бенчмарки YadiskSource и AsyncYadiskSource на локальном FakeYadiskServer.
+
+Запуск из корня репозитория:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --quick --latency 0.02 --bandwidth 50e6
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/baseline.json
+
+Результаты записываются в JSON; при указании --baseline пропускная
+способность сравнивается с прошлым запуском, и при регрессии больше
+--tolerance процесс завершается с кодом 1.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.neuro_cloud_api.metrics import HistogramSink
+from src.neuro_cloud_api.sources.async_yadisk_source import AsyncYadiskSource
+from src.neuro_cloud_api.sources.transfer import TransferResult
+from src.neuro_cloud_api.sources.transport import TransportSettings
+from src.neuro_cloud_api.sources.yadisk_source import YadiskSource
+
+from .fake_yadisk_server import FakeServerSettings, FakeYadiskServer
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+TOKEN = "benchmark-token"
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Результат одного замера.
+
+    scenario: str - Сценарий (small_upload, small_download, large_download, ...)
+    mode: str - sync | async
+    workers: int - Количество воркеров (одновременных операций)
+    files: int - Количество файлов
+    bytes: int - Переданный объем
+    seconds: float - Время выполнения
+    files_per_sec: float - Файлов в секунду
+    mb_per_sec: float - Мегабайт в секунду
+    errors: int - Количество неудачных операций
+    p50: float - Медиана длительности одной операции, сек
+    p99: float - 99-й перцентиль длительности одной операции, сек
+    requests: Dict[str, int] - Запросы к серверу по видам
+    """
+    scenario: str
+    mode: str
+    workers: int
+    files: int
+    bytes: int
+    seconds: float
+    files_per_sec: float
+    mb_per_sec: float
+    errors: int
+    p50: float = 0.0
+    p99: float = 0.0
+    requests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}/{self.mode}/{self.workers}"
+
+
+class BenchmarkSuite:
+    """Набор сценариев над одним запущенным FakeYadiskServer."""
+
+    def __init__(self, server: FakeYadiskServer, workdir: Path, args: argparse.Namespace):
+        self.server = server
+        self.workdir = workdir
+        self.args = args
+        self.transport = TransportSettings(pool_size=max(args.workers + [args.segments]))
+        self.results: List[BenchmarkResult] = []
+
+    # --- Подготовка данных ---
+
+    def _local_files(self, name: str, count: int, size: int) -> List[Path]:
+        directory = self.workdir / name
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for i in range(count):
+            path = directory / f"{i:05d}.bin"
+            if not path.exists():
+                path.write_bytes(os.urandom(size))
+            paths.append(path)
+        return paths
+
+    def _remote_files(self, prefix: str, count: int, size: int) -> List[str]:
+        paths = []
+        for i in range(count):
+            path = f"{prefix}/{i:05d}.bin"
+            self.server.put_file(path, os.urandom(size))
+            paths.append(path)
+        return paths
+
+    def _sync_source(self) -> YadiskSource:
+        # Кэш метаданных отключен: замеряются запросы, а не попадания в кэш
+        return YadiskSource(TOKEN, cache_ttl=0, transport=self.transport)
+
+    def _async_source(self) -> AsyncYadiskSource:
+        return AsyncYadiskSource(TOKEN, cache_ttl=0, transport=self.transport)
+
+    # --- Замер ---
+
+    def _record(
+        self,
+        scenario: str,
+        mode: str,
+        workers: int,
+        histogram: HistogramSink,
+        operation: str,
+        seconds: float,
+        results: List[TransferResult],
+    ) -> BenchmarkResult:
+        summary = histogram.summary().get(operation)
+        size = sum(r.size for r in results if r.success)
+        result = BenchmarkResult(
+            scenario=scenario,
+            mode=mode,
+            workers=workers,
+            files=len(results),
+            bytes=size,
+            seconds=round(seconds, 4),
+            files_per_sec=round(len(results) / seconds, 2) if seconds else 0.0,
+            mb_per_sec=round(size / seconds / 1e6, 3) if seconds else 0.0,
+            errors=sum(1 for r in results if not r.success),
+            p50=round(summary.p50, 4) if summary else 0.0,
+            p99=round(summary.p99, 4) if summary else 0.0,
+            requests=self.server.request_counts(),
+        )
+        self.results.append(result)
+        print(
+            f"{result.key:<32} {result.seconds:>8.3f} сек  {result.files_per_sec:>9.1f} файл/с  "
+            f"{result.mb_per_sec:>8.2f} МБ/с  ошибок: {result.errors}"
+        )
+        return result
+
+    def _measure_sync(self, source: YadiskSource, call: Callable[[], Any]) -> Tuple[Any, float, HistogramSink]:
+        histogram = HistogramSink()
+        source.add_sink(histogram)
+        self.server.reset_counts()
+        # Источники печатают сообщение о каждой операции - в замере они не нужны
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            value = call()
+            elapsed = time.perf_counter() - start
+        source.remove_sink(histogram)
+        return value, elapsed, histogram
+
+    async def _measure_async(self, source: AsyncYadiskSource, call: Callable[[], Any]) -> Tuple[Any, float, HistogramSink]:
+        histogram = HistogramSink()
+        source.add_sink(histogram)
+        self.server.reset_counts()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            value = await call()
+            elapsed = time.perf_counter() - start
+        source.remove_sink(histogram)
+        return value, elapsed, histogram
+
+    # --- Сценарии ---
+
+    def run(self) -> List[BenchmarkResult]:
+        """Выполняет все сценарии."""
+        args = self.args
+        local = self._local_files("small", args.small_count, args.small_size)
+        remote = self._remote_files("/bench/small", args.small_count, args.small_size)
+        self._remote_files("/bench/large", 1, args.large_size)
+        large_local = self._local_files("large", 1, args.large_size)[0]
+        self.server.put_directory("/bench/tree")
+        for i in range(args.tree_dirs):
+            for j in range(args.tree_files):
+                self.server.put_file(f"/bench/tree/d{i:03d}/f{j:03d}.txt", b"x")
+
+        print("Синхронный источник")
+        self._run_sync(local, remote, large_local)
+        print("Асинхронный источник")
+        asyncio.run(self._run_async(local, remote, large_local))
+        return self.results
+
+    def _run_sync(self, local: List[Path], remote: List[str], large_local: Path) -> None:
+        args = self.args
+        source = self._sync_source()
+        try:
+            for workers in args.workers:
+                items = [(f"/bench/up/sync-{workers}/{p.name}", p) for p in local]
+                value, elapsed, histogram = self._measure_sync(
+                    source, lambda: source.upload_many(items, max_workers=workers)
+                )
+                self._record("small_upload", "sync", workers, histogram, "upload", elapsed, value)
+
+                target = self.workdir / f"down-sync-{workers}"
+                items = [(path, target / Path(path).name) for path in remote]
+                value, elapsed, histogram = self._measure_sync(
+                    source, lambda: source.download_many(items, max_workers=workers)
+                )
+                self._record("small_download", "sync", workers, histogram, "download", elapsed, value)
+                shutil.rmtree(target, ignore_errors=True)
+
+            self._large_sync(source, large_local)
+
+            value, elapsed, histogram = self._measure_sync(
+                source, lambda: source.list_files("/bench/tree", max_workers=max(args.workers))
+            )
+            self._record(
+                "list_tree", "sync", max(args.workers), histogram, "list_files", elapsed,
+                [TransferResult(item["path"], "", True) for item in value],
+            )
+        finally:
+            source.disconnect()
+
+    def _large_sync(self, source: YadiskSource, large_local: Path) -> None:
+        target = self.workdir / "large-sync.bin"
+        remote = "/bench/large/00000.bin"
+
+        def _single() -> List[TransferResult]:
+            ok = source.download_file(remote, target)
+            return [TransferResult(remote, str(target), ok, size=target.stat().st_size if ok else 0)]
+
+        def _segmented() -> List[TransferResult]:
+            ok = source.download_large_file(
+                remote, target, segment_size=self.args.segment_size,
+                max_workers=self.args.segments, threshold=0,
+            )
+            return [TransferResult(remote, str(target), ok, size=target.stat().st_size if ok else 0)]
+
+        def _upload() -> List[TransferResult]:
+            ok = source.upload_file(large_local, "/bench/up/large-sync.bin")
+            return [TransferResult("/bench/up/large-sync.bin", str(large_local), ok, size=large_local.stat().st_size)]
+
+        value, elapsed, histogram = self._measure_sync(source, _single)
+        self._record("large_download", "sync", 1, histogram, "download", elapsed, value)
+        target.unlink(missing_ok=True)
+        value, elapsed, histogram = self._measure_sync(source, _segmented)
+        self._record("large_download_segmented", "sync", self.args.segments, histogram,
+                     "download_large_file", elapsed, value)
+        target.unlink(missing_ok=True)
+        value, elapsed, histogram = self._measure_sync(source, _upload)
+        self._record("large_upload", "sync", 1, histogram, "upload", elapsed, value)
+
+    async def _run_async(self, local: List[Path], remote: List[str], large_local: Path) -> None:
+        args = self.args
+        source = self._async_source()
+        try:
+            for workers in args.workers:
+                items = [(f"/bench/up/async-{workers}/{p.name}", p) for p in local]
+                value, elapsed, histogram = await self._measure_async(
+                    source, lambda: source.upload_many(items, max_concurrency=workers)
+                )
+                self._record("small_upload", "async", workers, histogram, "upload", elapsed, value)
+
+                target = self.workdir / f"down-async-{workers}"
+                items = [(path, target / Path(path).name) for path in remote]
+                value, elapsed, histogram = await self._measure_async(
+                    source, lambda: source.download_many(items, max_concurrency=workers)
+                )
+                self._record("small_download", "async", workers, histogram, "download", elapsed, value)
+                shutil.rmtree(target, ignore_errors=True)
+
+            await self._large_async(source, large_local)
+
+            value, elapsed, histogram = await self._measure_async(
+                source, lambda: source.list_files("/bench/tree", max_workers=max(args.workers))
+            )
+            self._record(
+                "list_tree", "async", max(args.workers), histogram, "list_files", elapsed,
+                [TransferResult(item["path"], "", True) for item in value],
+            )
+        finally:
+            await source.disconnect()
+
+    async def _large_async(self, source: AsyncYadiskSource, large_local: Path) -> None:
+        target = self.workdir / "large-async.bin"
+        remote = "/bench/large/00000.bin"
+
+        async def _single() -> List[TransferResult]:
+            ok = await source.download_file(remote, target)
+            return [TransferResult(remote, str(target), ok, size=target.stat().st_size if ok else 0)]
+
+        async def _segmented() -> List[TransferResult]:
+            ok = await source.download_large_file(
+                remote, target, segment_size=self.args.segment_size,
+                max_concurrency=self.args.segments, threshold=0,
+            )
+            return [TransferResult(remote, str(target), ok, size=target.stat().st_size if ok else 0)]
+
+        async def _upload() -> List[TransferResult]:
+            ok = await source.upload_file(large_local, "/bench/up/large-async.bin")
+            return [TransferResult("/bench/up/large-async.bin", str(large_local), ok, size=large_local.stat().st_size)]
+
+        value, elapsed, histogram = await self._measure_async(source, _single)
+        self._record("large_download", "async", 1, histogram, "download", elapsed, value)
+        target.unlink(missing_ok=True)
+        value, elapsed, histogram = await self._measure_async(source, _segmented)
+        self._record("large_download_segmented", "async", self.args.segments, histogram,
+                     "download_large_file", elapsed, value)
+        target.unlink(missing_ok=True)
+        value, elapsed, histogram = await self._measure_async(source, _upload)
+        self._record("large_upload", "async", 1, histogram, "upload", elapsed, value)
+
+
+def compare(results: List[BenchmarkResult], baseline_path: Path, tolerance: float) -> List[str]:
+    """
+    Сравнивает пропускную способность с сохраненным запуском.
+
+    Returns:
+        Описания регрессий (замеры, ставшие медленнее более чем на tolerance)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            f"{r['scenario']}/{r['mode']}/{r['workers']}": r
+            for r in json.load(f)["results"]
+        }
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None or not previous["seconds"]:
+            continue
+        slowdown = result.seconds / previous["seconds"] - 1
+        if slowdown > tolerance:
+            regressions.append(
+                f"{result.key}: {previous['seconds']:.3f} -> {result.seconds:.3f} сек (+{slowdown:.0%})"
+            )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарки источников Яндекс.Диска на локальном сервере")
+    parser.add_argument("--output", type=Path, help="Файл результатов (по умолчанию benchmarks/results/<время>.json)")
+    parser.add_argument("--baseline", type=Path, help="Результаты прошлого запуска для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Допустимое замедление (0.2 = 20%%)")
+    parser.add_argument("--quick", action="store_true", help="Уменьшенный набор для быстрой проверки")
+    parser.add_argument("--workers", default="1,4,8,16", help="Значения параллельности через запятую")
+    parser.add_argument("--small-count", type=int, default=200, help="Количество маленьких файлов")
+    parser.add_argument("--small-size", type=int, default=4 * 1024, help="Размер маленького файла, байт")
+    parser.add_argument("--large-size", type=int, default=64 * 1024 * 1024, help="Размер большого файла, байт")
+    parser.add_argument("--segment-size", type=int, default=8 * 1024 * 1024, help="Размер сегмента, байт")
+    parser.add_argument("--segments", type=int, default=4, help="Параллельных сегментов большого файла")
+    parser.add_argument("--tree-dirs", type=int, default=50, help="Директорий в дереве для list_files")
+    parser.add_argument("--tree-files", type=int, default=20, help="Файлов в каждой директории дерева")
+    parser.add_argument("--latency", type=float, default=0.01, help="Задержка запроса API, сек")
+    parser.add_argument("--transfer-latency", type=float, default=0.01, help="Задержка до первого байта, сек")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Пропускная способность соединения, байт/с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля запросов с ошибкой 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Доля запросов с ответом 429")
+    parser.add_argument("--download-error-rate", type=float, default=0.0, help="Доля скачиваний с ошибкой 503")
+    parser.add_argument("--download-abort-rate", type=float, default=0.0,
+                        help="Доля скачиваний, обрываемых на середине")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора ошибок")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.workers = "1,8"
+        args.small_count = 40
+        args.large_size = 8 * 1024 * 1024
+        args.segment_size = 2 * 1024 * 1024
+        args.tree_dirs = 10
+    args.workers = [int(value) for value in str(args.workers).split(",") if value.strip()]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    settings = FakeServerSettings(
+        latency=args.latency,
+        transfer_latency=args.transfer_latency,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        download_error_rate=args.download_error_rate,
+        download_abort_rate=args.download_abort_rate,
+        seed=args.seed,
+    )
+    workdir = Path(tempfile.mkdtemp(prefix="neuro_cloud_bench_"))
+    try:
+        with FakeYadiskServer(settings) as server:
+            results = BenchmarkSuite(server, workdir, args).run()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "server": asdict(settings),
+        "parameters": {
+            "workers": args.workers,
+            "small_count": args.small_count,
+            "small_size": args.small_size,
+            "large_size": args.large_size,
+            "segment_size": args.segment_size,
+            "segments": args.segments,
+            "tree_dirs": args.tree_dirs,
+            "tree_files": args.tree_files,
+        },
+        "results": [asdict(result) for result in results],
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты записаны в {output}")
+
+    if args.baseline is not None:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("Регрессии производительности:")
+            for line in regressions:
+                print(" -", line)
+            return 1
+        print("Регрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
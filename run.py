@@ -5,6 +5,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from src.neuro_cloud_api import SourceFactory, SourceType
+from src.neuro_cloud_api.metrics import HistogramSink
 
 
 # Загружаем переменные из .env файла
@@ -13,6 +14,10 @@ load_dotenv()
 # Считываем токен
 yadisk_token = os.getenv('YADISK_TOKEN')
 
+# Параметры замера пакетной передачи
+BATCH_SIZE = 20
+BATCH_WORKERS = 8
+
 def main():
     total_start_time = time.perf_counter()
     
@@ -21,6 +26,9 @@ def main():
         token=yadisk_token,
         source_type=SourceType.YANDEX_DISK
     )
+    # Латентность и объем каждой операции по событиям источника
+    histogram = HistogramSink()
+    source.add_sink(histogram)
 
     print("Connecting...")
     connect_start = time.perf_counter()
@@ -64,6 +72,46 @@ def main():
     download_time = time.perf_counter() - download_start
     print(f"Время скачивания: {download_time:.3f} сек")
 
+    print(f"\nBatch transfer ({BATCH_SIZE} files)...")
+    batch_dir = Path("batch_upload")
+    batch_dir.mkdir(exist_ok=True)
+    batch_files = []
+    for i in range(BATCH_SIZE):
+        local_file = batch_dir / f"file_{i}.txt"
+        local_file.write_text(f"batch file {i}\n")
+        batch_files.append(local_file)
+
+    seq_upload_start = time.perf_counter()
+    for local_file in batch_files:
+        source.upload_file(local_path=local_file, remote_path=f"/batch_seq/{local_file.name}", overwrite=True)
+    seq_upload_time = time.perf_counter() - seq_upload_start
+
+    batch_upload_start = time.perf_counter()
+    upload_results = source.upload_many(
+        [(f"/batch_pool/{f.name}", f) for f in batch_files],
+        max_workers=BATCH_WORKERS,
+        # Пример можно запускать повторно: файлы прошлого запуска перезаписываются
+        overwrite=True
+    )
+    batch_upload_time = time.perf_counter() - batch_upload_start
+    print(f"Загружено в пуле: {sum(r.success for r in upload_results)}/{BATCH_SIZE}")
+
+    seq_download_start = time.perf_counter()
+    for local_file in batch_files:
+        source.download_file(
+            remote_path=f"/batch_seq/{local_file.name}",
+            local_path=Path("downloads/batch_seq") / local_file.name
+        )
+    seq_download_time = time.perf_counter() - seq_download_start
+
+    batch_download_start = time.perf_counter()
+    download_results = source.download_many(
+        [(f"/batch_pool/{f.name}", Path("downloads/batch_pool") / f.name) for f in batch_files],
+        max_workers=BATCH_WORKERS
+    )
+    batch_download_time = time.perf_counter() - batch_download_start
+    print(f"Скачано в пуле: {sum(r.success for r in download_results)}/{BATCH_SIZE}")
+
     source.disconnect()
     print("\nDisconnected")
     
@@ -76,6 +124,19 @@ def main():
     print(f"Поиск директорий:   {search_time:.3f} сек")
     print(f"Загрузка файла:     {upload_time:.3f} сек")
     print(f"Скачивание файла:   {download_time:.3f} сек")
+    print(f"{'-'*50}")
+    print(f"Пакет из {BATCH_SIZE} файлов, {BATCH_WORKERS} потоков:")
+    print(f"Загрузка последовательно:  {seq_upload_time:.3f} сек")
+    print(f"Загрузка в пуле:           {batch_upload_time:.3f} сек "
+          f"(x{seq_upload_time / batch_upload_time:.1f})")
+    print(f"Скачивание последовательно: {seq_download_time:.3f} сек")
+    print(f"Скачивание в пуле:          {batch_download_time:.3f} сек "
+          f"(x{seq_download_time / batch_download_time:.1f})")
+    print(f"{'-'*50}")
+    print("Операции (p50 / p99, сек):")
+    for operation, summary in sorted(histogram.summary().items()):
+        print(f"{operation:<20} n={summary.count:<4} {summary.p50:.3f} / {summary.p99:.3f}"
+              f"  повторов: {summary.retries}  ошибок: {summary.errors}")
     print(f"{'='*50}")
     print(f"ОБЩЕЕ ВРЕМЯ:        {total_time:.3f} сек")
     print("="*50)
@@ -1,11 +1,82 @@
-from .sources.yadisk_source import YadiskSource
-from .sources.async_yadisk_source import AsyncYadiskSource
-from .sources.source_factory import SourceFactory
-from .sources.source_type import SourceType
+from typing import TYPE_CHECKING
+
+from .sources import _LAZY_ATTRIBUTES as _SOURCES_LAZY_ATTRIBUTES
+
+# Классы загружаются при первом обращении: импорт пакета не тянет yadisk,
+# httpx и модули неиспользуемых источников. Список ведется в sources
+_LAZY_ATTRIBUTES = {name: ".sources" + module for name, module in _SOURCES_LAZY_ATTRIBUTES.items()}
+
+if TYPE_CHECKING:
+    from .sources.yadisk_source import YadiskSource
+    from .sources.async_yadisk_source import AsyncYadiskSource
+    from .sources.s3_source import S3Source
+    from .sources.async_s3_source import AsyncS3Source
+    from .sources.ggldisk_source import GoogleDriveSource
+    from .sources.async_ggldisk_source import AsyncGoogleDriveSource
+    from .sources.source_factory import SourceFactory
+    from .sources.registry import SourceRegistry, SourceSpec
+    from .sources.remote_index import RemoteIndex
+    from .sources.content_cache import ContentCache
+    from .sources.tiered_source import TieredSource
+    from .sources.bridged_source import BridgedSource, EventLoopThread
+    from .sources.transport import ClientRegistry, TransportSettings
+    from .sources.request_scheduler import RequestScheduler, RetryPolicy
+    from .sources.source_type import SourceType
+    from .sources.transfer import OperationResult, TransferResult
+    from .sources.operation_poller import OperationFailedError, OperationPoller
+    from .sources.shard_archive import (
+        AsyncShardReader, ShardIndex, ShardMember, ShardReader, ShardWriter, pack_directory, pack_files,
+    )
+    from .sources.dataset import AsyncRemoteDataset, DatasetItem, RemoteDataset
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "YadiskSource",
     "AsyncYadiskSource",
+    "S3Source",
+    "AsyncS3Source",
+    "GoogleDriveSource",
+    "AsyncGoogleDriveSource",
     "SourceFactory",
+    "SourceRegistry",
+    "SourceSpec",
     "SourceType",
-]
\ No newline at end of file
+    "RemoteIndex",
+    "ContentCache",
+    "TieredSource",
+    "BridgedSource",
+    "EventLoopThread",
+    "ClientRegistry",
+    "TransportSettings",
+    "RequestScheduler",
+    "RetryPolicy",
+    "TransferResult",
+    "OperationResult",
+    "OperationPoller",
+    "OperationFailedError",
+    "ShardIndex",
+    "ShardMember",
+    "ShardWriter",
+    "ShardReader",
+    "AsyncShardReader",
+    "pack_files",
+    "pack_directory",
+    "RemoteDataset",
+    "AsyncRemoteDataset",
+    "DatasetItem",
+]
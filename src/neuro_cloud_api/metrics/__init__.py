@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING
+
+from .events import (
+    Instrumentation, MetricsSink, OperationEvent, add_bytes, instrumented, note_retry, record_error
+)
+
+# Приемники загружаются при первом обращении: им нужен http.server
+_LAZY_ATTRIBUTES = {
+    "HistogramSink": ".sinks",
+    "LoggingSink": ".sinks",
+    "OperationSummary": ".sinks",
+    "PrometheusExporter": ".sinks",
+}
+
+if TYPE_CHECKING:
+    from .sinks import HistogramSink, LoggingSink, OperationSummary, PrometheusExporter
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = [
+    "Instrumentation",
+    "MetricsSink",
+    "OperationEvent",
+    "OperationSummary",
+    "HistogramSink",
+    "LoggingSink",
+    "PrometheusExporter",
+    "add_bytes",
+    "instrumented",
+    "note_retry",
+    "record_error",
+]
@@ -0,0 +1,251 @@
+import contextvars
+import functools
+import inspect
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Union
+
+
+@dataclass
+class OperationEvent:
+    """
+    Событие завершения операции источника.
+
+    operation: str - Название операции (download_file, upload, listdir, ...)
+    path: Optional[str] - Путь ресурса
+    source: str - Тип источника
+    bytes: int - Переданный объем данных
+    latency: float - Длительность операции, сек
+    retries: int - Количество повторов запросов
+    outcome: str - ok | error
+    error: Optional[str] - Описание ошибки
+    timestamp: float - Время завершения (time.time())
+    """
+    operation: str
+    path: Optional[str]
+    source: str
+    bytes: int
+    latency: float
+    retries: int
+    outcome: str
+    error: Optional[str] = None
+    timestamp: float = 0.0
+
+
+class MetricsSink:
+    """Базовый класс приемника событий."""
+
+    def handle(self, event: OperationEvent) -> None:
+        raise NotImplementedError
+
+
+class OperationSpan:
+    """
+    Изменяемое состояние выполняющейся операции.
+
+    Объем и повторы учитываются и во всех объемлющих операциях: например,
+    байты каждого файла download_many попадают и в событие файла, и в событие
+    всего пакета.
+    """
+
+    __slots__ = ("operation", "path", "parent", "bytes", "retries", "error", "start")
+
+    def __init__(self, operation: str, path: Optional[str], parent: Optional["OperationSpan"] = None):
+        self.operation = operation
+        self.path = path
+        self.parent = parent
+        self.bytes = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+        self.start = time.perf_counter()
+
+
+_current_span: "contextvars.ContextVar[Optional[OperationSpan]]" = contextvars.ContextVar(
+    "neuro_cloud_span", default=None
+)
+
+
+# Операции одного пакета обновляют общий родительский span из разных потоков
+_span_lock = threading.Lock()
+
+
+def add_bytes(amount: Optional[int]) -> None:
+    """Добавляет переданный объем к текущей операции (если она отслеживается)."""
+    span = _current_span.get()
+    if span is None or not amount:
+        return
+    with _span_lock:
+        while span is not None:
+            span.bytes += amount
+            span = span.parent
+
+
+def note_retry() -> None:
+    """Учитывает повтор запроса в текущей операции."""
+    span = _current_span.get()
+    if span is None:
+        return
+    with _span_lock:
+        while span is not None:
+            span.retries += 1
+            span = span.parent
+
+
+def record_error(error: Union[BaseException, str]) -> None:
+    """Запоминает ошибку (или ее описание) текущей операции (для методов, возвращающих False)."""
+    span = _current_span.get()
+    if span is not None:
+        span.error = error if isinstance(error, str) else str(error) or type(error).__name__
+
+
+class _Tracker:
+    """Контекстный менеджер одной операции."""
+
+    __slots__ = ("_instrumentation", "_span", "_token")
+
+    def __init__(self, instrumentation: "Instrumentation", operation: str, path: Optional[str]):
+        self._instrumentation = instrumentation
+        self._span = OperationSpan(operation, path, _current_span.get())
+        self._token: Any = None
+
+    def __enter__(self) -> OperationSpan:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        if exc is not None and self._span.error is None:
+            self._span.error = str(exc) or exc_type.__name__
+        self._instrumentation.finish(self._span)
+
+
+class _NullTracker:
+    """Контекстный менеджер без затрат, если приемников нет."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_TRACKER = _NullTracker()
+
+
+class Instrumentation:
+    """
+    Точка подключения приемников метрик источника.
+
+    Пока нет ни одного приемника, track возвращает пустой контекстный
+    менеджер и не измеряет время, поэтому накладные расходы минимальны.
+    """
+
+    def __init__(self, source: str = ""):
+        """
+        Args:
+            source: Имя источника, попадающее в события
+        """
+        self.source = source
+        self._sinks: List[MetricsSink] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._sinks)
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """Подключает приемник событий."""
+        with self._lock:
+            self._sinks = self._sinks + [sink]
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        """Отключает приемник событий."""
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s is not sink]
+
+    def track(self, operation: str, path: Optional[str] = None) -> Any:
+        """
+        Контекстный менеджер, измеряющий одну операцию.
+
+        Внутри него add_bytes, note_retry и record_error относятся к этой операции.
+        """
+        if not self._sinks:
+            return _NULL_TRACKER
+        return _Tracker(self, operation, path)
+
+    def finish(self, span: OperationSpan) -> None:
+        """Формирует событие и передает его приемникам."""
+        event = OperationEvent(
+            operation=span.operation,
+            path=span.path,
+            source=self.source,
+            bytes=span.bytes,
+            latency=time.perf_counter() - span.start,
+            retries=span.retries,
+            outcome="error" if span.error is not None else "ok",
+            error=span.error,
+            timestamp=time.time(),
+        )
+        for sink in self._sinks:
+            try:
+                sink.handle(event)
+            except Exception:
+                # Ошибка приемника метрик не должна ломать операцию
+                pass
+
+
+def _mark_failed(span: Optional[OperationSpan], result: Any) -> None:
+    if span is not None and span.error is None and result is False:
+        span.error = "failed"
+
+
+def instrumented(operation: str, path_arg: Optional[int] = 0) -> Callable:
+    """
+    Декоратор метода источника: каждый вызов порождает OperationEvent.
+
+    Результат False считается ошибкой. Путь берется из позиционного
+    аргумента с номером path_arg (без учета self).
+
+    Args:
+        operation: Название операции
+        path_arg: Номер аргумента с путем ресурса (None - без пути)
+    """
+    def decorator(func: Callable) -> Callable:
+        def _path(args: tuple, kwargs: dict) -> Optional[str]:
+            if path_arg is None:
+                return None
+            if len(args) > path_arg:
+                value = args[path_arg]
+            else:
+                names = list(inspect.signature(func).parameters)[1:]
+                value = kwargs.get(names[path_arg]) if path_arg < len(names) else None
+            return str(value) if isinstance(value, str) else None
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                instrumentation: Instrumentation = self.instrumentation
+                if not instrumentation.enabled:
+                    return await func(self, *args, **kwargs)
+                with instrumentation.track(operation, _path(args, kwargs)) as span:
+                    result = await func(self, *args, **kwargs)
+                    _mark_failed(span, result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            instrumentation: Instrumentation = self.instrumentation
+            if not instrumentation.enabled:
+                return func(self, *args, **kwargs)
+            with instrumentation.track(operation, _path(args, kwargs)) as span:
+                result = func(self, *args, **kwargs)
+                _mark_failed(span, result)
+                return result
+        return wrapper
+
+    return decorator
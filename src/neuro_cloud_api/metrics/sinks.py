@@ -0,0 +1,250 @@
+import bisect
+import logging
+import math
+import threading
+
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from .events import MetricsSink, OperationEvent
+
+
+@dataclass
+class OperationSummary:
+    """
+    Сводка по одной операции.
+
+    count: int - Количество вызовов
+    errors: int - Количество неудачных вызовов
+    retries: int - Суммарное количество повторов
+    bytes: int - Суммарный объем данных
+    p50: float - Медиана длительности, сек
+    p99: float - 99-й перцентиль длительности, сек
+    mean: float - Средняя длительность, сек
+    throughput: float - Байт в секунду на один вызов (bytes / суммарная длительность)
+    """
+    count: int
+    errors: int
+    retries: int
+    bytes: int
+    p50: float
+    p99: float
+    mean: float
+    throughput: float
+
+
+class _OperationStats:
+    __slots__ = ("count", "errors", "retries", "bytes", "total_latency", "samples")
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Перцентиль q (0..100) отсортированной последовательности (ближайший ранг)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class HistogramSink(MetricsSink):
+    """
+    Накопление длительностей в памяти с расчетом p50/p99 по операциям.
+
+    Для перцентилей хранятся последние max_samples длительностей каждой операции.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        """
+        Args:
+            max_samples: Количество хранимых длительностей на операцию
+        """
+        self.max_samples = max_samples
+        self._stats: Dict[str, _OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, event: OperationEvent) -> None:
+        with self._lock:
+            stats = self._stats.get(event.operation)
+            if stats is None:
+                stats = self._stats[event.operation] = _OperationStats(self.max_samples)
+            stats.count += 1
+            stats.errors += event.outcome != "ok"
+            stats.retries += event.retries
+            stats.bytes += event.bytes
+            stats.total_latency += event.latency
+            stats.samples.append(event.latency)
+
+    def summary(self) -> Dict[str, OperationSummary]:
+        """Сводка по всем операциям."""
+        with self._lock:
+            items = [
+                (name, stats.count, stats.errors, stats.retries, stats.bytes,
+                 stats.total_latency, sorted(stats.samples))
+                for name, stats in self._stats.items()
+            ]
+        result = {}
+        for name, count, errors, retries, size, total, samples in items:
+            result[name] = OperationSummary(
+                count=count,
+                errors=errors,
+                retries=retries,
+                bytes=size,
+                p50=percentile(samples, 50),
+                p99=percentile(samples, 99),
+                mean=total / count if count else 0.0,
+                throughput=size / total if total > 0 else 0.0,
+            )
+        return result
+
+    def reset(self) -> None:
+        """Очищает накопленные данные."""
+        with self._lock:
+            self._stats = {}
+
+
+class LoggingSink(MetricsSink):
+    """Запись событий в logging (поля события передаются в extra)."""
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+        error_level: int = logging.WARNING,
+    ):
+        """
+        Args:
+            logger: Логгер (по умолчанию "neuro_cloud_api")
+            level: Уровень успешных операций
+            error_level: Уровень неудачных операций
+        """
+        self.logger = logger or logging.getLogger("neuro_cloud_api")
+        self.level = level
+        self.error_level = error_level
+
+    def handle(self, event: OperationEvent) -> None:
+        level = self.level if event.outcome == "ok" else self.error_level
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "%s %s %s bytes=%d latency=%.3fs retries=%d%s",
+            event.operation, event.path or "-", event.outcome, event.bytes,
+            event.latency, event.retries, f" error={event.error}" if event.error else "",
+            extra={"neuro_cloud_event": event},
+        )
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class PrometheusExporter(MetricsSink):
+    """
+    Метрики в текстовом формате Prometheus.
+
+    Счетчики операций, байт и повторов и гистограмма длительностей с
+    метками operation и outcome. Текст выдает render(); serve() поднимает
+    HTTP-эндпоинт /metrics в фоновом потоке. Пакет prometheus_client не нужен.
+    """
+
+    def __init__(self, prefix: str = "neuro_cloud", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            prefix: Префикс имен метрик
+            buckets: Верхние границы корзин гистограммы длительностей, сек
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._operations: Dict[Tuple[str, str], int] = {}
+        self._bytes: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._histograms: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def handle(self, event: OperationEvent) -> None:
+        with self._lock:
+            key = (event.operation, event.outcome)
+            self._operations[key] = self._operations.get(key, 0) + 1
+            self._bytes[event.operation] = self._bytes.get(event.operation, 0) + event.bytes
+            self._retries[event.operation] = self._retries.get(event.operation, 0) + event.retries
+            # Последние два элемента - сумма и количество
+            histogram = self._histograms.setdefault(event.operation, [0] * (len(self.buckets) + 2))
+            index = bisect.bisect_left(self.buckets, event.latency)
+            if index < len(self.buckets):
+                histogram[index] += 1
+            histogram[-2] += event.latency
+            histogram[-1] += 1
+
+    def render(self) -> str:
+        """Текущие значения в текстовом формате Prometheus."""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_operations_total Количество операций",
+            f"# TYPE {p}_operations_total counter",
+        ]
+        with self._lock:
+            for (operation, outcome), value in sorted(self._operations.items()):
+                lines.append(f'{p}_operations_total{{operation="{operation}",outcome="{outcome}"}} {value}')
+            lines += [f"# HELP {p}_bytes_total Объем переданных данных", f"# TYPE {p}_bytes_total counter"]
+            for operation, value in sorted(self._bytes.items()):
+                lines.append(f'{p}_bytes_total{{operation="{operation}"}} {value}')
+            lines += [f"# HELP {p}_retries_total Количество повторов", f"# TYPE {p}_retries_total counter"]
+            for operation, value in sorted(self._retries.items()):
+                lines.append(f'{p}_retries_total{{operation="{operation}"}} {value}')
+            lines += [
+                f"# HELP {p}_operation_seconds Длительность операций",
+                f"# TYPE {p}_operation_seconds histogram",
+            ]
+            for operation, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram):
+                    cumulative += count
+                    lines.append(f'{p}_operation_seconds_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_operation_seconds_bucket{{operation="{operation}",le="+Inf"}} {int(histogram[-1])}')
+                lines.append(f'{p}_operation_seconds_sum{{operation="{operation}"}} {histogram[-2]}')
+                lines.append(f'{p}_operation_seconds_count{{operation="{operation}"}} {int(histogram[-1])}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9100, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """
+        Запускает HTTP-эндпоинт /metrics в фоновом потоке.
+
+        Returns:
+            Сервер (остановить можно методом stop)
+        """
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop(self) -> None:
+        """Останавливает HTTP-эндпоинт."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
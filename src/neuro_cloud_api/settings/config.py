@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 
 # Класс-Конфиг для того, чтобы параметры хранились в нем
@@ -10,8 +11,78 @@ class NeuroCloudApiConfig:
     token: str - Токен для подключению Облачного сервиса
     source_type: Enum - Тип сервиса (YANDEX_DISK | GOOGLE_DRIVE | S3)
     home_folder: str - Корневая папка, по-умолчанию, например, MATLLER
+    async_enabled: bool - Создавать асинхронный источник
+    cache_ttl: float - Время жизни кэша содержимого директорий, сек (0 - без кэша)
+    cache_max_entries: int - Максимальное количество директорий в кэше
+    index_path: Optional[str] - Путь к файлу SQLite локального индекса дерева (None - без индекса)
+    content_cache_dir: Optional[str] - Директория локального кэша скачанных файлов по хэшу (None - без кэша)
+    content_cache_max_bytes: int - Максимальный размер кэша скачанных файлов в байтах
+    pool_size: int - Размер пула HTTP-соединений клиента
+    keepalive_expiry: float - Время жизни простаивающего keep-alive соединения, сек
+    connect_timeout: float - Таймаут установки соединения, сек
+    read_timeout: float - Таймаут чтения ответа, сек
+    http2: bool - Использовать HTTP/2 (нужен пакет h2)
+    share_clients: bool - Использовать общий клиент и планировщик запросов для источников с одним токеном
+    rate_limit: Optional[float] - Максимум запросов в секунду (None - без ограничения)
+    rate_burst: Optional[int] - Максимум запросов подряд без ожидания
+    max_retries: int - Бюджет повторов операции при 429, 5xx и сетевых ошибках
+    tier_dir: Optional[str] - Директория локального уровня TieredSource (None - без уровня)
+    tier_max_bytes: Optional[int] - Максимальный размер локального уровня в байтах (None - без ограничения)
+    tier_max_pending: int - Емкость очереди отправки записей в облако
+    tier_workers: int - Количество воркеров отправки записей в облако
+    tier_write_through: bool - Загружать записи в облако синхронно
+    tier_max_age: Optional[float] - Срок годности локальной копии, сек (None - бессрочно)
+    s3_bucket: Optional[str] - Бакет S3 (token для S3 - ключи в виде "ACCESS_KEY:SECRET_KEY"
+        или пустая строка, тогда берутся AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY)
+    s3_endpoint_url: Optional[str] - Адрес S3-совместимого хранилища (None - AWS S3)
+    s3_region: str - Регион S3
+    s3_prefix: str - Префикс ключей, под которым находится корень источника
+    s3_part_size: int - Размер части составной загрузки и сегмента скачивания в байтах
+    s3_max_concurrency: int - Количество одновременно передаваемых частей одного объекта
+    s3_multipart_threshold: Optional[int] - Минимальный размер объекта для составной
+        загрузки и параллельного скачивания (None - s3_part_size)
+    gdrive_api_url: Optional[str] - Адрес API Google Drive (None - https://www.googleapis.com)
+    gdrive_root_id: str - Идентификатор папки, являющейся корнем источника
+    gdrive_chunk_size: int - Размер фрагмента возобновляемой загрузки в байтах (кратен 256 КБ)
+    gdrive_id_cache_ttl: float - Время жизни кэша идентификаторов путей, сек (0 - без кэша)
+    bridge_enabled: bool - Синхронный источник создавать как BridgedSource поверх
+        асинхронного (событийный цикл в фоновом потоке)
+    bridge_max_concurrency: int - Максимум одновременных передач BridgedSource, запущенных через submit_*
     '''
     token: str
     source_type: Enum
     home_folder: str
     async_enabled: bool = True
+    cache_ttl: float = 30.0
+    cache_max_entries: int = 1024
+    index_path: Optional[str] = None
+    content_cache_dir: Optional[str] = None
+    content_cache_max_bytes: int = 10 * 1024 * 1024 * 1024
+    pool_size: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 15.0
+    http2: bool = False
+    share_clients: bool = True
+    rate_limit: Optional[float] = None
+    rate_burst: Optional[int] = None
+    max_retries: int = 3
+    tier_dir: Optional[str] = None
+    tier_max_bytes: Optional[int] = None
+    tier_max_pending: int = 256
+    tier_workers: int = 2
+    tier_write_through: bool = False
+    tier_max_age: Optional[float] = None
+    s3_bucket: Optional[str] = None
+    s3_endpoint_url: Optional[str] = None
+    s3_region: str = "us-east-1"
+    s3_prefix: str = ""
+    s3_part_size: int = 8 * 1024 * 1024
+    s3_max_concurrency: int = 8
+    s3_multipart_threshold: Optional[int] = None
+    gdrive_api_url: Optional[str] = None
+    gdrive_root_id: str = "root"
+    gdrive_chunk_size: int = 8 * 1024 * 1024
+    gdrive_id_cache_ttl: float = 300.0
+    bridge_enabled: bool = False
+    bridge_max_concurrency: int = 64
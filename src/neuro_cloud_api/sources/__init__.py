@@ -1,11 +1,114 @@
-from .yadisk_source import YadiskSource
-from .async_yadisk_source import AsyncYadiskSource
-from .source_factory import SourceFactory
-from .source_type import SourceType
+from typing import TYPE_CHECKING
+
+# Классы загружаются при первом обращении: импорт пакета не тянет yadisk,
+# httpx и модули неиспользуемых источников
+_LAZY_ATTRIBUTES = {
+    "YadiskSource": ".yadisk_source",
+    "AsyncYadiskSource": ".async_yadisk_source",
+    "S3Source": ".s3_source",
+    "AsyncS3Source": ".async_s3_source",
+    "GoogleDriveSource": ".ggldisk_source",
+    "AsyncGoogleDriveSource": ".async_ggldisk_source",
+    "SourceFactory": ".source_factory",
+    "SourceRegistry": ".registry",
+    "SourceSpec": ".registry",
+    "SourceType": ".source_type",
+    "RemoteIndex": ".remote_index",
+    "ContentCache": ".content_cache",
+    "TieredSource": ".tiered_source",
+    "BridgedSource": ".bridged_source",
+    "EventLoopThread": ".bridged_source",
+    "ClientRegistry": ".transport",
+    "TransportSettings": ".transport",
+    "RequestScheduler": ".request_scheduler",
+    "RetryPolicy": ".request_scheduler",
+    "TransferResult": ".transfer",
+    "OperationResult": ".transfer",
+    "OperationPoller": ".operation_poller",
+    "OperationFailedError": ".operation_poller",
+    "ShardIndex": ".shard_archive",
+    "ShardMember": ".shard_archive",
+    "ShardWriter": ".shard_archive",
+    "ShardReader": ".shard_archive",
+    "AsyncShardReader": ".shard_archive",
+    "pack_files": ".shard_archive",
+    "pack_directory": ".shard_archive",
+    "RemoteDataset": ".dataset",
+    "AsyncRemoteDataset": ".dataset",
+    "DatasetItem": ".dataset",
+}
+
+if TYPE_CHECKING:
+    from .yadisk_source import YadiskSource
+    from .async_yadisk_source import AsyncYadiskSource
+    from .s3_source import S3Source
+    from .async_s3_source import AsyncS3Source
+    from .ggldisk_source import GoogleDriveSource
+    from .async_ggldisk_source import AsyncGoogleDriveSource
+    from .source_factory import SourceFactory
+    from .registry import SourceRegistry, SourceSpec
+    from .remote_index import RemoteIndex
+    from .content_cache import ContentCache
+    from .tiered_source import TieredSource
+    from .bridged_source import BridgedSource, EventLoopThread
+    from .transport import ClientRegistry, TransportSettings
+    from .request_scheduler import RequestScheduler, RetryPolicy
+    from .source_type import SourceType
+    from .transfer import OperationResult, TransferResult
+    from .operation_poller import OperationFailedError, OperationPoller
+    from .shard_archive import (
+        AsyncShardReader, ShardIndex, ShardMember, ShardReader, ShardWriter, pack_directory, pack_files,
+    )
+    from .dataset import AsyncRemoteDataset, DatasetItem, RemoteDataset
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "YadiskSource",
     "AsyncYadiskSource",
+    "S3Source",
+    "AsyncS3Source",
+    "GoogleDriveSource",
+    "AsyncGoogleDriveSource",
     "SourceFactory",
+    "SourceRegistry",
+    "SourceSpec",
     "SourceType",
-]
\ No newline at end of file
+    "RemoteIndex",
+    "ContentCache",
+    "TieredSource",
+    "BridgedSource",
+    "EventLoopThread",
+    "ClientRegistry",
+    "TransportSettings",
+    "RequestScheduler",
+    "RetryPolicy",
+    "TransferResult",
+    "OperationResult",
+    "OperationPoller",
+    "OperationFailedError",
+    "ShardIndex",
+    "ShardMember",
+    "ShardWriter",
+    "ShardReader",
+    "AsyncShardReader",
+    "pack_files",
+    "pack_directory",
+    "RemoteDataset",
+    "AsyncRemoteDataset",
+    "DatasetItem",
+]
@@ -0,0 +1,672 @@
+import asyncio
+import io
+import os
+import time
+
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .base_source import BaseSource
+from .gdrive_client import (
+    DEFAULT_FIELDS, MAX_BATCH_SIZE, AsyncDriveClient, DriveError, DriveNotFoundError, DrivePathExistsError,
+    DriveRequest, DriveServerError, DriveUnauthorizedError, UploadStatus, batch_payload, children_query,
+    copy_request, create_drive_scheduler, create_folder_request, delete_request, download_request, get_request,
+    list_request, move_request, multipart_upload_request, resource_from_drive, resumable_start_request,
+    trash_request,
+)
+from .ggldisk_source import DEFAULT_CHUNK_SIZE, aligned_chunk_size, path_prefixes
+from .path_id_cache import PathIdCache
+from .path_utils import is_subpath, join_path, normalize_path, parent_path
+from .request_scheduler import RequestScheduler
+from .source_type import SourceType
+from .streaming import (
+    BYTES_LIKE, UploadData, achain_parts, aiter_parts, anext_part, is_local_path, read_part, upload_position,
+)
+from .transfer import AsyncByteLimiter, TransferResult, run_bounded
+from .transport import TransportSettings
+from ..metrics.events import add_bytes, instrumented, record_error
+
+
+class AsyncGoogleDriveSource(BaseSource):
+    """Асинхронный клиент Google Drive (см. GoogleDriveSource)."""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: Optional[str] = None,
+        root_id: str = "root",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        id_cache_ttl: float = 300.0,
+        id_cache_max_entries: int = 10000,
+        transport: Optional[TransportSettings] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        super().__init__(token, source_type=SourceType.GOOGLE_DRIVE)
+        self.client = AsyncDriveClient(token, api_url, transport)
+        self.scheduler = scheduler or create_drive_scheduler()
+        self.root_id = root_id
+        self.chunk_size = aligned_chunk_size(chunk_size)
+        self.path_ids = PathIdCache(ttl=id_cache_ttl, max_entries=id_cache_max_entries)
+        self._folder_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def _root(self) -> Dict[str, Any]:
+        return {"id": self.root_id, "name": "", "path": "/", "type": "dir"}
+
+    @instrumented("connect", path_arg=None)
+    async def connect(self) -> bool:
+        if await self.check_connection():
+            self.is_connected = True
+            return True
+        return False
+
+    @instrumented("check_connection", path_arg=None)
+    async def check_connection(self) -> bool:
+        try:
+            await self.scheduler.call_async(
+                self.client.json, get_request(self.root_id, ("id",)), operation="check_token"
+            )
+            return True
+        except DriveUnauthorizedError:
+            return False
+
+    async def iter_files(
+        self,
+        path: str = "/",
+        recursive: bool = False,
+        page_size: int = 1000,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        folders_only: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Постраничный обход содержимого папки (см. GoogleDriveSource.iter_files).
+        """
+        folder = await self._resolve(path)
+        if folder is None or folder["type"] != "dir":
+            raise DriveNotFoundError(404, "notFound", f"Папка {path} не найдена")
+        pending: List[Tuple[str, str, Optional[str]]] = [(normalize_path(path), folder["id"], None)]
+        while pending:
+            batch, pending = pending[:MAX_BATCH_SIZE], pending[MAX_BATCH_SIZE:]
+            requests = [
+                list_request(children_query(folder_id, folders_only=folders_only), fields, page_size, token)
+                for _, folder_id, token in batch
+            ]
+            for (directory, folder_id, _), page in zip(batch, await self._execute(requests)):
+                if isinstance(page, Exception):
+                    raise page
+                for item in page.get("files") or []:
+                    resource = resource_from_drive(item, join_path(directory, item.get("name") or ""))
+                    self.path_ids.put(resource["path"], resource)
+                    if recursive and resource["type"] == "dir":
+                        pending.append((resource["path"], resource["id"], None))
+                    yield resource
+                if page.get("nextPageToken"):
+                    pending.append((directory, folder_id, page["nextPageToken"]))
+
+    @instrumented("list_directories")
+    async def list_directories(self, path: str = "/") -> List[str]:
+        return [item["path"] async for item in self.iter_files(path, fields=(), folders_only=True)]
+
+    @instrumented("search_directories", path_arg=1)
+    async def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        result: List[str] = []
+        listing = self.iter_files(path, fields=(), folders_only=True)
+        try:
+            async for item in listing:
+                if name.lower() in item["name"].lower():
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        break
+        finally:
+            await listing.aclose()
+        return result
+
+    @instrumented("list_files")
+    async def list_files(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        strict: bool = False,
+    ) -> List[Dict[str, Any]]:
+        try:
+            if strict and await self._resolve(path) is None:
+                return []
+            return [item async for item in self.iter_files(path, recursive, fields=fields) if item["type"] == "file"]
+        except Exception as e:
+            if strict:
+                raise
+            record_error(e)
+            return []
+
+    @instrumented("get_metadata_many", path_arg=None)
+    async def get_metadata_many(
+        self,
+        paths: Iterable[str],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Метаданные набора ресурсов пакетными запросами (см. GoogleDriveSource.get_metadata_many).
+        """
+        return await self._resolve_many(paths, fields, fresh=True)
+
+    @instrumented("remove")
+    async def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        try:
+            item = await self._resolve(remote_path, fresh=True)
+            if item is None or normalize_path(remote_path) == "/":
+                return False
+            request = delete_request(item["id"]) if permanently else trash_request(item["id"])
+            await self.scheduler.call_async(self.client.send, request, operation="remove")
+            self.path_ids.invalidate_tree(remote_path)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    async def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Копирование на стороне Google Drive (см. GoogleDriveSource.copy)."""
+        try:
+            item, name, parent_id = await self._prepare_target(src_path, dst_path, overwrite)
+            dst_path = normalize_path(dst_path)
+            if item["type"] == "file":
+                created = await self.scheduler.call_async(
+                    self.client.json, copy_request(item["id"], name, parent_id), operation="copy"
+                )
+                self.path_ids.put(dst_path, resource_from_drive(created, dst_path))
+            else:
+                await self._copy_folder(normalize_path(src_path), dst_path, name, parent_id)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    async def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Перемещение на стороне Google Drive (см. GoogleDriveSource.move)."""
+        try:
+            item, name, parent_id = await self._prepare_target(src_path, dst_path, overwrite)
+            old_parent_id = (await self._resolve(parent_path(src_path)))["id"]
+            moved = parent_id != old_parent_id
+            request = move_request(
+                item["id"], name, parent_id if moved else None, old_parent_id if moved else None
+            )
+            updated = await self.scheduler.call_async(self.client.json, request, operation="move")
+            self.path_ids.invalidate_tree(src_path)
+            self.path_ids.invalidate_tree(dst_path)
+            self.path_ids.put(normalize_path(dst_path), resource_from_drive(updated, normalize_path(dst_path)))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_file")
+    async def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
+        try:
+            await self._download(remote_path, Path(local_path))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_fileobj")
+    async def download_fileobj(self, remote_path: str, file_obj: Any) -> bool:
+        """
+        Скачивание файла в file-like объект (синхронный или асинхронный).
+        """
+        start = upload_position(file_obj)
+
+        async def _attempt(file_id: str) -> int:
+            if start is not None:
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            return await self.client.download(download_request(file_id), file_obj.write)
+
+        try:
+            add_bytes(await self._with_file_id(
+                remote_path,
+                lambda file_id: self.scheduler.call_async(
+                    _attempt, file_id, operation="download", retries=None if start is not None else 0
+                ),
+            ))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("read_range")
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части файла Range-запросом без скачивания всего файла.
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        async def _attempt(file_id: str) -> bytes:
+            buffer = io.BytesIO()
+            await self.client.download(download_request(file_id, start, start + length - 1), buffer.write)
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} файла {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        data = await self._with_file_id(
+            remote_path, lambda file_id: self.scheduler.call_async(_attempt, file_id, operation="download")
+        )
+        add_bytes(len(data))
+        return data
+
+    @instrumented("upload_file", path_arg=1)
+    async def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Загрузка файла или данных из памяти (см. GoogleDriveSource.upload_file).
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект (синхронный или асинхронный)
+                или (асинхронный) итератор фрагментов
+            remote_path: Путь на Google Drive
+            overwrite: Перезаписать существующий файл
+
+        Returns:
+            True если загрузка успешна, иначе False
+        """
+        try:
+            if is_local_path(local_path):
+                local_path = Path(local_path)
+                if not local_path.exists():
+                    return False
+            await self._upload(local_path, remote_path, overwrite)
+            return True
+        except DrivePathExistsError:
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_many", path_arg=None)
+    async def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора файлов.
+
+        Идентификаторы и размеры файлов разрешаются заранее пакетными запросами.
+
+        Args:
+            items: Пары (путь на Google Drive, локальный путь)
+            max_concurrency: Максимальное число одновременных скачиваний
+            max_bytes_in_flight: Ограничение суммарного размера скачиваемых
+                одновременно файлов в байтах (None - без ограничения)
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        items = list(items)
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+        try:
+            resolved = await self._resolve_many([remote_path for remote_path, _ in items])
+        except Exception as e:
+            record_error(e)
+            resolved = {}
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                reserved = 0
+                if limiter is not None:
+                    meta = resolved.get(normalize_path(remote_path)) or {}
+                    reserved = await limiter.acquire(meta.get("size") or 0)
+                try:
+                    await self._download(remote_path, local_path)
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(items, _worker, max_concurrency)
+
+    @instrumented("upload_many", path_arg=None)
+    async def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов.
+
+        Args:
+            items: Пары (путь на Google Drive, локальный путь)
+            max_concurrency: Максимальное число одновременных загрузок
+            max_bytes_in_flight: Ограничение суммарного размера загружаемых
+                одновременно файлов в байтах (None - без ограничения)
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                reserved = await limiter.acquire(size) if limiter is not None else 0
+                try:
+                    await self._upload(local_path, remote_path, overwrite)
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(list(items), _worker, max_concurrency)
+
+    async def disconnect(self):
+        """Отключение от Google Drive и закрытие пула соединений."""
+        if self.client:
+            await self.client.close()
+        self.client = None
+        self.is_connected = False
+
+    async def _execute(self, requests: Sequence[DriveRequest]) -> List[Union[Dict[str, Any], DriveError]]:
+        """Выполняет запросы пакетами по 100 (см. GoogleDriveSource._execute)."""
+        results: List[Any] = [None] * len(requests)
+        if len(requests) == 1:
+            try:
+                results[0] = await self.scheduler.call_async(self.client.json, requests[0], operation="get_meta")
+            except DriveError as e:
+                results[0] = e
+            return results
+        pending = list(range(len(requests)))
+        budget = self.scheduler.policy.budget("batch")
+        attempt = 0
+        while pending:
+            batches = [pending[offset:offset + MAX_BATCH_SIZE] for offset in range(0, len(pending), MAX_BATCH_SIZE)]
+            responses = await asyncio.gather(*(
+                self.scheduler.call_async(self.client.batch, [requests[i] for i in indexes], operation="batch")
+                for indexes in batches
+            ))
+            retry = []
+            for indexes, batch in zip(batches, responses):
+                for index, (status, body) in zip(indexes, batch):
+                    results[index] = batch_payload(status, body)
+                    if isinstance(results[index], DriveServerError) and attempt < budget:
+                        retry.append(index)
+            pending = retry
+            if pending:
+                attempt += 1
+                await asyncio.sleep(self.scheduler.policy.backoff(attempt))
+        return results
+
+    async def _resolve(self, path: str, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        return (await self._resolve_many([path], fresh=fresh))[normalize_path(path)]
+
+    async def _resolve_many(
+        self,
+        paths: Iterable[str],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        fresh: bool = False,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Разрешает пути в ресурсы по уровням (см. GoogleDriveSource._resolve_many)."""
+        targets = {normalize_path(path) for path in paths}
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {"/": self._root}
+        levels: Dict[int, set] = {}
+        for target in targets:
+            for depth, prefix in enumerate(path_prefixes(target), 1):
+                levels.setdefault(depth, set()).add(prefix)
+        for depth in sorted(levels):
+            lookups: List[Tuple[str, DriveRequest]] = []
+            for path in sorted(levels[depth]):
+                parent = resolved.get(parent_path(path))
+                if parent is None or parent["type"] != "dir":
+                    resolved[path] = None
+                    continue
+                cached = self.path_ids.get(path)
+                if cached is not None and not (fresh and path in targets):
+                    resolved[path] = cached
+                elif cached is not None:
+                    lookups.append((path, get_request(cached["id"], fields)))
+                else:
+                    name = path.rsplit("/", 1)[-1]
+                    lookups.append((path, list_request(children_query(parent["id"], name), fields, page_size=10)))
+            values = await self._execute([request for _, request in lookups])
+            for (path, _), value in zip(lookups, values):
+                resolved[path] = self._store_lookup(path, value)
+        if fresh and "/" in targets:
+            value = (await self._execute([get_request(self.root_id, fields)]))[0]
+            resolved["/"] = self._store_lookup("/", value)
+        return {target: resolved.get(target) for target in targets}
+
+    def _store_lookup(self, path: str, value: Union[Dict[str, Any], DriveError]) -> Optional[Dict[str, Any]]:
+        if isinstance(value, DriveNotFoundError):
+            self.path_ids.invalidate_tree(path)
+            return None
+        if isinstance(value, Exception):
+            raise value
+        files = value.get("files") if "files" in value else [value]
+        if not files:
+            return None
+        resource = resource_from_drive(files[0], path)
+        if path != "/":
+            self.path_ids.put(path, resource)
+        return resource
+
+    async def _with_file_id(self, remote_path: str, func) -> Any:
+        item = await self._resolve(remote_path)
+        if item is None or item["type"] != "file":
+            raise DriveNotFoundError(404, "notFound", f"Файл {remote_path} не найден")
+        try:
+            return await func(item["id"])
+        except DriveNotFoundError:
+            # Идентификатор из кэша устарел - разрешаем путь заново
+            self.path_ids.invalidate_tree(remote_path)
+            item = await self._resolve(remote_path)
+            if item is None or item["type"] != "file":
+                raise
+            return await func(item["id"])
+
+    async def _prepare_target(
+        self, src_path: str, dst_path: str, overwrite: bool
+    ) -> Tuple[Dict[str, Any], str, str]:
+        """Проверка источника и назначения (см. GoogleDriveSource._prepare_target)."""
+        src_path, dst_path = normalize_path(src_path), normalize_path(dst_path)
+        if is_subpath(dst_path, src_path):
+            raise ValueError(f"Путь назначения {dst_path} находится внутри {src_path}")
+        item = await self._resolve(src_path, fresh=True)
+        if item is None or src_path == "/":
+            raise DriveNotFoundError(404, "notFound", f"Ресурс {src_path} не найден")
+        existing = await self._resolve(dst_path, fresh=True)
+        if existing is not None:
+            if not overwrite:
+                raise DrivePathExistsError(409, "alreadyExists", f"{dst_path} уже существует")
+            await self.scheduler.call_async(self.client.send, trash_request(existing["id"]), operation="remove")
+            self.path_ids.invalidate_tree(dst_path)
+        return item, dst_path.rsplit("/", 1)[-1], await self._ensure_folder(parent_path(dst_path))
+
+    async def _copy_folder(self, src_path: str, dst_path: str, name: str, parent_id: str) -> None:
+        created = await self.scheduler.call_async(
+            self.client.json, create_folder_request(name, parent_id), operation="mkdir"
+        )
+        self.path_ids.put(dst_path, resource_from_drive(created, dst_path))
+        folder_ids = {src_path: created["id"]}
+        copies: List[Tuple[str, DriveRequest]] = []
+        # Обход идет в ширину, поэтому папка создается раньше своего содержимого
+        async for item in self.iter_files(src_path, recursive=True, fields=()):
+            target = join_path(dst_path, item["path"][len(src_path):].lstrip("/"))
+            target_parent = folder_ids[parent_path(item["path"])]
+            if item["type"] == "dir":
+                created = await self.scheduler.call_async(
+                    self.client.json, create_folder_request(item["name"], target_parent), operation="mkdir"
+                )
+                folder_ids[item["path"]] = created["id"]
+                self.path_ids.put(target, resource_from_drive(created, target))
+            else:
+                copies.append((target, copy_request(item["id"], item["name"], target_parent)))
+        for (target, _), result in zip(copies, await self._execute([request for _, request in copies])):
+            if isinstance(result, Exception):
+                raise result
+            self.path_ids.put(target, resource_from_drive(result, target))
+
+    async def _ensure_folder(self, path: str) -> str:
+        path = normalize_path(path)
+        if path == "/":
+            return self.root_id
+        if self._folder_lock is None:
+            self._folder_lock = asyncio.Lock()
+        async with self._folder_lock:
+            resolved = await self._resolve_many(path_prefixes(path))
+            parent_id = self.root_id
+            for prefix in path_prefixes(path):
+                item = resolved.get(prefix)
+                if item is None:
+                    created = await self.scheduler.call_async(
+                        self.client.json, create_folder_request(prefix.rsplit("/", 1)[-1], parent_id),
+                        operation="mkdir",
+                    )
+                    item = resource_from_drive(created, prefix)
+                    self.path_ids.put(prefix, item)
+                elif item["type"] != "dir":
+                    raise DriveError(409, "notAFolder", f"{prefix} не является папкой")
+                parent_id = item["id"]
+            return parent_id
+
+    @instrumented("download", path_arg=0)
+    async def _download(self, remote_path: str, local_path: Path) -> None:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(local_path.name + ".download")
+
+        async def _attempt(file_id: str) -> int:
+            with open(tmp_path, "wb") as f:
+                return await self.client.download(download_request(file_id), f.write)
+
+        try:
+            size = await self._with_file_id(
+                remote_path, lambda file_id: self.scheduler.call_async(_attempt, file_id, operation="download")
+            )
+            os.replace(tmp_path, local_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        add_bytes(size)
+
+    @instrumented("upload", path_arg=1)
+    async def _upload(self, source: Union[Path, UploadData], remote_path: str, overwrite: bool = False) -> None:
+        remote_path = normalize_path(remote_path)
+        name = remote_path.rsplit("/", 1)[-1]
+        parent_id = await self._ensure_folder(parent_path(remote_path))
+        existing = await self._resolve(remote_path, fresh=True)
+        if existing is not None:
+            if not overwrite or existing["type"] != "file":
+                raise DrivePathExistsError(409, "alreadyExists", f"{remote_path} уже существует")
+        file_id = existing["id"] if existing is not None else None
+        loop = asyncio.get_running_loop()
+
+        if isinstance(source, Path):
+            size: Optional[int] = source.stat().st_size
+        elif isinstance(source, BYTES_LIKE):
+            source = memoryview(source).cast("B")
+            size = len(source)
+        else:
+            size = None
+
+        chunks: Optional[AsyncIterator[bytes]] = None
+        if size is None:
+            # Поток короче одного фрагмента отправляется одним запросом
+            parts = aiter_parts(source, self.chunk_size)
+            first = await anext_part(parts) or b""
+            second = await anext_part(parts)
+            if second is None:
+                source, size = first, len(first)
+            else:
+                chunks = achain_parts([first, second], parts)
+        if chunks is None and size <= self.chunk_size:
+            data = await loop.run_in_executor(None, read_part, source, 0, size)
+            created = await self.scheduler.call_async(
+                self.client.json, multipart_upload_request(name, parent_id, data, file_id), operation="upload"
+            )
+        else:
+            if chunks is None:
+                chunks = _read_chunks(source, size, self.chunk_size)
+            session_url = await self.scheduler.call_async(
+                self.client.start_upload, resumable_start_request(name, parent_id, size, file_id),
+                operation="upload_start",
+            )
+            created = await self._send_chunks(session_url, chunks, size)
+        self.path_ids.invalidate_tree(remote_path)
+        self.path_ids.put(remote_path, resource_from_drive(created, remote_path))
+
+    async def _send_chunks(
+        self, session_url: str, chunks: AsyncIterator[bytes], size: Optional[int]
+    ) -> Dict[str, Any]:
+        offset = 0
+        current = await anext_part(chunks) or b""
+        while True:
+            following = await anext_part(chunks)
+            total = size if size is not None else (offset + len(current) if following is None else None)
+            status = await self._send_chunk(session_url, offset, current, total)
+            if status.resource is not None:
+                return status.resource
+            if following is None:
+                raise DriveError(500, "uploadIncomplete", "Сервер не подтвердил завершение загрузки")
+            offset += len(current)
+            current = following
+
+    async def _send_chunk(self, session_url: str, offset: int, data: bytes, total: Optional[int]) -> UploadStatus:
+        end = offset + len(data)
+        state = {"start": offset, "query": False}
+
+        async def _attempt() -> UploadStatus:
+            if state["query"]:
+                # После ошибки досылаем только то, что сервер не принял
+                status = await self.client.upload_chunk(session_url, 0, b"", total)
+                if status.resource is not None:
+                    return status
+                state["start"] = max(offset, min(status.committed, end))
+            state["query"] = True
+            start = state["start"]
+            return await self.client.upload_chunk(session_url, start, data[start - offset:], total)
+
+        while True:
+            status = await self.scheduler.call_async(_attempt, operation="upload")
+            if status.resource is not None or status.committed >= end:
+                add_bytes(len(data))
+                return status
+            state["start"] = max(offset, status.committed)
+            state["query"] = False
+
+
+async def _read_chunks(source: Any, size: int, chunk_size: int) -> AsyncIterator[bytes]:
+    """Читает фрагменты файла или буфера известного размера, не блокируя цикл событий."""
+    loop = asyncio.get_running_loop()
+    for offset in range(0, size, chunk_size):
+        yield await loop.run_in_executor(None, read_part, source, offset, min(chunk_size, size - offset))
@@ -0,0 +1,611 @@
+import asyncio
+import io
+import os
+import time
+
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from .base_source import BaseSource
+from .path_utils import is_subpath, normalize_path
+from .request_scheduler import RequestScheduler
+from .s3_client import (
+    AsyncS3Client, S3Error, S3NotFoundError, S3PreconditionFailedError, S3Settings, create_s3_scheduler,
+)
+from .s3_source import COPY_PART_SIZE, DEFAULT_PART_SIZE, MAX_COPY_SIZE, S3KeyMapper, part_size_for
+from .segmented_download import SegmentedDownload
+from .source_type import SourceType
+from .streaming import (
+    BYTES_LIKE, UploadData, achain_parts, aiter_parts, anext_part, is_local_path, read_part, upload_position,
+)
+from .transfer import AsyncByteLimiter, TransferResult, run_bounded
+from .transport import TransportSettings
+from ..metrics.events import add_bytes, instrumented, record_error
+
+
+class AsyncS3Source(BaseSource):
+    """Асинхронный клиент S3-совместимого хранилища (см. S3Source)."""
+
+    def __init__(
+        self,
+        bucket: str,
+        credentials: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        prefix: str = "",
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = 8,
+        multipart_threshold: Optional[int] = None,
+        transport: Optional[TransportSettings] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        super().__init__(credentials or "", source_type=SourceType.S3)
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency должен быть положительным")
+        self.settings = S3Settings.from_credentials(
+            bucket, credentials, access_key, secret_key, region=region, endpoint_url=endpoint_url,
+        )
+        self.part_size = part_size_for(None, part_size)
+        self.max_concurrency = max_concurrency
+        self.multipart_threshold = multipart_threshold if multipart_threshold is not None else self.part_size
+        transport = transport or TransportSettings(pool_size=max(10, max_concurrency))
+        self.client = AsyncS3Client(self.settings, transport)
+        self.scheduler = scheduler or create_s3_scheduler()
+        self.keys = S3KeyMapper(prefix)
+
+    @instrumented("connect", path_arg=None)
+    async def connect(self) -> bool:
+        if await self.check_connection():
+            self.is_connected = True
+            return True
+        return False
+
+    @instrumented("check_connection", path_arg=None)
+    async def check_connection(self) -> bool:
+        try:
+            return await self.scheduler.call_async(self.client.head_bucket, operation="head_bucket")
+        except S3Error as e:
+            if e.status != 403:
+                record_error(e)
+            return False
+
+    async def iter_objects(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Постраничный обход объектов под путем (см. S3Source.iter_objects).
+        """
+        token = None
+        delimiter = None if recursive else "/"
+        while True:
+            page = await self.scheduler.call_async(
+                self.client.list_objects, self.keys.dir_prefix(path), delimiter, token, page_size,
+                operation="list_objects",
+            )
+            for prefix in page.prefixes:
+                yield self.keys.dir_dict(prefix)
+            for obj in page.objects:
+                if not obj.key.endswith("/"):
+                    yield self.keys.file_dict(obj)
+            token = page.next_token
+            if not token:
+                return
+
+    @instrumented("list_directories")
+    async def list_directories(self, path: str = "/") -> List[str]:
+        return [item["path"] async for item in self.iter_objects(path, recursive=False) if item["type"] == "dir"]
+
+    @instrumented("search_directories", path_arg=1)
+    async def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        result: List[str] = []
+        listing = self.iter_objects(path, recursive=False)
+        try:
+            async for item in listing:
+                if item["type"] == "dir" and name.lower() in item["name"].lower():
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        break
+        finally:
+            await listing.aclose()
+        return result
+
+    @instrumented("list_files")
+    async def list_files(self, path: str = "/", recursive: bool = True, strict: bool = False) -> List[Dict[str, Any]]:
+        try:
+            return [item async for item in self.iter_objects(path, recursive) if item["type"] == "file"]
+        except Exception as e:
+            if strict:
+                raise
+            record_error(e)
+            return []
+
+    @instrumented("remove")
+    async def remove(self, remote_path: str, permanently: bool = True) -> bool:
+        try:
+            keys = [
+                self.keys.key(item["path"]) async for item in self.iter_objects(remote_path)
+                if item["type"] == "file"
+            ]
+            await run_bounded(
+                [keys[offset:offset + 1000] for offset in range(0, len(keys), 1000)],
+                lambda batch: self.scheduler.call_async(
+                    self.client.delete_objects, batch, operation="delete_objects"
+                ),
+                self.max_concurrency,
+            )
+            key = self.keys.key(remote_path)
+            if key:
+                await self.scheduler.call_async(self.client.delete_object, key, operation="delete")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    async def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Копирование на стороне хранилища (см. S3Source.copy)."""
+        try:
+            await self._copy(src_path, dst_path, overwrite)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    async def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Перемещение: копирование и удаление исходных объектов (см. S3Source.move)."""
+        try:
+            keys = await self._copy(src_path, dst_path, overwrite)
+            await run_bounded(
+                [keys[offset:offset + 1000] for offset in range(0, len(keys), 1000)],
+                lambda batch: self.scheduler.call_async(
+                    self.client.delete_objects, batch, operation="delete_objects"
+                ),
+                self.max_concurrency,
+            )
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_file")
+    async def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
+        """
+        Скачивание объекта; объекты от multipart_threshold скачиваются
+        параллельными Range-запросами с докачкой.
+        """
+        try:
+            return await self._download(remote_path, Path(local_path))
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_fileobj")
+    async def download_fileobj(self, remote_path: str, file_obj: Any) -> bool:
+        """
+        Скачивание объекта в file-like объект (синхронный или асинхронный).
+        """
+        start = upload_position(file_obj)
+
+        async def _attempt() -> int:
+            if start is not None:
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            return await self.client.get_object(self.keys.key(remote_path), file_obj.write)
+
+        try:
+            add_bytes(await self.scheduler.call_async(
+                _attempt, operation="download", retries=None if start is not None else 0
+            ))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("read_range")
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части объекта Range-запросом без скачивания всего объекта.
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        async def _attempt() -> bytes:
+            buffer = io.BytesIO()
+            await self.client.get_object(self.keys.key(remote_path), buffer.write, start, start + length - 1)
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} объекта {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        data = await self.scheduler.call_async(_attempt, operation="download")
+        add_bytes(len(data))
+        return data
+
+    @instrumented("upload_file", path_arg=1)
+    async def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Загрузка файла или данных из памяти; данные от multipart_threshold
+        загружаются составной загрузкой, до max_concurrency частей одновременно.
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект (синхронный или асинхронный)
+                или (асинхронный) итератор фрагментов
+            remote_path: Путь к объекту
+            overwrite: Перезаписать существующий объект
+
+        Returns:
+            True если загрузка успешна, иначе False
+        """
+        try:
+            if is_local_path(local_path):
+                local_path = Path(local_path)
+                if not local_path.exists():
+                    return False
+            await self._upload(local_path, remote_path, overwrite)
+            return True
+        except S3PreconditionFailedError:
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_many", path_arg=None)
+    async def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора объектов.
+
+        Args:
+            items: Пары (путь к объекту, локальный путь)
+            max_concurrency: Максимальное число одновременных скачиваний
+            max_bytes_in_flight: Ограничение суммарного размера скачиваемых
+                одновременно объектов в байтах (None - без ограничения)
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                reserved = 0
+                if limiter is not None:
+                    obj = await self.scheduler.call_async(
+                        self.client.head_object, self.keys.key(remote_path), operation="head_object"
+                    )
+                    reserved = await limiter.acquire(obj.size)
+                try:
+                    if not await self._download(remote_path, local_path):
+                        raise IOError("Контрольная сумма не совпадает")
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(list(items), _worker, max_concurrency)
+
+    @instrumented("upload_many", path_arg=None)
+    async def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов.
+
+        Args:
+            items: Пары (путь к объекту, локальный путь)
+            max_concurrency: Максимальное число одновременных загрузок
+            max_bytes_in_flight: Ограничение суммарного размера загружаемых
+                одновременно файлов в байтах (None - без ограничения)
+            overwrite: Перезаписывать существующие объекты
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                reserved = await limiter.acquire(size) if limiter is not None else 0
+                try:
+                    await self._upload(local_path, remote_path, overwrite)
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(list(items), _worker, max_concurrency)
+
+    @instrumented("download", path_arg=0)
+    async def _download(self, remote_path: str, local_path: Path) -> bool:
+        key = self.keys.key(remote_path)
+        obj = await self.scheduler.call_async(self.client.head_object, key, operation="head_object")
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        if obj.size < self.multipart_threshold or self.max_concurrency == 1:
+            tmp_path = local_path.with_name(local_path.name + ".download")
+
+            async def _attempt() -> None:
+                with open(tmp_path, "wb") as f:
+                    await self.client.get_object(key, f.write)
+
+            try:
+                await self.scheduler.call_async(_attempt, operation="download")
+                os.replace(tmp_path, local_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            add_bytes(obj.size)
+            return True
+
+        # ETag составного объекта - не MD5, тогда проверяется только размер
+        download = SegmentedDownload(local_path, obj.size, obj.md5, None, self.part_size)
+        download.prepare()
+        await run_bounded(
+            download.pending_segments(),
+            # Сегмент при повторе перезаписывается с начала
+            lambda index: self.scheduler.call_async(
+                self._fetch_segment, key, download, index, operation="download"
+            ),
+            self.max_concurrency,
+        )
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, download.verify):
+            download.discard()
+            return False
+        download.finalize()
+        return True
+
+    async def _fetch_segment(self, key: str, download: SegmentedDownload, index: int) -> None:
+        start, end = download.segment_range(index)
+        with download.write_at(start) as writer:
+            await self.client.get_object(key, writer.write, start, end)
+        if writer.written != end - start + 1:
+            raise IOError(f"Сегмент {index} скачан не полностью")
+        add_bytes(writer.written)
+        download.mark_done(index)
+
+    @instrumented("upload", path_arg=1)
+    async def _upload(self, source: Union[Path, UploadData], remote_path: str, overwrite: bool = False) -> None:
+        key = self.keys.key(remote_path)
+        loop = asyncio.get_running_loop()
+        if isinstance(source, Path):
+            size: Optional[int] = source.stat().st_size
+        elif isinstance(source, BYTES_LIKE):
+            source = memoryview(source).cast("B")
+            size = len(source)
+        else:
+            size = None
+
+        if size is not None and size < self.multipart_threshold:
+            data = await loop.run_in_executor(None, read_part, source, 0, size)
+            await self.scheduler.call_async(self.client.put_object, key, data, overwrite, operation="upload")
+            add_bytes(size)
+            return
+        parts: Optional[AsyncIterator[bytes]] = None
+        if size is None:
+            # Поток короче одной части отправляется одним запросом
+            chunks = aiter_parts(source, self.part_size)
+            first = await anext_part(chunks) or b""
+            second = await anext_part(chunks)
+            if second is None:
+                await self.scheduler.call_async(self.client.put_object, key, first, overwrite, operation="upload")
+                add_bytes(len(first))
+                return
+            parts = achain_parts([first, second], chunks)
+        if not overwrite and await self._exists(key):
+            raise S3PreconditionFailedError(412, "PreconditionFailed", f"{remote_path} уже существует")
+        await self._multipart(key, source, size, parts, overwrite)
+
+    async def _copy(self, src_path: str, dst_path: str, overwrite: bool) -> List[str]:
+        """Копирует объект или директорию; возвращает ключи скопированных объектов."""
+        if is_subpath(normalize_path(dst_path), normalize_path(src_path)):
+            raise ValueError(f"Путь назначения {dst_path} находится внутри {src_path}")
+        src_key = self.keys.key(src_path)
+        try:
+            obj = (
+                await self.scheduler.call_async(self.client.head_object, src_key, operation="head_object")
+                if src_key else None
+            )
+        except S3Error as e:
+            if e.status != 404:
+                raise
+            obj = None
+        if obj is not None:
+            items = [(src_key, self.keys.key(dst_path), obj.size)]
+        else:
+            src_prefix, dst_prefix = self.keys.dir_prefix(src_path), self.keys.dir_prefix(dst_path)
+            items = []
+            async for item in self.iter_objects(src_path):
+                key = self.keys.key(item["path"])
+                items.append((key, dst_prefix + key[len(src_prefix):], item["size"]))
+            if not items:
+                raise S3NotFoundError(404, "NoSuchKey", f"Ресурс {src_path} не найден")
+        if not overwrite and await self._occupied(dst_path):
+            raise S3PreconditionFailedError(412, "PreconditionFailed", f"{dst_path} уже существует")
+
+        async def _copy_one(item: Tuple[str, str, int]) -> None:
+            src_key, key, size = item
+            if size <= MAX_COPY_SIZE:
+                await self.scheduler.call_async(self.client.copy_object, src_key, key, overwrite, operation="copy")
+            else:
+                await self._multipart_copy(src_key, key, size, overwrite)
+
+        await run_bounded(items, _copy_one, self.max_concurrency)
+        return [src_key for src_key, _, _ in items]
+
+    async def _occupied(self, path: str) -> bool:
+        """Есть ли объект с этим путем или объекты под ним."""
+        key = self.keys.key(path)
+        if key and await self._exists(key):
+            return True
+        listing = self.iter_objects(path, page_size=1)
+        try:
+            async for _ in listing:
+                return True
+        finally:
+            await listing.aclose()
+        return False
+
+    async def _exists(self, key: str) -> bool:
+        try:
+            await self.scheduler.call_async(self.client.head_object, key, operation="head_object")
+            return True
+        except S3Error as e:
+            if e.status == 404:
+                return False
+            raise
+
+    async def _multipart(
+        self,
+        key: str,
+        source: Any,
+        size: Optional[int],
+        parts: Optional[AsyncIterator[bytes]],
+        overwrite: bool,
+    ) -> None:
+        part_size = part_size_for(size, self.part_size)
+        upload_id = await self.scheduler.call_async(
+            self.client.create_multipart_upload, key, operation="create_multipart"
+        )
+        etags: List[Tuple[int, str]] = []
+        loop = asyncio.get_running_loop()
+
+        async def _send(number: int, data: Any) -> None:
+            if isinstance(data, tuple):
+                data = await loop.run_in_executor(None, read_part, source, *data)
+            etag = await self.scheduler.call_async(
+                self.client.upload_part, key, upload_id, number, data, operation="upload_part"
+            )
+            add_bytes(len(data))
+            etags.append((number, etag))
+
+        try:
+            if parts is None:
+                # Известный размер: каждая часть читается по своему смещению
+                count = max(1, -(-size // part_size))
+                await run_bounded(
+                    [(i + 1, (i * part_size, min(part_size, size - i * part_size))) for i in range(count)],
+                    lambda item: _send(*item),
+                    self.max_concurrency,
+                )
+            else:
+                await _run_parts(parts, _send, self.max_concurrency)
+            await self.scheduler.call_async(
+                self.client.complete_multipart_upload, key, upload_id, etags, overwrite,
+                operation="complete_multipart",
+            )
+        except BaseException:
+            try:
+                await self.client.abort_multipart_upload(key, upload_id)
+            except Exception:
+                pass
+            raise
+
+    async def _multipart_copy(self, src_key: str, key: str, size: int, overwrite: bool) -> None:
+        part_size = part_size_for(size, max(self.part_size, COPY_PART_SIZE))
+        upload_id = await self.scheduler.call_async(
+            self.client.create_multipart_upload, key, operation="create_multipart"
+        )
+
+        async def _send(item: Tuple[int, int]) -> Tuple[int, str]:
+            number, start = item
+            end = min(start + part_size, size) - 1
+            etag = await self.scheduler.call_async(
+                self.client.upload_part_copy, key, upload_id, number, src_key, start, end,
+                operation="upload_part_copy",
+            )
+            return number, etag
+
+        try:
+            etags = await run_bounded(
+                list(enumerate(range(0, size, part_size), 1)), _send, self.max_concurrency
+            )
+            await self.scheduler.call_async(
+                self.client.complete_multipart_upload, key, upload_id, etags, overwrite,
+                operation="complete_multipart",
+            )
+        except BaseException:
+            try:
+                await self.client.abort_multipart_upload(key, upload_id)
+            except Exception:
+                pass
+            raise
+
+    async def disconnect(self):
+        """Отключение от S3 и закрытие пула соединений."""
+        if self.client:
+            await self.client.close()
+        self.client = None
+        self.is_connected = False
+
+
+async def _run_parts(parts: AsyncIterator[bytes], send, max_concurrency: int) -> None:
+    """
+    Отправляет части потока, держа в работе не более max_concurrency частей;
+    следующая часть читается только когда освободилось место.
+    """
+    slots = asyncio.Semaphore(max_concurrency)
+    tasks: List["asyncio.Task"] = []
+
+    async def _guarded(number: int, data: bytes) -> None:
+        try:
+            await send(number, data)
+        finally:
+            slots.release()
+
+    try:
+        number = 0
+        async for data in parts:
+            await slots.acquire()
+            if any(task.done() and task.exception() is not None for task in tasks):
+                slots.release()
+                break
+            number += 1
+            tasks.append(asyncio.ensure_future(_guarded(number, data)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
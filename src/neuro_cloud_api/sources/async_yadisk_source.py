@@ -1,65 +1,993 @@
+import asyncio
+import io
+import os
+import time
+import weakref
 import yadisk
 from pathlib import Path
-from typing import Union, List
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .base_source import BaseSource
+from .content_cache import ContentCache
+from .directory_creator import DirectoryCreator
+from .metadata_cache import MetadataCache
+from .operation_poller import AsyncOperationPoller
+from .path_utils import listing_api_fields, listing_fields, normalize_path, parent_path, resource_to_dict
+from .remote_index import RemoteIndex
+from .request_scheduler import RequestScheduler
+from .segmented_download import (
+    DEFAULT_SEGMENT_SIZE, DEFAULT_THRESHOLD, DownloadLinkCache, RangeNotSupportedError, SegmentedDownload
+)
+from .single_flight import AsyncSingleFlight
 from .source_type import SourceType
+from .streaming import (
+    DEFAULT_CHUNK_SIZE, UploadData, async_payload, is_local_path, is_replayable, iter_chunks,
+    payload_size, upload_position,
+)
+from .transfer import AsyncByteLimiter, OperationResult, TransferResult, run_bounded
+from .transport import (
+    ClientRegistry, TransportSettings, create_async_client, create_scheduler, without_retries
+)
+from .tree_walk import StopWalk, build_matcher, walk_parallel_async
+from ..metrics.events import add_bytes, instrumented, record_error
 
 class AsyncYadiskSource(BaseSource):
     """Асинхронный клиент Яндекс.Диска."""
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        cache_ttl: float = 30.0,
+        cache_max_entries: int = 1024,
+        index: Optional[RemoteIndex] = None,
+        content_cache: Optional[ContentCache] = None,
+        transport: Optional[TransportSettings] = None,
+        registry: Optional[ClientRegistry] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        # Общий клиент реестра берется в каждом цикле при первом обращении (см. client)
+        self._registry = registry
+        self._transport = transport or TransportSettings()
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, yadisk.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
         super().__init__(token, source_type=SourceType.YANDEX_DISK)
-        self.client = yadisk.AsyncClient(token=token)
+        if registry is None and transport is not None:
+            self.client = create_async_client(token, transport)
+        elif registry is None:
+            self.client = without_retries(yadisk.AsyncClient(token=token))
+        self.scheduler = scheduler or create_scheduler()
+        self.metadata_cache = MetadataCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        self.index = index
+        self.content_cache = content_cache
+        self._directories = DirectoryCreator(
+            exists_errors=(yadisk.exceptions.PathExistsError,),
+            parent_missing_errors=(yadisk.exceptions.ParentNotFoundError,),
+        )
+        self.operations = AsyncOperationPoller(self._operation_status)
+        # Ссылки на скачивание для Range-чтений (см. read_range)
+        self.download_links = DownloadLinkCache()
+        # Одинаковые одновременные запросы чтения выполняются одним запросом
+        self._flights = AsyncSingleFlight()
 
+    @property
+    def client(self) -> Optional[yadisk.AsyncClient]:
+        """
+        Клиент API. Общий клиент реестра берется для текущего событийного
+        цикла при первом обращении в нем (вне цикла - None).
+        """
+        if self._registry is None:
+            return self._client
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        client = self._loop_clients.get(loop)
+        if client is None:
+            for closed in [other for other in self._loop_clients if other.is_closed()]:
+                del self._loop_clients[closed]
+            client = self._loop_clients[loop] = self._registry.get_async_client(self.token, self._transport)
+        return client
+
+    @client.setter
+    def client(self, value: Optional[yadisk.AsyncClient]) -> None:
+        self._client = value
+
+    @instrumented("connect", path_arg=None)
     async def connect(self) -> bool:
         if await self.check_connection():
             self.is_connected = True
             return True
         return False
 
+    @instrumented("check_connection", path_arg=None)
     async def check_connection(self) -> bool:
         try:
-            return await self.client.check_token()
+            return await self.scheduler.call_async(self.client.check_token, operation="check_token")
         except yadisk.exceptions.UnauthorizedError:
             return False
 
+    async def iter_directory(
+        self,
+        path: str = "/",
+        page_size: int = 1000,
+        fields: Optional[Sequence[str]] = None,
+        resource_type: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Постраничный обход содержимого директории (см. YadiskSource.iter_directory).
+        """
+        fields = listing_fields(fields)
+        if resource_type not in (None, "dir", "file"):
+            raise ValueError(f"Неизвестный тип ресурса: {resource_type}")
+        cached = self.metadata_cache.get(path)
+        if cached is not None:
+            for item in cached:
+                if resource_type is None or item["type"] == resource_type:
+                    yield resource_to_dict(item, fields)
+            return
+        api_fields = listing_api_fields(fields)
+        offset = 0
+        while True:
+            page = await self.scheduler.call_async(
+                self.client.get_meta, path, limit=page_size, offset=offset, fields=api_fields, operation="listdir"
+            )
+            if page.type != "dir":
+                raise yadisk.exceptions.WrongResourceTypeError(f"{path} не является директорией")
+            items = page.embedded.items or []
+            for item in items:
+                if resource_type is None or item["type"] == resource_type:
+                    yield resource_to_dict(item, fields)
+            offset += len(items)
+            if not items or offset >= (page.embedded.total or 0):
+                return
+
+    @instrumented("list_directories")
     async def list_directories(self, path: str = "/") -> List[str]:
-        result = []
-        async for item in self.client.listdir(path):
-            if item["type"] == "dir":
-                result.append(item["path"])
-        return result
+        async def _list() -> List[str]:
+            # Полный список директории берется из кэша метаданных и заполняет его
+            return [item["path"] for item in await self._listdir(path) if item["type"] == "dir"]
+
+        # Каждый вызывающий получает свою копию общего результата
+        return list(await self._flights.run(("list_directories", normalize_path(path)), _list))
+
+    async def exists(self, remote_path: str) -> bool:
+        """Проверка существования ресурса (одновременные проверки пути объединяются)."""
+        return await self._flights.run(
+            ("exists", normalize_path(remote_path)),
+            lambda: self.scheduler.call_async(self.client.exists, remote_path, operation="exists"),
+        )
 
+    @instrumented("get_meta")
+    async def get_meta(self, remote_path: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Метаданные ресурса (одновременные запросы пути с теми же полями объединяются).
+
+        Args:
+            remote_path: Путь к ресурсу
+            fields: Поля (name, path, type, size, md5, modified; None - все)
+
+        Returns:
+            Словарь с запрошенными полями
+
+        Raises:
+            yadisk.exceptions.PathNotFoundError: Если ресурс не найден
+        """
+        fields = listing_fields(fields)
+
+        async def _meta() -> Dict[str, Any]:
+            meta = await self.scheduler.call_async(
+                self.client.get_meta, remote_path, fields=list(fields), operation="get_meta"
+            )
+            return resource_to_dict(meta, fields)
+
+        return dict(await self._flights.run(("get_meta", normalize_path(remote_path), fields), _meta))
+
+    @instrumented("download_file")
     async def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
         try:
-            local_path = Path(local_path)
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            await self.client.download(remote_path, str(local_path))
+            await self._download(remote_path, Path(local_path))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_large_file")
+    async def download_large_file(
+        self,
+        remote_path: str,
+        local_path: Union[str, Path],
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = 4,
+        threshold: int = DEFAULT_THRESHOLD,
+    ) -> bool:
+        """
+        Скачивание большого файла параллельными сегментами с докачкой.
+
+        Аналог YadiskSource.download_large_file: Range-запросы в заранее
+        выделенный файл, файл прогресса для докачки и проверка SHA256/MD5.
+        Файлы меньше threshold скачиваются одним потоком.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            local_path: Локальный путь для сохранения
+            segment_size: Размер сегмента в байтах
+            max_concurrency: Количество одновременно скачиваемых сегментов
+            threshold: Минимальный размер файла для сегментированного скачивания
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        download: Optional[SegmentedDownload] = None
+        try:
+            meta = await self.scheduler.call_async(
+                self.client.get_meta, remote_path, fields=["size", "md5", "sha256"], operation="get_meta"
+            )
+            if (meta["size"] or 0) < threshold:
+                return await self.download_file(remote_path, local_path)
+            key = ContentCache.key(meta["md5"], meta["sha256"])
+            loop = asyncio.get_running_loop()
+            if (
+                self.content_cache is not None and key
+                and await loop.run_in_executor(None, self.content_cache.fetch, key, local_path)
+            ):
+                return True
+
+            download = SegmentedDownload(
+                Path(local_path), meta["size"], meta["md5"], meta["sha256"], segment_size
+            )
+            # Выделение файла, запись сегментов и проверка хэша выполняются
+            # в пуле потоков, чтобы не останавливать цикл событий
+            await loop.run_in_executor(None, download.prepare)
+            link = await self.scheduler.call_async(
+                self.client.get_download_link, remote_path, operation="get_download_link"
+            )
+            await run_bounded(
+                download.pending_segments(),
+                # Сегмент при повторе перезаписывается с начала
+                lambda index: self.scheduler.call_async(
+                    self._fetch_segment, link, download, index, operation="download"
+                ),
+                max_concurrency,
+            )
+            if not await loop.run_in_executor(None, download.verify):
+                await loop.run_in_executor(None, download.discard)
+                record_error(f"Контрольная сумма файла {remote_path} не совпадает")
+                return False
+            await loop.run_in_executor(None, download.finalize)
+            if self.content_cache is not None and key:
+                await loop.run_in_executor(None, self.content_cache.store, key, local_path)
+            return True
+        except RangeNotSupportedError:
+            # Файл скачивается заново целиком: частичные данные и прогресс не нужны
+            if download is not None:
+                download.discard()
+            return await self.download_file(remote_path, local_path)
+        except Exception as e:
+            record_error(e)
+            return False
+
+    async def _fetch_segment(self, link: str, download: SegmentedDownload, index: int) -> None:
+        start, end = download.segment_range(index)
+        loop = asyncio.get_running_loop()
+        writer = await loop.run_in_executor(None, download.write_at, start)
+
+        async def _write(chunk: bytes) -> None:
+            await loop.run_in_executor(None, writer.write, chunk)
+
+        try:
+            await self._fetch_range(link, start, end, _write)
+        finally:
+            await loop.run_in_executor(None, writer.close)
+        if writer.written != end - start + 1:
+            raise IOError(f"Сегмент {index} скачан не полностью")
+        add_bytes(writer.written)
+        await loop.run_in_executor(None, download.mark_done, index)
+
+    async def _fetch_range(self, link: str, start: int, end: int, write: Callable[[bytes], Any]) -> None:
+        """Скачивает байты start..end (включительно) по ссылке Range-запросом."""
+        async with await self.client.session.send_request(
+            "GET", link,
+            headers={"Range": f"bytes={start}-{end}"},
+            timeout=yadisk.settings.DEFAULT_TIMEOUT,
+            stream=True,
+        ) as response:
+            if response.status == 200:
+                raise RangeNotSupportedError(link)
+            if response.status != 206:
+                raise await response.get_exception()
+            await response.download(write)
+
+    @instrumented("read_range")
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части файла Range-запросом без скачивания всего файла.
+
+        Ссылка на скачивание запоминается (см. DownloadLinkCache), поэтому
+        повторное чтение того же файла стоит одного запроса.
+
+        Raises:
+            RangeNotSupportedError: Если сервер вернул весь файл вместо диапазона
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        async def _attempt() -> bytes:
+            link = self.download_links.get(remote_path)
+            fresh = link is None
+            while True:
+                if link is None:
+                    link = await self.scheduler.call_async(
+                        self.client.get_download_link, remote_path, operation="get_download_link"
+                    )
+                    self.download_links.put(remote_path, link)
+                buffer = io.BytesIO()
+                try:
+                    await self._fetch_range(link, start, start + length - 1, buffer.write)
+                    break
+                except RangeNotSupportedError:
+                    raise
+                except Exception:
+                    self.download_links.invalidate(remote_path)
+                    if fresh:
+                        raise
+                    # Ссылка из кэша могла устареть: повторяем с новой
+                    link, fresh = None, True
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} файла {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        data = await self.scheduler.call_async(_attempt, operation="download")
+        add_bytes(len(data))
+        return data
+
+    @instrumented("download_fileobj")
+    async def download_fileobj(self, remote_path: str, file_obj: Any) -> bool:
+        """
+        Скачивание файла в file-like объект без записи на диск.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            file_obj: Объект с методом write (синхронным или асинхронным),
+                например io.BytesIO, открытый файл или сокет
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        start = upload_position(file_obj)
+
+        async def _attempt() -> None:
+            if start is not None:
+                # Повтор пишет данные заново с исходной позиции
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            await self.client.download(remote_path, file_obj)
+
+        try:
+            await self.scheduler.call_async(
+                _attempt, operation="download", retries=None if start is not None else 0
+            )
+            if start is not None:
+                add_bytes(file_obj.tell() - start)
             return True
-        except Exception:
+        except Exception as e:
+            record_error(e)
             return False
 
-    async def upload_file(self, local_path: Union[str, Path], remote_path: str) -> bool:
+    async def iter_download(
+        self,
+        remote_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Потоковое скачивание файла фрагментами.
+
+        Данные выдаются по мере поступления из сети, поэтому их можно
+        декодировать или хэшировать без временного файла. Ошибки
+        скачивания пробрасываются в итерацию.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            chunk_size: Размер фрагмента в байтах
+
+        Yields:
+            Фрагменты содержимого файла
+        """
+        async for chunk in iter_chunks(
+            # Уже выданные фрагменты не вернуть, поэтому поток не повторяется
+            lambda writer: self.scheduler.call_async(
+                self.client.download, remote_path, writer, operation="download", retries=0
+            ),
+            chunk_size,
+        ):
+            yield chunk
+
+    @instrumented("upload_file", path_arg=1)
+    async def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Загрузка файла или данных из памяти.
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект (синхронный или асинхронный)
+                или (асинхронный) итератор фрагментов
+            remote_path: Путь на Яндекс.Диске
+            overwrite: Перезаписать существующий файл
+
+        Returns:
+            True если загрузка успешна, иначе False
+        """
+        if not is_local_path(local_path):
+            try:
+                await self._upload(local_path, remote_path, overwrite)
+                return True
+            except Exception as e:
+                record_error(e)
+                return False
         try:
             local_path = Path(local_path)
             if not local_path.exists():
                 return False
-            await self.client.upload(str(local_path), remote_path)
+            await self._upload(local_path, remote_path, overwrite)
             return True
-        except Exception:
+        except Exception as e:
+            record_error(e)
             return False
 
-    async def search_directories(self, name: str, path: str = "/") -> List[str]:
+    @instrumented("download_many", path_arg=None)
+    async def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора файлов.
+
+        Args:
+            items: Пары (путь в облаке, локальный путь)
+            max_concurrency: Максимальное число одновременных скачиваний
+            max_bytes_in_flight: Ограничение суммарного размера скачиваемых
+                одновременно файлов в байтах (None - без ограничения).
+                Для учета размера выполняется запрос метаданных файла.
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                reserved = 0
+                if limiter is not None:
+                    meta = await self.scheduler.call_async(
+                        self.client.get_meta, remote_path, fields=["size"], operation="get_meta"
+                    )
+                    reserved = await limiter.acquire(meta["size"] or 0)
+                try:
+                    await self._download(remote_path, local_path)
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(list(items), _worker, max_concurrency)
+
+    @instrumented("upload_many", path_arg=None)
+    async def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_concurrency: int = 8,
+        max_bytes_in_flight: Optional[int] = None,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов.
+
+        Args:
+            items: Пары (путь в облаке, локальный путь)
+            max_concurrency: Максимальное число одновременных загрузок
+            max_bytes_in_flight: Ограничение суммарного размера загружаемых
+                одновременно файлов в байтах (None - без ограничения)
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        limiter = AsyncByteLimiter(max_bytes_in_flight) if max_bytes_in_flight else None
+
+        async def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                reserved = await limiter.acquire(size) if limiter is not None else 0
+                try:
+                    await self._upload(local_path, remote_path, overwrite)
+                finally:
+                    if limiter is not None:
+                        await limiter.release(reserved)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return await run_bounded(list(items), _worker, max_concurrency)
+
+    async def _download(self, remote_path: str, local_path: Path) -> None:
+        # Одновременные скачивания одного файла в один путь выполняются одним запросом
+        await self._flights.run(
+            ("download", normalize_path(remote_path), os.path.abspath(local_path)),
+            lambda: self._download_once(remote_path, local_path),
+        )
+
+    @instrumented("download")
+    async def _download_once(self, remote_path: str, local_path: Path) -> None:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.content_cache is None:
+            await self.scheduler.call_async(
+                self.client.download, remote_path, str(local_path), operation="download"
+            )
+            add_bytes(local_path.stat().st_size)
+            return
+        # Один запрос метаданных: при совпадении хэша файл берется из кэша
+        meta = await self.scheduler.call_async(
+            self.client.get_meta, remote_path, fields=["md5", "sha256"], operation="get_meta"
+        )
+        key = ContentCache.key(meta["md5"], meta["sha256"])
+        loop = asyncio.get_running_loop()
+        if key and await loop.run_in_executor(None, self.content_cache.fetch, key, local_path):
+            return
+        tmp_path = local_path.with_name(local_path.name + ".download")
+        try:
+            await self.scheduler.call_async(
+                self.client.download, remote_path, str(tmp_path), operation="download"
+            )
+            os.replace(tmp_path, local_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        add_bytes(local_path.stat().st_size)
+        if key:
+            await loop.run_in_executor(None, self.content_cache.store, key, local_path)
+
+    async def _ensure_directory_exists(self, remote_path: str) -> None:
+        """
+        Создает директорию и недостающих родителей, если их нет.
+
+        Одновременные загрузки в одну директорию создают ее один раз.
+        """
+        async def _mkdir(path: str) -> None:
+            await self.scheduler.call_async(self.client.mkdir, path, operation="mkdir")
+
+        for created in await self._directories.ensure_async(remote_path, _mkdir):
+            self.metadata_cache.invalidate(created)
+            if self.index is not None:
+                self.index.record(created, type="dir")
+
+    @instrumented("upload", path_arg=1)
+    async def _upload(
+        self,
+        source: Union[Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> None:
+        remote_dir = parent_path(remote_path)
+        if remote_dir != "/":
+            await self._ensure_directory_exists(remote_dir)
+        if isinstance(source, Path):
+            await self.scheduler.call_async(
+                self.client.upload, str(source), remote_path, overwrite=overwrite, operation="upload"
+            )
+            size = source.stat().st_size
+        else:
+            payload = async_payload(source)
+            start = upload_position(source)
+
+            async def _attempt() -> None:
+                if start is not None:
+                    source.seek(start)
+                await self.client.upload(payload, remote_path, overwrite=overwrite)
+
+            # Одноразовые генераторы и потоки повторно не отправляются
+            await self.scheduler.call_async(
+                _attempt, operation="upload", retries=None if is_replayable(source) else 0
+            )
+            size = payload_size(source)
+        add_bytes(size)
+        self.metadata_cache.invalidate(remote_path)
+        self.download_links.invalidate(remote_path)
+        if self.index is not None:
+            self.index.record(remote_path, size=size)
+
+    def _forget(self, remote_path: str) -> None:
+        """Сбрасывает все локальные сведения об удаленном ресурсе."""
+        self.metadata_cache.invalidate_tree(remote_path)
+        self._directories.forget(remote_path)
+        self.download_links.invalidate_tree(remote_path)
+        if self.index is not None:
+            self.index.remove(remote_path)
+
+    async def _listdir(self, path: str, fresh: bool = False) -> List[Dict[str, Any]]:
+        """Содержимое директории с использованием кэша метаданных."""
+        items = None if fresh else self.metadata_cache.get(path)
+        if items is None:
+            async def _list() -> List[Dict[str, Any]]:
+                return [resource_to_dict(item) async for item in self.client.listdir(path)]
+
+            async def _fetch() -> List[Dict[str, Any]]:
+                result = await self.scheduler.call_async(_list, operation="listdir")
+                self.metadata_cache.put(path, result)
+                return result
+
+            items = await self._flights.run(("listdir", normalize_path(path)), _fetch)
+        return items
+
+    @instrumented("search_directories", path_arg=1)
+    async def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        if self.index is not None:
+            found = self.index.search_directories(name, path)
+            if found is not None:
+                return found[:max_results]
+        if max_results is None:
+            return [
+                item["path"] for item in await self._listdir(path)
+                if item["type"] == "dir" and name.lower() in item["name"].lower()
+            ]
         result = []
-        async for item in self.client.listdir(path):
-            if item["type"] == "dir" and name.lower() in item["name"].lower():
-                result.append(item["path"])
+        # С ограничением директория читается постранично до нужного числа совпадений
+        listing = self.iter_directory(path, fields=("name", "path"), resource_type="dir")
+        try:
+            async for item in listing:
+                if name.lower() in item["name"].lower():
+                    result.append(item["path"])
+                    if len(result) >= max_results:
+                        break
+        finally:
+            # Прерванный асинхронный генератор закрывается явно, а не сборщиком мусора
+            await listing.aclose()
         return result
 
+    @instrumented("find_directories", path_arg=1)
+    async def find_directories(
+        self,
+        pattern: str,
+        path: str = "/",
+        max_depth: Optional[int] = None,
+        regex: bool = False,
+        max_results: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> List[str]:
+        """
+        Рекурсивный поиск директорий с параллельным обходом дерева.
+
+        Обход выполняется в ширину: директории одного уровня запрашиваются
+        одновременно пулом из max_workers воркеров, читающих общую очередь.
+
+        Args:
+            pattern: Glob-шаблон, подстрока или регулярное выражение для имени
+            path: Корень обхода (например, home_folder из NeuroCloudApiConfig)
+            max_depth: Максимальная глубина (1 - только прямые потомки, None - без ограничения)
+            regex: Интерпретировать pattern как регулярное выражение
+            max_results: Остановить обход после стольких совпадений
+            max_workers: Количество одновременных запросов listdir
+
+        Returns:
+            Список путей к найденным директориям в порядке обнаружения
+        """
+        matches = build_matcher(pattern, regex)
+        result: List[str] = []
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            children = []
+            for item in items:
+                if item["type"] != "dir":
+                    continue
+                if matches(item["name"]):
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        raise StopWalk
+                if max_depth is None or depth + 1 < max_depth:
+                    children.append(item["path"])
+            return children
+
+        await walk_parallel_async(path, self._listdir, _visit, max_workers)
+        return result
+
+    @instrumented("list_files")
+    async def list_files(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        max_workers: int = 8,
+        strict: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получение списка файлов с метаданными.
+
+        Args:
+            path: Путь к директории
+            recursive: Обойти все поддиректории (параллельно)
+            max_workers: Количество одновременных запросов listdir
+            strict: Пробрасывать ошибку листинга любой директории вместо того,
+                чтобы пропустить ее (отсутствующая директория path считается пустой)
+
+        Returns:
+            Список файлов в виде словарей с ключами name, path, type, size, md5, modified
+        """
+        result: List[Dict[str, Any]] = []
+
+        def _on_error(directory: str, e: Exception) -> None:
+            if strict and (directory != path or not isinstance(e, yadisk.exceptions.PathNotFoundError)):
+                raise e
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            result.extend(item for item in items if item["type"] == "file")
+            if not recursive:
+                return []
+            return [item["path"] for item in items if item["type"] == "dir"]
+
+        await walk_parallel_async(path, self._listdir, _visit, max_workers, on_error=_on_error)
+        return result
+
+    @instrumented("remove")
+    async def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        """
+        Удаление файла или директории.
+
+        Args:
+            remote_path: Путь к ресурсу
+            permanently: Удалить безвозвратно, минуя корзину
+
+        Returns:
+            True если удаление успешно, иначе False
+        """
+        try:
+            await self._start_operation(
+                self.client.remove, remote_path, permanently=permanently, operation="remove"
+            )
+            self._forget(remote_path)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    async def copy(self, src_path: str, dst_path: str, overwrite: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Копирование на стороне Яндекс.Диска (см. YadiskSource.copy).
+
+        Returns:
+            True если копирование успешно, иначе False
+        """
+        try:
+            await self._start_operation(
+                self.client.copy, src_path, dst_path, overwrite=overwrite, operation="copy", timeout=timeout
+            )
+            self._forget(dst_path)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    async def move(self, src_path: str, dst_path: str, overwrite: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Перемещение на стороне Яндекс.Диска (см. YadiskSource.move).
+
+        Returns:
+            True если перемещение успешно, иначе False
+        """
+        try:
+            await self._start_operation(
+                self.client.move, src_path, dst_path, overwrite=overwrite, operation="move", timeout=timeout
+            )
+            self._forget(src_path)
+            self._forget(dst_path)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy_many", path_arg=None)
+    async def copy_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        overwrite: bool = False,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное копирование на стороне Яндекс.Диска.
+
+        Одновременно запускается не больше max_concurrency операций;
+        асинхронные операции сервера ждет общий опрос статусов
+        (self.operations), а не запустившая их корутина.
+
+        Args:
+            items: Пары (исходный путь, путь назначения)
+            overwrite: Перезаписывать существующие ресурсы
+            max_concurrency: Количество одновременно запускаемых операций
+            timeout: Максимальное время ожидания каждой операции, сек
+
+        Returns:
+            Список OperationResult в порядке items
+        """
+        return await self._run_operations(
+            [(src, dst) for src, dst in items],
+            lambda src, dst: self._start_operation(
+                self.client.copy, src, dst, overwrite=overwrite, operation="copy", timeout=timeout, detach=True
+            ),
+            lambda src, dst: self._forget(dst),
+            max_concurrency,
+        )
+
+    @instrumented("move_many", path_arg=None)
+    async def move_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        overwrite: bool = False,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное перемещение на стороне Яндекс.Диска (см. copy_many).
+
+        Returns:
+            Список OperationResult в порядке items
+        """
+        def _forget(src: str, dst: str) -> None:
+            self._forget(src)
+            self._forget(dst)
+
+        return await self._run_operations(
+            [(src, dst) for src, dst in items],
+            lambda src, dst: self._start_operation(
+                self.client.move, src, dst, overwrite=overwrite, operation="move", timeout=timeout, detach=True
+            ),
+            _forget,
+            max_concurrency,
+        )
+
+    @instrumented("remove_many", path_arg=None)
+    async def remove_many(
+        self,
+        paths: Iterable[str],
+        permanently: bool = False,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное удаление (см. copy_many).
+
+        Returns:
+            Список OperationResult (dst_path=None) в порядке paths
+        """
+        return await self._run_operations(
+            [(path, None) for path in paths],
+            lambda path, _: self._start_operation(
+                self.client.remove, path, permanently=permanently, operation="remove", timeout=timeout, detach=True
+            ),
+            lambda path, _: self._forget(path),
+            max_concurrency,
+        )
+
+    async def _start_operation(
+        self,
+        func: Any,
+        *args: Any,
+        operation: str,
+        timeout: Optional[float] = None,
+        detach: bool = False,
+        **kwargs: Any,
+    ) -> Optional[asyncio.Future]:
+        """
+        Запускает операцию на сервере и ждет ее завершения.
+
+        При detach=True не ждет, а возвращает Future асинхронной операции
+        сервера (None, если сервер выполнил ее синхронно).
+        """
+        link = await self.scheduler.call_async(func, *args, wait=False, operation=operation, **kwargs)
+        if not isinstance(link, yadisk.objects.OperationLinkObject):
+            return None
+        future = self.operations.add(link.href, timeout)
+        if detach:
+            return future
+        await future
+        return None
+
+    async def _operation_status(self, link: str) -> str:
+        return await self.scheduler.call_async(
+            self.client.get_operation_status, link, operation="operation_status"
+        )
+
+    async def _run_operations(self, items, start, forget, max_concurrency: int) -> List[OperationResult]:
+        async def _start(item: Tuple[str, Optional[str]]) -> Tuple[float, Any]:
+            begin = time.perf_counter()
+            try:
+                return begin, await start(*item)
+            except Exception as e:
+                return begin, e
+
+        async def _finish(item: Tuple[str, Optional[str]], started: Tuple[float, Any]) -> OperationResult:
+            begin, pending = started
+            error = pending if isinstance(pending, Exception) else None
+            if pending is not None and error is None:
+                try:
+                    await pending
+                except Exception as e:
+                    error = e
+            if error is None:
+                forget(*item)
+            return OperationResult(
+                item[0], item[1], error is None, elapsed=time.perf_counter() - begin,
+                error=None if error is None else str(error) or type(error).__name__,
+            )
+
+        started = await run_bounded(items, _start, max_concurrency)
+        return list(await asyncio.gather(*(_finish(item, s) for item, s in zip(items, started))))
+
+    @instrumented("refresh_index")
+    async def refresh_index(self, path: str = "/", full: bool = False, max_workers: int = 8) -> int:
+        """
+        Инкрементальное обновление локального индекса дерева диска.
+
+        Перечитываются только поддиректории, которых еще нет в индексе
+        или у которых изменилось время модификации.
+
+        Args:
+            path: Корень обновляемого поддерева
+            full: Перечитать все поддерево целиком
+            max_workers: Количество одновременных запросов listdir
+
+        Returns:
+            Количество прочитанных директорий
+        """
+        if self.index is None:
+            raise ValueError("Индекс не подключен к источнику")
+        listed = 0
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            nonlocal listed
+            listed += 1
+            return self.index.apply_listing(directory, items, full=full)
+
+        await walk_parallel_async(
+            path, lambda directory: self._listdir(directory, fresh=True), _visit, max_workers
+        )
+        return listed
+
     async def disconnect(self):
         """Отключение от облачного хранилища."""
-        if self.client:
-            await self.client.close()
+        await self.operations.close()
+        if self._registry is not None:
+            # Общие клиенты освобождаются; клиент последнего источника закрывает реестр
+            for loop in list(self._loop_clients):
+                await self._registry.release_async_client(self.token, self._transport, loop)
+            self._loop_clients.clear()
+        elif self._client:
+            await self._client.close()
         self.client = None
         self.is_connected = False
\ No newline at end of file
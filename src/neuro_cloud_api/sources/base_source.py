@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from enum import Enum
 from pathlib import Path
-from typing import Union, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .transfer import TransferResult
+from ..metrics.events import Instrumentation, MetricsSink
 
 
 class BaseSource(ABC):
@@ -20,6 +23,16 @@ class BaseSource(ABC):
         self.client = None
         self.is_connected = False
         # self.is_async = False
+        # События операций (см. add_sink); без приемников не измеряются
+        self.instrumentation = Instrumentation(getattr(source_type, "name", str(source_type)))
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """Подключает приемник событий операций (HistogramSink, LoggingSink, PrometheusExporter)."""
+        self.instrumentation.add_sink(sink)
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        """Отключает приемник событий операций."""
+        self.instrumentation.remove_sink(sink)
 
     @abstractmethod
     def connect(self) -> bool:
@@ -47,10 +60,47 @@ class BaseSource(ABC):
         pass
 
     @abstractmethod
-    def search_directories(self, name: str, path: str = "/") -> List[str]:
-        """Поиск директорий по имени."""
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        """Поиск директорий по имени (max_results - остановить поиск после стольких совпадений)."""
         pass
 
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """Чтение length байт файла начиная со смещения start."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает чтение диапазона")
+
+    def list_files(self, path: str = "/", recursive: bool = True, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Список файлов с метаданными (name, path, type, size, md5, modified).
+
+        strict=True - ошибка листинга любой директории пробрасывается, а не
+        превращается в пустой или неполный список.
+        """
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает список файлов")
+
+    def download_many(
+        self, items: Iterable[Tuple[str, Union[str, Path]]], max_workers: int = 8
+    ) -> List[TransferResult]:
+        """Параллельное скачивание набора файлов (пары удаленный путь, локальный путь)."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает пакетное скачивание")
+
+    def upload_many(
+        self, items: Iterable[Tuple[str, Union[str, Path]]], max_workers: int = 8, overwrite: bool = False
+    ) -> List[TransferResult]:
+        """Параллельная загрузка набора файлов (пары удаленный путь, локальный путь)."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает пакетную загрузку")
+
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Копирование файла или директории на стороне хранилища."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает копирование")
+
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """Перемещение файла или директории на стороне хранилища."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает перемещение")
+
+    def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        """Удаление файла или директории."""
+        raise NotImplementedError(f"Источник {type(self).__name__} не поддерживает удаление")
+
     def disconnect(self):
         """Отключение от облачного хранилища."""
         self.client = None
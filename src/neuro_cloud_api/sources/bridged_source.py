@@ -0,0 +1,462 @@
+import asyncio
+import concurrent.futures
+import threading
+
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .base_source import BaseSource
+from .streaming import UploadData
+from .transfer import OperationResult, TransferResult
+from ..metrics.events import MetricsSink
+
+
+class EventLoopThread:
+    """
+    Событийный цикл asyncio, работающий в отдельном потоке.
+
+    Синхронный код передает в цикл корутины через submit (получает
+    concurrent.futures.Future) или run (ждет результата). Цикл живет
+    до вызова stop, поэтому соединения и планировщик асинхронного
+    источника переиспользуются между вызовами.
+    """
+
+    def __init__(self, name: str = "neuro-cloud-loop"):
+        """
+        Args:
+            name: Имя потока цикла
+        """
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._lock = threading.Lock()
+        self._futures: Set[concurrent.futures.Future] = set()
+        self._closed = False
+        self._thread.start()
+        self._started.wait()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Событийный цикл потока."""
+        return self._loop
+
+    @property
+    def closed(self) -> bool:
+        """Цикл остановлен (stop вызван)."""
+        return self._closed
+
+    def in_loop_thread(self) -> bool:
+        """Вызов выполняется в потоке цикла."""
+        return threading.get_ident() == self._thread.ident
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Запускает корутину в цикле.
+
+        Returns:
+            concurrent.futures.Future с результатом корутины; cancel() отменяет задачу в цикле
+
+        Raises:
+            RuntimeError: Если цикл остановлен
+        """
+        with self._lock:
+            if self._closed:
+                if asyncio.iscoroutine(coro):
+                    coro.close()
+                raise RuntimeError("Событийный цикл остановлен")
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Выполняет корутину в цикле и ждет результата.
+
+        Raises:
+            RuntimeError: Если вызван из потока цикла (ожидание заблокировало бы цикл)
+            concurrent.futures.TimeoutError: Если результат не получен за timeout
+        """
+        if self.in_loop_thread():
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError("Блокирующий вызов из потока событийного цикла")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def pending(self) -> int:
+        """Количество незавершенных корутин, переданных через submit."""
+        with self._lock:
+            return len(self._futures)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет завершения переданных корутин (новые корутины принимаются).
+
+        Returns:
+            True если все корутины завершились за timeout
+        """
+        with self._lock:
+            futures = set(self._futures)
+        _, not_done = concurrent.futures.wait(futures, timeout)
+        return not not_done
+
+    def cancel(self) -> int:
+        """
+        Отменяет незавершенные корутины и ждет, пока отмена дойдет до них.
+
+        Returns:
+            Количество отмененных корутин
+        """
+        with self._lock:
+            futures = list(self._futures)
+        # cancel вызывает _discard, поэтому выполняется без блокировки
+        futures = [future for future in futures if future.cancel()]
+        if not self.in_loop_thread():
+            concurrent.futures.wait(futures)
+        return len(futures)
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Останавливает цикл и поток.
+
+        Новые корутины перестают приниматься; принятые дорабатывают (drain=True)
+        не дольше timeout, оставшиеся отменяются.
+
+        Args:
+            drain: Дождаться завершения принятых корутин
+            timeout: Максимальное время ожидания, сек
+
+        Returns:
+            True если все принятые корутины завершились сами, без отмены
+        """
+        with self._lock:
+            if self._closed:
+                return True
+            self._closed = True
+            futures = set(self._futures)
+        _, not_done = concurrent.futures.wait(futures, timeout if drain else 0)
+        self.cancel()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if not self.in_loop_thread():
+            self._thread.join()
+        return not not_done
+
+    def _discard(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            # Задачи, созданные самим источником (не через submit), отменяются
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+
+class BridgedSource(BaseSource):
+    """
+    Синхронный источник поверх асинхронного (AsyncYadiskSource и т.п.).
+
+    Асинхронный источник живет в одном долгоживущем событийном цикле в
+    фоновом потоке. Блокирующие методы (download_file, list_directories, ...)
+    передают корутину в цикл и ждут результата, а методы submit_* сразу
+    возвращают concurrent.futures.Future, поэтому синхронный код (воркер
+    Flask/Celery) может запустить сотни передач одновременно и собрать
+    результаты через concurrent.futures.wait/as_completed. Одновременно
+    выполняется не больше max_concurrency передач, запущенных через submit_*.
+
+    disconnect перестает принимать новые операции, дожидается уже запущенных,
+    отключает асинхронный источник и останавливает цикл.
+    """
+
+    def __init__(
+        self,
+        source: Union[BaseSource, Callable[[], BaseSource]],
+        max_concurrency: int = 64,
+        loop_thread: Optional[EventLoopThread] = None,
+    ):
+        """
+        Args:
+            source: Асинхронный источник или функция, создающая его. Функция
+                вызывается в потоке цикла, поэтому клиент и общие ресурсы
+                ClientRegistry привязываются к циклу моста
+            max_concurrency: Максимальное число одновременных передач submit_*
+            loop_thread: Общий поток с циклом (None - мост создает и останавливает свой)
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency должен быть положительным")
+        self._owns_loop = loop_thread is None
+        self.loop_thread = loop_thread or EventLoopThread()
+        try:
+            self.source = self.loop_thread.run(self._create(source, max_concurrency))
+        except BaseException:
+            if self._owns_loop:
+                self.loop_thread.stop(drain=False)
+            raise
+        super().__init__(self.source.token, source_type=self.source.source_type)
+        self.client = self.source.client
+        self.max_concurrency = max_concurrency
+        self._closed = False
+
+    async def _create(self, source: Union[BaseSource, Callable[[], BaseSource]], max_concurrency: int) -> BaseSource:
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        return source if isinstance(source, BaseSource) else source()
+
+    # --- Метрики асинхронного источника ---
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """Подключает приемник событий операций асинхронного источника."""
+        self.source.add_sink(sink)
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        """Отключает приемник событий операций асинхронного источника."""
+        self.source.remove_sink(sink)
+
+    # --- Блокирующие методы ---
+
+    def call(self, method: str, *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Вызывает асинхронный метод источника и ждет результата.
+
+        Args:
+            method: Имя метода асинхронного источника
+            timeout: Максимальное время ожидания, сек (по истечении операция отменяется)
+
+        Returns:
+            Результат метода
+        """
+        self._check_open()
+        return self.loop_thread.run(getattr(self.source, method)(*args, **kwargs), timeout)
+
+    def connect(self) -> bool:
+        """Подключение асинхронного источника."""
+        self.is_connected = self.call("connect")
+        return self.is_connected
+
+    def check_connection(self) -> bool:
+        """Проверка подключения."""
+        return self.call("check_connection")
+
+    def list_directories(self, path: str = "/") -> List[str]:
+        """Получение списка директорий."""
+        return self.call("list_directories", path)
+
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        """Поиск директорий по имени."""
+        return self.call("search_directories", name, path, max_results=max_results)
+
+    def exists(self, remote_path: str) -> bool:
+        """Проверка существования ресурса."""
+        return self.call("exists", remote_path)
+
+    def get_meta(self, remote_path: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Метаданные ресурса."""
+        return self.call("get_meta", remote_path, fields)
+
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """Чтение части файла Range-запросом."""
+        return self.call("read_range", remote_path, start, length)
+
+    def iter_directory(self, path: str = "/", **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Постраничный обход содержимого директории (параметры - как у AsyncYadiskSource.iter_directory)."""
+        self._check_open()
+        return self._iterate(self.source.iter_directory(path, **kwargs))
+
+    def find_directories(self, pattern: str, path: str = "/", **kwargs: Any) -> List[str]:
+        """Рекурсивный поиск директорий (параметры - как у AsyncYadiskSource.find_directories)."""
+        return self.call("find_directories", pattern, path, **kwargs)
+
+    def list_files(self, path: str = "/", **kwargs: Any) -> List[Dict[str, Any]]:
+        """Список файлов с метаданными (параметры - как у AsyncYadiskSource.list_files)."""
+        return self.call("list_files", path, **kwargs)
+
+    def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
+        """Скачивание файла."""
+        return self.call("download_file", remote_path, local_path)
+
+    def download_large_file(self, remote_path: str, local_path: Union[str, Path], **kwargs: Any) -> bool:
+        """Сегментное скачивание большого файла (параметры - как у AsyncYadiskSource.download_large_file)."""
+        return self.call("download_large_file", remote_path, local_path, **kwargs)
+
+    def download_fileobj(self, remote_path: str, file_obj: Any) -> bool:
+        """Скачивание файла в file-like объект (пишется из потока цикла, пока вызывающий ждет)."""
+        return self.call("download_fileobj", remote_path, file_obj)
+
+    def iter_download(self, remote_path: str, **kwargs: Any) -> Iterator[bytes]:
+        """Потоковое скачивание файла фрагментами."""
+        self._check_open()
+        return self._iterate(self.source.iter_download(remote_path, **kwargs))
+
+    def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """Загрузка файла или данных из памяти."""
+        return self.call("upload_file", local_path, remote_path, overwrite=overwrite)
+
+    def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        """Удаление файла или директории."""
+        return self.call("remove", remote_path, permanently=permanently)
+
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False, **kwargs: Any) -> bool:
+        """Копирование на стороне хранилища."""
+        return self.call("copy", src_path, dst_path, overwrite=overwrite, **kwargs)
+
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False, **kwargs: Any) -> bool:
+        """Перемещение на стороне хранилища."""
+        return self.call("move", src_path, dst_path, overwrite=overwrite, **kwargs)
+
+    def copy_many(self, items: Iterable[Tuple[str, str]], **kwargs: Any) -> List[OperationResult]:
+        """Пакетное копирование на стороне хранилища (параметры - как у AsyncYadiskSource.copy_many)."""
+        return self.call("copy_many", list(items), **kwargs)
+
+    def move_many(self, items: Iterable[Tuple[str, str]], **kwargs: Any) -> List[OperationResult]:
+        """Пакетное перемещение на стороне хранилища (параметры - как у AsyncYadiskSource.move_many)."""
+        return self.call("move_many", list(items), **kwargs)
+
+    def remove_many(self, paths: Iterable[str], **kwargs: Any) -> List[OperationResult]:
+        """Пакетное удаление (параметры - как у AsyncYadiskSource.remove_many)."""
+        return self.call("remove_many", list(paths), **kwargs)
+
+    def download_many(self, items: Iterable[Tuple[str, Union[str, Path]]], **kwargs: Any) -> List[TransferResult]:
+        """Параллельное скачивание набора файлов (параметры - как у AsyncYadiskSource.download_many)."""
+        return self.call("download_many", list(items), **kwargs)
+
+    def upload_many(self, items: Iterable[Tuple[str, Union[str, Path]]], **kwargs: Any) -> List[TransferResult]:
+        """Параллельная загрузка набора файлов (параметры - как у AsyncYadiskSource.upload_many)."""
+        return self.call("upload_many", list(items), **kwargs)
+
+    # --- Неблокирующие методы ---
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+        """
+        Запускает асинхронный метод источника в цикле, не дожидаясь результата.
+
+        Одновременно выполняется не больше max_concurrency операций,
+        остальные ждут своей очереди в цикле.
+
+        Args:
+            method: Имя метода асинхронного источника
+
+        Returns:
+            concurrent.futures.Future с результатом метода
+
+        Raises:
+            RuntimeError: Если источник отключен
+        """
+        self._check_open()
+        return self.loop_thread.submit(self._bounded(getattr(self.source, method), args, kwargs))
+
+    def submit_download(self, remote_path: str, local_path: Union[str, Path]) -> concurrent.futures.Future:
+        """Запускает скачивание файла; Future с результатом download_file."""
+        return self.submit("download_file", remote_path, local_path)
+
+    def submit_upload(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> concurrent.futures.Future:
+        """Запускает загрузку файла; Future с результатом upload_file."""
+        return self.submit("upload_file", local_path, remote_path, overwrite=overwrite)
+
+    def submit_download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+    ) -> List[concurrent.futures.Future]:
+        """
+        Запускает скачивание набора файлов.
+
+        Args:
+            items: Пары (путь в облаке, локальный путь)
+
+        Returns:
+            Future (с результатом download_file) для каждого элемента в порядке items
+        """
+        return [self.submit_download(remote_path, local_path) for remote_path, local_path in items]
+
+    def submit_upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        overwrite: bool = False,
+    ) -> List[concurrent.futures.Future]:
+        """
+        Запускает загрузку набора файлов.
+
+        Args:
+            items: Пары (путь в облаке, локальный путь)
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Future (с результатом upload_file) для каждого элемента в порядке items
+        """
+        return [self.submit_upload(local_path, remote_path, overwrite) for remote_path, local_path in items]
+
+    def pending(self) -> int:
+        """Количество незавершенных операций в цикле."""
+        return self.loop_thread.pending()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет завершения запущенных операций.
+
+        Returns:
+            True если все операции завершились за timeout
+        """
+        return self.loop_thread.drain(timeout)
+
+    def disconnect(self, timeout: Optional[float] = None):
+        """
+        Дожидается запущенных операций, отключает асинхронный источник и останавливает цикл.
+
+        Args:
+            timeout: Максимальное время ожидания запущенных операций, сек;
+                не завершившиеся за это время операции отменяются
+        """
+        if not self._closed:
+            self._closed = True
+            if not self.loop_thread.drain(timeout):
+                self.loop_thread.cancel()
+            try:
+                self.loop_thread.run(self.source.disconnect())
+            finally:
+                if self._owns_loop:
+                    self.loop_thread.stop(drain=False)
+        super().disconnect()
+
+    # --- Служебные методы ---
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Источник отключен")
+
+    async def _bounded(self, method: Callable[..., Awaitable[Any]], args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+        async with self._semaphore:
+            return await method(*args, **kwargs)
+
+    def _iterate(self, iterator: Any) -> Iterator[Any]:
+        # Каждый шаг асинхронного итератора выполняется в цикле моста
+        try:
+            while True:
+                try:
+                    yield self.loop_thread.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self.loop_thread.closed and not self.loop_thread.in_loop_thread():
+                self.loop_thread.run(iterator.aclose())
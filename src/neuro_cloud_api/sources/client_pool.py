@@ -0,0 +1,60 @@
+import queue
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List
+
+
+class ClientPool:
+    """
+    Потокобезопасный пул клиентов облачного хранилища.
+
+    Клиент выдается потоку на время одной операции и затем возвращается
+    в пул, поэтому воркеры переиспользуют уже открытые HTTP-сессии,
+    а число созданных клиентов не превышает числа одновременных операций.
+    """
+
+    def __init__(self, factory: Callable[[], Any], close_clients: bool = True):
+        """
+        Args:
+            factory: Функция, создающая новый клиент
+            close_clients: Закрывать клиенты в close (False - клиенты принадлежат
+                другому владельцу, например ClientRegistry)
+        """
+        self._factory = factory
+        self._close_clients = close_clients
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._all: List[Any] = []
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Количество созданных клиентов."""
+        return len(self._all)
+
+    @contextmanager
+    def client(self) -> Iterator[Any]:
+        """Выдает свободный клиент, создавая новый при необходимости."""
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            client = self._factory()
+            with self._lock:
+                self._all.append(client)
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+    def close(self) -> None:
+        """Закрывает все клиенты пула."""
+        with self._lock:
+            clients, self._all = self._all, []
+        self._idle = queue.LifoQueue()
+        if not self._close_clients:
+            return
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
@@ -0,0 +1,270 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .metadata_cache import CacheStats
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+
+class ContentCache:
+    """
+    Локальный кэш скачанных файлов, адресуемый по хэшу содержимого.
+
+    Файл хранится под именем своего SHA256 (или MD5, если облако не сообщило
+    SHA256) и выдается копией (или жесткой ссылкой), поэтому одинаковые
+    файлы, скачиваемые разными процессами и по разным путям, передаются
+    по сети один раз. Объекты добавляются атомарным переименованием,
+    вытеснение давно не использованных объектов выполняется под файловой
+    блокировкой, поэтому кэшем одновременно могут пользоваться несколько
+    процессов.
+
+    Метки последнего использования для LRU хранятся в отдельных файлах
+    директории access: при выдаче жесткой ссылкой объект и файл
+    пользователя - один inode, и кэш не меняет ни его права, ни времена.
+    Выданный жесткой ссылкой файл нельзя изменять на месте, иначе
+    испортится объект кэша.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        use_hardlinks: bool = False,
+    ):
+        """
+        Args:
+            root: Директория кэша
+            max_bytes: Максимальный суммарный размер объектов в байтах
+            use_hardlinks: Выдавать файлы жесткими ссылками вместо копий
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes должен быть положительным")
+        self.root = Path(root)
+        self.objects_path = self.root / "objects"
+        self.access_path = self.root / "access"
+        self.lock_path = self.root / ".lock"
+        self.max_bytes = max_bytes
+        self.use_hardlinks = use_hardlinks
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(md5: Optional[str] = None, sha256: Optional[str] = None) -> Optional[str]:
+        """
+        Ключ объекта по хэшам файла в облаке.
+
+        Returns:
+            Ключ или None, если хэш неизвестен (такой файл не кэшируется)
+        """
+        if sha256:
+            return f"sha256-{sha256.lower()}"
+        if md5:
+            return f"md5-{md5.lower()}"
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Проверяет наличие объекта в кэше."""
+        return self._object_path(key).exists()
+
+    def fetch(self, key: str, local_path: Union[str, Path]) -> bool:
+        """
+        Выдает объект из кэша в local_path.
+
+        Args:
+            key: Ключ объекта
+            local_path: Путь, по которому нужно положить файл
+
+        Returns:
+            True при попадании в кэш, False если объекта нет
+        """
+        local_path = Path(local_path)
+        obj = self._object_path(key)
+        try:
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._tmp_path(local_path)
+            try:
+                self._place(obj, tmp_path)
+                os.replace(tmp_path, local_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            self._touch(key)
+        except FileNotFoundError:
+            # Объекта нет или его только что вытеснил другой процесс
+            self._count(hit=False)
+            return False
+        self._count(hit=True)
+        return True
+
+    def store(self, key: str, local_path: Union[str, Path]) -> bool:
+        """
+        Добавляет скачанный файл в кэш.
+
+        Содержимое сверяется с ключом, поэтому поврежденный или
+        несовпадающий файл в кэш не попадет.
+
+        Args:
+            key: Ключ объекта
+            local_path: Путь к скачанному файлу
+
+        Returns:
+            True если объект добавлен или уже был в кэше
+        """
+        local_path = Path(local_path)
+        obj = self._object_path(key)
+        if obj.exists():
+            return True
+        algorithm, expected = key.split("-", 1)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(obj)
+        try:
+            digest = hashlib.new(algorithm)
+            with open(local_path, "rb") as src, open(tmp_path, "wb") as dst:
+                for block in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(block)
+                    dst.write(block)
+            if digest.hexdigest() != expected:
+                return False
+            os.replace(tmp_path, obj)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._touch(key)
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """
+        Вытесняет давно не использованные объекты сверх max_bytes.
+
+        Returns:
+            Количество удаленных объектов
+        """
+        removed = 0
+        with self._file_lock():
+            objects = self._objects()
+            total = sum(size for _, size, _ in objects)
+            for path, size, _ in sorted(objects, key=lambda item: item[2]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self._stamp_path(path.name).unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        with self._lock:
+            self._evictions += removed
+        return removed
+
+    def usage(self) -> int:
+        """Суммарный размер объектов в байтах."""
+        return sum(size for _, size, _ in self._objects())
+
+    def stats(self) -> CacheStats:
+        """Статистика обращений этого экземпляра (size - количество объектов)."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits, misses=self._misses,
+                evictions=self._evictions, size=len(self._objects()),
+            )
+
+    def clear(self) -> None:
+        """Удаляет все объекты кэша."""
+        with self._file_lock():
+            for path, _, _ in self._objects():
+                path.unlink(missing_ok=True)
+                self._stamp_path(path.name).unlink(missing_ok=True)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _place(self, obj: Path, target: Path) -> None:
+        if self.use_hardlinks:
+            try:
+                os.link(obj, target)
+                return
+            except FileNotFoundError:
+                raise
+            except OSError:
+                # Другая файловая система или ссылки не поддерживаются
+                pass
+        shutil.copyfile(obj, target)
+
+    def _object_path(self, key: str) -> Path:
+        name = key.split("-", 1)[-1]
+        return self.objects_path / name[:2] / key
+
+    def _stamp_path(self, key: str) -> Path:
+        name = key.split("-", 1)[-1]
+        return self.access_path / name[:2] / key
+
+    def _touch(self, key: str) -> None:
+        """Обновляет метку последнего использования объекта."""
+        stamp = self._stamp_path(key)
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+
+    def _objects(self) -> List[Tuple[Path, int, float]]:
+        result = []
+        for path in self.objects_path.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            try:
+                used = self._stamp_path(path.name).stat().st_mtime
+            except FileNotFoundError:
+                used = stat.st_mtime
+            result.append((path, stat.st_size, used))
+        return result
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Межпроцессная блокировка кэша."""
+        with open(self.lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.05)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,379 @@
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import io
+import itertools
+import queue
+import random
+import tempfile
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .path_utils import normalize_path
+from .shard_archive import AsyncShardReader, ShardReader
+from ..metrics.events import record_error
+
+
+DEFAULT_PREFETCH = 64
+DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class DatasetItem:
+    """
+    Элемент набора данных.
+
+    path: str - Путь к файлу в облаке (для шардов - имя файла в наборе)
+    data: Any - Содержимое: bytes, файловый объект или результат decode
+    """
+    path: str
+    data: Any
+
+
+class _DatasetBase:
+    def __init__(
+        self,
+        source: Any,
+        paths: Optional[Union[str, Sequence[str]]],
+        prefetch: int,
+        workers: int,
+        shuffle: bool,
+        seed: Optional[int],
+        decode: Optional[Callable[[Any], Any]],
+        decode_workers: int,
+        decode_processes: bool,
+        as_file: bool,
+        spool_size: int,
+        ordered: bool,
+        skip_errors: bool,
+    ):
+        if prefetch <= 0 or workers <= 0:
+            raise ValueError("prefetch и число загрузчиков должны быть положительными")
+        if decode_workers < 0:
+            raise ValueError("decode_workers не может быть отрицательным")
+        if decode_processes and (decode is None or not decode_workers):
+            raise ValueError("decode_processes требует decode и decode_workers > 0")
+        self.source = source
+        self.paths = paths
+        self.prefetch = prefetch
+        self.shuffle = shuffle
+        self.seed = seed
+        self.decode = decode
+        self.decode_workers = decode_workers
+        self.decode_processes = decode_processes
+        self.as_file = as_file
+        self.spool_size = spool_size
+        self.ordered = ordered
+        self.skip_errors = skip_errors
+        self.epoch = 0
+        # Файлы, пропущенные из-за ошибок (skip_errors): путь -> текст ошибки
+        self.errors: Dict[str, str] = {}
+        self._listing: Optional[List[str]] = None
+
+    @property
+    def _sharded(self) -> bool:
+        return isinstance(self.source, (ShardReader, AsyncShardReader))
+
+    def set_epoch(self, epoch: int) -> None:
+        """Номер эпохи: при shuffle и заданном seed каждая эпоха дает свой порядок."""
+        self.epoch = epoch
+
+    def _select(self, listing: List[str]) -> List[str]:
+        if self._sharded and isinstance(self.paths, str):
+            # Для шардов строка - префикс-директория имен в наборе
+            prefix = normalize_path(self.paths).strip("/")
+            if prefix:
+                listing = [name for name in listing if name == prefix or name.startswith(prefix + "/")]
+        return listing
+
+    def _order(self, paths: List[str]) -> List[str]:
+        paths = list(paths)
+        if self.shuffle:
+            # Строковое зерно воспроизводимо между запусками, в отличие от hash()
+            random.Random(None if self.seed is None else f"{self.seed}:{self.epoch}").shuffle(paths)
+        return paths
+
+    def _buffer(self) -> Any:
+        if self.as_file:
+            # Большие файлы уходят на диск, память ограничена spool_size на элемент
+            return tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        return io.BytesIO()
+
+    def _output(self, buffer: Any) -> Any:
+        if self.as_file:
+            buffer.seek(0)
+            return buffer
+        return buffer.getvalue()
+
+    def _wrap(self, data: bytes) -> Any:
+        return io.BytesIO(data) if self.as_file else data
+
+    def _decode_pool(self) -> Optional[Executor]:
+        if self.decode is None or not self.decode_workers:
+            return None
+        if self.decode_processes:
+            return ProcessPoolExecutor(self.decode_workers)
+        return ThreadPoolExecutor(self.decode_workers, thread_name_prefix="dataset-decode")
+
+    def _failed(self, path: str, error: BaseException) -> None:
+        if not self.skip_errors:
+            raise error
+        record_error(error)
+        self.errors[path] = str(error) or type(error).__name__
+
+
+class RemoteDataset(_DatasetBase):
+    """
+    Итератор по файлам облачной директории или списка с предзагрузкой.
+
+    Пока модель обрабатывает текущий элемент, следующие prefetch файлов
+    уже скачиваются пулом из max_workers потоков, поэтому цикл обучения
+    не ждет сети. В памяти одновременно не больше prefetch скачанных
+    элементов: следующий файл запрашивается, только когда выдан
+    предыдущий. Источник - синхронный источник (download_fileobj,
+    list_files) или ShardReader.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        paths: Optional[Union[str, Sequence[str]]] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        max_workers: int = 8,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        decode_workers: int = 0,
+        decode_processes: bool = False,
+        as_file: bool = False,
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+        ordered: bool = True,
+        skip_errors: bool = False,
+    ):
+        """
+        Args:
+            source: Синхронный источник или ShardReader
+            paths: Директория в облаке (файлы берутся рекурсивно) или список путей;
+                для ShardReader - список имен или префикс (None - весь набор)
+            prefetch: Максимальное число скачиваемых и ожидающих выдачи элементов
+            max_workers: Количество одновременных скачиваний
+            shuffle: Перемешать порядок файлов
+            seed: Зерно перемешивания (None - новый порядок при каждом проходе)
+            decode: Функция decode(data) -> объект, применяется к содержимому файла
+            decode_workers: Размер пула декодирования (0 - декодировать в потоке скачивания)
+            decode_processes: Декодировать в пуле процессов (decode и данные должны сериализоваться)
+            as_file: Выдавать файловые объекты вместо bytes
+            spool_size: Размер файла, после которого файловый объект хранится на диске, байт
+            ordered: Выдавать элементы в порядке списка (False - по мере готовности)
+            skip_errors: Пропускать файлы с ошибкой скачивания (см. errors) вместо исключения
+        """
+        super().__init__(
+            source, paths, prefetch, max_workers, shuffle, seed, decode, decode_workers,
+            decode_processes, as_file, spool_size, ordered, skip_errors,
+        )
+        self.max_workers = max_workers
+
+    def __len__(self) -> int:
+        return len(self.listing())
+
+    def listing(self) -> List[str]:
+        """Пути файлов набора (директория читается один раз и запоминается)."""
+        if self._listing is None:
+            if self._sharded:
+                listing = self.source.names() if self.paths is None or isinstance(self.paths, str) else self.paths
+            elif isinstance(self.paths, str):
+                listing = sorted(item["path"] for item in self.source.list_files(self.paths, recursive=True))
+            elif self.paths is None:
+                raise ValueError("Для источника нужно указать директорию или список путей")
+            else:
+                listing = self.paths
+            self._listing = self._select(list(listing))
+        return self._listing
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        paths = iter(self._order(self.listing()))
+        fetchers = ThreadPoolExecutor(self.max_workers, thread_name_prefix="dataset-fetch")
+        decoders = self._decode_pool()
+        window: Deque[Tuple[str, Future]] = collections.deque()
+        # Порядок готовности для ordered=False
+        ready: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+
+        def _submit(path: str) -> None:
+            future = self._submit(path, fetchers, decoders)
+            window.append((path, future))
+            if not self.ordered:
+                future.add_done_callback(lambda done: ready.put((path, done)))
+
+        try:
+            for path in itertools.islice(paths, self.prefetch):
+                _submit(path)
+            while window:
+                if self.ordered:
+                    path, future = window.popleft()
+                    concurrent.futures.wait([future])
+                else:
+                    path, future = ready.get()
+                    window.remove((path, future))
+                # Освободившееся место сразу занимает следующий файл
+                for next_path in itertools.islice(paths, 1):
+                    _submit(next_path)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self._failed(path, e)
+                    continue
+                yield DatasetItem(path, data)
+        finally:
+            for _, future in window:
+                future.cancel()
+            fetchers.shutdown(wait=False, cancel_futures=True)
+            if decoders is not None:
+                decoders.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, path: str) -> Any:
+        if self._sharded:
+            return self._wrap(self.source.read(path))
+        buffer = self._buffer()
+        if not self.source.download_fileobj(path, buffer):
+            buffer.close()
+            raise IOError(f"Не удалось скачать файл {path}")
+        return self._output(buffer)
+
+    def _load(self, path: str) -> Any:
+        data = self._fetch(path)
+        # Без пула декодирования decode выполняется в потоке скачивания
+        return data if self.decode is None else self.decode(data)
+
+    def _submit(self, path: str, fetchers: Executor, decoders: Optional[Executor]) -> Future:
+        # Контекст копируется, чтобы скачивания попали в событие вызывающей операции
+        if decoders is None:
+            return fetchers.submit(contextvars.copy_context().run, self._load, path)
+        fetched = fetchers.submit(contextvars.copy_context().run, self._fetch, path)
+        result: Future = Future()
+
+        def _decoded(future: Future) -> None:
+            if future.cancelled():
+                result.cancel()
+            elif future.exception() is not None:
+                result.set_exception(future.exception())
+            else:
+                result.set_result(future.result())
+
+        def _fetched(future: Future) -> None:
+            if future.cancelled() or future.exception() is not None:
+                _decoded(future)
+                return
+            try:
+                decoders.submit(self.decode, future.result()).add_done_callback(_decoded)
+            except RuntimeError:
+                # Пул декодирования уже остановлен: итерация прервана
+                result.cancel()
+
+        fetched.add_done_callback(_fetched)
+        return result
+
+
+class AsyncRemoteDataset(_DatasetBase):
+    """
+    Асинхронный вариант RemoteDataset для асинхронных источников
+    и AsyncShardReader (async for item in dataset).
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        paths: Optional[Union[str, Sequence[str]]] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        max_concurrency: int = 16,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        decode_workers: int = 0,
+        decode_processes: bool = False,
+        as_file: bool = False,
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+        ordered: bool = True,
+        skip_errors: bool = False,
+    ):
+        """
+        Параметры - как у RemoteDataset; max_concurrency - количество
+        одновременных скачиваний. decode выполняется в пуле из
+        decode_workers потоков (процессов), при decode_workers=0 - в пуле
+        цикла по умолчанию, чтобы не блокировать цикл.
+        """
+        super().__init__(
+            source, paths, prefetch, max_concurrency, shuffle, seed, decode, decode_workers,
+            decode_processes, as_file, spool_size, ordered, skip_errors,
+        )
+        self.max_concurrency = max_concurrency
+
+    async def listing(self) -> List[str]:
+        """Пути файлов набора (директория читается один раз и запоминается)."""
+        if self._listing is None:
+            if self._sharded:
+                listing = self.source.names() if self.paths is None or isinstance(self.paths, str) else self.paths
+            elif isinstance(self.paths, str):
+                listing = sorted(item["path"] for item in await self.source.list_files(self.paths, recursive=True))
+            elif self.paths is None:
+                raise ValueError("Для источника нужно указать директорию или список путей")
+            else:
+                listing = self.paths
+            self._listing = self._select(list(listing))
+        return self._listing
+
+    async def __aiter__(self) -> AsyncIterator[DatasetItem]:
+        paths = iter(self._order(await self.listing()))
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        decoders = self._decode_pool()
+        window: Deque[Tuple[str, asyncio.Task]] = collections.deque()
+        ready: "asyncio.Queue[Tuple[str, asyncio.Task]]" = asyncio.Queue()
+
+        async def _load(path: str) -> Any:
+            async with semaphore:
+                data = await self._fetch(path)
+            if self.decode is None:
+                return data
+            return await loop.run_in_executor(decoders, self.decode, data)
+
+        def _submit(path: str) -> None:
+            task = asyncio.ensure_future(_load(path))
+            window.append((path, task))
+            if not self.ordered:
+                task.add_done_callback(lambda done: ready.put_nowait((path, done)))
+
+        try:
+            for path in itertools.islice(paths, self.prefetch):
+                _submit(path)
+            while window:
+                if self.ordered:
+                    path, task = window.popleft()
+                    await asyncio.wait([task])
+                else:
+                    path, task = await ready.get()
+                    window.remove((path, task))
+                for next_path in itertools.islice(paths, 1):
+                    _submit(next_path)
+                try:
+                    data = task.result()
+                except Exception as e:
+                    self._failed(path, e)
+                    continue
+                yield DatasetItem(path, data)
+        finally:
+            for _, task in window:
+                task.cancel()
+            if decoders is not None:
+                decoders.shutdown(wait=False, cancel_futures=True)
+
+    async def _fetch(self, path: str) -> Any:
+        if self._sharded:
+            return self._wrap(await self.source.read(path))
+        buffer = self._buffer()
+        if not await self.source.download_fileobj(path, buffer):
+            buffer.close()
+            raise IOError(f"Не удалось скачать файл {path}")
+        return self._output(buffer)
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple, Type
+
+from .path_utils import is_subpath, normalize_path, parent_path
+
+
+class DirectoryCreator:
+    """
+    Создание директорий в облаке с запоминанием уже существующих.
+
+    Сначала создается сама директория; если облако сообщает, что нет
+    родителя, недостающие родители создаются сверху вниз, после чего
+    попытка повторяется. Ответ "уже существует" считается успехом, поэтому
+    параллельные загрузчики не конфликтуют. Подтвержденные директории
+    запоминаются, и повторные загрузки в них не требуют запросов.
+    """
+
+    def __init__(
+        self,
+        exists_errors: Tuple[Type[BaseException], ...] = (),
+        parent_missing_errors: Tuple[Type[BaseException], ...] = (),
+    ):
+        """
+        Args:
+            exists_errors: Исключения mkdir, означающие, что путь уже существует
+            parent_missing_errors: Исключения mkdir, означающие, что нет родителя
+        """
+        self.exists_errors = exists_errors
+        self.parent_missing_errors = parent_missing_errors
+        self._known: Set[str] = {"/"}
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._inflight: Dict[str, "asyncio.Future[List[str]]"] = {}
+
+    def is_known(self, path: str) -> bool:
+        """Проверяет, подтверждено ли существование директории."""
+        return normalize_path(path) in self._known
+
+    def mark(self, path: str) -> None:
+        """Запоминает директорию и всех ее родителей как существующие."""
+        path = normalize_path(path)
+        with self._lock:
+            while path not in self._known:
+                self._known.add(path)
+                path = parent_path(path)
+
+    def forget(self, path: str) -> None:
+        """Забывает директорию и все вложенные (например, после удаления)."""
+        path = normalize_path(path)
+        with self._lock:
+            self._known = {p for p in self._known if p == "/" or not is_subpath(p, path)}
+
+    def ensure(self, path: str, mkdir: Callable[[str], Any]) -> List[str]:
+        """
+        Гарантирует существование директории (синхронно).
+
+        Args:
+            path: Путь к директории
+            mkdir: Функция создания одной директории
+
+        Returns:
+            Список директорий, созданных этим вызовом (сверху вниз)
+        """
+        path = normalize_path(path)
+        if path in self._known:
+            return []
+        with self._lock:
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            if path in self._known:
+                return []
+            try:
+                mkdir(path)
+                created = [path]
+            except self.exists_errors:
+                created = []
+            except self.parent_missing_errors:
+                created = self.ensure(parent_path(path), mkdir)
+                try:
+                    mkdir(path)
+                    created.append(path)
+                except self.exists_errors:
+                    pass
+            self.mark(path)
+        with self._lock:
+            self._path_locks.pop(path, None)
+        return created
+
+    async def ensure_async(self, path: str, mkdir: Callable[[str], Awaitable[Any]]) -> List[str]:
+        """
+        Гарантирует существование директории (асинхронно).
+
+        Одновременные вызовы для одной и той же директории ожидают один
+        общий запрос.
+
+        Args:
+            path: Путь к директории
+            mkdir: Корутина создания одной директории
+
+        Returns:
+            Список директорий, созданных этим вызовом (сверху вниз)
+        """
+        path = normalize_path(path)
+        while True:
+            if path in self._known:
+                return []
+            inflight = self._inflight.get(path)
+            if inflight is None:
+                break
+            try:
+                await asyncio.shield(inflight)
+                return []
+            except asyncio.CancelledError:
+                # Отменен вызов, создававший директорию, - пробуем сами
+                if not inflight.cancelled():
+                    raise
+        future: "asyncio.Future[List[str]]" = asyncio.get_running_loop().create_future()
+        self._inflight[path] = future
+        try:
+            try:
+                await mkdir(path)
+                created = [path]
+            except self.exists_errors:
+                created = []
+            except self.parent_missing_errors:
+                created = await self.ensure_async(parent_path(path), mkdir)
+                try:
+                    await mkdir(path)
+                    created.append(path)
+                except self.exists_errors:
+                    pass
+            self.mark(path)
+            future.set_result(created)
+            return created
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Исключение получают ожидающие вызовы; здесь оно уже обработано
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(path, None)
@@ -0,0 +1,524 @@
+import inspect
+import json
+import uuid
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, urlencode, urlsplit
+
+import httpx
+
+from .request_scheduler import RequestScheduler, RetryPolicy
+from .transport import TransportSettings
+
+
+DRIVE_API_URL = "https://www.googleapis.com"
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# Поля ресурса, которые запрашиваются по умолчанию
+DEFAULT_FIELDS = ("id", "name", "mimeType", "size", "md5Checksum", "modifiedTime")
+# Поля, без которых ресурс нельзя превратить в словарь источника
+REQUIRED_FIELDS = ("id", "name", "mimeType")
+# Размер фрагмента возобновляемой загрузки должен быть кратен 256 КиБ
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+MAX_BATCH_SIZE = 100
+
+
+class DriveError(Exception):
+    """Ошибка, которую вернул Google Drive API."""
+
+    def __init__(self, status: int, reason: str = "", message: str = "", response: Any = None):
+        super().__init__(f"{reason or 'DriveError'}: {message or status} | Status code: {status}")
+        self.status = status
+        self.reason = reason
+        self.message = message
+        # Ответ с заголовками (Retry-After учитывается RequestScheduler)
+        self.response = response
+
+
+class DriveNotFoundError(DriveError):
+    """Ресурс не найден."""
+
+
+class DriveUnauthorizedError(DriveError):
+    """Токен недействителен или истек."""
+
+
+class DriveServerError(DriveError):
+    """Временная ошибка Drive (5xx), запрос можно повторить."""
+
+
+class DriveRateLimitError(DriveServerError):
+    """Превышен лимит запросов (429 или 403 rateLimitExceeded)."""
+
+
+class DrivePathExistsError(DriveError):
+    """Ресурс по пути уже существует."""
+
+
+def create_drive_scheduler(
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> RequestScheduler:
+    """
+    Планировщик запросов для Google Drive: повторяются сетевые ошибки, 5xx и превышение лимита.
+    """
+    return RequestScheduler(
+        rate=rate,
+        burst=burst,
+        policy=policy,
+        retriable_errors=(httpx.TransportError, DriveServerError),
+        throttle_errors=(DriveRateLimitError,),
+    )
+
+
+def drive_error(status: int, body: bytes, response: Any = None) -> DriveError:
+    """Создает исключение по статусу и JSON-телу ответа Drive."""
+    reason = message = ""
+    try:
+        error = json.loads(body or b"{}").get("error") or {}
+        if isinstance(error, dict):
+            message = error.get("message") or ""
+            errors = error.get("errors") or []
+            reason = (errors[0].get("reason") if errors else "") or error.get("status") or ""
+        else:
+            reason = str(error)
+    except (ValueError, AttributeError):
+        message = body[:200].decode("utf-8", "replace") if body else ""
+    if status == 401:
+        return DriveUnauthorizedError(status, reason, message, response)
+    if status == 404:
+        return DriveNotFoundError(status, reason, message, response)
+    if status == 429 or (status == 403 and reason in ("rateLimitExceeded", "userRateLimitExceeded")):
+        return DriveRateLimitError(status, reason, message, response)
+    if status >= 500:
+        return DriveServerError(status, reason, message, response)
+    return DriveError(status, reason, message, response)
+
+
+def escape_query(value: str) -> str:
+    """Экранирует строку для языка запросов Drive (q)."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def fields_param(fields: Sequence[str], listing: bool = False) -> str:
+    """
+    Проекция полей ответа (параметр fields).
+
+    Args:
+        fields: Поля ресурса; обязательные поля добавляются автоматически
+        listing: Проекция для files.list (с маркером следующей страницы)
+    """
+    selected = list(REQUIRED_FIELDS) + [f for f in fields if f not in REQUIRED_FIELDS]
+    joined = ",".join(selected)
+    return f"nextPageToken,files({joined})" if listing else joined
+
+
+@dataclass
+class DriveRequest:
+    """
+    Запрос к Drive API.
+
+    method: str - HTTP-метод
+    path: str - Путь с параметрами относительно адреса API (например "/drive/v3/files?q=...")
+    headers: Dict[str, str] - Заголовки
+    content: bytes - Тело запроса
+    """
+    method: str
+    path: str
+    headers: Dict[str, str]
+    content: bytes = b""
+
+
+@dataclass
+class UploadStatus:
+    """
+    Состояние возобновляемой загрузки.
+
+    committed: int - Количество байт, принятых сервером
+    resource: Optional[Dict[str, Any]] - Ресурс созданного файла, если загрузка завершена
+    """
+    committed: int
+    resource: Optional[Dict[str, Any]] = None
+
+
+def _request(method: str, path: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> DriveRequest:
+    if params:
+        path += "?" + urlencode({k: v for k, v in params.items() if v is not None})
+    headers: Dict[str, str] = {}
+    content = b""
+    if body is not None:
+        content = json.dumps(body).encode("utf-8")
+        headers["content-type"] = "application/json; charset=UTF-8"
+    return DriveRequest(method, path, headers, content)
+
+
+def about_request() -> DriveRequest:
+    return _request("GET", "/drive/v3/about", {"fields": "user"})
+
+
+def list_request(
+    query: str,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    page_size: int = 1000,
+    page_token: Optional[str] = None,
+) -> DriveRequest:
+    return _request("GET", "/drive/v3/files", {
+        "q": query,
+        "fields": fields_param(fields, listing=True),
+        "pageSize": page_size,
+        "pageToken": page_token,
+        "spaces": "drive",
+    })
+
+
+def children_query(parent_id: str, name: Optional[str] = None, folders_only: bool = False) -> str:
+    """Запрос содержимого папки (или ресурса с именем name в ней), без удаленных в корзину."""
+    query = f"'{escape_query(parent_id)}' in parents and trashed = false"
+    if name is not None:
+        query += f" and name = '{escape_query(name)}'"
+    if folders_only:
+        query += f" and mimeType = '{FOLDER_MIME_TYPE}'"
+    return query
+
+
+def get_request(file_id: str, fields: Sequence[str] = DEFAULT_FIELDS) -> DriveRequest:
+    return _request("GET", f"/drive/v3/files/{quote(file_id, safe='')}", {"fields": fields_param(fields)})
+
+
+def create_folder_request(name: str, parent_id: str) -> DriveRequest:
+    return _request(
+        "POST", "/drive/v3/files", {"fields": fields_param(DEFAULT_FIELDS)},
+        {"name": name, "mimeType": FOLDER_MIME_TYPE, "parents": [parent_id]},
+    )
+
+
+def delete_request(file_id: str) -> DriveRequest:
+    return _request("DELETE", f"/drive/v3/files/{quote(file_id, safe='')}")
+
+
+def trash_request(file_id: str) -> DriveRequest:
+    return _request("PATCH", f"/drive/v3/files/{quote(file_id, safe='')}", {"fields": "id"}, {"trashed": True})
+
+
+def copy_request(file_id: str, name: str, parent_id: str) -> DriveRequest:
+    """Копия файла (files.copy); папки Drive не копирует."""
+    return _request(
+        "POST", f"/drive/v3/files/{quote(file_id, safe='')}/copy", {"fields": fields_param(DEFAULT_FIELDS)},
+        {"name": name, "parents": [parent_id]},
+    )
+
+
+def move_request(
+    file_id: str, name: str, parent_id: Optional[str] = None, old_parent_id: Optional[str] = None
+) -> DriveRequest:
+    """Переименование и перенос ресурса в другую папку (files.update с addParents/removeParents)."""
+    return _request(
+        "PATCH", f"/drive/v3/files/{quote(file_id, safe='')}",
+        {"addParents": parent_id, "removeParents": old_parent_id, "fields": fields_param(DEFAULT_FIELDS)},
+        {"name": name},
+    )
+
+
+def download_request(file_id: str, start: Optional[int] = None, end: Optional[int] = None) -> DriveRequest:
+    request = _request("GET", f"/drive/v3/files/{quote(file_id, safe='')}", {"alt": "media"})
+    if start or end is not None:
+        request.headers["range"] = f"bytes={start or 0}-{'' if end is None else end}"
+    return request
+
+
+def _upload_target(name: str, parent_id: str, file_id: Optional[str]) -> Tuple[str, str, Dict[str, Any]]:
+    # Новый файл создается POST, содержимое существующего заменяется PATCH
+    if file_id:
+        return "PATCH", f"/upload/drive/v3/files/{quote(file_id, safe='')}", {}
+    return "POST", "/upload/drive/v3/files", {"name": name, "parents": [parent_id]}
+
+
+def multipart_upload_request(
+    name: str, parent_id: str, data: bytes, file_id: Optional[str] = None
+) -> DriveRequest:
+    """Загрузка небольшого файла одним запросом (метаданные и содержимое)."""
+    method, path, metadata = _upload_target(name, parent_id, file_id)
+    boundary = uuid.uuid4().hex
+    content = b"".join([
+        f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode("ascii"),
+        json.dumps(metadata).encode("utf-8"),
+        f"\r\n--{boundary}\r\nContent-Type: application/octet-stream\r\n\r\n".encode("ascii"),
+        data,
+        f"\r\n--{boundary}--".encode("ascii"),
+    ])
+    request = _request(method, path, {"uploadType": "multipart", "fields": fields_param(DEFAULT_FIELDS)})
+    request.headers["content-type"] = f"multipart/related; boundary={boundary}"
+    request.content = content
+    return request
+
+
+def resumable_start_request(
+    name: str, parent_id: str, size: Optional[int], file_id: Optional[str] = None
+) -> DriveRequest:
+    """Открытие сессии возобновляемой загрузки; адрес сессии возвращается в заголовке Location."""
+    method, path, metadata = _upload_target(name, parent_id, file_id)
+    request = _request(method, path, {"uploadType": "resumable", "fields": fields_param(DEFAULT_FIELDS)}, metadata)
+    if size is not None:
+        request.headers["x-upload-content-length"] = str(size)
+    return request
+
+
+def chunk_headers(start: int, length: int, total: Optional[int]) -> Dict[str, str]:
+    """Заголовки фрагмента возобновляемой загрузки (total=None - размер еще неизвестен)."""
+    total_text = "*" if total is None else str(total)
+    if length == 0:
+        return {"content-range": f"bytes */{total_text}"}
+    return {"content-range": f"bytes {start}-{start + length - 1}/{total_text}"}
+
+
+def batch_body(requests: Sequence[DriveRequest]) -> Tuple[str, bytes]:
+    """
+    Тело пакетного запроса (multipart/mixed) из нескольких запросов к API.
+
+    Returns:
+        Граница частей и тело запроса
+    """
+    boundary = "batch_" + uuid.uuid4().hex
+    parts = []
+    for index, request in enumerate(requests):
+        lines = [f"{request.method} {request.path} HTTP/1.1"]
+        lines += [f"{name}: {value}" for name, value in request.headers.items()]
+        inner = "\r\n".join(lines).encode("utf-8") + b"\r\n\r\n" + request.content
+        parts.append(
+            f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <item{index}>\r\n\r\n".encode("ascii")
+            + inner + b"\r\n"
+        )
+    return boundary, b"".join(parts) + f"--{boundary}--\r\n".encode("ascii")
+
+
+def parse_batch(content_type: str, body: bytes, count: int) -> List[Tuple[int, bytes]]:
+    """
+    Разбирает ответ пакетного запроса.
+
+    Returns:
+        Пары (HTTP-статус, тело) в порядке запросов
+    """
+    boundary = ""
+    for param in content_type.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "boundary":
+            boundary = value.strip('"')
+    if not boundary:
+        raise DriveError(500, "badBatchResponse", "В ответе нет границы частей")
+    results: List[Optional[Tuple[int, bytes]]] = [None] * count
+    for position, part in enumerate(body.split(b"--" + boundary.encode("ascii"))[1:]):
+        if part.startswith(b"--"):
+            break
+        outer_headers, _, inner = part.lstrip(b"\r\n").partition(b"\r\n\r\n")
+        index = position
+        for line in outer_headers.split(b"\r\n"):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-id":
+                # <response-item3>
+                digits = "".join(ch for ch in value if ch.isdigit())
+                if digits:
+                    index = int(digits)
+        head, _, payload = inner.partition(b"\r\n\r\n")
+        status = int(head.split(b"\r\n", 1)[0].split()[1])
+        if 0 <= index < count:
+            results[index] = (status, payload.rstrip(b"\r\n"))
+    return [result if result is not None else (500, b"") for result in results]
+
+
+def parse_upload_status(response: Any) -> UploadStatus:
+    """Состояние загрузки по ответу на фрагмент или запрос статуса (308 или 200/201)."""
+    if response.status_code in (200, 201):
+        return UploadStatus(-1, response.json())
+    accepted = response.headers.get("range")
+    # "bytes=0-1048575" - сервер принял байты с 0 по 1048575
+    committed = int(accepted.rsplit("-", 1)[1]) + 1 if accepted else 0
+    return UploadStatus(committed)
+
+
+def _timeout(settings: TransportSettings) -> httpx.Timeout:
+    return httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout)
+
+
+class _DriveBase:
+    def __init__(self, token: str, api_url: Optional[str] = None):
+        self.api_url = (api_url or DRIVE_API_URL).rstrip("/")
+        self._auth = {"authorization": f"Bearer {token}"}
+
+    def _url(self, request: DriveRequest) -> str:
+        return self.api_url + request.path
+
+    def _batch_request(self, requests: Sequence[DriveRequest]) -> Tuple[str, Dict[str, str], bytes]:
+        boundary, body = batch_body(requests)
+        headers = dict(self._auth, **{"content-type": f"multipart/mixed; boundary={boundary}"})
+        return self.api_url + "/batch/drive/v3", headers, body
+
+    def _check_session(self, session_url: str) -> None:
+        # Адрес сессии выдает сервер; запросы к чужому хосту не отправляем
+        if urlsplit(session_url).netloc and urlsplit(session_url).netloc != urlsplit(self.api_url).netloc:
+            raise DriveError(400, "badSessionUrl", session_url)
+
+
+class DriveClient(_DriveBase):
+    """
+    Синхронный клиент Google Drive API v3 поверх httpx.
+
+    Клиент потокобезопасен: воркеры пакетных операций делят его пул соединений.
+    """
+
+    def __init__(self, token: str, api_url: Optional[str] = None, transport: Optional[TransportSettings] = None):
+        """
+        Args:
+            token: OAuth-токен доступа
+            api_url: Адрес API (по умолчанию https://www.googleapis.com)
+            transport: Настройки HTTP-транспорта
+        """
+        super().__init__(token, api_url)
+        transport = transport or TransportSettings()
+        self.http = httpx.Client(timeout=_timeout(transport), **transport.httpx_args())
+
+    def close(self) -> None:
+        self.http.close()
+
+    def send(self, request: DriveRequest) -> httpx.Response:
+        """Выполняет запрос; ответ с ошибкой превращается в DriveError."""
+        response = self.http.request(
+            request.method, self._url(request), headers=dict(self._auth, **request.headers), content=request.content
+        )
+        if response.status_code >= 400:
+            raise drive_error(response.status_code, response.content, response)
+        return response
+
+    def json(self, request: DriveRequest) -> Dict[str, Any]:
+        response = self.send(request)
+        return response.json() if response.content else {}
+
+    def batch(self, requests: Sequence[DriveRequest]) -> List[Tuple[int, bytes]]:
+        """
+        Выполняет до 100 запросов одним HTTP-запросом.
+
+        Returns:
+            Пары (HTTP-статус, тело) в порядке запросов
+        """
+        url, headers, body = self._batch_request(requests)
+        response = self.http.post(url, headers=headers, content=body)
+        if response.status_code >= 400:
+            raise drive_error(response.status_code, response.content, response)
+        return parse_batch(response.headers.get("content-type", ""), response.content, len(requests))
+
+    def start_upload(self, request: DriveRequest) -> str:
+        """Открывает сессию возобновляемой загрузки и возвращает ее адрес."""
+        session_url = self.send(request).headers.get("location")
+        if not session_url:
+            raise DriveError(500, "noSessionUrl", "Сервер не вернул адрес сессии загрузки")
+        self._check_session(session_url)
+        return session_url
+
+    def upload_chunk(self, session_url: str, start: int, data: bytes, total: Optional[int]) -> UploadStatus:
+        """Отправляет фрагмент (пустой фрагмент - запрос состояния загрузки)."""
+        response = self.http.put(
+            session_url, headers=dict(self._auth, **chunk_headers(start, len(data), total)), content=data
+        )
+        if response.status_code not in (200, 201, 308):
+            raise drive_error(response.status_code, response.content, response)
+        return parse_upload_status(response)
+
+    def download(self, request: DriveRequest, write: Callable[[bytes], Any]) -> int:
+        """Скачивает содержимое файла потоком; возвращает количество байт."""
+        with self.http.stream(
+            request.method, self._url(request), headers=dict(self._auth, **request.headers)
+        ) as response:
+            if response.status_code >= 400:
+                raise drive_error(response.status_code, response.read(), response)
+            received = 0
+            for chunk in response.iter_bytes():
+                write(chunk)
+                received += len(chunk)
+            return received
+
+
+class AsyncDriveClient(_DriveBase):
+    """Асинхронный клиент Google Drive API v3 поверх httpx.AsyncClient."""
+
+    def __init__(self, token: str, api_url: Optional[str] = None, transport: Optional[TransportSettings] = None):
+        super().__init__(token, api_url)
+        transport = transport or TransportSettings()
+        self.http = httpx.AsyncClient(timeout=_timeout(transport), **transport.httpx_args())
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+    async def send(self, request: DriveRequest) -> httpx.Response:
+        response = await self.http.request(
+            request.method, self._url(request), headers=dict(self._auth, **request.headers), content=request.content
+        )
+        if response.status_code >= 400:
+            raise drive_error(response.status_code, response.content, response)
+        return response
+
+    async def json(self, request: DriveRequest) -> Dict[str, Any]:
+        response = await self.send(request)
+        return response.json() if response.content else {}
+
+    async def batch(self, requests: Sequence[DriveRequest]) -> List[Tuple[int, bytes]]:
+        url, headers, body = self._batch_request(requests)
+        response = await self.http.post(url, headers=headers, content=body)
+        if response.status_code >= 400:
+            raise drive_error(response.status_code, response.content, response)
+        return parse_batch(response.headers.get("content-type", ""), response.content, len(requests))
+
+    async def start_upload(self, request: DriveRequest) -> str:
+        session_url = (await self.send(request)).headers.get("location")
+        if not session_url:
+            raise DriveError(500, "noSessionUrl", "Сервер не вернул адрес сессии загрузки")
+        self._check_session(session_url)
+        return session_url
+
+    async def upload_chunk(self, session_url: str, start: int, data: bytes, total: Optional[int]) -> UploadStatus:
+        response = await self.http.put(
+            session_url, headers=dict(self._auth, **chunk_headers(start, len(data), total)), content=data
+        )
+        if response.status_code not in (200, 201, 308):
+            raise drive_error(response.status_code, response.content, response)
+        return parse_upload_status(response)
+
+    async def download(self, request: DriveRequest, write: Callable[[bytes], Any]) -> int:
+        async with self.http.stream(
+            request.method, self._url(request), headers=dict(self._auth, **request.headers)
+        ) as response:
+            if response.status_code >= 400:
+                raise drive_error(response.status_code, await response.aread(), response)
+            received = 0
+            async for chunk in response.aiter_bytes():
+                # Приемник может быть асинхронным (aiofiles и т.п.)
+                result = write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+                received += len(chunk)
+            return received
+
+
+def resource_from_drive(item: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """
+    Преобразует ресурс Drive в словарь источника.
+
+    Returns:
+        Словарь с ключами name, path, type, size, md5, modified и id
+    """
+    size = item.get("size")
+    return {
+        "name": item.get("name"),
+        "path": path,
+        "type": "dir" if item.get("mimeType") == FOLDER_MIME_TYPE else "file",
+        "size": int(size) if size is not None else None,
+        "md5": item.get("md5Checksum"),
+        "modified": item.get("modifiedTime"),
+        "id": item.get("id"),
+    }
+
+
+def batch_payload(status: int, body: bytes) -> Union[Dict[str, Any], DriveError]:
+    """Результат одного запроса пакета: JSON-ответ или исключение."""
+    if status >= 400:
+        return drive_error(status, body)
+    return json.loads(body) if body.strip() else {}
@@ -1,28 +1,888 @@
+import contextvars
+import io
+import logging
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from .base_source import BaseSource
+from .gdrive_client import (
+    DEFAULT_FIELDS, MAX_BATCH_SIZE, UPLOAD_CHUNK_ALIGNMENT, DriveClient, DriveError, DriveNotFoundError,
+    DrivePathExistsError, DriveRequest, DriveServerError, DriveUnauthorizedError, UploadStatus,
+    batch_payload, children_query, copy_request, create_drive_scheduler, create_folder_request, delete_request,
+    download_request, get_request, list_request, move_request, multipart_upload_request, resource_from_drive,
+    resumable_start_request, trash_request,
+)
+from .path_id_cache import PathIdCache
+from .path_utils import is_subpath, join_path, normalize_path, parent_path
+from .request_scheduler import RequestScheduler
+from .source_type import SourceType
+from .streaming import BYTES_LIKE, UploadData, is_local_path, chain_parts, iter_parts, read_part, upload_position
+from .transfer import TransferResult
+from .transport import TransportSettings
+from ..metrics.events import add_bytes, instrumented, record_error
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def aligned_chunk_size(chunk_size: int) -> int:
+    """Размер фрагмента возобновляемой загрузки, округленный вверх до кратного 256 КиБ."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+    return -(-chunk_size // UPLOAD_CHUNK_ALIGNMENT) * UPLOAD_CHUNK_ALIGNMENT
+
+
+def path_prefixes(path: str) -> List[str]:
+    """Все предки пути и сам путь сверху вниз, без корня: "/a/b" -> ["/a", "/a/b"]."""
+    parts = [part for part in normalize_path(path).split("/") if part]
+    return ["/" + "/".join(parts[:depth]) for depth in range(1, len(parts) + 1)]
 
 
-class FileSource(BaseSource):
+class GoogleDriveSource(BaseSource):
     """
-        Источник локального видео-файла.
-        Выполняет только:
-        * нормализацию пути;
-        * проверку существования;
-        * возврат URI.
-        Декодированием занимается Decoder.
+    Класс для работы с Google Drive (API v3).
+
+    Drive адресует ресурсы по идентификаторам, поэтому пути разрешаются
+    по сегментам. Разрешенные пути хранятся в PathIdCache, а сегменты
+    нескольких путей одного уровня и листинги нескольких папок
+    запрашиваются одним пакетным запросом (до 100 запросов в пакете).
+    Большие файлы загружаются возобновляемой загрузкой по фрагментам:
+    после сетевой ошибки загрузка продолжается с последнего принятого
+    сервером байта, а не с начала.
     """
 
-    def __init__(self, path: Union[str, Path]):
+    def __init__(
+        self,
+        token: str,
+        api_url: Optional[str] = None,
+        root_id: str = "root",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        id_cache_ttl: float = 300.0,
+        id_cache_max_entries: int = 10000,
+        transport: Optional[TransportSettings] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        """
+        Инициализация клиента Google Drive.
+
+        Args:
+            token: OAuth-токен доступа Google Drive
+            api_url: Адрес API (по умолчанию https://www.googleapis.com)
+            root_id: Идентификатор папки, которая считается корнем "/"
+            chunk_size: Размер фрагмента возобновляемой загрузки (округляется до кратного 256 КиБ);
+                файлы меньше одного фрагмента загружаются одним запросом
+            id_cache_ttl: Время жизни записей кэша путь -> идентификатор, сек (0 - без кэша)
+            id_cache_max_entries: Максимальное количество путей в кэше
+            transport: Настройки HTTP-транспорта
+            scheduler: Планировщик запросов (ограничение частоты и повторы)
+        """
+        super().__init__(token, source_type=SourceType.GOOGLE_DRIVE)
+        self.client = DriveClient(token, api_url, transport)
+        self.scheduler = scheduler or create_drive_scheduler()
+        self.root_id = root_id
+        self.chunk_size = aligned_chunk_size(chunk_size)
+        self.path_ids = PathIdCache(ttl=id_cache_ttl, max_entries=id_cache_max_entries)
+        # Папки создаются под блокировкой, иначе параллельные загрузки создадут дубликаты
+        self._folder_lock = threading.Lock()
+
+    @property
+    def _root(self) -> Dict[str, Any]:
+        return {"id": self.root_id, "name": "", "path": "/", "type": "dir"}
+
+    @instrumented("connect", path_arg=None)
+    def connect(self) -> bool:
+        """Подключение к Google Drive."""
+        if self.check_connection():
+            self.is_connected = True
+            logger.debug("Успешно подключено к Google Drive")
+            return True
+        record_error("Не удалось подключиться к Google Drive")
+        return False
+
+    @instrumented("check_connection", path_arg=None)
+    def check_connection(self) -> bool:
+        """Проверка подключения к Google Drive."""
+        try:
+            self.scheduler.call(self.client.json, get_request(self.root_id, ("id",)), operation="check_token")
+            return True
+        except DriveUnauthorizedError:
+            record_error("Неверный токен Google Drive")
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    def iter_files(
+        self,
+        path: str = "/",
+        recursive: bool = False,
+        page_size: int = 1000,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        folders_only: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Постраничный обход содержимого папки.
+
+        Запрашиваются только поля fields (id, name и mimeType добавляются
+        всегда). При рекурсивном обходе страницы листингов папок одного
+        уровня запрашиваются пакетами, поэтому количество HTTP-запросов
+        определяется количеством страниц, деленным на 100, а не количеством папок.
+
+        Args:
+            path: Путь к папке
+            recursive: Обойти все вложенные папки
+            page_size: Количество ресурсов на страницу (не больше 1000)
+            fields: Поля ресурсов Drive (проекция ответа)
+            folders_only: Только папки (фильтр на стороне сервера)
+
+        Yields:
+            Словари с ключами name, path, type, size, md5, modified и id
+        """
+        folder = self._resolve(path)
+        if folder is None or folder["type"] != "dir":
+            raise DriveNotFoundError(404, "notFound", f"Папка {path} не найдена")
+        # Очередь листингов: (путь папки, id папки, маркер страницы)
+        pending: List[Tuple[str, str, Optional[str]]] = [(normalize_path(path), folder["id"], None)]
+        while pending:
+            batch, pending = pending[:MAX_BATCH_SIZE], pending[MAX_BATCH_SIZE:]
+            requests = [
+                list_request(children_query(folder_id, folders_only=folders_only), fields, page_size, token)
+                for _, folder_id, token in batch
+            ]
+            for (directory, folder_id, _), page in zip(batch, self._execute(requests)):
+                if isinstance(page, Exception):
+                    raise page
+                for item in page.get("files") or []:
+                    resource = resource_from_drive(item, join_path(directory, item.get("name") or ""))
+                    self.path_ids.put(resource["path"], resource)
+                    if recursive and resource["type"] == "dir":
+                        pending.append((resource["path"], resource["id"], None))
+                    yield resource
+                if page.get("nextPageToken"):
+                    pending.append((directory, folder_id, page["nextPageToken"]))
+
+    @instrumented("list_directories")
+    def list_directories(self, path: str = "/") -> List[str]:
+        """
+        Получение списка папок.
+
+        Args:
+            path: Путь к папке
+
+        Returns:
+            Список путей к папкам
+        """
+        try:
+            return [item["path"] for item in self.iter_files(path, fields=(), folders_only=True)]
+        except Exception as e:
+            record_error(e)
+            return []
+
+    @instrumented("search_directories", path_arg=1)
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        """
+        Поиск папок по имени.
+
+        Args:
+            name: Имя для поиска
+            path: Путь для поиска
+            max_results: Остановить поиск после стольких совпадений
+                (следующие страницы листинга не запрашиваются)
+
+        Returns:
+            Список путей к найденным папкам
+        """
+        result: List[str] = []
+        try:
+            for item in self.iter_files(path, fields=(), folders_only=True):
+                if name.lower() in item["name"].lower():
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        break
+        except Exception as e:
+            record_error(e)
+        return result
+
+    @instrumented("list_files")
+    def list_files(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        strict: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получение списка файлов с метаданными.
+
+        Args:
+            path: Путь к папке
+            recursive: Включить файлы всех вложенных папок
+            fields: Поля ресурсов Drive (проекция ответа)
+            strict: Пробрасывать ошибку листинга вместо пустого списка
+                (отсутствующая папка path считается пустой)
+
+        Returns:
+            Список файлов в виде словарей с ключами name, path, type, size, md5, modified и id
+        """
+        try:
+            if strict and self._resolve(path) is None:
+                return []
+            return [item for item in self.iter_files(path, recursive, fields=fields) if item["type"] == "file"]
+        except Exception as e:
+            if strict:
+                raise
+            record_error(e)
+            return []
+
+    @instrumented("get_metadata_many", path_arg=None)
+    def get_metadata_many(
+        self,
+        paths: Iterable[str],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Метаданные набора ресурсов пакетными запросами.
+
+        Сегменты путей одного уровня разрешаются одним пакетным запросом,
+        уже известные пути берутся из кэша, а их метаданные запрашиваются
+        по идентификатору в том же пакете.
+
+        Args:
+            paths: Пути к ресурсам
+            fields: Поля ресурсов Drive (проекция ответа)
+
+        Returns:
+            Словарь путь -> метаданные (None, если ресурса нет)
+        """
+        return self._resolve_many(paths, fields, fresh=True)
+
+    @instrumented("remove")
+    def remove(self, remote_path: str, permanently: bool = False) -> bool:
         """
-            :param path: путь к видео-файлу
+        Удаление файла или папки.
+
+        Args:
+            remote_path: Путь к ресурсу
+            permanently: Удалить безвозвратно, минуя корзину
+
+        Returns:
+            True если удаление успешно, иначе False
         """
-        self._path: Path = Path(path).expanduser().resolve()
+        try:
+            item = self._resolve(remote_path, fresh=True)
+            if item is None or normalize_path(remote_path) == "/":
+                record_error(f"Ресурс {remote_path} не найден")
+                return False
+            request = delete_request(item["id"]) if permanently else trash_request(item["id"])
+            self.scheduler.call(self.client.send, request, operation="remove")
+            self.path_ids.invalidate_tree(remote_path)
+            logger.debug(f"Ресурс {remote_path} удален")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Копирование файла или папки на стороне Google Drive (files.copy).
+
+        Drive копирует только файлы, поэтому структура папки воссоздается
+        сверху вниз, а файлы копируются пакетными запросами.
+
+        Args:
+            src_path: Путь к исходному ресурсу
+            dst_path: Путь назначения
+            overwrite: Заменить существующий ресурс (он перемещается в корзину)
+
+        Returns:
+            True если копирование успешно, иначе False
+        """
+        try:
+            item, name, parent_id = self._prepare_target(src_path, dst_path, overwrite)
+            dst_path = normalize_path(dst_path)
+            if item["type"] == "file":
+                created = self.scheduler.call(
+                    self.client.json, copy_request(item["id"], name, parent_id), operation="copy"
+                )
+                self.path_ids.put(dst_path, resource_from_drive(created, dst_path))
+            else:
+                self._copy_folder(normalize_path(src_path), dst_path, name, parent_id)
+            logger.debug(f"Ресурс {src_path} скопирован в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Перемещение (переименование) файла или папки на стороне Google Drive.
+
+        Ресурс сохраняет идентификатор: меняются имя и родительская папка
+        (addParents/removeParents).
+
+        Args:
+            src_path: Путь к исходному ресурсу
+            dst_path: Путь назначения
+            overwrite: Заменить существующий ресурс (он перемещается в корзину)
+
+        Returns:
+            True если перемещение успешно, иначе False
+        """
+        try:
+            item, name, parent_id = self._prepare_target(src_path, dst_path, overwrite)
+            old_parent_id = self._resolve(parent_path(src_path))["id"]
+            moved = parent_id != old_parent_id
+            request = move_request(
+                item["id"], name, parent_id if moved else None, old_parent_id if moved else None
+            )
+            updated = self.scheduler.call(self.client.json, request, operation="move")
+            self.path_ids.invalidate_tree(src_path)
+            self.path_ids.invalidate_tree(dst_path)
+            self.path_ids.put(normalize_path(dst_path), resource_from_drive(updated, normalize_path(dst_path)))
+            logger.debug(f"Ресурс {src_path} перемещен в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_file")
+    def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
+        """
+        Скачивание файла с Google Drive.
+
+        Args:
+            remote_path: Путь к файлу
+            local_path: Локальный путь для сохранения
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        try:
+            local_path = Path(local_path)
+            self._download(remote_path, local_path)
+            logger.debug(f"Файл {remote_path} скачан в {local_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_fileobj")
+    def download_fileobj(self, remote_path: str, file_obj: BinaryIO) -> bool:
+        """
+        Скачивание файла в file-like объект без записи на диск.
+
+        Args:
+            remote_path: Путь к файлу
+            file_obj: Объект с методом write, например io.BytesIO или открытый файл
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        start = upload_position(file_obj)
+
+        def _attempt(file_id: str) -> int:
+            if start is not None:
+                # Повтор пишет данные заново с исходной позиции
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            return self.client.download(download_request(file_id), file_obj.write)
+
+        try:
+            add_bytes(self._with_file_id(
+                remote_path,
+                lambda file_id: self.scheduler.call(
+                    _attempt, file_id, operation="download", retries=None if start is not None else 0
+                ),
+            ))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("read_range")
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части файла Range-запросом без скачивания всего файла.
+
+        Args:
+            remote_path: Путь к файлу
+            start: Смещение первого байта
+            length: Количество байт
+
+        Returns:
+            Прочитанные байты
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        def _attempt(file_id: str) -> bytes:
+            buffer = io.BytesIO()
+            self.client.download(download_request(file_id, start, start + length - 1), buffer.write)
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} файла {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        data = self._with_file_id(
+            remote_path, lambda file_id: self.scheduler.call(_attempt, file_id, operation="download")
+        )
+        add_bytes(len(data))
+        return data
+
+    @instrumented("upload_file", path_arg=1)
+    def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Загрузка файла на Google Drive.
+
+        Файлы меньше chunk_size загружаются одним запросом, остальные -
+        возобновляемой загрузкой по фрагментам chunk_size. Недостающие
+        папки создаются. При overwrite=True заменяется содержимое
+        существующего файла (идентификатор файла сохраняется).
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект или итератор фрагментов
+            remote_path: Путь на Google Drive
+            overwrite: Перезаписать существующий файл
+
+        Returns:
+            True если загрузка успешна, иначе False
+        """
+        try:
+            if is_local_path(local_path):
+                local_path = Path(local_path)
+                if not local_path.exists():
+                    record_error(f"Локальный файл не найден: {local_path}")
+                    return False
+            self._upload(local_path, remote_path, overwrite)
+            if isinstance(local_path, Path):
+                logger.debug(f"Файл {local_path} загружен в {remote_path}")
+            else:
+                logger.debug(f"Данные загружены в {remote_path}")
+            return True
+        except DrivePathExistsError:
+            record_error(f"Файл {remote_path} уже существует")
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_many", path_arg=None)
+    def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора файлов в пуле потоков.
+
+        Идентификаторы файлов разрешаются заранее пакетными запросами.
+
+        Args:
+            items: Пары (путь на Google Drive, локальный путь)
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        items = list(items)
+        try:
+            self._resolve_many([remote_path for remote_path, _ in items])
+        except Exception as e:
+            record_error(e)
+
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                self._download(remote_path, local_path)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    @instrumented("upload_many", path_arg=None)
+    def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов в пуле потоков.
+
+        Args:
+            items: Пары (путь на Google Drive, локальный путь)
+            max_workers: Количество потоков-воркеров
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                self._upload(local_path, remote_path, overwrite)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    def disconnect(self):
+        """Отключение от Google Drive и закрытие пула соединений."""
+        if self.client:
+            self.client.close()
+        super().disconnect()
+
+    @staticmethod
+    def _run_in_pool(worker, items, max_workers: int) -> List[TransferResult]:
+        if max_workers <= 0:
+            raise ValueError("max_workers должен быть положительным")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Контекст копируется, чтобы события воркеров учитывались в объемлющей операции
+            futures = [executor.submit(contextvars.copy_context().run, worker, item) for item in items]
+            return [future.result() for future in futures]
+
+    def _execute(self, requests: Sequence[DriveRequest]) -> List[Union[Dict[str, Any], DriveError]]:
+        """
+        Выполняет запросы пакетами по 100.
+
+        Запросы пакета, завершившиеся временной ошибкой, повторяются
+        следующим пакетом с задержкой из политики повторов.
+
+        Returns:
+            JSON-ответы или исключения DriveError в порядке requests
+        """
+        results: List[Any] = [None] * len(requests)
+        if len(requests) == 1:
+            # Одиночный запрос дешевле отправить без обертки пакета
+            try:
+                results[0] = self.scheduler.call(self.client.json, requests[0], operation="get_meta")
+            except DriveError as e:
+                results[0] = e
+            return results
+        pending = list(range(len(requests)))
+        budget = self.scheduler.policy.budget("batch")
+        attempt = 0
+        while pending:
+            retry = []
+            for offset in range(0, len(pending), MAX_BATCH_SIZE):
+                indexes = pending[offset:offset + MAX_BATCH_SIZE]
+                responses = self.scheduler.call(
+                    self.client.batch, [requests[i] for i in indexes], operation="batch"
+                )
+                for index, (status, body) in zip(indexes, responses):
+                    results[index] = batch_payload(status, body)
+                    if isinstance(results[index], DriveServerError) and attempt < budget:
+                        retry.append(index)
+            pending = retry
+            if pending:
+                attempt += 1
+                time.sleep(self.scheduler.policy.backoff(attempt))
+        return results
+
+    def _resolve(self, path: str, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Ресурс по пути (None, если его нет)."""
+        return self._resolve_many([path], fresh=fresh)[normalize_path(path)]
+
+    def _resolve_many(
+        self,
+        paths: Iterable[str],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        fresh: bool = False,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Разрешает пути в ресурсы по уровням: все неизвестные сегменты одного
+        уровня запрашиваются одним пакетом.
+
+        Args:
+            paths: Пути к ресурсам
+            fields: Поля ресурсов Drive для конечных ресурсов
+            fresh: Запросить метаданные конечных ресурсов, даже если путь есть в кэше
+
+        Returns:
+            Словарь нормализованный путь -> ресурс или None
+        """
+        targets = {normalize_path(path) for path in paths}
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {"/": self._root}
+        levels: Dict[int, set] = {}
+        for target in targets:
+            for depth, prefix in enumerate(path_prefixes(target), 1):
+                levels.setdefault(depth, set()).add(prefix)
+        for depth in sorted(levels):
+            lookups: List[Tuple[str, DriveRequest]] = []
+            for path in sorted(levels[depth]):
+                parent = resolved.get(parent_path(path))
+                if parent is None or parent["type"] != "dir":
+                    resolved[path] = None
+                    continue
+                cached = self.path_ids.get(path)
+                if cached is not None and not (fresh and path in targets):
+                    resolved[path] = cached
+                elif cached is not None:
+                    lookups.append((path, get_request(cached["id"], fields)))
+                else:
+                    name = path.rsplit("/", 1)[-1]
+                    lookups.append((path, list_request(children_query(parent["id"], name), fields, page_size=10)))
+            for (path, request), value in zip(lookups, self._execute([request for _, request in lookups])):
+                resolved[path] = self._store_lookup(path, value)
+        if fresh and "/" in targets:
+            value = self._execute([get_request(self.root_id, fields)])[0]
+            resolved["/"] = self._store_lookup("/", value)
+        return {target: resolved.get(target) for target in targets}
+
+    def _store_lookup(self, path: str, value: Union[Dict[str, Any], DriveError]) -> Optional[Dict[str, Any]]:
+        if isinstance(value, DriveNotFoundError):
+            self.path_ids.invalidate_tree(path)
+            return None
+        if isinstance(value, Exception):
+            raise value
+        files = value.get("files") if "files" in value else [value]
+        if not files:
+            return None
+        # Drive допускает одинаковые имена в папке; берется первый ресурс
+        resource = resource_from_drive(files[0], path)
+        if path != "/":
+            self.path_ids.put(path, resource)
+        return resource
+
+    def _with_file_id(self, remote_path: str, func) -> Any:
+        """
+        Выполняет func(file_id); если идентификатор из кэша устарел, путь
+        разрешается заново и вызов повторяется.
+        """
+        item = self._resolve(remote_path)
+        if item is None or item["type"] != "file":
+            raise DriveNotFoundError(404, "notFound", f"Файл {remote_path} не найден")
+        try:
+            return func(item["id"])
+        except DriveNotFoundError:
+            self.path_ids.invalidate_tree(remote_path)
+            item = self._resolve(remote_path)
+            if item is None or item["type"] != "file":
+                raise
+            return func(item["id"])
+
+    def _prepare_target(self, src_path: str, dst_path: str, overwrite: bool) -> Tuple[Dict[str, Any], str, str]:
+        """
+        Проверяет исходный ресурс и путь назначения для копирования и перемещения.
+
+        Существующий ресурс назначения перемещается в корзину (overwrite=True),
+        недостающие папки назначения создаются.
+
+        Returns:
+            Исходный ресурс, имя и идентификатор родительской папки назначения
+        """
+        src_path, dst_path = normalize_path(src_path), normalize_path(dst_path)
+        if is_subpath(dst_path, src_path):
+            raise ValueError(f"Путь назначения {dst_path} находится внутри {src_path}")
+        item = self._resolve(src_path, fresh=True)
+        if item is None or src_path == "/":
+            raise DriveNotFoundError(404, "notFound", f"Ресурс {src_path} не найден")
+        existing = self._resolve(dst_path, fresh=True)
+        if existing is not None:
+            if not overwrite:
+                raise DrivePathExistsError(409, "alreadyExists", f"{dst_path} уже существует")
+            self.scheduler.call(self.client.send, trash_request(existing["id"]), operation="remove")
+            self.path_ids.invalidate_tree(dst_path)
+        return item, dst_path.rsplit("/", 1)[-1], self._ensure_folder(parent_path(dst_path))
+
+    def _copy_folder(self, src_path: str, dst_path: str, name: str, parent_id: str) -> None:
+        """Воссоздает папку src_path в dst_path: папки создаются по одной, файлы копируются пакетами."""
+        created = self.scheduler.call(self.client.json, create_folder_request(name, parent_id), operation="mkdir")
+        self.path_ids.put(dst_path, resource_from_drive(created, dst_path))
+        folder_ids = {src_path: created["id"]}
+        copies: List[Tuple[str, DriveRequest]] = []
+        # Обход идет в ширину, поэтому папка создается раньше своего содержимого
+        for item in self.iter_files(src_path, recursive=True, fields=()):
+            target = join_path(dst_path, item["path"][len(src_path):].lstrip("/"))
+            target_parent = folder_ids[parent_path(item["path"])]
+            if item["type"] == "dir":
+                created = self.scheduler.call(
+                    self.client.json, create_folder_request(item["name"], target_parent), operation="mkdir"
+                )
+                folder_ids[item["path"]] = created["id"]
+                self.path_ids.put(target, resource_from_drive(created, target))
+            else:
+                copies.append((target, copy_request(item["id"], item["name"], target_parent)))
+        for (target, _), result in zip(copies, self._execute([request for _, request in copies])):
+            if isinstance(result, Exception):
+                raise result
+            self.path_ids.put(target, resource_from_drive(result, target))
+
+    def _ensure_folder(self, path: str) -> str:
+        """
+        Возвращает идентификатор папки, создавая недостающие папки сверху вниз.
+        """
+        path = normalize_path(path)
+        if path == "/":
+            return self.root_id
+        with self._folder_lock:
+            resolved = self._resolve_many(path_prefixes(path))
+            parent_id = self.root_id
+            for prefix in path_prefixes(path):
+                item = resolved.get(prefix)
+                if item is None:
+                    created = self.scheduler.call(
+                        self.client.json, create_folder_request(prefix.rsplit("/", 1)[-1], parent_id),
+                        operation="mkdir",
+                    )
+                    item = resource_from_drive(created, prefix)
+                    self.path_ids.put(prefix, item)
+                elif item["type"] != "dir":
+                    raise DriveError(409, "notAFolder", f"{prefix} не является папкой")
+                parent_id = item["id"]
+            return parent_id
+
+    @instrumented("download", path_arg=0)
+    def _download(self, remote_path: str, local_path: Path) -> None:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(local_path.name + ".download")
+
+        def _attempt(file_id: str) -> int:
+            with open(tmp_path, "wb") as f:
+                return self.client.download(download_request(file_id), f.write)
+
+        try:
+            size = self._with_file_id(
+                remote_path, lambda file_id: self.scheduler.call(_attempt, file_id, operation="download")
+            )
+            os.replace(tmp_path, local_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        add_bytes(size)
+
+    @instrumented("upload", path_arg=1)
+    def _upload(self, source: Union[Path, UploadData], remote_path: str, overwrite: bool = False) -> None:
+        remote_path = normalize_path(remote_path)
+        name = remote_path.rsplit("/", 1)[-1]
+        parent_id = self._ensure_folder(parent_path(remote_path))
+        existing = self._resolve(remote_path, fresh=True)
+        if existing is not None:
+            if not overwrite or existing["type"] != "file":
+                raise DrivePathExistsError(409, "alreadyExists", f"{remote_path} уже существует")
+        file_id = existing["id"] if existing is not None else None
+
+        if isinstance(source, Path):
+            size: Optional[int] = source.stat().st_size
+        elif isinstance(source, BYTES_LIKE):
+            source = memoryview(source).cast("B")
+            size = len(source)
+        else:
+            size = None
+
+        chunks: Optional[Iterator[bytes]] = None
+        if size is None:
+            # Поток короче одного фрагмента отправляется одним запросом
+            parts = iter_parts(source, self.chunk_size)
+            first = next(parts, b"")
+            second = next(parts, None)
+            if second is None:
+                source, size = first, len(first)
+            else:
+                chunks = chain_parts([first, second], parts)
+        if chunks is None and size <= self.chunk_size:
+            data = read_part(source, 0, size)
+            created = self.scheduler.call(
+                self.client.json, multipart_upload_request(name, parent_id, data, file_id), operation="upload"
+            )
+        else:
+            if chunks is None:
+                chunks = (
+                    read_part(source, offset, min(self.chunk_size, size - offset))
+                    for offset in range(0, size, self.chunk_size)
+                )
+            session_url = self.scheduler.call(
+                self.client.start_upload, resumable_start_request(name, parent_id, size, file_id),
+                operation="upload_start",
+            )
+            created = self._send_chunks(session_url, chunks, size)
+        self.path_ids.invalidate_tree(remote_path)
+        self.path_ids.put(remote_path, resource_from_drive(created, remote_path))
+
+    def _send_chunks(self, session_url: str, chunks: Iterator[bytes], size: Optional[int]) -> Dict[str, Any]:
+        """
+        Отправляет фрагменты возобновляемой загрузки.
+
+        Фрагмент читается только после того, как сервер принял предыдущий,
+        поэтому в памяти находится не больше одного фрагмента.
+
+        Returns:
+            Ресурс загруженного файла
+        """
+        offset = 0
+        current = next(chunks, b"")
+        while True:
+            following = next(chunks, None)
+            # Размер потока становится известен на последнем фрагменте
+            total = size if size is not None else (offset + len(current) if following is None else None)
+            status = self._send_chunk(session_url, offset, current, total)
+            if status.resource is not None:
+                return status.resource
+            if following is None:
+                raise DriveError(500, "uploadIncomplete", "Сервер не подтвердил завершение загрузки")
+            offset += len(current)
+            current = following
+
+    def _send_chunk(self, session_url: str, offset: int, data: bytes, total: Optional[int]) -> UploadStatus:
+        """
+        Отправляет один фрагмент с повторами.
+
+        После ошибки у сервера запрашивается количество принятых байт и
+        повторно отправляется только непринятый остаток фрагмента.
+        """
+        end = offset + len(data)
+        state = {"start": offset, "query": False}
+
+        def _attempt() -> UploadStatus:
+            if state["query"]:
+                status = self.client.upload_chunk(session_url, 0, b"", total)
+                if status.resource is not None:
+                    return status
+                state["start"] = max(offset, min(status.committed, end))
+            state["query"] = True
+            start = state["start"]
+            return self.client.upload_chunk(session_url, start, data[start - offset:], total)
 
-        if not self._path.exists():
-            raise FileNotFoundError(f"Video file does not exist: {self._path}")
+        while True:
+            status = self.scheduler.call(_attempt, operation="upload")
+            if status.resource is not None or status.committed >= end:
+                add_bytes(len(data))
+                return status
+            # Сервер принял фрагмент частично - досылаем остаток
+            state["start"] = max(offset, status.committed)
+            state["query"] = False
 
-    def get_uri(self) -> str:
-        """ Возвращает абсолютный путь к файлу. """
-        return str(self._path)
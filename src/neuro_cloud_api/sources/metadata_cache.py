@@ -0,0 +1,139 @@
+import threading
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .path_utils import is_subpath, normalize_path, parent_path
+
+
+@dataclass
+class CacheStats:
+    """
+    Статистика работы кэша метаданных.
+
+    hits: int - Количество попаданий
+    misses: int - Количество промахов (включая устаревшие записи)
+    evictions: int - Количество вытесненных по LRU записей
+    size: int - Текущее количество записей
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий среди всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MetadataCache:
+    """
+    Кэш содержимого директорий с TTL и вытеснением по LRU.
+
+    Ключ - нормализованный путь директории, значение - список ресурсов
+    в виде словарей (см. resource_to_dict). Кэш потокобезопасен и может
+    использоваться как синхронными, так и асинхронными источниками.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        """
+        Args:
+            ttl: Время жизни записи в секундах (0 - кэш отключен)
+            max_entries: Максимальное количество директорий в кэше
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш."""
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Возвращает закэшированное содержимое директории.
+
+        Args:
+            path: Путь к директории
+
+        Returns:
+            Список ресурсов или None, если записи нет или она устарела
+        """
+        if not self.enabled:
+            return None
+        key = normalize_path(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, path: str, items: List[Dict[str, Any]]) -> None:
+        """
+        Сохраняет содержимое директории.
+
+        Args:
+            path: Путь к директории
+            items: Список ресурсов
+        """
+        if not self.enabled:
+            return
+        key = normalize_path(path)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, items)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        """
+        Сбрасывает записи, затронутые изменением ресурса path.
+
+        Удаляется содержимое самого path (если это директория)
+        и содержимое его родительской директории.
+
+        Args:
+            path: Путь к созданному или измененному ресурсу
+        """
+        key = normalize_path(path)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries.pop(parent_path(key), None)
+
+    def invalidate_tree(self, path: str) -> None:
+        """
+        Сбрасывает записи для path, всех вложенных директорий и родителя.
+
+        Args:
+            path: Путь к удаленному или перемещенному ресурсу
+        """
+        key = normalize_path(path)
+        with self._lock:
+            for cached in [p for p in self._entries if is_subpath(p, key)]:
+                del self._entries[cached]
+            self._entries.pop(parent_path(key), None)
+
+    def clear(self) -> None:
+        """Очищает кэш (статистика сохраняется)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Возвращает текущую статистику кэша."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
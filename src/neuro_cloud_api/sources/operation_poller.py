@@ -0,0 +1,334 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+# Статусы асинхронной операции на сервере
+IN_PROGRESS = "in-progress"
+SUCCESS = "success"
+FAILED = "failed"
+
+
+class OperationFailedError(Exception):
+    """Асинхронная операция на сервере завершилась ошибкой."""
+
+
+@dataclass(order=True)
+class _Operation:
+    due: float
+    order: int
+    link: str = field(compare=False)
+    future: Any = field(compare=False)
+    interval: float = field(compare=False)
+    deadline: Optional[float] = field(compare=False)
+
+
+class _PollSchedule:
+    """
+    Расписание опроса: операции упорядочены по времени следующего запроса статуса.
+
+    Интервал опроса операции растет от min_interval до max_interval:
+    короткие операции завершаются быстро, а долгие не расходуют
+    лимит запросов.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float):
+        if min_interval <= 0 or max_interval < min_interval or backoff < 1:
+            raise ValueError("Нужно 0 < min_interval <= max_interval и backoff >= 1")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._heap: List[_Operation] = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, link: str, future: Any, timeout: Optional[float]) -> None:
+        now = time.monotonic()
+        deadline = now + timeout if timeout is not None else None
+        heapq.heappush(
+            self._heap, _Operation(now + self.min_interval, next(self._order), link, future, self.min_interval, deadline)
+        )
+
+    def due(self, limit: int) -> List[_Operation]:
+        """Извлекает до limit операций, которые пора опросить."""
+        now = time.monotonic()
+        operations = []
+        while self._heap and self._heap[0].due <= now and len(operations) < limit:
+            operation = heapq.heappop(self._heap)
+            # Ожидание, отмененное вызывающим, больше не опрашивается
+            if not operation.future.done():
+                operations.append(operation)
+        return operations
+
+    def delay(self) -> Optional[float]:
+        """Время до следующего опроса (None - опрашивать нечего)."""
+        if not self._heap:
+            return None
+        return max(self._heap[0].due - time.monotonic(), 0.0)
+
+    def reschedule(self, operation: _Operation) -> bool:
+        """
+        Возвращает незавершенную операцию в расписание.
+
+        Returns:
+            False если срок ожидания операции истек
+        """
+        now = time.monotonic()
+        if operation.deadline is not None and now >= operation.deadline:
+            return False
+        operation.interval = min(operation.interval * self.backoff, self.max_interval)
+        operation.due = now + operation.interval
+        if operation.deadline is not None:
+            operation.due = min(operation.due, operation.deadline)
+        operation.order = next(self._order)
+        heapq.heappush(self._heap, operation)
+        return True
+
+    def drain(self) -> List[_Operation]:
+        operations, self._heap = self._heap, []
+        return operations
+
+
+def _settle(operation: _Operation, status: Any) -> bool:
+    """
+    Завершает ожидание операции по статусу или ошибке запроса статуса.
+
+    Returns:
+        False если операция еще выполняется
+    """
+    future = operation.future
+    if future.done():
+        return True
+    if isinstance(status, BaseException):
+        future.set_exception(status)
+    elif status == SUCCESS:
+        future.set_result(True)
+    elif status == FAILED:
+        future.set_exception(OperationFailedError(f"Операция {operation.link} завершилась ошибкой"))
+    elif status is None:
+        future.set_exception(TimeoutError(f"Операция {operation.link} не завершилась за отведенное время"))
+    else:
+        return False
+    return True
+
+
+class OperationPoller:
+    """
+    Опрос статусов асинхронных операций сервера одним потоком.
+
+    Копирование, перемещение и удаление больших директорий сервер
+    выполняет асинхронно и возвращает ссылку на операцию. Вместо потока,
+    ждущего каждую операцию, все операции опрашиваются одним фоновым
+    потоком: за раз запрашиваются статусы не больше max_concurrency
+    операций, интервал опроса каждой операции растет до max_interval.
+    Поток запускается при добавлении операции и завершается, когда
+    ожидающих операций не остается.
+    """
+
+    def __init__(
+        self,
+        status: Callable[[str], str],
+        max_concurrency: int = 8,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+    ):
+        """
+        Args:
+            status: Функция status(link) -> "in-progress" | "success" | "failed"
+            max_concurrency: Максимальное число одновременных запросов статуса
+            min_interval: Интервал первого опроса операции, сек
+            max_interval: Максимальный интервал опроса операции, сек
+            backoff: Множитель интервала после каждого опроса незавершенной операции
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency должен быть положительным")
+        self.status = status
+        self.max_concurrency = max_concurrency
+        self._schedule = _PollSchedule(min_interval, max_interval, backoff)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def add(self, link: str, timeout: Optional[float] = None) -> concurrent.futures.Future:
+        """
+        Ставит операцию на опрос.
+
+        Args:
+            link: Ссылка (идентификатор) операции
+            timeout: Максимальное время ожидания операции, сек (None - без ограничения)
+
+        Returns:
+            Future: True при успехе; OperationFailedError, TimeoutError или ошибка запроса статуса
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Опрос операций остановлен")
+            self._schedule.add(link, future, timeout)
+            if self._thread is None:
+                # Поток общий для всех операций, поэтому не наследует контекст
+                # (и метрики) операции, которая его запустила
+                self._thread = threading.Thread(
+                    target=contextvars.Context().run, args=(self._run,), name="operation-poller", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def wait(self, link: str, timeout: Optional[float] = None) -> None:
+        """
+        Ждет завершения операции.
+
+        Raises:
+            OperationFailedError: Если операция завершилась ошибкой
+            TimeoutError: Если операция не завершилась за timeout
+        """
+        self.add(link, timeout).result()
+
+    def pending(self) -> int:
+        """Количество операций, ожидающих завершения."""
+        with self._cond:
+            return len(self._schedule)
+
+    def close(self) -> None:
+        """Останавливает опрос; ожидающие операции получают RuntimeError."""
+        with self._cond:
+            self._closed = True
+            operations = self._schedule.drain()
+            self._cond.notify()
+        for operation in operations:
+            _settle(operation, RuntimeError(f"Опрос операции {operation.link} остановлен"))
+
+    def _run(self) -> None:
+        with concurrent.futures.ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="operation-status") as executor:
+            while True:
+                with self._cond:
+                    while True:
+                        if not self._schedule:
+                            self._thread = None
+                            return
+                        delay = self._schedule.delay()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    operations = self._schedule.due(self.max_concurrency)
+                statuses = [executor.submit(self.status, operation.link) for operation in operations]
+                for operation, status in zip(operations, statuses):
+                    self._resolve(operation, status.exception() or status.result())
+
+    def _resolve(self, operation: _Operation, status: Any) -> None:
+        if _settle(operation, status):
+            return
+        with self._cond:
+            requeued = not self._closed and self._schedule.reschedule(operation)
+        if not requeued:
+            _settle(operation, None)
+
+
+class AsyncOperationPoller:
+    """
+    Опрос статусов асинхронных операций сервера одной задачей asyncio.
+
+    Асинхронный вариант OperationPoller: задача запускается в текущем
+    цикле при добавлении операции и завершается, когда ожидающих операций
+    не остается.
+    """
+
+    def __init__(
+        self,
+        status: Callable[[str], Awaitable[str]],
+        max_concurrency: int = 8,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+    ):
+        """
+        Args:
+            status: Корутина status(link) -> "in-progress" | "success" | "failed"
+            max_concurrency: Максимальное число одновременных запросов статуса
+            min_interval: Интервал первого опроса операции, сек
+            max_interval: Максимальный интервал опроса операции, сек
+            backoff: Множитель интервала после каждого опроса незавершенной операции
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency должен быть положительным")
+        self.status = status
+        self.max_concurrency = max_concurrency
+        self._schedule = _PollSchedule(min_interval, max_interval, backoff)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def add(self, link: str, timeout: Optional[float] = None) -> asyncio.Future:
+        """
+        Ставит операцию на опрос (вызывается из цикла).
+
+        Returns:
+            asyncio.Future: True при успехе; OperationFailedError, TimeoutError или ошибка запроса статуса
+        """
+        if self._closed:
+            raise RuntimeError("Опрос операций остановлен")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._schedule.add(link, future, timeout)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            # Задача общая для всех операций и не наследует контекст вызывающего
+            self._task = contextvars.Context().run(loop.create_task, self._run())
+        self._wakeup.set()
+        return future
+
+    async def wait(self, link: str, timeout: Optional[float] = None) -> None:
+        """
+        Ждет завершения операции.
+
+        Raises:
+            OperationFailedError: Если операция завершилась ошибкой
+            TimeoutError: Если операция не завершилась за timeout
+        """
+        await self.add(link, timeout)
+
+    def pending(self) -> int:
+        """Количество операций, ожидающих завершения."""
+        return len(self._schedule)
+
+    async def close(self) -> None:
+        """Останавливает опрос; ожидающие операции получают RuntimeError."""
+        self._closed = True
+        for operation in self._schedule.drain():
+            _settle(operation, RuntimeError(f"Опрос операции {operation.link} остановлен"))
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._schedule:
+            delay = self._schedule.delay()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            operations = self._schedule.due(self.max_concurrency)
+            statuses = await asyncio.gather(
+                *(self.status(operation.link) for operation in operations), return_exceptions=True
+            )
+            for operation, status in zip(operations, statuses):
+                if not _settle(operation, status) and (self._closed or not self._schedule.reschedule(operation)):
+                    _settle(operation, None)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .metadata_cache import CacheStats
+from .path_utils import is_subpath, normalize_path
+
+
+class PathIdCache:
+    """
+    Кэш соответствия путей идентификаторам ресурсов с TTL и вытеснением по LRU.
+
+    Хранилища с адресацией по идентификаторам (Google Drive) разрешают путь
+    по одному запросу на каждый сегмент. Кэш хранит уже разрешенные пути,
+    поэтому разрешение начинается с ближайшего известного предка, а путь,
+    разрешенный целиком, не требует запросов. Кэш потокобезопасен.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000):
+        """
+        Args:
+            ttl: Время жизни записи в секундах (0 - кэш отключен)
+            max_entries: Максимальное количество путей в кэше
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш."""
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает ресурс по пути.
+
+        Args:
+            path: Путь к ресурсу
+
+        Returns:
+            Словарь ресурса (как минимум с ключами id и type) или None
+        """
+        if not self.enabled:
+            return None
+        key = normalize_path(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, path: str, item: Dict[str, Any]) -> None:
+        """
+        Сохраняет ресурс пути.
+
+        Args:
+            path: Путь к ресурсу
+            item: Словарь ресурса с ключами id и type
+        """
+        if not self.enabled:
+            return
+        key = normalize_path(path)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, item)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_tree(self, path: str) -> None:
+        """
+        Сбрасывает записи для path и всех вложенных путей.
+
+        Args:
+            path: Путь к удаленному, перемещенному или замененному ресурсу
+        """
+        key = normalize_path(path)
+        with self._lock:
+            for cached in [p for p in self._entries if is_subpath(p, key)]:
+                del self._entries[cached]
+
+    def clear(self) -> None:
+        """Очищает кэш (статистика сохраняется)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Возвращает текущую статистику кэша."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
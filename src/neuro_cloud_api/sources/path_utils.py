@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Поля словаря ресурса (см. resource_to_dict)
+RESOURCE_FIELDS = ("name", "path", "type", "size", "md5", "modified")
+
+
+def normalize_path(path: str) -> str:
+    """
+    Приводит путь в облаке к единому виду.
+
+    Убирает префикс "disk:", добавляет ведущий и убирает завершающий "/",
+    чтобы "disk:/a/b/", "/a/b" и "a/b" считались одним и тем же путем.
+
+    Args:
+        path: Путь в облачном хранилище
+
+    Returns:
+        Нормализованный путь
+    """
+    if path.startswith("disk:"):
+        path = path[len("disk:"):]
+    path = "/" + path.strip("/")
+    return path
+
+
+def parent_path(path: str) -> str:
+    """Возвращает нормализованный путь родительской директории."""
+    path = normalize_path(path)
+    if path == "/":
+        return "/"
+    return path.rsplit("/", 1)[0] or "/"
+
+
+def join_path(parent: str, name: str) -> str:
+    """Соединяет путь директории и имя ресурса."""
+    parent = normalize_path(parent)
+    return f"{parent.rstrip('/')}/{name}"
+
+
+def is_subpath(path: str, root: str) -> bool:
+    """Проверяет, что path совпадает с root или лежит внутри него."""
+    path, root = normalize_path(path), normalize_path(root)
+    return root == "/" or path == root or path.startswith(root + "/")
+
+
+def resource_to_dict(item: Any, fields: Sequence[str] = RESOURCE_FIELDS) -> Dict[str, Any]:
+    """
+    Преобразует ресурс yadisk в словарь с нужными полями.
+
+    Args:
+        item: Ресурс (ResourceObject или словарь)
+        fields: Поля словаря (по умолчанию все из RESOURCE_FIELDS)
+
+    Returns:
+        Словарь с ключами name, path, type, size, md5, modified (или fields)
+    """
+    return {field: item[field] for field in fields}
+
+
+def listing_fields(fields: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """
+    Проверяет проекцию полей листинга; поле type включается всегда.
+
+    Args:
+        fields: Поля из RESOURCE_FIELDS (None - все)
+
+    Raises:
+        ValueError: Если запрошено неизвестное поле
+    """
+    if fields is None:
+        return RESOURCE_FIELDS
+    unknown = [field for field in fields if field not in RESOURCE_FIELDS]
+    if unknown:
+        raise ValueError(f"Неизвестные поля ресурса: {unknown}. Доступные поля: {list(RESOURCE_FIELDS)}")
+    return tuple(dict.fromkeys(("type",) + tuple(fields)))
+
+
+def listing_api_fields(fields: Sequence[str]) -> List[str]:
+    """
+    Параметр fields запроса содержимого директории к REST API Яндекс.Диска:
+    в ответ попадают только нужные поля ресурсов и сведения о странице.
+    """
+    return ["type", "embedded.offset", "embedded.limit", "embedded.total"] + [
+        f"embedded.items.{field}" for field in fields
+    ]
@@ -0,0 +1,227 @@
+import importlib
+import threading
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+# Группа entry points, через которую сторонние пакеты регистрируют источники
+ENTRY_POINT_GROUP = "neuro_cloud_api.sources"
+
+# Класс, функция или ссылка на них в виде "модуль:атрибут"
+LazyObject = Union[str, Callable[..., Any]]
+
+
+def load_object(reference: LazyObject, package: Optional[str] = None) -> Any:
+    """
+    Загружает объект по ссылке "модуль:атрибут", импортируя модуль при первом обращении.
+
+    Args:
+        reference: Ссылка или уже загруженный объект (возвращается как есть)
+        package: Пакет для относительных ссылок (".yadisk_source:YadiskSource")
+
+    Returns:
+        Загруженный объект
+    """
+    if not isinstance(reference, str):
+        return reference
+    module_name, _, attribute = reference.partition(":")
+    module = importlib.import_module(module_name, package)
+    for name in attribute.split("."):
+        module = getattr(module, name)
+    return module
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """
+    Описание источника в реестре.
+
+    name: str - Имя типа источника ("yandex_disk", "s3", ...)
+    sync_source: Optional[LazyObject] - Класс синхронного источника или ссылка "модуль:Класс"
+    async_source: Optional[LazyObject] - Класс асинхронного источника или ссылка "модуль:Класс"
+    options: Optional[LazyObject] - Функция options(token, config) -> dict именованных
+        аргументов конструктора (None - передается только token)
+    package: Optional[str] - Пакет для относительных ссылок
+    """
+    name: str
+    sync_source: Optional[LazyObject] = None
+    async_source: Optional[LazyObject] = None
+    options: Optional[LazyObject] = None
+    package: Optional[str] = None
+
+
+def normalize_name(name: Any) -> str:
+    """Имя типа источника: SourceType или строка ("Yandex-Disk" -> "yandex_disk")."""
+    value = getattr(name, "value", name)
+    return str(value).lower().replace("-", "_").replace(" ", "_")
+
+
+class SourceRegistry:
+    """
+    Реестр типов источников с отложенной загрузкой реализаций.
+
+    Источник регистрируется ссылками "модуль:Класс", поэтому модуль
+    источника и его зависимости (yadisk, httpx) импортируются только при
+    создании первого экземпляра. Имена, не зарегистрированные явно,
+    ищутся среди entry points группы neuro_cloud_api.sources: объект
+    entry point - SourceSpec или функция register(registry).
+    """
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Args:
+            entry_point_group: Группа entry points (None - не искать сторонние источники)
+        """
+        self.entry_point_group = entry_point_group
+        self._specs: Dict[str, SourceSpec] = {}
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: Any,
+        sync_source: Optional[LazyObject] = None,
+        async_source: Optional[LazyObject] = None,
+        options: Optional[LazyObject] = None,
+        package: Optional[str] = None,
+        replace: bool = False,
+    ) -> SourceSpec:
+        """
+        Регистрирует тип источника.
+
+        Args:
+            name: Имя типа источника (строка или SourceType)
+            sync_source: Класс синхронного источника или ссылка "модуль:Класс"
+            async_source: Класс асинхронного источника или ссылка "модуль:Класс"
+            options: Функция options(token, config) -> dict или ссылка на нее
+            package: Пакет для относительных ссылок
+            replace: Заменить уже зарегистрированный тип
+
+        Returns:
+            SourceSpec
+
+        Raises:
+            ValueError: Если тип уже зарегистрирован и replace=False
+        """
+        spec = SourceSpec(normalize_name(name), sync_source, async_source, options, package)
+        with self._lock:
+            if spec.name in self._specs and not replace:
+                raise ValueError(f"Тип источника {spec.name} уже зарегистрирован")
+            self._specs[spec.name] = spec
+        return spec
+
+    def unregister(self, name: Any) -> None:
+        """Удаляет тип источника из реестра."""
+        with self._lock:
+            self._specs.pop(normalize_name(name), None)
+
+    def names(self) -> List[str]:
+        """Имена зарегистрированных типов, включая доступные через entry points."""
+        with self._lock:
+            return sorted(set(self._specs) | set(self._discover()))
+
+    def __contains__(self, name: Any) -> bool:
+        return normalize_name(name) in self.names()
+
+    def get(self, name: Any) -> SourceSpec:
+        """
+        Описание типа источника.
+
+        Raises:
+            ValueError: Если тип не зарегистрирован и не найден среди entry points
+        """
+        key = normalize_name(name)
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                entry_point = self._discover().get(key)
+                if entry_point is not None:
+                    spec = self._load_entry_point(key, entry_point)
+            if spec is None:
+                raise ValueError(f"Неподдерживаемый тип источника: {key}. Доступные типы: {self.names()}")
+            return spec
+
+    def source_class(self, name: Any, asynchronous: bool = False) -> type:
+        """
+        Класс источника; модуль источника импортируется при первом обращении.
+
+        Raises:
+            NotImplementedError: Если для типа нет синхронной (асинхронной) реализации
+        """
+        spec = self.get(name)
+        reference = spec.async_source if asynchronous else spec.sync_source
+        if reference is None:
+            kind = "асинхронный" if asynchronous else "синхронный"
+            raise NotImplementedError(f"{kind.capitalize()} источник {spec.name} еще не реализован")
+        return load_object(reference, spec.package)
+
+    def create(self, name: Any, token: Optional[str], config: Any = None, asynchronous: bool = False) -> Any:
+        """
+        Создает источник.
+
+        Args:
+            name: Имя типа источника
+            token: Токен авторизации
+            config: Конфигурация NeuroCloudApiConfig (может отсутствовать)
+            asynchronous: Создать асинхронный источник
+
+        Returns:
+            Экземпляр источника
+        """
+        spec = self.get(name)
+        # Параметры проверяются до импорта модуля источника
+        options = {"token": token} if spec.options is None else load_object(spec.options, spec.package)(token, config)
+        return self.source_class(spec.name, asynchronous)(**options)
+
+    def _discover(self) -> Dict[str, Any]:
+        # Поиск entry points читает метаданные всех установленных пакетов,
+        # поэтому выполняется один раз и только при обращении к незнакомому типу
+        if self._entry_points is None:
+            self._entry_points = {}
+            if self.entry_point_group:
+                from importlib.metadata import entry_points
+
+                try:
+                    found = entry_points(group=self.entry_point_group)
+                except TypeError:
+                    # Python < 3.10
+                    found = entry_points().get(self.entry_point_group, [])
+                for entry_point in found:
+                    self._entry_points.setdefault(normalize_name(entry_point.name), entry_point)
+        return {name: ep for name, ep in self._entry_points.items() if name not in self._specs}
+
+    def _load_entry_point(self, name: str, entry_point: Any) -> Optional[SourceSpec]:
+        loaded = entry_point.load()
+        if isinstance(loaded, SourceSpec):
+            self._specs[name] = SourceSpec(
+                name, loaded.sync_source, loaded.async_source, loaded.options, loaded.package
+            )
+        else:
+            loaded(self)
+        return self._specs.get(name)
+
+
+# Встроенные источники; модули импортируются при создании первого экземпляра
+source_registry = SourceRegistry()
+source_registry.register(
+    "yandex_disk",
+    ".yadisk_source:YadiskSource",
+    ".async_yadisk_source:AsyncYadiskSource",
+    options=".source_factory:SourceFactory.yadisk_options",
+    package=__package__,
+)
+source_registry.register(
+    "google_drive",
+    ".ggldisk_source:GoogleDriveSource",
+    ".async_ggldisk_source:AsyncGoogleDriveSource",
+    options=".source_factory:SourceFactory.gdrive_options",
+    package=__package__,
+)
+source_registry.register(
+    "s3",
+    ".s3_source:S3Source",
+    ".async_s3_source:AsyncS3Source",
+    options=".source_factory:SourceFactory.s3_options",
+    package=__package__,
+)
@@ -0,0 +1,283 @@
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .path_utils import normalize_path, parent_path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    path        TEXT PRIMARY KEY,
+    parent      TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    remote_path TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    size        INTEGER,
+    md5         TEXT,
+    modified    TEXT,
+    listed      INTEGER NOT NULL DEFAULT 0,
+    indexed_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_parent ON resources (parent);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (name);
+CREATE INDEX IF NOT EXISTS resources_size ON resources (size);
+"""
+
+COLUMNS = "remote_path, name, type, size, md5, modified"
+
+
+class RemoteIndex:
+    """
+    Локальный индекс дерева облачного хранилища в SQLite.
+
+    Хранит путь, тип, размер, md5 и время изменения каждого ресурса
+    и позволяет искать по имени, префиксу пути и диапазону размеров
+    без обращения к сети. Содержимое директории считается проиндексированным
+    (listed), если она хотя бы раз была полностью прочитана через apply_listing.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        """
+        Args:
+            db_path: Путь к файлу базы SQLite (":memory:" - индекс в памяти)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def apply_listing(self, path: str, items: List[Dict[str, Any]], full: bool = False) -> List[str]:
+        """
+        Обновляет индекс содержимым директории.
+
+        Ресурсы, пропавшие из директории, удаляются вместе с поддеревьями.
+        Поддиректория требует повторного чтения, если она еще не была
+        проиндексирована или изменилось ее время модификации.
+
+        Args:
+            path: Путь к директории
+            items: Содержимое директории (словари resource_to_dict)
+            full: Считать все поддиректории требующими повторного чтения
+
+        Returns:
+            Пути поддиректорий, которые нужно перечитать
+        """
+        directory = normalize_path(path)
+        now = time.time()
+        stale = []
+        with self._lock, self._conn:
+            known = {
+                row["path"]: row
+                for row in self._conn.execute(
+                    "SELECT path, modified, listed FROM resources WHERE parent = ? AND path != ?",
+                    (directory, directory),
+                )
+            }
+            seen = set()
+            for item in items:
+                key = normalize_path(item["path"])
+                seen.add(key)
+                modified = _format_modified(item["modified"])
+                row = known.get(key)
+                unchanged = (
+                    row is not None and row["listed"] and modified is not None
+                    and row["modified"] == modified
+                )
+                if item["type"] == "dir" and (full or not unchanged):
+                    stale.append(item["path"])
+                self._conn.execute(
+                    "INSERT INTO resources (path, parent, name, remote_path, type, size, md5, modified, listed, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET remote_path = excluded.remote_path, type = excluded.type, "
+                    "size = excluded.size, md5 = excluded.md5, modified = excluded.modified, "
+                    "indexed_at = excluded.indexed_at",
+                    (key, directory, item["name"], item["path"], item["type"],
+                     item["size"], item["md5"], modified, now),
+                )
+            for key in set(known) - seen:
+                self._delete_subtree(key)
+            self._conn.execute(
+                "INSERT INTO resources (path, parent, name, remote_path, type, listed, indexed_at) "
+                "VALUES (?, ?, ?, ?, 'dir', 1, ?) "
+                "ON CONFLICT(path) DO UPDATE SET listed = 1, indexed_at = excluded.indexed_at",
+                (directory, parent_path(directory), directory.rsplit("/", 1)[-1], path, now),
+            )
+        return stale
+
+    def record(
+        self,
+        remote_path: str,
+        type: str = "file",
+        size: Optional[int] = None,
+        md5: Optional[str] = None,
+        modified: Any = None,
+    ) -> None:
+        """
+        Добавляет или обновляет один ресурс (например, после загрузки файла).
+
+        Запись добавляется, только если родительская директория уже есть
+        в индексе, чтобы не создавать в нем неполные ветки.
+
+        Args:
+            remote_path: Путь к ресурсу
+            type: Тип ресурса ("file" или "dir")
+            size: Размер в байтах
+            md5: MD5-хэш содержимого
+            modified: Время изменения (по умолчанию - текущее)
+        """
+        key = normalize_path(remote_path)
+        modified = _format_modified(modified) or time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+        with self._lock, self._conn:
+            if self._conn.execute(
+                "SELECT 1 FROM resources WHERE path = ?", (parent_path(key),)
+            ).fetchone() is None:
+                return
+            self._conn.execute(
+                "INSERT INTO resources (path, parent, name, remote_path, type, size, md5, modified, listed, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?) "
+                "ON CONFLICT(path) DO UPDATE SET type = excluded.type, size = excluded.size, "
+                "md5 = excluded.md5, modified = excluded.modified, indexed_at = excluded.indexed_at",
+                (key, parent_path(key), key.rsplit("/", 1)[-1], remote_path, type,
+                 size, md5, modified, time.time()),
+            )
+
+    def remove(self, remote_path: str) -> None:
+        """Удаляет ресурс и все вложенные в него записи."""
+        with self._lock, self._conn:
+            self._delete_subtree(normalize_path(remote_path))
+
+    def is_listed(self, path: str) -> bool:
+        """Проверяет, проиндексировано ли содержимое директории."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT listed FROM resources WHERE path = ?", (normalize_path(path),)
+            ).fetchone()
+        return bool(row and row["listed"])
+
+    def children(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Содержимое директории из индекса.
+
+        Args:
+            path: Путь к директории
+
+        Returns:
+            Список ресурсов или None, если директория не проиндексирована
+        """
+        if not self.is_listed(path):
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM resources WHERE parent = ? AND path != '/' ORDER BY name",
+                (normalize_path(path),),
+            ).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        prefix: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Поиск ресурсов в индексе без сетевых запросов.
+
+        Args:
+            name: Glob-шаблон имени (регистронезависимый), например "*.jpg"
+            prefix: Путь директории, внутри которой искать
+            min_size: Минимальный размер в байтах
+            max_size: Максимальный размер в байтах
+            type: Тип ресурса ("file" или "dir")
+            limit: Максимальное количество результатов
+
+        Returns:
+            Список ресурсов в виде словарей
+        """
+        conditions: List[str] = ["path != '/'"]
+        params: List[Any] = []
+        if name is not None:
+            conditions.append("lower(name) GLOB ?")
+            params.append(name.lower())
+        if prefix is not None and normalize_path(prefix) != "/":
+            root = normalize_path(prefix)
+            conditions.append("substr(path, 1, ?) = ?")
+            params += [len(root) + 1, root + "/"]
+        if min_size is not None:
+            conditions.append("size >= ?")
+            params.append(min_size)
+        if max_size is not None:
+            conditions.append("size <= ?")
+            params.append(max_size)
+        if type is not None:
+            conditions.append("type = ?")
+            params.append(type)
+        sql = f"SELECT {COLUMNS} FROM resources WHERE {' AND '.join(conditions)} ORDER BY path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def search_directories(self, name: str, path: str = "/") -> Optional[List[str]]:
+        """
+        Аналог search_directories источника, выполняемый по индексу.
+
+        Returns:
+            Список путей или None, если директория path не проиндексирована
+        """
+        items = self.children(path)
+        if items is None:
+            return None
+        return [
+            item["path"] for item in items
+            if item["type"] == "dir" and name.lower() in item["name"].lower()
+        ]
+
+    def clear(self) -> None:
+        """Удаляет все записи индекса."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM resources")
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self._conn.close()
+
+    def _delete_subtree(self, key: str) -> None:
+        if key == "/":
+            self._conn.execute("DELETE FROM resources")
+            return
+        self._conn.execute(
+            "DELETE FROM resources WHERE path = ? OR substr(path, 1, ?) = ?",
+            (key, len(key) + 1, key + "/"),
+        )
+
+
+def _format_modified(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "name": row["name"],
+        "path": row["remote_path"],
+        "type": row["type"],
+        "size": row["size"],
+        "md5": row["md5"],
+        "modified": row["modified"],
+    }
@@ -0,0 +1,256 @@
+import random
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from ..metrics.events import note_retry
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Политика повторов запросов.
+
+    max_retries: int - Бюджет повторов операции по умолчанию
+    base_delay: float - Задержка перед первым повтором, сек
+    max_delay: float - Максимальная задержка между повторами, сек
+    budgets: Dict[str, int] - Бюджеты повторов для отдельных операций,
+        например {"upload": 8, "listdir": 2}
+    """
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budgets: Dict[str, int] = field(default_factory=dict)
+
+    def budget(self, operation: Optional[str]) -> int:
+        """Бюджет повторов для операции."""
+        return self.budgets.get(operation, self.max_retries) if operation else self.max_retries
+
+    def backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка с полным джиттером для номера повтора (с 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class SchedulerStats:
+    """Статистика планировщика запросов."""
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов "ведро токенов".
+
+    Токены пополняются со скоростью rate в секунду, в ведре помещается не
+    более burst токенов. Пауза (pause), например по заголовку Retry-After,
+    задерживает все запросы, а не только тот, который получил отказ.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Запросов в секунду (None - без ограничения)
+            burst: Емкость ведра (по умолчанию - max(1, rate))
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate должен быть положительным")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на seconds секунд."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reserve(self) -> float:
+        """
+        Забирает токен.
+
+        Returns:
+            Сколько секунд нужно подождать перед запросом
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = max(0.0, self._paused_until - now)
+            if self.rate is None:
+                return pause
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # Отрицательный остаток - очередь ожидающих; каждый ждет своей доли
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, pause)
+
+    def acquire(self) -> None:
+        """Ждет токен (синхронно)."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Ждет токен (асинхронно)."""
+        # asyncio импортируется здесь: синхронным процессам он не нужен
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Планировщик запросов к облачному хранилищу.
+
+    Каждый запрос забирает токен из общего TokenBucket. Запросы, завершившиеся
+    временной ошибкой (сеть, 5xx, 429), повторяются с экспоненциальной
+    задержкой и джиттером в пределах бюджета повторов операции. Если ответ
+    содержит Retry-After, выдача токенов приостанавливается на это время для
+    всех запросов планировщика, поэтому нагрузка держится на уровне лимита
+    провайдера, а не колеблется между всплесками и отказами.
+
+    Один планировщик можно разделить между несколькими источниками.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        policy: Optional[RetryPolicy] = None,
+        retriable_errors: Tuple[Type[BaseException], ...] = (),
+        throttle_errors: Tuple[Type[BaseException], ...] = (),
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate: Запросов в секунду (None - без ограничения)
+            burst: Максимальное количество запросов подряд без ожидания
+            policy: Политика повторов
+            retriable_errors: Исключения, после которых запрос повторяется
+            throttle_errors: Исключения "слишком много запросов" (тоже повторяются)
+            sleep: Функция ожидания для синхронных повторов
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.policy = policy or RetryPolicy()
+        self.retriable_errors = tuple(retriable_errors) + tuple(throttle_errors)
+        self.throttle_errors = tuple(throttle_errors)
+        self._sleep = sleep
+        self._stats = SchedulerStats()
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        operation: Optional[str] = None,
+        retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Выполняет синхронный запрос с ограничением частоты и повторами.
+
+        Args:
+            func: Функция запроса
+            *args, **kwargs: Аргументы func
+            operation: Название операции (для бюджета повторов из политики)
+            retries: Бюджет повторов этого вызова (переопределяет политику)
+
+        Returns:
+            Результат func
+        """
+        budget = self.policy.budget(operation) if retries is None else retries
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self._count("requests")
+            try:
+                return func(*args, **kwargs)
+            except self.retriable_errors as e:
+                attempt += 1
+                delay = self._on_error(e, attempt, budget)
+            self._sleep(delay)
+
+    async def call_async(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        operation: Optional[str] = None,
+        retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Асинхронный вариант call: func - корутинная функция.
+        """
+        import asyncio
+
+        budget = self.policy.budget(operation) if retries is None else retries
+        attempt = 0
+        while True:
+            await self.bucket.acquire_async()
+            self._count("requests")
+            try:
+                return await func(*args, **kwargs)
+            except self.retriable_errors as e:
+                attempt += 1
+                delay = self._on_error(e, attempt, budget)
+            await asyncio.sleep(delay)
+
+    def stats(self) -> SchedulerStats:
+        """Снимок статистики."""
+        with self._lock:
+            return SchedulerStats(**vars(self._stats))
+
+    def _on_error(self, error: BaseException, attempt: int, budget: int) -> float:
+        """Учитывает ошибку и возвращает задержку или пробрасывает ошибку, если бюджет исчерпан."""
+        throttled = isinstance(error, self.throttle_errors)
+        if throttled:
+            self._count("throttled")
+        if attempt > budget:
+            self._count("failures")
+            raise error
+        self._count("retries")
+        note_retry()
+        delay = self.policy.backoff(attempt)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            self.bucket.pause(retry_after)
+            delay = max(delay, retry_after)
+        return delay
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self._stats, name, getattr(self._stats, name) + 1)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Значение заголовка Retry-After из ответа, приложенного к исключению.
+
+    Поддерживаются оба формата заголовка: число секунд и HTTP-дата.
+    """
+    response = getattr(error, "response", None)
+    # Ответ yadisk оборачивает ответ HTTP-библиотеки (requests, httpx, aiohttp)
+    headers = getattr(getattr(response, "_response", response), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
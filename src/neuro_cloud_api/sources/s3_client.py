@@ -0,0 +1,641 @@
+import base64
+import datetime
+import hashlib
+import hmac
+import inspect
+import os
+import xml.etree.ElementTree as ET
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+import httpx
+
+from .request_scheduler import RequestScheduler, RetryPolicy
+from .transport import TransportSettings
+
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+@dataclass(frozen=True)
+class S3Settings:
+    """
+    Параметры подключения к S3-совместимому хранилищу.
+
+    bucket: str - Имя бакета
+    access_key: str - Идентификатор ключа доступа
+    secret_key: str - Секретный ключ
+    region: str - Регион (для подписи запросов)
+    endpoint_url: Optional[str] - Адрес хранилища (None - AWS S3 региона region),
+        например http://127.0.0.1:9000 для локального MinIO
+    session_token: Optional[str] - Токен временных учетных данных
+    path_style: Optional[bool] - Адресация бакета в пути URL (None - для своего endpoint_url)
+    """
+    bucket: str
+    access_key: str
+    secret_key: str
+    region: str = "us-east-1"
+    endpoint_url: Optional[str] = None
+    session_token: Optional[str] = None
+    path_style: Optional[bool] = None
+
+    @classmethod
+    def from_credentials(
+        cls,
+        bucket: str,
+        credentials: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "S3Settings":
+        """
+        Создает настройки, взяв ключи из аргументов, строки "ACCESS_KEY:SECRET_KEY"
+        или переменных окружения AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY.
+        """
+        if not (access_key and secret_key) and credentials and ":" in credentials:
+            access_key, secret_key = credentials.split(":", 1)
+        access_key = access_key or os.getenv("AWS_ACCESS_KEY_ID")
+        secret_key = secret_key or os.getenv("AWS_SECRET_ACCESS_KEY")
+        if not access_key or not secret_key:
+            raise ValueError("Не заданы ключи доступа S3")
+        kwargs.setdefault("session_token", os.getenv("AWS_SESSION_TOKEN"))
+        return cls(bucket=bucket, access_key=access_key, secret_key=secret_key, **kwargs)
+
+
+class S3Error(Exception):
+    """Ошибка, которую вернуло S3-хранилище."""
+
+    def __init__(self, status: int, code: str = "", message: str = "", response: Any = None):
+        super().__init__(f"{code or 'S3Error'}: {message or status} | Status code: {status}")
+        self.status = status
+        self.code = code
+        self.message = message
+        # Ответ с заголовками (Retry-After учитывается RequestScheduler)
+        self.response = response
+
+
+class S3NotFoundError(S3Error):
+    """Объект или бакет не найден."""
+
+
+class S3PreconditionFailedError(S3Error):
+    """Не выполнено условие запроса (например, объект уже существует)."""
+
+
+class S3ServerError(S3Error):
+    """Временная ошибка хранилища (5xx), запрос можно повторить."""
+
+
+class S3ThrottleError(S3ServerError):
+    """Хранилище просит снизить частоту запросов (SlowDown, 429)."""
+
+
+def create_s3_scheduler(
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> RequestScheduler:
+    """
+    Планировщик запросов для S3: повторяются сетевые ошибки, 5xx и SlowDown.
+    """
+    return RequestScheduler(
+        rate=rate,
+        burst=burst,
+        policy=policy,
+        retriable_errors=(httpx.TransportError, S3ServerError),
+        throttle_errors=(S3ThrottleError,),
+    )
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_v4(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    service: str = "s3",
+    now: Optional[datetime.datetime] = None,
+) -> Dict[str, str]:
+    """
+    Подписывает запрос по AWS Signature Version 4.
+
+    Args:
+        method: HTTP-метод
+        url: Полный URL с уже закодированными путем и параметрами
+        headers: Заголовки запроса (подписываются все переданные)
+        payload_hash: SHA256 тела запроса в hex или "UNSIGNED-PAYLOAD"
+        access_key, secret_key: Ключи доступа
+        region: Регион
+        service: Сервис
+        now: Время подписи (по умолчанию текущее)
+
+    Returns:
+        Заголовки запроса с добавленными host, x-amz-date и Authorization
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    parts = urlsplit(url)
+    headers = {name.lower(): str(value).strip() for name, value in headers.items()}
+    headers.setdefault("host", parts.netloc)
+    headers["x-amz-date"] = amz_date
+
+    query = []
+    for pair in filter(None, parts.query.split("&")):
+        name, _, value = pair.partition("=")
+        query.append((name, value))
+    canonical_query = "&".join(f"{name}={value}" for name, value in sorted(query))
+    signed_headers = ";".join(sorted(headers))
+    canonical_headers = "".join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+    canonical_request = "\n".join([
+        method, parts.path or "/", canonical_query, canonical_headers, signed_headers, payload_hash,
+    ])
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+    key = _hmac(_hmac(_hmac(_hmac(f"AWS4{secret_key}".encode("utf-8"), date), region), service), "aws4_request")
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    headers["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    return headers
+
+
+def _encode(value: str, safe: str = "") -> str:
+    return quote(value, safe="-_.~" + safe)
+
+
+def _strip_ns(root: ET.Element) -> ET.Element:
+    for element in root.iter():
+        if "}" in element.tag:
+            element.tag = element.tag.split("}", 1)[1]
+    return root
+
+
+@dataclass
+class S3Object:
+    """
+    Объект из листинга.
+
+    key: str - Ключ объекта
+    size: int - Размер в байтах
+    etag: str - ETag без кавычек (MD5 содержимого, если объект загружен одним запросом)
+    modified: Optional[datetime.datetime] - Время изменения
+    """
+    key: str
+    size: int
+    etag: str
+    modified: Optional[datetime.datetime] = None
+
+    @property
+    def md5(self) -> Optional[str]:
+        """MD5 содержимого (у составных объектов ETag не является MD5)."""
+        return self.etag if self.etag and "-" not in self.etag else None
+
+
+@dataclass
+class ListPage:
+    """Страница листинга: объекты, общие префиксы ("директории") и маркер продолжения."""
+    objects: List[S3Object]
+    prefixes: List[str]
+    next_token: Optional[str]
+
+
+@dataclass
+class _Request:
+    method: str
+    url: str
+    headers: Dict[str, str]
+    content: bytes = b""
+
+
+class _S3Protocol:
+    """Формирование подписанных запросов и разбор ответов S3 (общие для клиентов)."""
+
+    def __init__(self, settings: S3Settings):
+        self.settings = settings
+        endpoint = settings.endpoint_url or f"https://s3.{settings.region}.amazonaws.com"
+        path_style = settings.path_style if settings.path_style is not None else bool(settings.endpoint_url)
+        parts = urlsplit(endpoint)
+        if path_style:
+            self._base = f"{parts.scheme}://{parts.netloc}/{_encode(settings.bucket)}"
+        else:
+            self._base = f"{parts.scheme}://{settings.bucket}.{parts.netloc}"
+
+    def _request(
+        self,
+        method: str,
+        key: str = "",
+        query: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content: bytes = b"",
+    ) -> _Request:
+        url = self._base + "/" + _encode(key, safe="/")
+        if query:
+            url += "?" + "&".join(
+                f"{_encode(name)}={_encode(value)}" for name, value in sorted(query.items())
+            )
+        headers = dict(headers or {})
+        payload_hash = hashlib.sha256(content).hexdigest() if content else EMPTY_SHA256
+        headers["x-amz-content-sha256"] = payload_hash
+        if self.settings.session_token:
+            headers["x-amz-security-token"] = self.settings.session_token
+        signed = sign_v4(
+            method, url, headers, payload_hash,
+            self.settings.access_key, self.settings.secret_key, self.settings.region,
+        )
+        return _Request(method, url, signed, content)
+
+    @staticmethod
+    def _error(status: int, body: bytes, response: Any) -> S3Error:
+        code = message = ""
+        if body:
+            try:
+                root = _strip_ns(ET.fromstring(body))
+                code = root.findtext("Code") or ""
+                message = root.findtext("Message") or ""
+            except ET.ParseError:
+                message = body[:200].decode("utf-8", "replace")
+        if status == 404:
+            return S3NotFoundError(status, code or "NotFound", message, response)
+        if status == 412:
+            return S3PreconditionFailedError(status, code or "PreconditionFailed", message, response)
+        if status == 429 or code == "SlowDown":
+            return S3ThrottleError(status, code or "SlowDown", message, response)
+        if status >= 500:
+            return S3ServerError(status, code, message, response)
+        return S3Error(status, code, message, response)
+
+    # --- Запросы ---
+
+    def _head_bucket(self) -> _Request:
+        return self._request("HEAD")
+
+    def _head_object(self, key: str) -> _Request:
+        return self._request("HEAD", key)
+
+    def _get_object(self, key: str, start: Optional[int] = None, end: Optional[int] = None) -> _Request:
+        headers = {}
+        if start is not None:
+            headers["range"] = f"bytes={start}-{'' if end is None else end}"
+        return self._request("GET", key, headers=headers)
+
+    def _put_object(self, key: str, content: bytes, overwrite: bool) -> _Request:
+        headers = {} if overwrite else {"if-none-match": "*"}
+        return self._request("PUT", key, headers=headers, content=content)
+
+    def _copy_headers(self, src_key: str) -> Dict[str, str]:
+        return {"x-amz-copy-source": "/" + _encode(self.settings.bucket) + "/" + _encode(src_key, safe="/")}
+
+    def _copy_object(self, src_key: str, key: str, overwrite: bool) -> _Request:
+        headers = self._copy_headers(src_key)
+        if not overwrite:
+            headers["if-none-match"] = "*"
+        return self._request("PUT", key, headers=headers)
+
+    def _create_multipart(self, key: str) -> _Request:
+        return self._request("POST", key, query={"uploads": ""})
+
+    def _upload_part(self, key: str, upload_id: str, number: int, content: bytes) -> _Request:
+        return self._request("PUT", key, query={"partNumber": str(number), "uploadId": upload_id}, content=content)
+
+    def _upload_part_copy(
+        self, key: str, upload_id: str, number: int, src_key: str, start: int, end: int
+    ) -> _Request:
+        headers = self._copy_headers(src_key)
+        headers["x-amz-copy-source-range"] = f"bytes={start}-{end}"
+        return self._request("PUT", key, query={"partNumber": str(number), "uploadId": upload_id}, headers=headers)
+
+    def _complete_multipart(self, key: str, upload_id: str, etags: List[Tuple[int, str]], overwrite: bool) -> _Request:
+        root = ET.Element("CompleteMultipartUpload")
+        for number, etag in sorted(etags):
+            part = ET.SubElement(root, "Part")
+            ET.SubElement(part, "PartNumber").text = str(number)
+            ET.SubElement(part, "ETag").text = etag
+        headers = {} if overwrite else {"if-none-match": "*"}
+        return self._request(
+            "POST", key, query={"uploadId": upload_id}, headers=headers, content=ET.tostring(root),
+        )
+
+    def _abort_multipart(self, key: str, upload_id: str) -> _Request:
+        return self._request("DELETE", key, query={"uploadId": upload_id})
+
+    def _list_objects(
+        self, prefix: str, delimiter: Optional[str], token: Optional[str], max_keys: int
+    ) -> _Request:
+        query = {"list-type": "2", "prefix": prefix, "max-keys": str(max_keys)}
+        if delimiter:
+            query["delimiter"] = delimiter
+        if token:
+            query["continuation-token"] = token
+        return self._request("GET", query=query)
+
+    def _delete_object(self, key: str) -> _Request:
+        return self._request("DELETE", key)
+
+    def _delete_objects(self, keys: List[str]) -> _Request:
+        root = ET.Element("Delete")
+        ET.SubElement(root, "Quiet").text = "true"
+        for key in keys:
+            ET.SubElement(ET.SubElement(root, "Object"), "Key").text = key
+        content = ET.tostring(root)
+        headers = {"content-md5": base64.b64encode(hashlib.md5(content).digest()).decode("ascii")}
+        return self._request("POST", query={"delete": ""}, headers=headers, content=content)
+
+    # --- Разбор ответов ---
+
+    @staticmethod
+    def _parse_head(headers: Any) -> S3Object:
+        modified = headers.get("last-modified")
+        return S3Object(
+            key="",
+            size=int(headers.get("content-length") or 0),
+            etag=(headers.get("etag") or "").strip('"'),
+            modified=_parse_http_date(modified) if modified else None,
+        )
+
+    @staticmethod
+    def _parse_list(body: bytes) -> ListPage:
+        root = _strip_ns(ET.fromstring(body))
+        objects = [
+            S3Object(
+                key=item.findtext("Key") or "",
+                size=int(item.findtext("Size") or 0),
+                etag=(item.findtext("ETag") or "").strip('"'),
+                modified=_parse_iso_date(item.findtext("LastModified")),
+            )
+            for item in root.findall("Contents")
+        ]
+        prefixes = [item.findtext("Prefix") or "" for item in root.findall("CommonPrefixes")]
+        truncated = (root.findtext("IsTruncated") or "").lower() == "true"
+        return ListPage(objects, prefixes, root.findtext("NextContinuationToken") if truncated else None)
+
+    @staticmethod
+    def _parse_upload_id(body: bytes) -> str:
+        return _strip_ns(ET.fromstring(body)).findtext("UploadId") or ""
+
+    @staticmethod
+    def _parse_copy_etag(body: bytes) -> str:
+        return _strip_ns(ET.fromstring(body)).findtext("ETag") or ""
+
+    def _check_complete(self, body: bytes, response: Any) -> None:
+        # CompleteMultipartUpload, CopyObject и UploadPartCopy могут вернуть 200 с ошибкой в теле
+        if body and b"<Error>" in body:
+            raise self._error(500, body, response)
+
+    def _check_deleted(self, body: bytes, response: Any) -> None:
+        if body and b"<Error>" in body:
+            root = _strip_ns(ET.fromstring(body))
+            error = root.find("Error")
+            if error is not None:
+                raise S3Error(200, error.findtext("Code") or "", error.findtext("Key") or "", response)
+
+
+def _parse_iso_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _parse_http_date(value: str) -> Optional[datetime.datetime]:
+    import email.utils
+
+    try:
+        return email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _timeout(settings: TransportSettings) -> httpx.Timeout:
+    return httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout)
+
+
+class S3Client(_S3Protocol):
+    """
+    Синхронный клиент S3 поверх httpx.
+
+    Клиент потокобезопасен: воркеры параллельных передач делят его пул
+    соединений (размер пула задается TransportSettings.pool_size).
+    """
+
+    def __init__(self, settings: S3Settings, transport: Optional[TransportSettings] = None):
+        super().__init__(settings)
+        transport = transport or TransportSettings()
+        self.http = httpx.Client(timeout=_timeout(transport), **transport.httpx_args())
+
+    def close(self) -> None:
+        self.http.close()
+
+    def _send(self, request: _Request) -> httpx.Response:
+        response = self.http.request(request.method, request.url, headers=request.headers, content=request.content)
+        if response.status_code >= 300:
+            raise self._error(response.status_code, response.content, response)
+        return response
+
+    def head_bucket(self) -> bool:
+        self._send(self._head_bucket())
+        return True
+
+    def head_object(self, key: str) -> S3Object:
+        obj = self._parse_head(self._send(self._head_object(key)).headers)
+        obj.key = key
+        return obj
+
+    def get_object(
+        self,
+        key: str,
+        write: Callable[[bytes], Any],
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> int:
+        """
+        Скачивает объект (или диапазон start..end включительно) потоком.
+
+        Returns:
+            Количество полученных байт
+        """
+        request = self._get_object(key, start, end)
+        with self.http.stream(request.method, request.url, headers=request.headers) as response:
+            if response.status_code >= 300:
+                raise self._error(response.status_code, response.read(), response)
+            if start is not None and response.status_code != 206:
+                raise S3Error(response.status_code, "RangeNotSatisfied", "Хранилище вернуло весь объект", response)
+            received = 0
+            for chunk in response.iter_bytes():
+                write(chunk)
+                received += len(chunk)
+            return received
+
+    def put_object(self, key: str, content: bytes, overwrite: bool = True) -> str:
+        return self._send(self._put_object(key, content, overwrite)).headers.get("etag", "").strip('"')
+
+    def copy_object(self, src_key: str, key: str, overwrite: bool = True) -> None:
+        """Копирует объект (до 5 ГиБ) на стороне хранилища."""
+        response = self._send(self._copy_object(src_key, key, overwrite))
+        self._check_complete(response.content, response)
+
+    def create_multipart_upload(self, key: str) -> str:
+        return self._parse_upload_id(self._send(self._create_multipart(key)).content)
+
+    def upload_part(self, key: str, upload_id: str, number: int, content: bytes) -> str:
+        return self._send(self._upload_part(key, upload_id, number, content)).headers.get("etag", "")
+
+    def upload_part_copy(self, key: str, upload_id: str, number: int, src_key: str, start: int, end: int) -> str:
+        """Копирует байты start..end (включительно) объекта src_key в часть составной загрузки."""
+        response = self._send(self._upload_part_copy(key, upload_id, number, src_key, start, end))
+        self._check_complete(response.content, response)
+        return self._parse_copy_etag(response.content)
+
+    def complete_multipart_upload(
+        self, key: str, upload_id: str, etags: List[Tuple[int, str]], overwrite: bool = True
+    ) -> None:
+        response = self._send(self._complete_multipart(key, upload_id, etags, overwrite))
+        self._check_complete(response.content, response)
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self._send(self._abort_multipart(key, upload_id))
+
+    def list_objects(
+        self,
+        prefix: str = "",
+        delimiter: Optional[str] = None,
+        token: Optional[str] = None,
+        max_keys: int = 1000,
+    ) -> ListPage:
+        return self._parse_list(self._send(self._list_objects(prefix, delimiter, token, max_keys)).content)
+
+    def iter_pages(self, prefix: str = "", delimiter: Optional[str] = None, max_keys: int = 1000) -> Iterator[ListPage]:
+        token = None
+        while True:
+            page = self.list_objects(prefix, delimiter, token, max_keys)
+            yield page
+            token = page.next_token
+            if not token:
+                return
+
+    def delete_object(self, key: str) -> None:
+        self._send(self._delete_object(key))
+
+    def delete_objects(self, keys: List[str]) -> None:
+        response = self._send(self._delete_objects(keys))
+        self._check_deleted(response.content, response)
+
+
+class AsyncS3Client(_S3Protocol):
+    """Асинхронный клиент S3 поверх httpx.AsyncClient."""
+
+    def __init__(self, settings: S3Settings, transport: Optional[TransportSettings] = None):
+        super().__init__(settings)
+        transport = transport or TransportSettings()
+        self.http = httpx.AsyncClient(timeout=_timeout(transport), **transport.httpx_args())
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+    async def _send(self, request: _Request) -> httpx.Response:
+        response = await self.http.request(
+            request.method, request.url, headers=request.headers, content=request.content
+        )
+        if response.status_code >= 300:
+            raise self._error(response.status_code, response.content, response)
+        return response
+
+    async def head_bucket(self) -> bool:
+        await self._send(self._head_bucket())
+        return True
+
+    async def head_object(self, key: str) -> S3Object:
+        obj = self._parse_head((await self._send(self._head_object(key))).headers)
+        obj.key = key
+        return obj
+
+    async def get_object(
+        self,
+        key: str,
+        write: Callable[[bytes], Any],
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> int:
+        request = self._get_object(key, start, end)
+        async with self.http.stream(request.method, request.url, headers=request.headers) as response:
+            if response.status_code >= 300:
+                raise self._error(response.status_code, await response.aread(), response)
+            if start is not None and response.status_code != 206:
+                raise S3Error(response.status_code, "RangeNotSatisfied", "Хранилище вернуло весь объект", response)
+            received = 0
+            async for chunk in response.aiter_bytes():
+                # Приемник может быть асинхронным (aiofiles и т.п.)
+                result = write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+                received += len(chunk)
+            return received
+
+    async def put_object(self, key: str, content: bytes, overwrite: bool = True) -> str:
+        return (await self._send(self._put_object(key, content, overwrite))).headers.get("etag", "").strip('"')
+
+    async def copy_object(self, src_key: str, key: str, overwrite: bool = True) -> None:
+        response = await self._send(self._copy_object(src_key, key, overwrite))
+        self._check_complete(response.content, response)
+
+    async def create_multipart_upload(self, key: str) -> str:
+        return self._parse_upload_id((await self._send(self._create_multipart(key))).content)
+
+    async def upload_part(self, key: str, upload_id: str, number: int, content: bytes) -> str:
+        return (await self._send(self._upload_part(key, upload_id, number, content))).headers.get("etag", "")
+
+    async def upload_part_copy(
+        self, key: str, upload_id: str, number: int, src_key: str, start: int, end: int
+    ) -> str:
+        response = await self._send(self._upload_part_copy(key, upload_id, number, src_key, start, end))
+        self._check_complete(response.content, response)
+        return self._parse_copy_etag(response.content)
+
+    async def complete_multipart_upload(
+        self, key: str, upload_id: str, etags: List[Tuple[int, str]], overwrite: bool = True
+    ) -> None:
+        response = await self._send(self._complete_multipart(key, upload_id, etags, overwrite))
+        self._check_complete(response.content, response)
+
+    async def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        await self._send(self._abort_multipart(key, upload_id))
+
+    async def list_objects(
+        self,
+        prefix: str = "",
+        delimiter: Optional[str] = None,
+        token: Optional[str] = None,
+        max_keys: int = 1000,
+    ) -> ListPage:
+        return self._parse_list((await self._send(self._list_objects(prefix, delimiter, token, max_keys))).content)
+
+    async def iter_pages(
+        self, prefix: str = "", delimiter: Optional[str] = None, max_keys: int = 1000
+    ) -> AsyncIterator[ListPage]:
+        token = None
+        while True:
+            page = await self.list_objects(prefix, delimiter, token, max_keys)
+            yield page
+            token = page.next_token
+            if not token:
+                return
+
+    async def delete_object(self, key: str) -> None:
+        await self._send(self._delete_object(key))
+
+    async def delete_objects(self, keys: List[str]) -> None:
+        response = await self._send(self._delete_objects(keys))
+        self._check_deleted(response.content, response)
@@ -1,28 +1,804 @@
+import contextvars
+import io
+import logging
+import os
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .base_source import BaseSource
+from .path_utils import is_subpath, normalize_path
+from .request_scheduler import RequestScheduler
+from .s3_client import (
+    S3Client, S3Error, S3NotFoundError, S3Object, S3PreconditionFailedError, S3Settings, create_s3_scheduler,
+)
+from .segmented_download import SegmentedDownload
+from .source_type import SourceType
+from .streaming import BYTES_LIKE, UploadData, is_local_path, chain_parts, iter_parts, read_part, upload_position
+from .transfer import TransferResult
+from .transport import TransportSettings
+from ..metrics.events import add_bytes, instrumented, record_error
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+# CopyObject копирует объекты до 5 ГиБ, большие копируются частями (UploadPartCopy)
+MAX_COPY_SIZE = 5 * 1024 * 1024 * 1024
+COPY_PART_SIZE = 512 * 1024 * 1024
+
+
+def part_size_for(size: Optional[int], part_size: int) -> int:
+    """
+    Размер части составной загрузки: не меньше 5 МиБ (минимум S3) и такой,
+    чтобы объект размера size уложился в 10000 частей.
+    """
+    part_size = max(part_size, MIN_PART_SIZE)
+    if size:
+        part_size = max(part_size, -(-size // MAX_PARTS))
+    return part_size
+
+
+class S3KeyMapper:
+    """
+    Преобразование путей источника ("/a/b") в ключи S3 ("<prefix>/a/b") и обратно.
+    """
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    def key(self, path: str) -> str:
+        return self.prefix + normalize_path(path).lstrip("/")
+
+    def dir_prefix(self, path: str) -> str:
+        """Префикс ключей содержимого директории."""
+        key = self.key(path)
+        return key + "/" if key and not key.endswith("/") else key
 
+    def path(self, key: str) -> str:
+        return normalize_path(key[len(self.prefix):])
 
-class FileSource(BaseSource):
+    def file_dict(self, obj: S3Object) -> Dict[str, Any]:
+        path = self.path(obj.key)
+        return {
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "type": "file",
+            "size": obj.size,
+            "md5": obj.md5,
+            "modified": obj.modified,
+        }
+
+    def dir_dict(self, prefix: str) -> Dict[str, Any]:
+        path = self.path(prefix)
+        return {
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "type": "dir",
+            "size": None,
+            "md5": None,
+            "modified": None,
+        }
+
+
+class S3Source(BaseSource):
     """
-        Источник локального видео-файла.
-        Выполняет только:
-        * нормализацию пути;
-        * проверку существования;
-        * возврат URI.
-        Декодированием занимается Decoder.
+    Класс для работы с S3-совместимым хранилищем (AWS S3, MinIO, Yandex Object Storage).
+
+    Директории - это общие префиксы ключей с разделителем "/". Большие
+    объекты загружаются составной загрузкой (multipart upload) частями
+    part_size, до max_concurrency частей одновременно, и скачиваются
+    параллельными Range-запросами, поэтому передача одного объекта
+    использует канал полностью, а не один TCP-поток.
     """
 
-    def __init__(self, path: Union[str, Path]):
+    def __init__(
+        self,
+        bucket: str,
+        credentials: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        prefix: str = "",
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = 8,
+        multipart_threshold: Optional[int] = None,
+        transport: Optional[TransportSettings] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        """
+        Инициализация клиента S3.
+
+        Args:
+            bucket: Имя бакета
+            credentials: Ключи в виде "ACCESS_KEY:SECRET_KEY" (по умолчанию -
+                access_key/secret_key или переменные окружения AWS_*)
+            endpoint_url: Адрес хранилища (None - AWS S3), например http://127.0.0.1:9000
+            region: Регион
+            prefix: Префикс ключей, под которым находится корень источника
+            access_key, secret_key: Ключи доступа
+            part_size: Размер части составной загрузки и сегмента скачивания в байтах
+            max_concurrency: Количество одновременно передаваемых частей одного объекта
+            multipart_threshold: Минимальный размер объекта для составной загрузки
+                и параллельного скачивания (по умолчанию part_size)
+            transport: Настройки HTTP-транспорта (пул соединений должен вмещать
+                max_concurrency соединений)
+            scheduler: Планировщик запросов (ограничение частоты и повторы)
+        """
+        super().__init__(credentials or "", source_type=SourceType.S3)
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency должен быть положительным")
+        self.settings = S3Settings.from_credentials(
+            bucket, credentials, access_key, secret_key, region=region, endpoint_url=endpoint_url,
+        )
+        self.part_size = part_size_for(None, part_size)
+        self.max_concurrency = max_concurrency
+        self.multipart_threshold = multipart_threshold if multipart_threshold is not None else self.part_size
+        transport = transport or TransportSettings(pool_size=max(10, max_concurrency))
+        self.client = S3Client(self.settings, transport)
+        self.scheduler = scheduler or create_s3_scheduler()
+        self.keys = S3KeyMapper(prefix)
+
+    @instrumented("connect", path_arg=None)
+    def connect(self) -> bool:
+        """Подключение к S3."""
+        if self.check_connection():
+            self.is_connected = True
+            logger.debug(f"Успешно подключено к бакету {self.settings.bucket}")
+            return True
+        record_error(f"Не удалось подключиться к бакету {self.settings.bucket}")
+        return False
+
+    @instrumented("check_connection", path_arg=None)
+    def check_connection(self) -> bool:
+        """Проверка доступа к бакету."""
+        try:
+            return self.scheduler.call(self.client.head_bucket, operation="head_bucket")
+        except S3Error as e:
+            if e.status == 403:
+                record_error("Неверные ключи доступа S3")
+            else:
+                record_error(e)
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    def iter_objects(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        page_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Постраничный обход объектов под путем.
+
+        Следующая страница запрашивается только когда потребитель дочитал
+        предыдущую, поэтому прерванный обход не листает весь префикс.
+
+        Args:
+            path: Путь к директории
+            recursive: Все объекты под префиксом (иначе - только непосредственное
+                содержимое директории, включая поддиректории)
+            page_size: Количество ключей на страницу (не больше 1000)
+
+        Yields:
+            Словари с ключами name, path, type, size, md5, modified
+        """
+        token = None
+        delimiter = None if recursive else "/"
+        while True:
+            page = self.scheduler.call(
+                self.client.list_objects, self.keys.dir_prefix(path), delimiter, token, page_size,
+                operation="list_objects",
+            )
+            for prefix in page.prefixes:
+                yield self.keys.dir_dict(prefix)
+            for obj in page.objects:
+                if not obj.key.endswith("/"):
+                    yield self.keys.file_dict(obj)
+            token = page.next_token
+            if not token:
+                return
+
+    @instrumented("list_directories")
+    def list_directories(self, path: str = "/") -> List[str]:
         """
-            :param path: путь к видео-файлу
+        Получение списка директорий (общих префиксов).
+
+        Args:
+            path: Путь к директории
+
+        Returns:
+            Список путей к директориям
+        """
+        try:
+            return [item["path"] for item in self.iter_objects(path, recursive=False) if item["type"] == "dir"]
+        except Exception as e:
+            record_error(e)
+            return []
+
+    @instrumented("search_directories", path_arg=1)
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        """
+        Поиск директорий по имени.
+
+        Args:
+            name: Имя для поиска
+            path: Путь для поиска
+            max_results: Остановить поиск после стольких совпадений
+                (следующие страницы листинга не запрашиваются)
+
+        Returns:
+            Список путей к найденным директориям
+        """
+        result: List[str] = []
+        try:
+            for item in self.iter_objects(path, recursive=False):
+                if item["type"] == "dir" and name.lower() in item["name"].lower():
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        break
+        except Exception as e:
+            record_error(e)
+        return result
+
+    @instrumented("list_files")
+    def list_files(self, path: str = "/", recursive: bool = True, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Получение списка файлов с метаданными.
+
+        Рекурсивный список получается плоским листингом префикса без обхода
+        директорий, по 1000 ключей на запрос.
+
+        Args:
+            path: Путь к директории
+            recursive: Включить файлы всех поддиректорий
+            strict: Пробрасывать ошибку листинга вместо пустого списка
+
+        Returns:
+            Список файлов в виде словарей с ключами name, path, type, size, md5, modified
+        """
+        try:
+            return [item for item in self.iter_objects(path, recursive) if item["type"] == "file"]
+        except Exception as e:
+            if strict:
+                raise
+            record_error(e)
+            return []
+
+    @instrumented("remove")
+    def remove(self, remote_path: str, permanently: bool = True) -> bool:
+        """
+        Удаление объекта или всех объектов под префиксом директории.
+
+        Args:
+            remote_path: Путь к объекту или директории
+            permanently: Не используется (в S3 нет корзины), оставлен для
+                совместимости с YadiskSource.remove
+
+        Returns:
+            True если удаление успешно, иначе False
+        """
+        try:
+            keys = [self.keys.key(item["path"]) for item in self.iter_objects(remote_path) if item["type"] == "file"]
+            # Пакетное удаление - до 1000 ключей за запрос
+            for offset in range(0, len(keys), 1000):
+                self.scheduler.call(
+                    self.client.delete_objects, keys[offset:offset + 1000], operation="delete_objects"
+                )
+            key = self.keys.key(remote_path)
+            if key:
+                self.scheduler.call(self.client.delete_object, key, operation="delete")
+            logger.debug(f"Ресурс {remote_path} удален")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Копирование объекта или директории на стороне хранилища (CopyObject;
+        данные не передаются через клиент).
+
+        Объекты директории копируются параллельно, до max_concurrency
+        одновременно; объекты больше 5 ГиБ копируются частями.
+
+        Args:
+            src_path: Путь к исходному объекту или директории
+            dst_path: Путь назначения
+            overwrite: Перезаписать существующий ресурс
+
+        Returns:
+            True если копирование успешно, иначе False
+        """
+        try:
+            self._copy(src_path, dst_path, overwrite)
+            logger.debug(f"Ресурс {src_path} скопирован в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Перемещение объекта или директории.
+
+        В S3 нет переименования: объекты копируются на стороне хранилища,
+        затем исходные удаляются. Если копирование не удалось, исходные
+        объекты не удаляются.
+
+        Args:
+            src_path: Путь к исходному объекту или директории
+            dst_path: Путь назначения
+            overwrite: Перезаписать существующий ресурс
+
+        Returns:
+            True если перемещение успешно, иначе False
+        """
+        try:
+            keys = self._copy(src_path, dst_path, overwrite)
+            for offset in range(0, len(keys), 1000):
+                self.scheduler.call(
+                    self.client.delete_objects, keys[offset:offset + 1000], operation="delete_objects"
+                )
+            logger.debug(f"Ресурс {src_path} перемещен в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_file")
+    def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
         """
-        self._path: Path = Path(path).expanduser().resolve()
+        Скачивание объекта.
+
+        Объекты от multipart_threshold скачиваются параллельными
+        Range-запросами по part_size байт с докачкой (см. SegmentedDownload).
+
+        Args:
+            remote_path: Путь к объекту
+            local_path: Локальный путь для сохранения
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        try:
+            local_path = Path(local_path)
+            if not self._download(remote_path, local_path):
+                record_error(f"Контрольная сумма файла {remote_path} не совпадает")
+                return False
+            logger.debug(f"Файл {remote_path} скачан в {local_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_fileobj")
+    def download_fileobj(self, remote_path: str, file_obj: BinaryIO) -> bool:
+        """
+        Скачивание объекта в file-like объект без записи на диск.
+
+        Args:
+            remote_path: Путь к объекту
+            file_obj: Объект с методом write, например io.BytesIO или открытый файл
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        start = upload_position(file_obj)
+
+        def _attempt() -> int:
+            if start is not None:
+                # Повтор пишет данные заново с исходной позиции
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            return self.client.get_object(self.keys.key(remote_path), file_obj.write)
+
+        try:
+            add_bytes(self.scheduler.call(
+                _attempt, operation="download", retries=None if start is not None else 0
+            ))
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("read_range")
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части объекта Range-запросом без скачивания всего объекта.
+
+        Args:
+            remote_path: Путь к объекту
+            start: Смещение первого байта
+            length: Количество байт
+
+        Returns:
+            Прочитанные байты
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        def _attempt() -> bytes:
+            buffer = io.BytesIO()
+            self.client.get_object(self.keys.key(remote_path), buffer.write, start, start + length - 1)
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} объекта {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        data = self.scheduler.call(_attempt, operation="download")
+        add_bytes(len(data))
+        return data
+
+    @instrumented("upload_file", path_arg=1)
+    def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Загрузка файла или данных из памяти.
+
+        Данные от multipart_threshold загружаются составной загрузкой:
+        части читаются по мере отправки, одновременно передается не более
+        max_concurrency частей. При ошибке незавершенная загрузка отменяется.
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект или итератор фрагментов
+            remote_path: Путь к объекту
+            overwrite: Перезаписать существующий объект
+
+        Returns:
+            True если загрузка успешна, иначе False
+        """
+        try:
+            if is_local_path(local_path):
+                local_path = Path(local_path)
+                if not local_path.exists():
+                    record_error(f"Локальный файл не найден: {local_path}")
+                    return False
+            self._upload(local_path, remote_path, overwrite)
+            logger.debug(f"Данные загружены в {remote_path}")
+            return True
+        except S3PreconditionFailedError:
+            record_error(f"Объект {remote_path} уже существует")
+            return False
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_many", path_arg=None)
+    def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора объектов в пуле потоков.
+
+        Args:
+            items: Пары (путь к объекту, локальный путь)
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                if not self._download(remote_path, local_path):
+                    raise IOError("Контрольная сумма не совпадает")
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    @instrumented("upload_many", path_arg=None)
+    def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов в пуле потоков.
+
+        Args:
+            items: Пары (путь к объекту, локальный путь)
+            max_workers: Количество потоков-воркеров
+            overwrite: Перезаписывать существующие объекты
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                self._upload(local_path, remote_path, overwrite)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    def disconnect(self):
+        """Отключение от S3 и закрытие пула соединений."""
+        if self.client:
+            self.client.close()
+        super().disconnect()
+
+    @staticmethod
+    def _run_in_pool(worker, items, max_workers: int) -> List[TransferResult]:
+        if max_workers <= 0:
+            raise ValueError("max_workers должен быть положительным")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Контекст копируется, чтобы события воркеров учитывались в объемлющей операции
+            futures = [executor.submit(contextvars.copy_context().run, worker, item) for item in items]
+            return [future.result() for future in futures]
+
+    @instrumented("download", path_arg=0)
+    def _download(self, remote_path: str, local_path: Path) -> bool:
+        key = self.keys.key(remote_path)
+        obj = self.scheduler.call(self.client.head_object, key, operation="head_object")
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        if obj.size < self.multipart_threshold or self.max_concurrency == 1:
+            tmp_path = local_path.with_name(local_path.name + ".download")
+
+            def _attempt() -> None:
+                with open(tmp_path, "wb") as f:
+                    self.client.get_object(key, f.write)
+
+            try:
+                self.scheduler.call(_attempt, operation="download")
+                os.replace(tmp_path, local_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            add_bytes(obj.size)
+            return True
+
+        # ETag составного объекта - не MD5, тогда проверяется только размер
+        download = SegmentedDownload(local_path, obj.size, obj.md5, None, self.part_size)
+        download.prepare()
+
+        def _fetch(index: int) -> None:
+            # Сегмент при повторе перезаписывается с начала
+            self.scheduler.call(self._fetch_segment, key, download, index, operation="download")
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _fetch, index)
+                for index in download.pending_segments()
+            ]
+            for future in futures:
+                future.result()
+        if not download.verify():
+            download.discard()
+            return False
+        download.finalize()
+        return True
+
+    def _fetch_segment(self, key: str, download: SegmentedDownload, index: int) -> None:
+        start, end = download.segment_range(index)
+        with download.write_at(start) as writer:
+            self.client.get_object(key, writer.write, start, end)
+        if writer.written != end - start + 1:
+            raise IOError(f"Сегмент {index} скачан не полностью")
+        add_bytes(writer.written)
+        download.mark_done(index)
+
+    @instrumented("upload", path_arg=1)
+    def _upload(self, source: Union[Path, UploadData], remote_path: str, overwrite: bool = False) -> None:
+        key = self.keys.key(remote_path)
+        if isinstance(source, Path):
+            size: Optional[int] = source.stat().st_size
+        elif isinstance(source, BYTES_LIKE):
+            source = memoryview(source).cast("B")
+            size = len(source)
+        else:
+            size = None
+
+        if size is not None and size < self.multipart_threshold:
+            data = source.read_bytes() if isinstance(source, Path) else bytes(source)
+            self.scheduler.call(self.client.put_object, key, data, overwrite, operation="upload")
+            add_bytes(size)
+            return
+        if size is None:
+            # Поток короче одной части отправляется одним запросом
+            chunks = iter_parts(source, self.part_size)
+            first = next(chunks, b"")
+            second = next(chunks, None)
+            if second is None:
+                self.scheduler.call(self.client.put_object, key, first, overwrite, operation="upload")
+                add_bytes(len(first))
+                return
+            parts = chain_parts([first, second], chunks)
+        else:
+            parts = None
+        if not overwrite and self._exists(key):
+            # Проверяем заранее, чтобы не передавать данные впустую
+            raise S3PreconditionFailedError(412, "PreconditionFailed", f"{remote_path} уже существует")
+        self._multipart(key, source, size, parts, overwrite)
+
+    def _copy(self, src_path: str, dst_path: str, overwrite: bool) -> List[str]:
+        """Копирует объект или директорию; возвращает ключи скопированных объектов."""
+        if is_subpath(normalize_path(dst_path), normalize_path(src_path)):
+            raise ValueError(f"Путь назначения {dst_path} находится внутри {src_path}")
+        src_key = self.keys.key(src_path)
+        try:
+            obj = self.scheduler.call(self.client.head_object, src_key, operation="head_object") if src_key else None
+        except S3Error as e:
+            if e.status != 404:
+                raise
+            obj = None
+        if obj is not None:
+            items = [(src_key, self.keys.key(dst_path), obj.size)]
+        else:
+            src_prefix, dst_prefix = self.keys.dir_prefix(src_path), self.keys.dir_prefix(dst_path)
+            items = []
+            for item in self.iter_objects(src_path):
+                key = self.keys.key(item["path"])
+                items.append((key, dst_prefix + key[len(src_prefix):], item["size"]))
+            if not items:
+                raise S3NotFoundError(404, "NoSuchKey", f"Ресурс {src_path} не найден")
+        if not overwrite and self._occupied(dst_path):
+            raise S3PreconditionFailedError(412, "PreconditionFailed", f"{dst_path} уже существует")
+
+        def _copy_one(item: Tuple[str, str, int]) -> None:
+            src_key, key, size = item
+            if size <= MAX_COPY_SIZE:
+                self.scheduler.call(self.client.copy_object, src_key, key, overwrite, operation="copy")
+            else:
+                self._multipart_copy(src_key, key, size, overwrite)
+
+        if len(items) == 1:
+            _copy_one(items[0])
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, _copy_one, item) for item in items]
+            for future in futures:
+                future.result()
+        return [src_key for src_key, _, _ in items]
+
+    def _occupied(self, path: str) -> bool:
+        """Есть ли объект с этим путем или объекты под ним."""
+        key = self.keys.key(path)
+        if key and self._exists(key):
+            return True
+        return next(iter(self.iter_objects(path, page_size=1)), None) is not None
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self.scheduler.call(self.client.head_object, key, operation="head_object")
+            return True
+        except S3Error as e:
+            if e.status == 404:
+                return False
+            raise
+
+    def _multipart(
+        self,
+        key: str,
+        source: Any,
+        size: Optional[int],
+        parts: Optional[Iterator[bytes]],
+        overwrite: bool,
+    ) -> None:
+        part_size = part_size_for(size, self.part_size)
+        upload_id = self.scheduler.call(self.client.create_multipart_upload, key, operation="create_multipart")
+        etags: List[Tuple[int, str]] = []
+        lock = threading.Lock()
+
+        def _send(number: int, data: Any) -> None:
+            if isinstance(data, tuple):
+                data = read_part(source, *data)
+            etag = self.scheduler.call(
+                self.client.upload_part, key, upload_id, number, data, operation="upload_part"
+            )
+            add_bytes(len(data))
+            with lock:
+                etags.append((number, etag))
+
+        if parts is None:
+            # Известный размер: каждая часть читается воркером по своему смещению
+            count = max(1, -(-size // part_size))
+            parts = ((i * part_size, min(part_size, size - i * part_size)) for i in range(count))
+        try:
+            _run_parts(parts, _send, self.max_concurrency)
+            self.scheduler.call(
+                self.client.complete_multipart_upload, key, upload_id, etags, overwrite,
+                operation="complete_multipart",
+            )
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(key, upload_id)
+            except Exception:
+                pass
+            raise
+
+    def _multipart_copy(self, src_key: str, key: str, size: int, overwrite: bool) -> None:
+        part_size = part_size_for(size, max(self.part_size, COPY_PART_SIZE))
+        upload_id = self.scheduler.call(self.client.create_multipart_upload, key, operation="create_multipart")
+        etags: List[Tuple[int, str]] = []
+        lock = threading.Lock()
+
+        def _send(number: int, start: int) -> None:
+            end = min(start + part_size, size) - 1
+            etag = self.scheduler.call(
+                self.client.upload_part_copy, key, upload_id, number, src_key, start, end,
+                operation="upload_part_copy",
+            )
+            with lock:
+                etags.append((number, etag))
+
+        try:
+            _run_parts(range(0, size, part_size), _send, self.max_concurrency)
+            self.scheduler.call(
+                self.client.complete_multipart_upload, key, upload_id, etags, overwrite,
+                operation="complete_multipart",
+            )
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(key, upload_id)
+            except Exception:
+                pass
+            raise
+
+
+def _run_parts(parts: Iterable[Any], send, max_concurrency: int) -> None:
+    """
+    Отправляет части в пуле потоков, держа в работе не более max_concurrency частей.
+
+    Следующая часть берется из parts только когда освободилось место, поэтому
+    в памяти одновременно находится не более max_concurrency частей.
+    """
+    slots = threading.BoundedSemaphore(max_concurrency)
+    failed: List[BaseException] = []
+    futures: List[Future] = []
 
-        if not self._path.exists():
-            raise FileNotFoundError(f"Video file does not exist: {self._path}")
+    def _done(future: Future) -> None:
+        slots.release()
+        if future.exception() is not None:
+            failed.append(future.exception())
 
-    def get_uri(self) -> str:
-        """ Возвращает абсолютный путь к файлу. """
-        return str(self._path)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for number, data in enumerate(parts, 1):
+            slots.acquire()
+            if failed:
+                slots.release()
+                break
+            future = executor.submit(contextvars.copy_context().run, send, number, data)
+            future.add_done_callback(_done)
+            futures.append(future)
+    for future in futures:
+        future.result()
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .path_utils import is_subpath, normalize_path
+
+
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+DEFAULT_THRESHOLD = 64 * 1024 * 1024
+
+
+class SegmentedDownload:
+    """
+    Состояние сегментированного скачивания большого файла.
+
+    Данные пишутся в предварительно выделенный файл "<имя>.part", список
+    скачанных сегментов хранится в файле прогресса "<имя>.part.json".
+    Если скачивание прервалось, при следующем запуске с теми же размером,
+    хэшем и размером сегмента докачиваются только недостающие сегменты.
+    """
+
+    def __init__(
+        self,
+        local_path: Path,
+        size: int,
+        md5: Optional[str] = None,
+        sha256: Optional[str] = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+    ):
+        """
+        Args:
+            local_path: Итоговый путь к файлу
+            size: Размер файла в облаке
+            md5: MD5-хэш файла в облаке
+            sha256: SHA256-хэш файла в облаке
+            segment_size: Размер сегмента в байтах
+        """
+        if segment_size <= 0:
+            raise ValueError("segment_size должен быть положительным")
+        self.local_path = Path(local_path)
+        self.part_path = self.local_path.with_name(self.local_path.name + ".part")
+        self.progress_path = self.local_path.with_name(self.local_path.name + ".part.json")
+        self.size = size
+        self.md5 = md5
+        self.sha256 = sha256
+        self.segment_size = segment_size
+        self.done: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def segment_count(self) -> int:
+        return max(1, -(-self.size // self.segment_size))
+
+    def segment_range(self, index: int) -> Tuple[int, int]:
+        """Возвращает границы сегмента (включительно) для заголовка Range."""
+        start = index * self.segment_size
+        return start, min(start + self.segment_size, self.size) - 1
+
+    def pending_segments(self) -> List[int]:
+        """Номера сегментов, которые еще не скачаны."""
+        return [i for i in range(self.segment_count) if i not in self.done]
+
+    def prepare(self) -> None:
+        """
+        Восстанавливает прогресс прошлой попытки или выделяет новый файл.
+        """
+        self.local_path.parent.mkdir(parents=True, exist_ok=True)
+        progress = self._load_progress()
+        if (
+            progress is not None
+            and progress.get("size") == self.size
+            and progress.get("md5") == self.md5
+            and progress.get("sha256") == self.sha256
+            and progress.get("segment_size") == self.segment_size
+            and self.part_path.exists()
+            and self.part_path.stat().st_size == self.size
+        ):
+            self.done = set(progress.get("done", []))
+            return
+        self.done = set()
+        with open(self.part_path, "wb") as f:
+            f.truncate(self.size)
+        self._save_progress()
+
+    def write_at(self, offset: int) -> "SegmentWriter":
+        """Открывает файл для записи сегмента с указанного смещения."""
+        return SegmentWriter(self.part_path, offset)
+
+    def mark_done(self, index: int) -> None:
+        """Отмечает сегмент скачанным и сохраняет прогресс."""
+        with self._lock:
+            self.done.add(index)
+            self._save_progress()
+
+    def verify(self) -> bool:
+        """
+        Сверяет хэш скачанного файла с хэшем в облаке.
+
+        Используется SHA256, если он известен, иначе MD5.
+        Если облако не сообщило хэш, проверяется только размер.
+        """
+        if self.part_path.stat().st_size != self.size:
+            return False
+        expected, digest = (self.sha256, hashlib.sha256()) if self.sha256 else (self.md5, hashlib.md5())
+        if not expected:
+            return True
+        with open(self.part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest().lower() == expected.lower()
+
+    def finalize(self) -> None:
+        """Переименовывает скачанный файл и удаляет файл прогресса."""
+        os.replace(self.part_path, self.local_path)
+        self.progress_path.unlink(missing_ok=True)
+
+    def discard(self) -> None:
+        """Удаляет скачанные данные и прогресс (например, при несовпадении хэша)."""
+        self.part_path.unlink(missing_ok=True)
+        self.progress_path.unlink(missing_ok=True)
+        self.done = set()
+
+    def _load_progress(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.progress_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_progress(self) -> None:
+        # Пишем во временный файл и атомарно заменяем, чтобы прогресс
+        # не повредился при прерывании процесса
+        tmp_path = self.progress_path.with_name(self.progress_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "size": self.size,
+                "md5": self.md5,
+                "sha256": self.sha256,
+                "segment_size": self.segment_size,
+                "done": sorted(self.done),
+            }, f)
+        os.replace(tmp_path, self.progress_path)
+
+
+class SegmentWriter:
+    """Запись фрагментов сегмента в файл начиная с заданного смещения."""
+
+    def __init__(self, path: Path, offset: int):
+        self.written = 0
+        self._file = open(path, "r+b")
+        self._file.seek(offset)
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self.written += len(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "SegmentWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class RangeNotSupportedError(Exception):
+    """Сервер вернул весь файл вместо запрошенного диапазона."""
+
+
+class DownloadLinkCache:
+    """
+    Кэш ссылок на скачивание файлов.
+
+    Ссылка на скачивание действует несколько часов, поэтому при частых
+    Range-чтениях одного файла (см. read_range) ее не нужно запрашивать
+    перед каждым чтением. Запись удаляется по истечении ttl, при
+    изменении файла и после ошибки запроса по ссылке.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 4096):
+        """
+        Args:
+            ttl: Время жизни ссылки в кэше, сек (0 - кэш отключен)
+            max_entries: Максимальное количество ссылок в кэше
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[str]:
+        key = normalize_path(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, path: str, link: str) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        key = normalize_path(path)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), link)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(normalize_path(path), None)
+
+    def invalidate_tree(self, path: str) -> None:
+        """Удаляет ссылки на path и все файлы внутри него."""
+        root = normalize_path(path)
+        with self._lock:
+            for key in [key for key in self._entries if is_subpath(key, root)]:
+                del self._entries[key]
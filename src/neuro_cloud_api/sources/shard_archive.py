@@ -0,0 +1,538 @@
+import concurrent.futures
+import contextvars
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .path_utils import join_path, normalize_path
+from .transfer import run_bounded
+
+
+DEFAULT_SHARD_SIZE = 256 * 1024 * 1024
+# Члены шарда, между которыми не больше max_gap байт, читаются одним запросом
+DEFAULT_MAX_GAP = 1024 * 1024
+DEFAULT_MAX_REQUEST = 32 * 1024 * 1024
+INDEX_NAME = "index.tsv.gz"
+
+_INDEX_MAGIC = "#neuro-shards"
+_INDEX_VERSION = 1
+
+
+def _padded(size: int) -> int:
+    """Размер данных члена tar с выравниванием до блока."""
+    return -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+
+@dataclass(frozen=True)
+class ShardMember:
+    """
+    Положение файла в шардах.
+
+    name: str - Имя файла в наборе
+    shard: int - Номер шарда
+    offset: int - Смещение данных файла в шарде
+    size: int - Размер файла в байтах
+    """
+    name: str
+    shard: int
+    offset: int
+    size: int
+
+
+class ShardIndex:
+    """
+    Индекс набора шардов: имя файла -> (номер шарда, смещение, размер).
+
+    Хранится отдельно от шардов как текст "имя<TAB>шард<TAB>смещение<TAB>размер",
+    сжатый gzip: имена файлов одного набора похожи, поэтому индекс миллиона
+    файлов занимает единицы мегабайт и читается одним запросом.
+    """
+
+    def __init__(self, prefix: str = "shard", shard_count: int = 0):
+        """
+        Args:
+            prefix: Префикс имен шардов ("<prefix>-00000.tar")
+            shard_count: Количество шардов в наборе
+        """
+        self.prefix = prefix
+        self.shard_count = shard_count
+        self._members: Dict[str, Tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def shard_name(self, shard: int) -> str:
+        """Имя файла шарда по номеру."""
+        return f"{self.prefix}-{shard:05d}.tar"
+
+    def add(self, member: ShardMember) -> None:
+        if member.name in self._members:
+            raise ValueError(f"Файл {member.name} уже есть в наборе")
+        self._members[member.name] = (member.shard, member.offset, member.size)
+        self.shard_count = max(self.shard_count, member.shard + 1)
+
+    def get(self, name: str) -> ShardMember:
+        """
+        Положение файла в шардах.
+
+        Raises:
+            KeyError: Если файла нет в наборе
+        """
+        try:
+            shard, offset, size = self._members[name]
+        except KeyError:
+            raise KeyError(f"Файла {name} нет в наборе") from None
+        return ShardMember(name, shard, offset, size)
+
+    def members(self) -> Iterator[ShardMember]:
+        """Все файлы набора в порядке упаковки."""
+        for name, (shard, offset, size) in self._members.items():
+            yield ShardMember(name, shard, offset, size)
+
+    def dumps(self) -> bytes:
+        """Индекс в формате хранения (gzip)."""
+        lines = [f"{_INDEX_MAGIC}\t{_INDEX_VERSION}\t{self.prefix}\t{self.shard_count}\n"]
+        lines.extend(
+            f"{name}\t{shard}\t{offset}\t{size}\n" for name, (shard, offset, size) in self._members.items()
+        )
+        return gzip.compress("".join(lines).encode("utf-8"), mtime=0)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "ShardIndex":
+        """
+        Индекс из формата хранения.
+
+        Raises:
+            ValueError: Если данные не являются индексом шардов
+        """
+        # Записи разделяются только \n: splitlines разрывал бы и имена с \x1c или \u2028
+        lines = gzip.decompress(data).decode("utf-8").split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        header = lines[0].split("\t") if lines else []
+        if len(header) != 4 or header[0] != _INDEX_MAGIC:
+            raise ValueError("Данные не являются индексом шардов")
+        if int(header[1]) != _INDEX_VERSION:
+            raise ValueError(f"Неподдерживаемая версия индекса шардов: {header[1]}")
+        index = cls(header[2], int(header[3]))
+        members = index._members
+        for line in lines[1:]:
+            name, shard, offset, size = line.rsplit("\t", 3)
+            members[name] = (int(shard), int(offset), int(size))
+        return index
+
+
+class ShardWriter:
+    """
+    Упаковка файлов в шарды tar фиксированного размера.
+
+    Шард закрывается, когда следующий файл не помещается в shard_size
+    (файл больше shard_size занимает отдельный шард). Шарды - обычные
+    несжатые tar-архивы: данные каждого файла лежат в шарде непрерывно,
+    их смещение записывается в индекс, поэтому файл читается из шарда
+    одним Range-запросом.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        prefix: str = "shard",
+        on_shard: Optional[Callable[[int, Path], Any]] = None,
+    ):
+        """
+        Args:
+            directory: Локальная директория для шардов
+            shard_size: Размер шарда в байтах
+            prefix: Префикс имен шардов
+            on_shard: Вызывается on_shard(номер, путь) для каждого готового шарда
+        """
+        if shard_size <= 0:
+            raise ValueError("shard_size должен быть положительным")
+        self.directory = Path(directory)
+        self.shard_size = shard_size
+        self.on_shard = on_shard
+        self.index = ShardIndex(prefix)
+        self._shard = -1
+        self._tar: Optional[tarfile.TarFile] = None
+        self._closed = False
+
+    def add(self, name: str, data: Union[str, Path, bytes]) -> ShardMember:
+        """
+        Добавляет файл в текущий шард.
+
+        Args:
+            name: Имя файла в наборе (по нему файл читается из шардов)
+            data: Путь к локальному файлу или содержимое
+
+        Returns:
+            Положение файла в шардах
+        """
+        if self._closed:
+            raise RuntimeError("Упаковка завершена")
+        if not name or any(char in name for char in "\t\r\n"):
+            raise ValueError(f"Недопустимое имя файла: {name!r}")
+        if name in self.index:
+            raise ValueError(f"Файл {name} уже есть в наборе")
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+            size, mtime = len(data), time.time()
+        else:
+            stat = os.stat(data)
+            size, mtime = stat.st_size, stat.st_mtime
+
+        if self._tar is None or (
+            self._tar.offset and self._tar.offset + tarfile.BLOCKSIZE + _padded(size) > self.shard_size
+        ):
+            self._next_shard()
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(mtime)
+        info.mode = 0o644
+        if isinstance(data, bytes):
+            self._tar.addfile(info, io.BytesIO(data))
+        else:
+            with open(data, "rb") as file:
+                self._tar.addfile(info, file)
+        # После addfile позиция архива стоит за выровненными данными файла
+        member = ShardMember(name, self._shard, self._tar.offset - _padded(size), size)
+        self.index.add(member)
+        return member
+
+    def close(self) -> ShardIndex:
+        """Закрывает последний шард и возвращает индекс набора."""
+        if not self._closed:
+            self._closed = True
+            self._finish_shard()
+        return self.index
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def abort(self) -> None:
+        """Прерывает упаковку: текущий шард закрывается без вызова on_shard."""
+        self._closed = True
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+    def _next_shard(self) -> None:
+        self._finish_shard()
+        self._shard += 1
+        self.index.shard_count = self._shard + 1
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._tar = tarfile.open(self.directory / self.index.shard_name(self._shard), "w")
+
+    def _finish_shard(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._tar = None
+        if self.on_shard is not None:
+            self.on_shard(self._shard, self.directory / self.index.shard_name(self._shard))
+
+
+def pack_files(
+    source: Any,
+    files: Iterable[Tuple[str, Union[str, Path, bytes]]],
+    remote_dir: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    prefix: str = "shard",
+    max_workers: int = 4,
+    overwrite: bool = False,
+    workdir: Optional[Union[str, Path]] = None,
+) -> ShardIndex:
+    """
+    Упаковывает файлы в шарды и загружает их вместе с индексом в remote_dir.
+
+    Готовый шард загружается, пока пакуются следующие; на диске одновременно
+    лежит не больше max_workers + 1 шардов. Индекс загружается последним,
+    поэтому читатели не увидят набор с недозагруженными шардами.
+
+    Args:
+        source: Синхронный источник (для асинхронного - BridgedSource)
+        files: Пары (имя в наборе, путь к локальному файлу или содержимое)
+        remote_dir: Директория набора в облаке
+        shard_size: Размер шарда в байтах
+        prefix: Префикс имен шардов
+        max_workers: Количество одновременно загружаемых шардов
+        overwrite: Перезаписывать существующие шарды и индекс
+        workdir: Директория для временных шардов (по умолчанию системная)
+
+    Returns:
+        Индекс набора
+
+    Raises:
+        IOError: Если шард или индекс не удалось загрузить
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers должен быть положительным")
+    remote_dir = normalize_path(remote_dir)
+
+    def _upload(path: Path, remote_path: str) -> None:
+        try:
+            if not source.upload_file(path, remote_path, overwrite=overwrite):
+                raise IOError(f"Не удалось загрузить шард {remote_path}")
+        finally:
+            path.unlink(missing_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="shards-", dir=workdir) as tmp_dir, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploads: List[Future] = []
+
+        def _on_shard(shard: int, path: Path) -> None:
+            remote_path = join_path(remote_dir, writer.index.shard_name(shard))
+            # Контекст копируется, чтобы загрузки попали в событие вызывающей операции
+            uploads.append(executor.submit(contextvars.copy_context().run, _upload, path, remote_path))
+            pending = [future for future in uploads if not future.done()]
+            if len(pending) > max_workers:
+                concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in uploads:
+                if future.done():
+                    # Ошибка загрузки прерывает упаковку
+                    future.result()
+
+        writer = ShardWriter(tmp_dir, shard_size, prefix, on_shard=_on_shard)
+        try:
+            for name, data in files:
+                writer.add(name, data)
+            index = writer.close()
+        except BaseException:
+            writer.abort()
+            for future in uploads:
+                future.cancel()
+            raise
+        for future in uploads:
+            future.result()
+
+    # Источник с отложенной записью (TieredSource) должен отправить шарды раньше индекса
+    flush = getattr(source, "flush", None)
+    if callable(flush) and flush() is False:
+        raise IOError(f"Не удалось загрузить шарды в {remote_dir}")
+    index_path = join_path(remote_dir, INDEX_NAME)
+    if not source.upload_file(index.dumps(), index_path, overwrite=overwrite):
+        raise IOError(f"Не удалось загрузить индекс {index_path}")
+    return index
+
+
+def pack_directory(
+    source: Any,
+    local_dir: Union[str, Path],
+    remote_dir: str,
+    **kwargs: Any,
+) -> ShardIndex:
+    """
+    Упаковывает все файлы локальной директории (рекурсивно) в шарды.
+
+    Имена файлов в наборе - пути относительно local_dir через "/".
+    Остальные параметры - как у pack_files.
+    """
+    root = Path(local_dir)
+    files = (
+        (path.relative_to(root).as_posix(), path)
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    )
+    return pack_files(source, files, remote_dir, **kwargs)
+
+
+@dataclass
+class _Span:
+    """Непрерывный диапазон шарда, покрывающий несколько файлов."""
+    shard: int
+    start: int
+    end: int
+    members: List[ShardMember] = field(default_factory=list)
+
+
+def _plan_reads(members: Iterable[ShardMember], max_gap: int, max_request: int) -> List[_Span]:
+    """
+    Объединяет близкие файлы одного шарда в общие диапазоны.
+
+    Файлы, между которыми не больше max_gap байт, читаются одним запросом
+    размером до max_request: вместо запроса на каждый маленький файл
+    выполняется несколько больших.
+    """
+    spans: List[_Span] = []
+    for member in sorted(set(members), key=lambda member: (member.shard, member.offset)):
+        end = member.offset + member.size
+        span = spans[-1] if spans else None
+        if (
+            span is not None and span.shard == member.shard
+            and member.offset - span.end <= max_gap and end - span.start <= max_request
+        ):
+            span.end = max(span.end, end)
+            span.members.append(member)
+        else:
+            spans.append(_Span(member.shard, member.offset, end, [member]))
+    return spans
+
+
+def _split(span: _Span, data: bytes, results: Dict[str, bytes]) -> None:
+    for member in span.members:
+        start = member.offset - span.start
+        results[member.name] = data[start:start + member.size]
+
+
+class _ReaderBase:
+    def __init__(
+        self,
+        source: Any,
+        remote_dir: str,
+        index: ShardIndex,
+        max_gap: int = DEFAULT_MAX_GAP,
+        max_request: int = DEFAULT_MAX_REQUEST,
+    ):
+        if max_gap < 0 or max_request <= 0:
+            raise ValueError("Нужно max_gap >= 0 и max_request > 0")
+        self.source = source
+        self.remote_dir = normalize_path(remote_dir)
+        self.index = index
+        self.max_gap = max_gap
+        self.max_request = max_request
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> List[str]:
+        """Имена всех файлов набора в порядке упаковки."""
+        return list(self.index)
+
+    def shard_path(self, shard: int) -> str:
+        """Путь к шарду в облаке."""
+        return join_path(self.remote_dir, self.index.shard_name(shard))
+
+    def _plan(self, names: Sequence[str]) -> List[_Span]:
+        return _plan_reads((self.index.get(name) for name in names), self.max_gap, self.max_request)
+
+
+class ShardReader(_ReaderBase):
+    """
+    Чтение отдельных файлов из шардов Range-запросами.
+
+    Файл читается одним запросом нужного диапазона шарда, шард целиком
+    не скачивается. read_many объединяет близкие файлы одного шарда
+    в общие запросы, поэтому пакетное чтение маленьких файлов идет со
+    скоростью чтения больших. Источник должен поддерживать read_range.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        remote_dir: str,
+        index: ShardIndex,
+        max_gap: int = DEFAULT_MAX_GAP,
+        max_request: int = DEFAULT_MAX_REQUEST,
+    ):
+        """
+        Args:
+            source: Синхронный источник с read_range
+            remote_dir: Директория набора в облаке
+            index: Индекс набора (см. open)
+            max_gap: Максимальный промежуток между файлами, читаемыми одним запросом, байт
+            max_request: Максимальный размер одного запроса read_many, байт
+        """
+        super().__init__(source, remote_dir, index, max_gap, max_request)
+
+    @classmethod
+    def open(cls, source: Any, remote_dir: str, **kwargs: Any) -> "ShardReader":
+        """
+        Загружает индекс набора из remote_dir.
+
+        Raises:
+            IOError: Если индекс не удалось скачать
+        """
+        index_path = join_path(normalize_path(remote_dir), INDEX_NAME)
+        buffer = io.BytesIO()
+        if not source.download_fileobj(index_path, buffer):
+            raise IOError(f"Не удалось скачать индекс {index_path}")
+        return cls(source, remote_dir, ShardIndex.loads(buffer.getvalue()), **kwargs)
+
+    def read(self, name: str) -> bytes:
+        """
+        Содержимое файла набора.
+
+        Raises:
+            KeyError: Если файла нет в наборе
+        """
+        member = self.index.get(name)
+        return self.source.read_range(self.shard_path(member.shard), member.offset, member.size)
+
+    def read_many(self, names: Sequence[str], max_workers: int = 8) -> List[bytes]:
+        """
+        Содержимое нескольких файлов; близкие файлы читаются общими запросами.
+
+        Args:
+            names: Имена файлов набора
+            max_workers: Количество одновременных запросов
+
+        Returns:
+            Содержимое файлов в порядке names
+        """
+        spans = self._plan(names)
+        results: Dict[str, bytes] = {}
+
+        def _read(span: _Span) -> None:
+            _split(span, self.source.read_range(self.shard_path(span.shard), span.start, span.end - span.start), results)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Контекст копируется, чтобы объем запросов попал в событие вызывающей операции
+            for future in [executor.submit(contextvars.copy_context().run, _read, span) for span in spans]:
+                future.result()
+        return [results[name] for name in names]
+
+    def extract(self, name: str, local_path: Union[str, Path]) -> None:
+        """Сохраняет файл набора в local_path."""
+        local_path = Path(local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_path.write_bytes(self.read(name))
+
+
+class AsyncShardReader(_ReaderBase):
+    """Асинхронный вариант ShardReader для асинхронных источников."""
+
+    @classmethod
+    async def open(cls, source: Any, remote_dir: str, **kwargs: Any) -> "AsyncShardReader":
+        index_path = join_path(normalize_path(remote_dir), INDEX_NAME)
+        buffer = io.BytesIO()
+        if not await source.download_fileobj(index_path, buffer):
+            raise IOError(f"Не удалось скачать индекс {index_path}")
+        return cls(source, remote_dir, ShardIndex.loads(buffer.getvalue()), **kwargs)
+
+    async def read(self, name: str) -> bytes:
+        member = self.index.get(name)
+        return await self.source.read_range(self.shard_path(member.shard), member.offset, member.size)
+
+    async def read_many(self, names: Sequence[str], max_concurrency: int = 8) -> List[bytes]:
+        spans = self._plan(names)
+        results: Dict[str, bytes] = {}
+
+        async def _read(span: _Span) -> None:
+            data = await self.source.read_range(self.shard_path(span.shard), span.start, span.end - span.start)
+            _split(span, data, results)
+
+        await run_bounded(spans, _read, max_concurrency)
+        return [results[name] for name in names]
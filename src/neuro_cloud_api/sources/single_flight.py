@@ -0,0 +1,71 @@
+import asyncio
+
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """
+    Объединение одинаковых одновременных запросов (single-flight).
+
+    Пока запрос с ключом key выполняется, остальные вызовы run с тем же
+    ключом не отправляют свой запрос, а ждут общий и получают его
+    результат (или исключение). Запрос выполняется отдельной задачей:
+    отмена одного ожидающего не прерывает запрос для остальных, а когда
+    уходят все ожидающие, запрос отменяется. Результаты не кэшируются:
+    вызов после завершения запроса отправляет новый.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.started = 0
+        self.joined = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполняет запрос или присоединяется к уже выполняющемуся с тем же ключом.
+
+        Args:
+            key: Ключ запроса (операция и ее аргументы)
+            request: Функция, возвращающая корутину запроса
+
+        Returns:
+            Результат общего запроса
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(request()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.started += 1
+        else:
+            self.joined += 1
+        flight.waiters += 1
+        try:
+            # shield: отмена ожидающего не отменяет общий запрос
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Все ожидающие ушли: запрос больше никому не нужен
+                self._finish(key, flight)
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        # Новый запрос с тем же ключом мог уже занять место отмененного
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
@@ -1,9 +1,11 @@
-from typing import Optional, Union
+from dataclasses import replace
+from typing import Any, Dict, Optional, Union
 
 from .base_source import BaseSource
+from .registry import SourceRegistry, source_registry
+from .request_scheduler import RetryPolicy
 from .source_type import SourceType
-from .yadisk_source import YadiskSource
-from .async_yadisk_source import AsyncYadiskSource
+from .transport import TransportSettings, create_scheduler, default_registry
 from ..settings.config import NeuroCloudApiConfig
 
 
@@ -12,21 +14,28 @@ class SourceFactory:
     Фабрика для создания источников облачных хранилищ.
     Реализует паттерн Factory для автоматического выбора и создания
     соответствующего источника на основе типа.
+
+    Реализации источников берутся из реестра (SourceRegistry): модуль
+    источника импортируется только при создании первого экземпляра.
     """
 
+    # Реестр типов источников; сторонние источники регистрируются в нем
+    registry: SourceRegistry = source_registry
+
     @staticmethod
-    def parse(source_type: Union[str, SourceType, NeuroCloudApiConfig]) -> SourceType:
+    def parse(source_type: Union[str, SourceType, NeuroCloudApiConfig]) -> Union[SourceType, str]:
         """
         Определяет тип источника из различных входных данных.
 
         Args:
             source_type: Может быть:
-                - строкой ("yandex_disk", "google_drive", "s3")
+                - строкой ("yandex_disk", "google_drive", "s3" или имя
+                  стороннего источника из реестра)
                 - SourceType enum
                 - NeuroCloudApiConfig объект
 
         Returns:
-            SourceType enum
+            SourceType enum (для сторонних источников - имя типа из реестра)
 
         Raises:
             ValueError: Если тип источника не может быть определен
@@ -36,10 +45,159 @@ class SourceFactory:
         elif isinstance(source_type, NeuroCloudApiConfig):
             return source_type.source_type
         elif isinstance(source_type, str):
-            return SourceType.from_string(source_type)
+            try:
+                return SourceType.from_string(source_type)
+            except ValueError:
+                # Сторонний источник из реестра
+                return SourceFactory.registry.get(source_type).name
         else:
             raise ValueError(f"Неподдерживаемый тип аргумента: {type(source_type)}")
 
+    @staticmethod
+    def yadisk_options(token: Optional[str], config: Optional[NeuroCloudApiConfig]) -> Dict[str, Any]:
+        """
+        Параметры источника Яндекс.Диска, заданные в конфигурации.
+
+        Args:
+            token: Токен авторизации
+            config: Конфигурация (может отсутствовать)
+
+        Returns:
+            Словарь именованных аргументов для конструктора YadiskSource/AsyncYadiskSource
+        """
+        if config is None:
+            return {"token": token}
+        from .content_cache import ContentCache
+        from .remote_index import RemoteIndex
+
+        policy = RetryPolicy(max_retries=config.max_retries)
+        return {
+            "token": token,
+            "cache_ttl": config.cache_ttl,
+            "cache_max_entries": config.cache_max_entries,
+            "index": RemoteIndex(config.index_path) if config.index_path else None,
+            "content_cache": (
+                ContentCache(config.content_cache_dir, config.content_cache_max_bytes)
+                if config.content_cache_dir else None
+            ),
+            "transport": SourceFactory.transport_settings(config),
+            "registry": default_registry if config.share_clients else None,
+            "scheduler": (
+                default_registry.get_scheduler(config.token, config.rate_limit, config.rate_burst, policy)
+                if config.share_clients else create_scheduler(config.rate_limit, config.rate_burst, policy)
+            ),
+        }
+
+    @staticmethod
+    def transport_settings(config: NeuroCloudApiConfig) -> TransportSettings:
+        """
+        Настройки HTTP-транспорта из конфигурации.
+
+        Args:
+            config: Конфигурация
+
+        Returns:
+            TransportSettings
+        """
+        return TransportSettings(
+            pool_size=config.pool_size,
+            keepalive_expiry=config.keepalive_expiry,
+            connect_timeout=config.connect_timeout,
+            read_timeout=config.read_timeout,
+            http2=config.http2,
+        )
+
+    @staticmethod
+    def s3_options(token: Optional[str], config: Optional[NeuroCloudApiConfig]) -> Dict[str, Any]:
+        """
+        Параметры S3-источника, заданные в конфигурации.
+
+        Args:
+            token: Ключи доступа (берутся из config)
+            config: Конфигурация (для S3 обязательна: в ней задается бакет)
+
+        Returns:
+            Словарь именованных аргументов для конструктора S3Source/AsyncS3Source
+
+        Raises:
+            ValueError: Если не задан s3_bucket
+        """
+        if config is None or not config.s3_bucket:
+            raise ValueError("Для S3 необходимо передать config с s3_bucket")
+        from .s3_client import create_s3_scheduler
+
+        transport = SourceFactory.transport_settings(config)
+        # Пул соединений должен вмещать все одновременно передаваемые части
+        transport = replace(transport, pool_size=max(transport.pool_size, config.s3_max_concurrency))
+        return {
+            "bucket": config.s3_bucket,
+            "credentials": config.token or None,
+            "endpoint_url": config.s3_endpoint_url,
+            "region": config.s3_region,
+            "prefix": config.s3_prefix,
+            "part_size": config.s3_part_size,
+            "max_concurrency": config.s3_max_concurrency,
+            "multipart_threshold": config.s3_multipart_threshold,
+            "transport": transport,
+            "scheduler": create_s3_scheduler(
+                config.rate_limit, config.rate_burst, RetryPolicy(max_retries=config.max_retries)
+            ),
+        }
+
+    @staticmethod
+    def gdrive_options(token: Optional[str], config: Optional[NeuroCloudApiConfig]) -> Dict[str, Any]:
+        """
+        Параметры источника Google Drive, заданные в конфигурации.
+
+        Args:
+            token: OAuth-токен доступа
+            config: Конфигурация (может отсутствовать)
+
+        Returns:
+            Словарь именованных аргументов для конструктора GoogleDriveSource/AsyncGoogleDriveSource
+        """
+        if config is None:
+            return {"token": token}
+        from .gdrive_client import create_drive_scheduler
+
+        return {
+            "token": token,
+            "api_url": config.gdrive_api_url,
+            "root_id": config.gdrive_root_id,
+            "chunk_size": config.gdrive_chunk_size,
+            "id_cache_ttl": config.gdrive_id_cache_ttl,
+            "transport": SourceFactory.transport_settings(config),
+            "scheduler": create_drive_scheduler(
+                config.rate_limit, config.rate_burst, RetryPolicy(max_retries=config.max_retries)
+            ),
+        }
+
+    @staticmethod
+    def with_tier(source: BaseSource, config: Optional[NeuroCloudApiConfig]) -> BaseSource:
+        """
+        Оборачивает источник локальным уровнем, если в конфигурации задан tier_dir.
+
+        Args:
+            source: Синхронный облачный источник
+            config: Конфигурация (может отсутствовать)
+
+        Returns:
+            TieredSource или исходный источник
+        """
+        if config is None or not config.tier_dir:
+            return source
+        from .tiered_source import TieredSource
+
+        return TieredSource(
+            source,
+            config.tier_dir,
+            max_bytes=config.tier_max_bytes,
+            max_pending=config.tier_max_pending,
+            workers=config.tier_workers,
+            write_through=config.tier_write_through,
+            max_age=config.tier_max_age,
+        )
+
     @staticmethod
     def create_source(
         token: Optional[str] = None,
@@ -72,15 +230,8 @@ class SourceFactory:
         else:
             raise ValueError("Необходимо указать source_type или config")
 
-        # Создаем соответствующий источник на основе типа
-        if source_type_enum == SourceType.YANDEX_DISK:
-            return YadiskSource(token=token)
-        elif source_type_enum == SourceType.GOOGLE_DRIVE:
-            raise NotImplementedError("Google Drive источник еще не реализован")
-        elif source_type_enum == SourceType.S3:
-            raise NotImplementedError("S3 источник еще не реализован")
-        else:
-            raise ValueError(f"Неподдерживаемый тип источника: {source_type_enum}")
+        source = SourceFactory.registry.create(source_type_enum, token, config)
+        return SourceFactory.with_tier(source, config)
 
     @staticmethod
     def create_async_source(
@@ -114,15 +265,60 @@ class SourceFactory:
         else:
             raise ValueError("Необходимо указать source_type или config")
 
-        # Создаем соответствующий асинхронный источник на основе типа
-        if source_type_enum == SourceType.YANDEX_DISK:
-            return AsyncYadiskSource(token=token)
-        elif source_type_enum == SourceType.GOOGLE_DRIVE:
-            raise NotImplementedError("Google Drive асинхронный источник еще не реализован")
-        elif source_type_enum == SourceType.S3:
-            raise NotImplementedError("S3 асинхронный источник еще не реализован")
+        if config is not None and config.tier_dir:
+            raise NotImplementedError("Локальный уровень (tier_dir) поддерживается только синхронными источниками")
+
+        return SourceFactory.registry.create(source_type_enum, token, config, asynchronous=True)
+
+    @staticmethod
+    def create_bridged_source(
+        token: Optional[str] = None,
+        source_type: Optional[Union[str, SourceType, NeuroCloudApiConfig]] = None,
+        config: Optional[NeuroCloudApiConfig] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> BaseSource:
+        """
+        Создает синхронный источник поверх асинхронного (BridgedSource).
+
+        Асинхронный источник создается в событийном цикле фонового потока;
+        блокирующие методы ждут результата, а submit_* возвращают Future.
+        Если в конфигурации задан tier_dir, мост оборачивается локальным уровнем.
+
+        Args:
+            token: Токен для авторизации (опционально, если передан config)
+            source_type: Тип источника (строка, SourceType или NeuroCloudApiConfig)
+            config: Конфигурация (если передан, source_type и token игнорируются)
+            max_concurrency: Максимум одновременных передач submit_*
+                (None - bridge_max_concurrency из конфигурации или 64)
+
+        Returns:
+            BridgedSource (или TieredSource поверх него)
+
+        Raises:
+            ValueError: Если тип источника не поддерживается
+            NotImplementedError: Если асинхронный источник еще не реализован
+        """
+        if config is not None:
+            source_type_enum = config.source_type
+            token = config.token
+        elif source_type is not None:
+            source_type_enum = SourceFactory.parse(source_type)
+            if token is None:
+                raise ValueError("Необходимо указать token или передать config")
         else:
-            raise ValueError(f"Неподдерживаемый тип источника: {source_type_enum}")
+            raise ValueError("Необходимо указать source_type или config")
+
+        if max_concurrency is None:
+            max_concurrency = config.bridge_max_concurrency if config is not None else 64
+        # Класс проверяется заранее, чтобы не запускать цикл для неподдерживаемого типа
+        SourceFactory.registry.source_class(source_type_enum, asynchronous=True)
+        from .bridged_source import BridgedSource
+
+        source = BridgedSource(
+            lambda: SourceFactory.registry.create(source_type_enum, token, config, asynchronous=True),
+            max_concurrency=max_concurrency,
+        )
+        return SourceFactory.with_tier(source, config)
 
     @staticmethod
     def create_source_from_config(config: NeuroCloudApiConfig) -> BaseSource:
@@ -130,14 +326,26 @@ class SourceFactory:
         Создает источник на основе конфигурации.
         Автоматически выбирает синхронный или асинхронный источник
         в зависимости от параметра async_enabled в конфиге.
+        Если задан tier_dir, синхронный источник оборачивается локальным уровнем.
+        Если в конфиге bridge_enabled, синхронный источник создается как BridgedSource.
 
         Args:
             config: Конфигурация NeuroCloudApiConfig
 
         Returns:
             Экземпляр соответствующего источника (BaseSource)
+
+        Raises:
+            ValueError: Если одновременно заданы async_enabled и tier_dir
         """
+        if config.async_enabled and config.tier_dir:
+            raise ValueError(
+                "Локальный уровень (tier_dir) поддерживается только синхронными источниками: "
+                "задайте async_enabled=False (при необходимости вместе с bridge_enabled=True)"
+            )
         if config.async_enabled:
             return SourceFactory.create_async_source(config=config)
+        elif config.bridge_enabled:
+            return SourceFactory.create_bridged_source(config=config)
         else:
             return SourceFactory.create_source(config=config)
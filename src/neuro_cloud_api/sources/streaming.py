@@ -0,0 +1,292 @@
+import asyncio
+import inspect
+import os
+
+from pathlib import Path
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, BinaryIO, Callable, Iterable, Iterator, List, Optional, Union
+)
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Источник данных для загрузки: буфер, file-like объект или генератор фрагментов
+UploadData = Union[bytes, bytearray, memoryview, BinaryIO, Iterable[bytes], AsyncIterable[bytes]]
+BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+class AsyncChunkQueueWriter:
+    """
+    Асинхронный file-like объект, передающий записанные данные в очередь.
+
+    Используется как приемник для client.download: каждый полученный из сети
+    фрагмент попадает в ограниченную очередь, из которой его читает
+    потребитель. Заполненная очередь приостанавливает скачивание.
+    """
+
+    def __init__(self, max_chunks: int = 8):
+        """
+        Args:
+            max_chunks: Максимальное количество фрагментов в очереди
+        """
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=max_chunks)
+
+    def seekable(self) -> bool:
+        # Поток нельзя перемотать, поэтому yadisk не будет повторять скачивание
+        # с середины и не будет вызывать tell/seek
+        return False
+
+    async def write(self, data: bytes) -> int:
+        await self.queue.put(bytes(data))
+        return len(data)
+
+
+async def iter_chunks(
+    download: Callable[[AsyncChunkQueueWriter], Awaitable[None]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_chunks: int = 8,
+) -> AsyncIterator[bytes]:
+    """
+    Превращает скачивание в file-like объект в асинхронный итератор фрагментов.
+
+    Скачивание выполняется в фоновой задаче; если потребитель прекращает
+    итерацию раньше времени, задача отменяется.
+
+    Args:
+        download: Корутина, записывающая данные в переданный writer
+        chunk_size: Размер выдаваемых фрагментов в байтах (последний может быть меньше)
+        max_chunks: Максимальное количество непрочитанных фрагментов в очереди
+
+    Yields:
+        Фрагменты данных
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+    writer = AsyncChunkQueueWriter(max_chunks)
+
+    async def _produce() -> None:
+        try:
+            await download(writer)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await writer.queue.put(None)
+            raise
+        await writer.queue.put(None)
+
+    task = asyncio.ensure_future(_produce())
+    buffer = bytearray()
+    try:
+        while True:
+            data = await writer.queue.get()
+            if data is None:
+                break
+            buffer += data
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        # Пробрасываем ошибку скачивания, если она была
+        await task
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+def is_local_path(value: Any) -> bool:
+    """Проверяет, является ли источник загрузки путем к локальному файлу."""
+    return isinstance(value, (str, os.PathLike))
+
+
+def payload_size(data: Any) -> Optional[int]:
+    """Размер данных в байтах, если его можно узнать без чтения."""
+    if isinstance(data, BYTES_LIKE):
+        return memoryview(data).nbytes
+    return None
+
+
+def upload_position(data: Any) -> Optional[int]:
+    """
+    Позиция, к которой нужно перемотать file-like объект перед повтором загрузки.
+
+    Returns:
+        Текущая позиция или None, если объект не file-like или не перематывается
+    """
+    if not hasattr(data, "read") or not hasattr(data, "seek"):
+        return None
+    try:
+        seekable = data.seekable()
+        if asyncio.iscoroutine(seekable):
+            # Асинхронные файлы (aiofiles и т.п.) не перематываем
+            seekable.close()
+            return None
+        return data.tell() if seekable else None
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def is_replayable(data: Any) -> bool:
+    """
+    Проверяет, можно ли отправить данные повторно (при повторе запроса).
+
+    Буферы и коллекции перечитываются заново, перематываемые файлы
+    перематываются; одноразовые генераторы и потоки повторить нельзя.
+    """
+    if isinstance(data, BYTES_LIKE) or is_local_path(data):
+        return True
+    if hasattr(data, "read"):
+        return upload_position(data) is not None
+    if isinstance(data, AsyncIterable):
+        return False
+    if isinstance(data, Iterable):
+        return iter(data) is not data
+    return False
+
+
+def _iter_view(data: Union[bytes, bytearray, memoryview], chunk_size: int) -> Iterator[memoryview]:
+    # Срезы memoryview ссылаются на исходный буфер и не копируют данные
+    view = memoryview(data).cast("B")
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+def sync_payload(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Приводит данные к виду, который принимает yadisk.Client.upload.
+
+    Буферы передаются фрагментами без копирования всего буфера, причем через
+    функцию-фабрику генератора, чтобы yadisk мог повторить загрузку.
+
+    Args:
+        data: bytes, bytearray, memoryview, file-like объект или итератор фрагментов
+        chunk_size: Размер фрагмента для буферов
+
+    Returns:
+        File-like объект или функция, возвращающая итератор фрагментов
+    """
+    if isinstance(data, BYTES_LIKE):
+        return lambda: _iter_view(data, chunk_size)
+    if hasattr(data, "read"):
+        return data
+    if isinstance(data, Iterable):
+        return lambda: iter(data)
+    raise TypeError(f"Неподдерживаемый источник данных для загрузки: {type(data)}")
+
+
+def async_payload(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Приводит данные к виду, который принимает yadisk.AsyncClient.upload.
+
+    Args:
+        data: bytes, bytearray, memoryview, file-like объект (синхронный или
+            асинхронный) или (асинхронный) итератор фрагментов
+        chunk_size: Размер фрагмента для буферов
+
+    Returns:
+        File-like объект или функция, возвращающая асинхронный итератор фрагментов
+    """
+    if isinstance(data, BYTES_LIKE):
+        async def _from_buffer() -> AsyncIterator[memoryview]:
+            for chunk in _iter_view(data, chunk_size):
+                yield chunk
+        return _from_buffer
+    if hasattr(data, "read"):
+        return data
+    if isinstance(data, AsyncIterable):
+        return lambda: data.__aiter__()
+    if isinstance(data, Iterable):
+        async def _from_iterable() -> AsyncIterator[bytes]:
+            for chunk in data:
+                yield chunk
+        return _from_iterable
+    raise TypeError(f"Неподдерживаемый источник данных для загрузки: {type(data)}")
+
+
+def read_part(source: Any, offset: int, length: int) -> bytes:
+    """Читает часть локального файла (Path) или буфера начиная со смещения offset."""
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+    return bytes(source[offset:offset + length])
+
+
+def iter_parts(source: Any, part_size: int) -> Iterator[bytes]:
+    """Нарезает file-like объект или итератор фрагментов на части по part_size байт."""
+    if hasattr(source, "read"):
+        while True:
+            data = source.read(part_size)
+            if not data:
+                return
+            # read может вернуть меньше запрошенного (сокеты, пайпы)
+            while len(data) < part_size:
+                more = source.read(part_size - len(data))
+                if not more:
+                    break
+                data += more
+            yield data
+        return
+    buffer = bytearray()
+    for chunk in source:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def chain_parts(head: List[bytes], rest: Iterator[bytes]) -> Iterator[bytes]:
+    """Возвращает уже прочитанные части head, а затем остальные части rest."""
+    yield from head
+    yield from rest
+
+
+async def aiter_parts(source: Any, part_size: int) -> AsyncIterator[bytes]:
+    """Нарезает (асинхронный) file-like объект или итератор фрагментов на части."""
+    read = getattr(source, "read", None)
+    if read is not None and inspect.iscoroutinefunction(read):
+        while True:
+            data = await read(part_size)
+            if not data:
+                return
+            while len(data) < part_size:
+                more = await read(part_size - len(data))
+                if not more:
+                    break
+                data += more
+            yield data
+        return
+    if isinstance(source, AsyncIterable):
+        buffer = bytearray()
+        async for chunk in source:
+            buffer += chunk
+            while len(buffer) >= part_size:
+                yield bytes(buffer[:part_size])
+                del buffer[:part_size]
+        if buffer:
+            yield bytes(buffer)
+        return
+    for part in iter_parts(source, part_size):
+        yield part
+
+
+async def anext_part(iterator: AsyncIterator[bytes]) -> Optional[bytes]:
+    """Следующая часть асинхронного итератора или None, если части закончились."""
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def achain_parts(head: List[bytes], rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Асинхронный вариант chain_parts."""
+    for part in head:
+        yield part
+    async for part in rest:
+        yield part
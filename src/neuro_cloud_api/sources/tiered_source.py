@@ -0,0 +1,836 @@
+import contextvars
+import hashlib
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .base_source import BaseSource
+from .metadata_cache import CacheStats
+from .path_utils import is_subpath, normalize_path
+from .streaming import BYTES_LIKE, UploadData, is_local_path
+from .transfer import TransferResult
+from ..metrics.events import instrumented, record_error
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+_STOP = object()
+
+
+class TieredSource(BaseSource):
+    """
+    Локальный "горячий" уровень на диске перед облачным источником.
+
+    Чтение: файл берется с локального диска, если он уже есть на уровне
+    (и не старше max_age); иначе скачивается из облака один раз, и все
+    следующие чтения идут с диска. Одновременные чтения одного файла
+    ждут одного скачивания.
+
+    Запись с перезаписью (overwrite=True): файл сначала атомарно сохраняется
+    на уровне, а в облако отправляется фоновыми воркерами через ограниченную
+    очередь (write-back).
+    Если очередь заполнена, upload_file ждет свободного места, поэтому
+    отставание от облака ограничено. Повторная запись файла, еще не
+    отправленного в облако, не порождает второй загрузки: отправится
+    последняя версия. Файлы, ожидающие отправки, отмечаются на диске и после
+    перезапуска процесса снова ставятся в очередь; такие файлы не вытесняются
+    и не перезаписываются из облака, поэтому чтение сразу после записи
+    видит записанные данные.
+
+    Директорию уровня могут делить несколько процессов: временные файлы
+    каждого экземпляра лежат в его собственной поддиректории tmp, занятой
+    межпроцессной блокировкой, и при запуске удаляются только
+    поддиректории завершившихся экземпляров.
+
+    Управление согласованностью:
+        - flush - дождаться отправки всех записей (и повторить неудачные);
+        - write_through=True - upload_file возвращает управление только
+          после загрузки в облако;
+        - max_age - срок, после которого локальная копия перечитывается из облака;
+        - invalidate - сбросить локальную копию пути.
+
+    Оборачивается синхронный источник (YadiskSource и т.п.).
+    """
+
+    def __init__(
+        self,
+        cloud: BaseSource,
+        root: Union[str, Path],
+        max_bytes: Optional[int] = None,
+        max_pending: int = 256,
+        workers: int = 2,
+        write_through: bool = False,
+        max_age: Optional[float] = None,
+        use_hardlinks: bool = False,
+    ):
+        """
+        Args:
+            cloud: Облачный источник
+            root: Директория локального уровня
+            max_bytes: Максимальный размер уровня в байтах (None - без ограничения);
+                сверх него вытесняются давно не читавшиеся файлы, уже отправленные в облако
+            max_pending: Емкость очереди отправки в облако
+            workers: Количество воркеров отправки
+            write_through: Загружать в облако синхронно внутри upload_file
+            max_age: Срок годности локальной копии, сек (None - бессрочно)
+            use_hardlinks: Выдавать файлы жесткими ссылками вместо копий
+                (быстрее, но изменение выданного файла на месте испортит уровень)
+        """
+        if max_pending <= 0 or workers <= 0:
+            raise ValueError("max_pending и workers должны быть положительными")
+        super().__init__(cloud.token, source_type=cloud.source_type)
+        self.cloud = cloud
+        self.root = Path(root)
+        self.files_path = self.root / "files"
+        self.pending_path = self.root / "pending"
+        # Временные файлы хранятся отдельно: имена файлов уровня принадлежат пользователю
+        self.tmp_dir = self.root / "tmp"
+        self.max_bytes = max_bytes
+        self.write_through = write_through
+        self.max_age = max_age
+        self.use_hardlinks = use_hardlinks
+        self.files_path.mkdir(parents=True, exist_ok=True)
+        self.pending_path.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._session_lock: Optional[BinaryIO] = None
+        self._remove_stale_sessions()
+        self._session_dir = self._open_session()
+
+        self._cond = threading.Condition()
+        # Путь -> версия записи, еще не подтвержденной облаком
+        self._pending: Dict[str, int] = {}
+        self._queued: Set[str] = set()
+        self._active: Set[str] = set()
+        self._failed: Dict[str, str] = {}
+        self._version = 0
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._usage = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._scan()
+
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"tiered-write-back-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._workers:
+            thread.start()
+        self._recover()
+
+    @instrumented("connect", path_arg=None)
+    def connect(self) -> bool:
+        """Подключение облачного источника."""
+        self.is_connected = self.cloud.connect()
+        return self.is_connected
+
+    def check_connection(self) -> bool:
+        """Проверка подключения облачного источника."""
+        return self.cloud.check_connection()
+
+    def list_directories(self, path: str = "/") -> List[str]:
+        """Список директорий (из облака)."""
+        return self.cloud.list_directories(path)
+
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
+        """Поиск директорий по имени (в облаке)."""
+        return self.cloud.search_directories(name, path, max_results)
+
+    def list_files(self, path: str = "/", recursive: bool = True, strict: bool = False) -> List[Dict[str, Any]]:
+        """Список файлов (из облака)."""
+        return self.cloud.list_files(path, recursive, strict=strict)
+
+    @instrumented("download_file")
+    def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
+        """
+        Получение файла: с локального уровня или из облака с сохранением на уровне.
+
+        Args:
+            remote_path: Путь к файлу в облаке
+            local_path: Локальный путь для сохранения
+
+        Returns:
+            True если файл получен, иначе False
+        """
+        path = normalize_path(remote_path)
+        try:
+            with self._path_lock(path):
+                hot_path = self._ensure(path)
+                if hot_path is None:
+                    return False
+                local_path = Path(local_path)
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._tmp_path(local_path)
+                try:
+                    self._place(hot_path, tmp_path)
+                    os.replace(tmp_path, local_path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+            self._evict()
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_fileobj")
+    def download_fileobj(self, remote_path: str, file_obj: BinaryIO) -> bool:
+        """
+        Получение файла в file-like объект: с локального уровня или из облака
+        с сохранением на уровне.
+
+        Args:
+            remote_path: Путь к файлу в облаке
+            file_obj: Объект с методом write, например io.BytesIO или открытый файл
+
+        Returns:
+            True если файл получен, иначе False
+        """
+        path = normalize_path(remote_path)
+        try:
+            with self._path_lock(path):
+                hot_path = self._ensure(path)
+                if hot_path is None:
+                    return False
+                with open(hot_path, "rb") as file:
+                    shutil.copyfileobj(file, file_obj)
+            self._evict()
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    def get_local_path(self, remote_path: str) -> Optional[Path]:
+        """
+        Путь к файлу на локальном уровне (при необходимости файл скачивается).
+
+        Файл нужно только читать: он принадлежит уровню. Для изменения
+        используйте download_file и upload_file. Если задан max_bytes, файл
+        может быть позже вытеснен с уровня.
+
+        Returns:
+            Путь к локальной копии или None, если файл не удалось получить
+        """
+        path = normalize_path(remote_path)
+        with self._path_lock(path):
+            hot_path = self._ensure(path)
+        self._evict()
+        return hot_path
+
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части файла: из локальной копии, если она есть на уровне,
+        иначе Range-запросом к облаку (файл на уровень не скачивается).
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        path = normalize_path(remote_path)
+        with self._path_lock(path):
+            hot_path = self._hot_path(path)
+            if self._is_fresh(path, hot_path):
+                self._touch(path, hit=True)
+                with open(hot_path, "rb") as file:
+                    file.seek(start)
+                    data = file.read(length)
+                if len(data) != length:
+                    raise IOError(f"Диапазон {start}+{length} файла {remote_path} прочитан не полностью")
+                return data
+        return self.cloud.read_range(path, start, length)
+
+    @instrumented("upload_file", path_arg=1)
+    def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """
+        Запись файла на локальный уровень с отправкой в облако.
+
+        Запись с overwrite=False (как у облачных источников) синхронная:
+        существование файла проверяет облако, и файл попадает на уровень
+        только после загрузки.
+
+        Запись с overwrite=True в режиме write-back возвращает True, как
+        только файл сохранен локально и поставлен в очередь; ошибки отправки
+        видны в flush и failed_writes. В режиме write_through возвращается
+        результат загрузки в облако.
+
+        Args:
+            local_path: Локальный путь к файлу или данные в памяти
+                (bytes, bytearray, memoryview, file-like объект или итератор фрагментов)
+            remote_path: Путь в облаке
+            overwrite: Перезаписать существующий файл
+
+        Returns:
+            True если запись принята, иначе False
+        """
+        path = normalize_path(remote_path)
+        hot_path = self._hot_path(path)
+        if not overwrite:
+            return self._create(local_path, path, hot_path)
+        try:
+            hot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._tier_tmp_path()
+            try:
+                self._write(local_path, tmp_path)
+                with self._path_lock(path), self._cond:
+                    os.replace(tmp_path, hot_path)
+                    self._version += 1
+                    version = self._pending[path] = self._version
+                    self._failed.pop(path, None)
+                    enqueue = path not in self._queued and path not in self._active
+                    if enqueue:
+                        self._queued.add(path)
+                    self._mark_pending(path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            self._track(path, hot_path)
+            self._evict()
+        except Exception as e:
+            record_error(e)
+            return False
+
+        if self.write_through:
+            if enqueue:
+                # Запись уходит в облако прямо сейчас, очередь не нужна
+                with self._cond:
+                    self._queued.discard(path)
+            return self._upload(path, version)
+        if enqueue:
+            # Блокируется, если очередь заполнена: отставание от облака ограничено
+            self._queue.put(path)
+        return True
+
+    @instrumented("download_many", path_arg=None)
+    def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+    ) -> List[TransferResult]:
+        """
+        Параллельное получение набора файлов через уровень (см. download_file).
+
+        Args:
+            items: Пары (путь к файлу в облаке, локальный путь)
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        return self._transfer_many(
+            items, max_workers, lambda remote_path, local_path: self.download_file(remote_path, local_path)
+        )
+
+    @instrumented("upload_many", path_arg=None)
+    def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная запись набора файлов через уровень (см. upload_file).
+
+        В режиме write-back передача считается успешной, когда файл сохранен
+        на уровне и поставлен в очередь; дождаться облака можно через flush.
+
+        Args:
+            items: Пары (путь в облаке, локальный путь к файлу)
+            max_workers: Количество потоков-воркеров
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        return self._transfer_many(
+            items, max_workers,
+            lambda remote_path, local_path: self.upload_file(local_path, remote_path, overwrite=overwrite),
+        )
+
+    @instrumented("flush", path_arg=None)
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет отправки в облако всех принятых записей.
+
+        Записи, которые не удалось отправить раньше, ставятся в очередь
+        повторно.
+
+        Args:
+            timeout: Максимальное время ожидания, сек (None - без ограничения)
+
+        Returns:
+            True если все записи отправлены в облако
+        """
+        with self._cond:
+            retry = [path for path in self._failed if path not in self._queued and path not in self._active]
+            self._failed.clear()
+            self._queued.update(retry)
+        for path in retry:
+            self._queue.put(path)
+        with self._cond:
+            self._cond.wait_for(
+                lambda: all(path in self._failed for path in self._pending), timeout
+            )
+            return not self._pending
+
+    def pending_writes(self) -> List[str]:
+        """Пути, записи в которые еще не подтверждены облаком."""
+        with self._cond:
+            return sorted(self._pending)
+
+    def failed_writes(self) -> Dict[str, str]:
+        """Неудачные отправки в облако: путь -> ошибка (повторяются в flush)."""
+        with self._cond:
+            return dict(self._failed)
+
+    def invalidate(self, remote_path: str) -> bool:
+        """
+        Удаляет локальную копию файла или директории, уже отправленную в облако.
+
+        Следующее чтение скачает файл заново. Файлы, ожидающие отправки,
+        не удаляются.
+
+        Returns:
+            True если локальные копии сброшены, False если есть неотправленные записи
+        """
+        path = normalize_path(remote_path)
+        with self._cond:
+            paths = [p for p in self._lru if is_subpath(p, path)]
+            busy = any(is_subpath(p, path) for p in self._pending)
+        for p in paths:
+            with self._path_lock(p), self._cond:
+                if p not in self._pending:
+                    self._drop(p)
+        return not busy
+
+    def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        """
+        Удаляет ресурс локально и в облаке (неотправленные записи отменяются).
+
+        Returns:
+            True если удаление успешно, иначе False
+        """
+        path = normalize_path(remote_path)
+        with self._cond:
+            for p in [p for p in self._pending if is_subpath(p, path)]:
+                del self._pending[p]
+                self._failed.pop(p, None)
+                self._unmark_pending(p)
+            for p in [p for p in self._lru if is_subpath(p, path)]:
+                self._drop(p)
+            self._cond.notify_all()
+        try:
+            return self.cloud.remove(path, permanently=permanently)
+        except NotImplementedError as e:
+            # Локальная копия удалена, но ресурс в облаке остался
+            record_error(e)
+            return False
+
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Копирует ресурс в облаке; сначала отправляются все неотправленные записи.
+
+        Returns:
+            True если копирование успешно, иначе False
+        """
+        self.flush()
+        if not self.cloud.copy(src_path, dst_path, overwrite=overwrite):
+            return False
+        self.invalidate(dst_path)
+        return True
+
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False) -> bool:
+        """
+        Перемещает ресурс в облаке; сначала отправляются все неотправленные записи.
+
+        Returns:
+            True если перемещение успешно, иначе False
+        """
+        self.flush()
+        if not self.cloud.move(src_path, dst_path, overwrite=overwrite):
+            return False
+        self.invalidate(src_path)
+        self.invalidate(dst_path)
+        return True
+
+    def stats(self) -> CacheStats:
+        """Статистика чтений с уровня (size - количество локальных файлов)."""
+        with self._cond:
+            return CacheStats(
+                hits=self._hits, misses=self._misses,
+                evictions=self._evictions, size=len(self._lru),
+            )
+
+    def usage(self) -> int:
+        """Суммарный размер файлов на уровне в байтах."""
+        with self._cond:
+            return self._usage
+
+    def disconnect(self, flush: bool = True, timeout: Optional[float] = None):
+        """
+        Останавливает воркеры отправки и отключает облачный источник.
+
+        Args:
+            flush: Дождаться отправки принятых записей
+            timeout: Максимальное время ожидания отправки, сек
+        """
+        if not self._closed:
+            if flush:
+                self.flush(timeout)
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(_STOP)
+            for thread in self._workers:
+                thread.join(timeout)
+            if not any(thread.is_alive() for thread in self._workers):
+                self._close_session()
+        self.cloud.disconnect()
+        super().disconnect()
+
+    @staticmethod
+    def _transfer_many(
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int,
+        transfer: Callable[[str, Path], bool],
+    ) -> List[TransferResult]:
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                if not transfer(remote_path, local_path):
+                    raise IOError(f"Передача файла {remote_path} не удалась")
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        if max_workers <= 0:
+            raise ValueError("max_workers должен быть положительным")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Контекст копируется, чтобы события воркеров учитывались в объемлющей операции
+            futures = [executor.submit(contextvars.copy_context().run, _worker, item) for item in items]
+            return [future.result() for future in futures]
+
+    # --- Отправка в облако ---
+
+    def _worker(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is _STOP:
+                return
+            with self._cond:
+                self._queued.discard(path)
+                version = self._pending.get(path)
+                if version is None:
+                    continue
+                self._active.add(path)
+            try:
+                self._upload(path, version)
+            finally:
+                with self._cond:
+                    self._active.discard(path)
+
+    def _upload(self, path: str, version: int) -> bool:
+        """Отправляет файл в облако, пока отправленная версия не станет последней."""
+        while True:
+            hot_path = self._hot_path(path)
+            try:
+                ok = self.cloud.upload_file(hot_path, path, overwrite=True)
+                error = None if ok else "upload_file вернул False"
+            except Exception as e:
+                ok, error = False, str(e) or type(e).__name__
+            with self._cond:
+                current = self._pending.get(path)
+                if current is None:
+                    # Запись отменена (remove) во время отправки
+                    return ok
+                if not ok:
+                    self._failed[path] = error
+                    self._cond.notify_all()
+                    return False
+                if current == version:
+                    del self._pending[path]
+                    self._unmark_pending(path)
+                    self._cond.notify_all()
+                    return True
+                # Файл перезаписали во время отправки - отправляем новую версию
+                version = current
+
+    def _create(self, data: Union[str, Path, UploadData], path: str, hot_path: Path) -> bool:
+        """Загружает новый файл в облако без перезаписи и сохраняет его на уровне."""
+        try:
+            hot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._tier_tmp_path()
+            try:
+                self._write(data, tmp_path)
+                with self._path_lock(path):
+                    with self._cond:
+                        pending = path in self._pending
+                    if pending:
+                        record_error(f"Файл {path} уже существует")
+                        return False
+                    if not self.cloud.upload_file(tmp_path, path, overwrite=False):
+                        return False
+                    os.replace(tmp_path, hot_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            self._track(path, hot_path)
+            self._evict()
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    def _mark_pending(self, path: str) -> None:
+        marker = self._marker_path(path)
+        tmp_path = self._tier_tmp_path()
+        tmp_path.write_text(path, encoding="utf-8")
+        os.replace(tmp_path, marker)
+
+    def _unmark_pending(self, path: str) -> None:
+        self._marker_path(path).unlink(missing_ok=True)
+
+    def _recover(self) -> None:
+        """Ставит в очередь записи, не отправленные до перезапуска процесса."""
+        for marker in self.pending_path.glob("*.pending"):
+            path = marker.read_text(encoding="utf-8")
+            if not self._hot_path(path).exists():
+                marker.unlink(missing_ok=True)
+                continue
+            with self._cond:
+                self._version += 1
+                self._pending[path] = self._version
+                self._queued.add(path)
+            self._queue.put(path)
+
+    # --- Локальный уровень ---
+
+    def _ensure(self, path: str) -> Optional[Path]:
+        """Обеспечивает актуальную локальную копию (вызывается под блокировкой пути)."""
+        hot_path = self._hot_path(path)
+        if self._is_fresh(path, hot_path):
+            self._touch(path, hit=True)
+            return hot_path
+        with self._cond:
+            self._misses += 1
+        hot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tier_tmp_path()
+        try:
+            if not self.cloud.download_file(path, tmp_path):
+                return None
+            os.replace(tmp_path, hot_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._track(path, hot_path)
+        return hot_path
+
+    def _hot_path(self, path: str) -> Path:
+        parts = [part for part in normalize_path(path).split("/") if part]
+        if not parts or any(part in (".", "..") for part in parts):
+            raise ValueError(f"Недопустимый путь файла: {path}")
+        return self.files_path.joinpath(*parts)
+
+    def _marker_path(self, path: str) -> Path:
+        return self.pending_path / f"{hashlib.sha1(path.encode('utf-8')).hexdigest()}.pending"
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._cond:
+            lock = self._path_locks.get(path)
+            if lock is None:
+                lock = self._path_locks[path] = threading.Lock()
+            return lock
+
+    def _is_fresh(self, path: str, hot_path: Path) -> bool:
+        with self._cond:
+            if path in self._pending:
+                return True
+        try:
+            modified = hot_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return self.max_age is None or time.time() - modified <= self.max_age
+
+    def _touch(self, path: str, hit: bool) -> None:
+        with self._cond:
+            if path in self._lru:
+                self._lru.move_to_end(path)
+            if hit:
+                self._hits += 1
+
+    def _track(self, path: str, hot_path: Path) -> None:
+        size = hot_path.stat().st_size
+        with self._cond:
+            self._usage += size - self._lru.pop(path, 0)
+            self._lru[path] = size
+
+    def _drop(self, path: str) -> None:
+        """Удаляет локальную копию (вызывается под self._cond)."""
+        self._usage -= self._lru.pop(path, 0)
+        try:
+            self._hot_path(path).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Вытесняет давно не читавшиеся отправленные файлы сверх max_bytes."""
+        if self.max_bytes is None:
+            return
+        with self._cond:
+            for path in list(self._lru):
+                if self._usage <= self.max_bytes:
+                    break
+                lock = self._path_locks.get(path)
+                if path in self._pending or (lock is not None and lock.locked()):
+                    continue
+                self._drop(path)
+                self._evictions += 1
+
+    def _scan(self) -> None:
+        """Восстанавливает учет файлов уровня (порядок LRU - по времени изменения)."""
+        entries = []
+        for hot_path in self.files_path.rglob("*"):
+            if not hot_path.is_file():
+                continue
+            stat = hot_path.stat()
+            path = "/" + hot_path.relative_to(self.files_path).as_posix()
+            entries.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(entries):
+            self._lru[path] = size
+            self._usage += size
+
+    def _place(self, hot_path: Path, target: Path) -> None:
+        if self.use_hardlinks:
+            try:
+                os.link(hot_path, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(hot_path, target)
+
+    @staticmethod
+    def _write(data: Union[str, Path, UploadData], target: Path) -> None:
+        if is_local_path(data):
+            shutil.copyfile(data, target)
+            return
+        with open(target, "wb") as f:
+            if isinstance(data, BYTES_LIKE):
+                f.write(data)
+            elif hasattr(data, "read"):
+                shutil.copyfileobj(data, f)
+            elif hasattr(data, "__aiter__"):
+                raise TypeError("Асинхронные итераторы не поддерживаются синхронным уровнем")
+            else:
+                for chunk in data:
+                    f.write(chunk)
+
+    def _tier_tmp_path(self) -> Path:
+        """Временный файл уровня (в той же файловой системе, что и файлы уровня)."""
+        return self._session_dir / f"{uuid.uuid4().hex}.tmp"
+
+    # --- Временные файлы экземпляров ---
+
+    def _open_session(self) -> Path:
+        """
+        Создает поддиректорию tmp этого экземпляра и занимает ее блокировку
+        до disconnect: пока файл блокировки занят, другие процессы ее не удаляют.
+        """
+        while True:
+            name = f"{os.getpid()}.{uuid.uuid4().hex}"
+            lock_path = self.tmp_dir / f"{name}.lock"
+            lock_file = open(lock_path, "a+b")
+            if not _try_lock(lock_file):
+                lock_file.close()
+                continue
+            try:
+                # Файл мог быть удален другим процессом между открытием и блокировкой
+                same = os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path))
+            except FileNotFoundError:
+                same = False
+            if not same:
+                lock_file.close()
+                continue
+            session_dir = self.tmp_dir / name
+            session_dir.mkdir(exist_ok=True)
+            self._session_lock = lock_file
+            return session_dir
+
+    def _close_session(self) -> None:
+        """Удаляет временные файлы экземпляра и освобождает блокировку."""
+        if self._session_lock is None:
+            return
+        shutil.rmtree(self._session_dir, ignore_errors=True)
+        _unlock(self._session_lock)
+        self._session_lock.close()
+        self._session_lock = None
+        _remove_lock_file(self.tmp_dir / f"{self._session_dir.name}.lock")
+
+    def _remove_stale_sessions(self) -> None:
+        """Удаляет незавершенные записи и скачивания завершившихся экземпляров."""
+        for lock_path in self.tmp_dir.glob("*.lock"):
+            try:
+                lock_file = open(lock_path, "r+b")
+            except FileNotFoundError:
+                continue
+            with lock_file:
+                if not _try_lock(lock_file):
+                    # Экземпляр еще работает
+                    continue
+                try:
+                    shutil.rmtree(self.tmp_dir / lock_path.stem, ignore_errors=True)
+                finally:
+                    _unlock(lock_file)
+            # Имена экземпляров уникальны, поэтому освобожденный файл никто не займет заново
+            _remove_lock_file(lock_path)
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _try_lock(file: BinaryIO) -> bool:
+    """Неблокирующий захват межпроцессной блокировки файла."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(file: BinaryIO) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _remove_lock_file(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        # Windows не удаляет файл, открытый другим процессом; его удалит следующий запуск
+        pass
@@ -0,0 +1,128 @@
+import asyncio
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class TransferResult:
+    """
+    Результат передачи одного файла в пакетной операции.
+
+    remote_path: str - Путь к файлу в облаке
+    local_path: str - Локальный путь к файлу
+    success: bool - Успешно ли выполнена передача
+    size: int - Количество переданных байт
+    elapsed: float - Время передачи в секундах
+    error: Optional[str] - Текст ошибки, если передача не удалась
+    """
+    remote_path: str
+    local_path: str
+    success: bool
+    size: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class OperationResult:
+    """
+    Результат серверной операции (копирование, перемещение, удаление) в пакетной операции.
+
+    src_path: str - Путь к исходному ресурсу
+    dst_path: Optional[str] - Путь назначения (None при удалении)
+    success: bool - Успешно ли выполнена операция
+    elapsed: float - Время от запуска до завершения операции на сервере, сек
+    error: Optional[str] - Текст ошибки, если операция не удалась
+    """
+    src_path: str
+    dst_path: Optional[str]
+    success: bool
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class AsyncByteLimiter:
+    """
+    Ограничитель суммарного объема данных, передаваемых одновременно.
+
+    Файл, размер которого превышает лимит, резервирует весь лимит целиком
+    и передается в одиночку, поэтому операция не может зависнуть.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Максимальное количество байт в передаче одновременно
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes должен быть положительным")
+        self.max_bytes = max_bytes
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Количество зарезервированных байт."""
+        return self._in_flight
+
+    async def acquire(self, size: int) -> int:
+        """
+        Резервирует объем под передачу.
+
+        Args:
+            size: Размер файла в байтах
+
+        Returns:
+            Фактически зарезервированный объем (передается в release)
+        """
+        amount = min(max(size, 0), self.max_bytes)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight + amount <= self.max_bytes)
+            self._in_flight += amount
+        return amount
+
+    async def release(self, amount: int) -> None:
+        """Освобождает объем, зарезервированный через acquire."""
+        async with self._condition:
+            self._in_flight -= amount
+            self._condition.notify_all()
+
+
+async def run_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    max_concurrency: int,
+) -> List[R]:
+    """
+    Обрабатывает элементы фиксированным числом воркеров.
+
+    В отличие от gather по всему списку, одновременно существует не более
+    max_concurrency корутин, а порядок результатов совпадает с порядком items.
+
+    Args:
+        items: Элементы для обработки
+        worker: Корутина, обрабатывающая один элемент
+        max_concurrency: Максимальное число одновременных операций
+
+    Returns:
+        Список результатов в порядке items
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency должен быть положительным")
+    results: List[Any] = [None] * len(items)
+    next_index = 0
+
+    async def _worker() -> None:
+        nonlocal next_index
+        while next_index < len(items):
+            index = next_index
+            next_index += 1
+            results[index] = await worker(items[index])
+
+    await asyncio.gather(*(_worker() for _ in range(min(max_concurrency, len(items)))))
+    return results
@@ -0,0 +1,263 @@
+import threading
+import weakref
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .request_scheduler import RequestScheduler, RetryPolicy
+
+if TYPE_CHECKING:
+    import yadisk
+
+
+@dataclass(frozen=True)
+class TransportSettings:
+    """
+    Параметры HTTP-транспорта клиентов Яндекс.Диска.
+
+    pool_size: int - Максимальное количество соединений (и открытых keep-alive соединений)
+    keepalive_expiry: float - Время жизни простаивающего соединения, сек
+    connect_timeout: float - Таймаут установки соединения, сек
+    read_timeout: float - Таймаут чтения ответа, сек
+    http2: bool - Использовать HTTP/2 (нужен пакет h2: pip install "httpx[http2]")
+    """
+    pool_size: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 15.0
+    http2: bool = False
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Таймауты в формате yadisk: (соединение, чтение)."""
+        return self.connect_timeout, self.read_timeout
+
+    def httpx_args(self) -> Dict[str, Any]:
+        """Аргументы конструктора httpx.Client / httpx.AsyncClient."""
+        import httpx
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "http2": self.http2,
+        }
+
+
+def create_client(token: str, settings: TransportSettings) -> "yadisk.Client":
+    """Создает синхронный клиент с настроенным транспортом (httpx)."""
+    import yadisk
+    from yadisk.sessions.httpx_session import HTTPXSession
+
+    return yadisk.Client(
+        token=token,
+        session=HTTPXSession(**settings.httpx_args()),
+        default_args={"timeout": settings.timeout, "n_retries": 0},
+    )
+
+
+def create_async_client(token: str, settings: TransportSettings) -> "yadisk.AsyncClient":
+    """Создает асинхронный клиент с настроенным транспортом (httpx)."""
+    import yadisk
+    from yadisk.sessions.async_httpx_session import AsyncHTTPXSession
+
+    return yadisk.AsyncClient(
+        token=token,
+        session=AsyncHTTPXSession(**settings.httpx_args()),
+        default_args={"timeout": settings.timeout, "n_retries": 0},
+    )
+
+
+def without_retries(client: Any) -> Any:
+    """
+    Отключает встроенные повторы yadisk: повторами управляет RequestScheduler.
+    """
+    client.default_args["n_retries"] = 0
+    return client
+
+
+def create_scheduler(
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> RequestScheduler:
+    """
+    Планировщик запросов для Яндекс.Диска.
+
+    Повторяются сетевые ошибки, 5xx и 429 (с учетом Retry-After).
+
+    Args:
+        rate: Запросов в секунду (None - без ограничения)
+        burst: Максимальное количество запросов подряд без ожидания
+        policy: Политика повторов
+    """
+    import yadisk
+
+    return RequestScheduler(
+        rate=rate,
+        burst=burst,
+        policy=policy,
+        retriable_errors=(yadisk.exceptions.RequestError, yadisk.exceptions.RetriableYaDiskError),
+        throttle_errors=(yadisk.exceptions.TooManyRequestsError,),
+    )
+
+
+class ClientRegistry:
+    """
+    Общие клиенты Яндекс.Диска, по одному на токен и набор настроек.
+
+    Источники, созданные для одного токена, получают один и тот же клиент
+    и переиспользуют его открытые соединения вместо новых TCP/TLS-рукопожатий.
+    Синхронные клиенты принадлежат реестру: disconnect источника их не
+    закрывает, они закрываются методом close.
+
+    Асинхронные клиенты дополнительно различаются по событийному циклу:
+    соединения httpx привязаны к циклу, поэтому клиент создается при первом
+    обращении источника внутри работающего цикла, а не при создании
+    источника. Реестр считает источники, получившие клиент; disconnect
+    последнего из них закрывает клиент. Клиенты завершенного цикла,
+    источники которого не были отключены, удаляются из реестра при
+    следующем обращении к нему (цикл хранится по слабой ссылке).
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[Any, ...], Any] = {}
+        # Цикл -> {(token, settings): [клиент, количество источников]}
+        self._loop_clients: "weakref.WeakKeyDictionary[Any, Dict[Tuple[Any, ...], List[Any]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get_client(self, token: str, settings: TransportSettings) -> "yadisk.Client":
+        """Возвращает общий синхронный клиент, создавая его при первом обращении."""
+        key = ("sync", token, settings)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = create_client(token, settings)
+            return client
+
+    def get_async_client(self, token: str, settings: TransportSettings) -> "yadisk.AsyncClient":
+        """
+        Возвращает общий асинхронный клиент текущего событийного цикла.
+
+        Вызывается внутри работающего цикла. Каждый вызов добавляет
+        пользователя клиента, которого нужно освободить release_async_client.
+
+        Raises:
+            RuntimeError: Если цикл не запущен
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = (token, settings)
+        with self._lock:
+            self._drop_closed_loops()
+            clients = self._loop_clients.get(loop)
+            if clients is None:
+                clients = self._loop_clients[loop] = {}
+            entry = clients.get(key)
+            if entry is None:
+                entry = clients[key] = [create_async_client(token, settings), 0]
+            entry[1] += 1
+            return entry[0]
+
+    async def release_async_client(self, token: str, settings: TransportSettings, loop: Any = None) -> None:
+        """
+        Освобождает клиент, полученный get_async_client в цикле loop.
+
+        Клиент последнего пользователя удаляется из реестра и закрывается,
+        если loop - текущий цикл (клиент другого, уже завершенного цикла
+        закрыть нельзя, он только удаляется).
+
+        Args:
+            token: Токен
+            settings: Настройки транспорта
+            loop: Цикл, в котором получен клиент (None - текущий)
+        """
+        import asyncio
+
+        running = asyncio.get_running_loop()
+        loop = loop or running
+        key = (token, settings)
+        with self._lock:
+            clients = self._loop_clients.get(loop) or {}
+            entry = clients.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del clients[key]
+        if loop is running:
+            await self._aclose_all([entry[0]])
+
+    def get_scheduler(
+        self,
+        token: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        policy: Optional[RetryPolicy] = None,
+    ) -> RequestScheduler:
+        """
+        Возвращает общий планировщик запросов для токена.
+
+        Лимиты провайдера действуют на токен, поэтому источники одного токена
+        должны делить одно ведро токенов и одну паузу Retry-After.
+        """
+        key = ("scheduler", token, rate, burst, repr(policy))
+        with self._lock:
+            scheduler = self._clients.get(key)
+            if scheduler is None:
+                scheduler = self._clients[key] = create_scheduler(rate, burst, policy)
+            return scheduler
+
+    @property
+    def size(self) -> int:
+        """Количество открытых общих клиентов."""
+        with self._lock:
+            self._drop_closed_loops()
+            unbound = sum(1 for key in self._clients if key[0] != "scheduler")
+            return unbound + sum(len(clients) for clients in self._loop_clients.values())
+
+    def close(self) -> None:
+        """Закрывает все синхронные клиенты реестра."""
+        with self._lock:
+            keys = [key for key in self._clients if key[0] == "sync"]
+            clients = [self._clients.pop(key) for key in keys]
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        """
+        Закрывает все асинхронные клиенты текущего цикла, в том числе еще
+        используемые источниками (после этого источники цикла не используются).
+        """
+        import asyncio
+
+        with self._lock:
+            clients = self._loop_clients.pop(asyncio.get_running_loop(), {})
+        await self._aclose_all([entry[0] for entry in clients.values()])
+
+    def _drop_closed_loops(self) -> None:
+        """Удаляет клиенты завершенных циклов (вызывается под self._lock)."""
+        for loop in [loop for loop in self._loop_clients if loop.is_closed()]:
+            # Закрыть клиент вне его цикла нельзя: соединения закроются вместе с ним
+            del self._loop_clients[loop]
+
+    @staticmethod
+    async def _aclose_all(clients: List[Any]) -> None:
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+
+# Реестр по умолчанию, используемый SourceFactory
+default_registry = ClientRegistry()
@@ -0,0 +1,138 @@
+import asyncio
+import fnmatch
+import re
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+GLOB_CHARS = set("*?[")
+
+
+def build_matcher(pattern: str, regex: bool = False) -> Callable[[str], bool]:
+    """
+    Создает функцию сопоставления имени ресурса с шаблоном.
+
+    Сопоставление регистронезависимое. Шаблон без символов glob ("*", "?", "[")
+    ищется как подстрока имени - так же, как в search_directories.
+
+    Args:
+        pattern: Glob-шаблон, подстрока или регулярное выражение
+        regex: Интерпретировать pattern как регулярное выражение (re.search)
+
+    Returns:
+        Функция, принимающая имя и возвращающая True при совпадении
+    """
+    if regex:
+        compiled = re.compile(pattern, re.IGNORECASE)
+        return lambda name: compiled.search(name) is not None
+    if not GLOB_CHARS & set(pattern):
+        pattern = f"*{pattern}*"
+    compiled = re.compile(fnmatch.translate(pattern.lower()))
+    return lambda name: compiled.match(name.lower()) is not None
+
+
+class StopWalk(Exception):
+    """Сигнал досрочной остановки обхода дерева."""
+
+
+def walk_parallel(
+    root: str,
+    list_dir: Callable[[str], List[Dict[str, Any]]],
+    visit: Callable[[str, int, List[Dict[str, Any]]], Iterable[str]],
+    max_workers: int = 8,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> None:
+    """
+    Обход дерева в ширину пулом потоков.
+
+    Каждая директория из очереди запрашивается через list_dir, как только
+    освобождается воркер. visit получает путь, глубину и содержимое директории
+    и возвращает пути поддиректорий, которые нужно обойти следующими.
+    Исключение StopWalk в visit останавливает обход. Исключение, выброшенное
+    из on_error, прерывает обход и пробрасывается вызывающему.
+
+    Args:
+        root: Корень обхода (глубина 0)
+        list_dir: Функция получения содержимого директории
+        visit: Обработчик содержимого директории
+        max_workers: Количество потоков-воркеров
+        on_error: Обработчик ошибок list_dir (по умолчанию ошибка пропускается)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(list_dir, root): (root, 0)}
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path, depth = pending.pop(future)
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        if on_error is not None:
+                            on_error(path, e)
+                        continue
+                    children = list(visit(path, depth, items))
+                    for child in children:
+                        pending[executor.submit(list_dir, child)] = (child, depth + 1)
+        except StopWalk:
+            pass
+        finally:
+            for other in pending:
+                other.cancel()
+
+
+async def walk_parallel_async(
+    root: str,
+    list_dir: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+    visit: Callable[[str, int, List[Dict[str, Any]]], Iterable[str]],
+    max_workers: int = 8,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> None:
+    """
+    Асинхронный обход дерева в ширину воркерами над общей очередью.
+
+    Семантика аргументов совпадает с walk_parallel.
+    """
+    queue: "asyncio.Queue[Tuple[str, int]]" = asyncio.Queue()
+    stopped = asyncio.Event()
+    failures: List[Exception] = []
+    queue.put_nowait((root, 0))
+
+    async def _worker() -> None:
+        while True:
+            path, depth = await queue.get()
+            try:
+                if stopped.is_set():
+                    continue
+                try:
+                    items = await list_dir(path)
+                except Exception as e:
+                    if on_error is not None:
+                        try:
+                            on_error(path, e)
+                        except Exception as error:
+                            failures.append(error)
+                            stopped.set()
+                    continue
+                if stopped.is_set():
+                    continue
+                try:
+                    children = list(visit(path, depth, items))
+                except StopWalk:
+                    stopped.set()
+                    continue
+                for child in children:
+                    queue.put_nowait((child, depth + 1))
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(_worker()) for _ in range(max_workers)]
+    try:
+        await queue.join()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    if failures:
+        raise failures[0]
@@ -1,51 +1,177 @@
+import contextvars
+import io
+import logging
+import os
+import time
 import yadisk
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, List
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from .base_source import BaseSource
+from .client_pool import ClientPool
+from .content_cache import ContentCache
+from .directory_creator import DirectoryCreator
+from .metadata_cache import MetadataCache
+from .operation_poller import OperationPoller
+from .path_utils import listing_api_fields, listing_fields, parent_path, resource_to_dict
+from .remote_index import RemoteIndex
+from .request_scheduler import RequestScheduler
+from .segmented_download import (
+    DEFAULT_SEGMENT_SIZE, DEFAULT_THRESHOLD, DownloadLinkCache, RangeNotSupportedError, SegmentedDownload
+)
 from .source_type import SourceType
+from .streaming import (
+    UploadData, is_local_path, is_replayable, payload_size, sync_payload, upload_position
+)
+from .transfer import OperationResult, TransferResult
+from .transport import ClientRegistry, TransportSettings, create_client, create_scheduler, without_retries
+from .tree_walk import StopWalk, build_matcher, walk_parallel
+from ..metrics.events import add_bytes, instrumented, record_error
+
+
+logger = logging.getLogger(__name__)
 
 
 class YadiskSource(BaseSource):
     """Класс для работы с Яндекс.Диском."""
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        cache_ttl: float = 30.0,
+        cache_max_entries: int = 1024,
+        index: Optional[RemoteIndex] = None,
+        content_cache: Optional[ContentCache] = None,
+        transport: Optional[TransportSettings] = None,
+        registry: Optional[ClientRegistry] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
         """
         Инициализация клиента Яндекс.Диска.
 
         Args:
             token: OAuth-токен Яндекс.Диска
+            cache_ttl: Время жизни записей кэша содержимого директорий, сек (0 - без кэша)
+            cache_max_entries: Максимальное количество директорий в кэше
+            index: Локальный индекс дерева диска (см. refresh_index)
+            content_cache: Локальный кэш скачанных файлов по хэшу содержимого
+            transport: Настройки HTTP-транспорта (пул соединений, keep-alive, таймауты, HTTP/2)
+            registry: Реестр общих клиентов; источники с одним токеном используют
+                один клиент и его открытые соединения
+            scheduler: Планировщик запросов (ограничение частоты и повторы);
+                можно разделить между источниками
         """
         super().__init__(token, source_type=SourceType.YANDEX_DISK) # Здесь должен получать конфиг
-        self.client = yadisk.Client(token=token)
+        self._shared_client = registry is not None
+        if registry is not None:
+            self.client = registry.get_client(token, transport or TransportSettings())
+            # Клиент httpx потокобезопасен: воркеры делят его пул соединений
+            self._client_pool = ClientPool(lambda: self.client, close_clients=False)
+        elif transport is not None:
+            self.client = create_client(token, transport)
+            self._client_pool = ClientPool(lambda: create_client(token, transport))
+        else:
+            self.client = without_retries(yadisk.Client(token=token))
+            # Клиенты для воркеров пакетных операций (по одному на поток)
+            self._client_pool = ClientPool(lambda: without_retries(yadisk.Client(token=token)))
+        self.scheduler = scheduler or create_scheduler()
+        self.metadata_cache = MetadataCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        self.index = index
+        self.content_cache = content_cache
+        self._directories = DirectoryCreator(
+            exists_errors=(yadisk.exceptions.PathExistsError,),
+            parent_missing_errors=(yadisk.exceptions.ParentNotFoundError,),
+        )
+        # Асинхронные операции сервера (копирование, перемещение, удаление
+        # директорий) опрашиваются одним общим потоком
+        self.operations = OperationPoller(self._operation_status)
+        # Ссылки на скачивание для Range-чтений (см. read_range)
+        self.download_links = DownloadLinkCache()
 
+    @instrumented("connect", path_arg=None)
     def connect(self) -> bool:
         """Подключение к Яндекс.Диску."""
         try:
             if self.check_connection():
                 self.is_connected = True
-                print("Успешно подключено к Яндекс.Диску")
+                logger.debug("Успешно подключено к Яндекс.Диску")
                 return True
             else:
-                print("Не удалось подключиться к Яндекс.Диску")
+                record_error("Не удалось подключиться к Яндекс.Диску")
                 return False
         except Exception as e:
-            print(f"Ошибка подключения: {e}")
+            record_error(e)
             return False
 
+    @instrumented("check_connection", path_arg=None)
     def check_connection(self) -> bool:
         """Проверка подключения к Яндекс.Диску."""
         try:
-            if self.client.check_token():
+            if self.scheduler.call(self.client.check_token, operation="check_token"):
                 return True
         except yadisk.exceptions.UnauthorizedError:
-            print("Неверный токен Яндекс.Диска")
+            record_error("Неверный токен Яндекс.Диска")
             return False
         except Exception as e:
-            print(f"Ошибка проверки подключения: {e}")
+            record_error(e)
             return False
 
+    def iter_directory(
+        self,
+        path: str = "/",
+        page_size: int = 1000,
+        fields: Optional[Sequence[str]] = None,
+        resource_type: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Постраничный обход содержимого директории.
+
+        Следующая страница запрашивается, только когда прочитана предыдущая,
+        поэтому в памяти находится не больше одной страницы, а прерванный
+        обход (break) не читает оставшиеся страницы. Каждая страница
+        запрашивается через планировщик отдельно и повторяется при ошибке.
+        Если директория есть в кэше метаданных, она отдается из кэша.
+
+        Args:
+            path: Путь к директории
+            page_size: Количество ресурсов на странице
+            fields: Нужные поля ресурсов из name, path, type, size, md5, modified
+                (None - все); API возвращает только их
+            resource_type: "dir" или "file" - только директории или только файлы
+                (API Яндекс.Диска не фильтрует содержимое директории по типу,
+                поэтому фильтр применяется к каждой странице)
+
+        Yields:
+            Ресурсы в виде словарей с полями fields (и type)
+        """
+        fields = listing_fields(fields)
+        if resource_type not in (None, "dir", "file"):
+            raise ValueError(f"Неизвестный тип ресурса: {resource_type}")
+        cached = self.metadata_cache.get(path)
+        if cached is not None:
+            for item in cached:
+                if resource_type is None or item["type"] == resource_type:
+                    yield resource_to_dict(item, fields)
+            return
+        api_fields = listing_api_fields(fields)
+        offset = 0
+        while True:
+            page = self.scheduler.call(
+                self.client.get_meta, path, limit=page_size, offset=offset, fields=api_fields, operation="listdir"
+            )
+            if page.type != "dir":
+                raise yadisk.exceptions.WrongResourceTypeError(f"{path} не является директорией")
+            items = page.embedded.items or []
+            for item in items:
+                if resource_type is None or item["type"] == resource_type:
+                    yield resource_to_dict(item, fields)
+            offset += len(items)
+            if not items or offset >= (page.embedded.total or 0):
+                return
+
+    @instrumented("list_directories")
     def list_directories(self, path: str = "/") -> List[str]:
         """
         Получение списка директорий на Яндекс.Диске.
@@ -58,33 +184,373 @@ class YadiskSource(BaseSource):
         """
         result = []
         try:
-            for item in self.client.listdir(path):
+            # Полный список директории берется из кэша метаданных и заполняет его
+            for item in self._listdir(path):
                 if item["type"] == "dir":
                     result.append(item["path"])
         except Exception as e:
-            print(f"Ошибка получения списка директорий {path}: {e}")
+            record_error(e)
         return result
 
-    def search_directories(self, name: str, path: str = "/") -> List[str]:
+    def exists(self, remote_path: str) -> bool:
+        """Проверка существования ресурса на Яндекс.Диске."""
+        return self.scheduler.call(self.client.exists, remote_path, operation="exists")
+
+    @instrumented("get_meta")
+    def get_meta(self, remote_path: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Метаданные ресурса.
+
+        Args:
+            remote_path: Путь к ресурсу
+            fields: Поля (name, path, type, size, md5, modified; None - все)
+
+        Returns:
+            Словарь с запрошенными полями
+
+        Raises:
+            yadisk.exceptions.PathNotFoundError: Если ресурс не найден
+        """
+        fields = listing_fields(fields)
+        meta = self.scheduler.call(self.client.get_meta, remote_path, fields=list(fields), operation="get_meta")
+        return resource_to_dict(meta, fields)
+
+    @instrumented("search_directories", path_arg=1)
+    def search_directories(self, name: str, path: str = "/", max_results: Optional[int] = None) -> List[str]:
         """
         Поиск директорий по имени на Яндекс.Диске.
 
         Args:
             name: Имя для поиска
             path: Путь для поиска
+            max_results: Остановить поиск после стольких совпадений
+                (1 - вернуть первое совпадение, не дочитывая директорию)
 
         Returns:
             Список путей к найденным директориям
         """
+        if self.index is not None:
+            found = self.index.search_directories(name, path)
+            if found is not None:
+                return found[:max_results]
         result = []
         try:
-            for item in self.client.listdir(path):
-                if item["type"] == "dir" and name.lower() in item["name"].lower():
+            if max_results is None:
+                for item in self._listdir(path):
+                    if item["type"] == "dir" and name.lower() in item["name"].lower():
+                        result.append(item["path"])
+                return result
+            # С ограничением директория читается постранично до нужного числа совпадений
+            for item in self.iter_directory(path, fields=("name", "path"), resource_type="dir"):
+                if name.lower() in item["name"].lower():
                     result.append(item["path"])
+                    if len(result) >= max_results:
+                        break
         except Exception as e:
-            print(f"Ошибка поиска директорий {name} в {path}: {e}")
+            record_error(e)
+        return result
+
+    @instrumented("find_directories", path_arg=1)
+    def find_directories(
+        self,
+        pattern: str,
+        path: str = "/",
+        max_depth: Optional[int] = None,
+        regex: bool = False,
+        max_results: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> List[str]:
+        """
+        Рекурсивный поиск директорий на Яндекс.Диске.
+
+        Обход выполняется в ширину пулом из max_workers потоков: каждая
+        найденная поддиректория ставится в очередь и запрашивается, как только
+        освобождается воркер.
+
+        Args:
+            pattern: Glob-шаблон, подстрока или регулярное выражение для имени
+            path: Корень обхода (например, home_folder из NeuroCloudApiConfig)
+            max_depth: Максимальная глубина (1 - только прямые потомки, None - без ограничения)
+            regex: Интерпретировать pattern как регулярное выражение
+            max_results: Остановить обход после стольких совпадений
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Список путей к найденным директориям в порядке обнаружения
+        """
+        matches = build_matcher(pattern, regex)
+        result: List[str] = []
+
+        def _list(directory: str) -> List[Dict[str, Any]]:
+            with self._client_pool.client() as client:
+                return self._listdir(directory, client)
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            children = []
+            for item in items:
+                if item["type"] != "dir":
+                    continue
+                if matches(item["name"]):
+                    result.append(item["path"])
+                    if max_results is not None and len(result) >= max_results:
+                        raise StopWalk
+                if max_depth is None or depth + 1 < max_depth:
+                    children.append(item["path"])
+            return children
+
+        walk_parallel(
+            path, _list, _visit, max_workers,
+            on_error=lambda directory, e: logger.warning(f"Ошибка обхода директории {directory}: {e}"),
+        )
+        return result
+
+    @instrumented("list_files")
+    def list_files(
+        self,
+        path: str = "/",
+        recursive: bool = True,
+        max_workers: int = 8,
+        strict: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получение списка файлов с метаданными.
+
+        Args:
+            path: Путь к директории
+            recursive: Обойти все поддиректории (параллельно, см. walk_parallel)
+            max_workers: Количество потоков-воркеров при рекурсивном обходе
+            strict: Пробрасывать ошибку листинга любой директории вместо того,
+                чтобы пропустить ее (отсутствующая директория path считается пустой)
+
+        Returns:
+            Список файлов в виде словарей с ключами name, path, type, size, md5, modified
+        """
+        result: List[Dict[str, Any]] = []
+
+        def _on_error(directory: str, e: Exception) -> None:
+            if not strict:
+                logger.warning(f"Ошибка получения списка файлов {directory}: {e}")
+            elif directory != path or not isinstance(e, yadisk.exceptions.PathNotFoundError):
+                raise e
+
+        def _list(directory: str) -> List[Dict[str, Any]]:
+            with self._client_pool.client() as client:
+                return self._listdir(directory, client)
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            result.extend(item for item in items if item["type"] == "file")
+            if not recursive:
+                return []
+            return [item["path"] for item in items if item["type"] == "dir"]
+
+        walk_parallel(path, _list, _visit, max_workers, on_error=_on_error)
         return result
 
+    @instrumented("remove")
+    def remove(self, remote_path: str, permanently: bool = False) -> bool:
+        """
+        Удаление файла или директории на Яндекс.Диске.
+
+        Args:
+            remote_path: Путь к ресурсу
+            permanently: Удалить безвозвратно, минуя корзину
+
+        Returns:
+            True если удаление успешно, иначе False
+        """
+        try:
+            self._start_operation(
+                self.client.remove, remote_path, permanently=permanently, operation="remove"
+            ).result()
+            self._forget(remote_path)
+            logger.debug(f"Ресурс {remote_path} удален")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy")
+    def copy(self, src_path: str, dst_path: str, overwrite: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Копирование файла или директории на стороне Яндекс.Диска (данные не передаются через клиент).
+
+        Args:
+            src_path: Путь к исходному ресурсу
+            dst_path: Путь назначения
+            overwrite: Перезаписать существующий ресурс
+            timeout: Максимальное время ожидания асинхронной операции, сек (None - без ограничения)
+
+        Returns:
+            True если копирование успешно, иначе False
+        """
+        try:
+            self._start_operation(
+                self.client.copy, src_path, dst_path, overwrite=overwrite, operation="copy", timeout=timeout
+            ).result()
+            self._forget(dst_path)
+            logger.debug(f"Ресурс {src_path} скопирован в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("move")
+    def move(self, src_path: str, dst_path: str, overwrite: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Перемещение (переименование) файла или директории на стороне Яндекс.Диска.
+
+        Args:
+            src_path: Путь к исходному ресурсу
+            dst_path: Путь назначения
+            overwrite: Перезаписать существующий ресурс
+            timeout: Максимальное время ожидания асинхронной операции, сек (None - без ограничения)
+
+        Returns:
+            True если перемещение успешно, иначе False
+        """
+        try:
+            self._start_operation(
+                self.client.move, src_path, dst_path, overwrite=overwrite, operation="move", timeout=timeout
+            ).result()
+            self._forget(src_path)
+            self._forget(dst_path)
+            logger.debug(f"Ресурс {src_path} перемещен в {dst_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("copy_many", path_arg=None)
+    def copy_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        overwrite: bool = False,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное копирование на стороне Яндекс.Диска.
+
+        Операции запускаются пулом из max_workers потоков; асинхронные
+        операции сервера ждет общий опрос статусов (self.operations),
+        поэтому воркер освобождается сразу после запуска операции.
+
+        Args:
+            items: Пары (исходный путь, путь назначения)
+            overwrite: Перезаписывать существующие ресурсы
+            max_workers: Количество одновременно запускаемых операций
+            timeout: Максимальное время ожидания каждой операции, сек
+
+        Returns:
+            Список OperationResult в порядке items
+        """
+        return self._run_operations(
+            [(src, dst) for src, dst in items],
+            lambda client, src, dst: self._start_operation(
+                client.copy, src, dst, overwrite=overwrite, operation="copy", timeout=timeout
+            ),
+            lambda src, dst: self._forget(dst),
+            max_workers,
+        )
+
+    @instrumented("move_many", path_arg=None)
+    def move_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        overwrite: bool = False,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное перемещение на стороне Яндекс.Диска (см. copy_many).
+
+        Args:
+            items: Пары (исходный путь, путь назначения)
+            overwrite: Перезаписывать существующие ресурсы
+            max_workers: Количество одновременно запускаемых операций
+            timeout: Максимальное время ожидания каждой операции, сек
+
+        Returns:
+            Список OperationResult в порядке items
+        """
+        def _forget(src: str, dst: str) -> None:
+            self._forget(src)
+            self._forget(dst)
+
+        return self._run_operations(
+            [(src, dst) for src, dst in items],
+            lambda client, src, dst: self._start_operation(
+                client.move, src, dst, overwrite=overwrite, operation="move", timeout=timeout
+            ),
+            _forget,
+            max_workers,
+        )
+
+    @instrumented("remove_many", path_arg=None)
+    def remove_many(
+        self,
+        paths: Iterable[str],
+        permanently: bool = False,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[OperationResult]:
+        """
+        Пакетное удаление (см. copy_many).
+
+        Args:
+            paths: Пути к ресурсам
+            permanently: Удалить безвозвратно, минуя корзину
+            max_workers: Количество одновременно запускаемых операций
+            timeout: Максимальное время ожидания каждой операции, сек
+
+        Returns:
+            Список OperationResult (dst_path=None) в порядке paths
+        """
+        return self._run_operations(
+            [(path, None) for path in paths],
+            lambda client, path, _: self._start_operation(
+                client.remove, path, permanently=permanently, operation="remove", timeout=timeout
+            ),
+            lambda path, _: self._forget(path),
+            max_workers,
+        )
+
+    @instrumented("refresh_index")
+    def refresh_index(self, path: str = "/", full: bool = False, max_workers: int = 8) -> int:
+        """
+        Инкрементальное обновление локального индекса дерева диска.
+
+        Перечитываются только поддиректории, которых еще нет в индексе
+        или у которых изменилось время модификации.
+
+        Args:
+            path: Корень обновляемого поддерева
+            full: Перечитать все поддерево целиком
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Количество прочитанных директорий
+        """
+        if self.index is None:
+            raise ValueError("Индекс не подключен к источнику")
+        listed = 0
+
+        def _list(directory: str) -> List[Dict[str, Any]]:
+            with self._client_pool.client() as client:
+                return self._listdir(directory, client, fresh=True)
+
+        def _visit(directory: str, depth: int, items: List[Dict[str, Any]]) -> List[str]:
+            nonlocal listed
+            listed += 1
+            return self.index.apply_listing(directory, items, full=full)
+
+        walk_parallel(
+            path, _list, _visit, max_workers,
+            on_error=lambda directory, e: logger.warning(f"Ошибка индексации директории {directory}: {e}"),
+        )
+        return listed
+
+    @instrumented("download_file")
     def download_file(self, remote_path: str, local_path: Union[str, Path]) -> bool:
         """
         Скачивание файла с Яндекс.Диска.
@@ -98,60 +564,497 @@ class YadiskSource(BaseSource):
         """
         try:
             local_path = Path(local_path)
-            local_path.parent.mkdir(parents=True, exist_ok=True) # Вынести создание дирректории в отдельный метод
+            self._download(self.client, remote_path, local_path)
+            logger.debug(f"Файл {remote_path} скачан в {local_path}")
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    @instrumented("download_large_file")
+    def download_large_file(
+        self,
+        remote_path: str,
+        local_path: Union[str, Path],
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_workers: int = 4,
+        threshold: int = DEFAULT_THRESHOLD,
+    ) -> bool:
+        """
+        Скачивание большого файла параллельными сегментами с докачкой.
+
+        Файл скачивается Range-запросами в несколько потоков в заранее
+        выделенный файл. Прогресс хранится рядом с файлом, поэтому прерванное
+        скачивание продолжается с недостающих сегментов. Результат сверяется
+        с SHA256/MD5 из метаданных. Файлы меньше threshold скачиваются
+        обычным способом одним потоком.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            local_path: Локальный путь для сохранения
+            segment_size: Размер сегмента в байтах
+            max_workers: Количество одновременно скачиваемых сегментов
+            threshold: Минимальный размер файла для сегментированного скачивания
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        download: Optional[SegmentedDownload] = None
+        try:
+            meta = self.scheduler.call(
+                self.client.get_meta, remote_path, fields=["size", "md5", "sha256"], operation="get_meta"
+            )
+            if (meta["size"] or 0) < threshold:
+                return self.download_file(remote_path, local_path)
+            key = ContentCache.key(meta["md5"], meta["sha256"])
+            if self.content_cache is not None and key and self.content_cache.fetch(key, local_path):
+                logger.debug(f"Файл {remote_path} взят из локального кэша в {local_path}")
+                return True
+
+            download = SegmentedDownload(
+                Path(local_path), meta["size"], meta["md5"], meta["sha256"], segment_size
+            )
+            download.prepare()
+            link = self.scheduler.call(self.client.get_download_link, remote_path, operation="get_download_link")
+
+            def _fetch(index: int) -> None:
+                with self._client_pool.client() as client:
+                    # Сегмент при повторе перезаписывается с начала
+                    self.scheduler.call(self._fetch_segment, client, link, download, index, operation="download")
 
-            self.client.download(remote_path, str(local_path))
-            print(f"Файл {remote_path} скачан в {local_path}")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Контекст копируется, чтобы объем и повторы сегментов попали в событие операции
+                futures = [
+                    executor.submit(contextvars.copy_context().run, _fetch, index)
+                    for index in download.pending_segments()
+                ]
+                for future in futures:
+                    future.result()
+
+            if not download.verify():
+                download.discard()
+                record_error(f"Контрольная сумма файла {remote_path} не совпадает")
+                return False
+            download.finalize()
+            if self.content_cache is not None and key:
+                self.content_cache.store(key, local_path)
+            logger.debug(f"Файл {remote_path} скачан в {local_path}")
             return True
+        except RangeNotSupportedError:
+            # Файл скачивается заново целиком: частичные данные и прогресс не нужны
+            if download is not None:
+                download.discard()
+            return self.download_file(remote_path, local_path)
         except Exception as e:
-            print(f"Ошибка скачивания файла {remote_path}: {e}")
+            record_error(e)
             return False
 
-    def _ensure_directory_exists(self, remote_path: str) -> None:
+    @classmethod
+    def _fetch_segment(cls, client: yadisk.Client, link: str, download: SegmentedDownload, index: int) -> None:
+        start, end = download.segment_range(index)
+        with download.write_at(start) as writer:
+            cls._fetch_range(client, link, start, end, writer.write)
+        if writer.written != end - start + 1:
+            raise IOError(f"Сегмент {index} скачан не полностью")
+        add_bytes(writer.written)
+        download.mark_done(index)
+
+    @staticmethod
+    def _fetch_range(client: yadisk.Client, link: str, start: int, end: int, write: Callable[[bytes], Any]) -> None:
+        """Скачивает байты start..end (включительно) по ссылке Range-запросом."""
+        with client.session.send_request(
+            "GET", link,
+            headers={"Range": f"bytes={start}-{end}"},
+            timeout=yadisk.settings.DEFAULT_TIMEOUT,
+            stream=True,
+        ) as response:
+            if response.status == 200:
+                raise RangeNotSupportedError(link)
+            if response.status != 206:
+                raise response.get_exception()
+            response.download(write)
+
+    @instrumented("read_range")
+    def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """
+        Чтение части файла Range-запросом без скачивания всего файла.
+
+        Ссылка на скачивание запоминается (см. DownloadLinkCache), поэтому
+        повторное чтение того же файла стоит одного запроса.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            start: Смещение первого байта
+            length: Количество байт
+
+        Returns:
+            Прочитанные байты
+
+        Raises:
+            RangeNotSupportedError: Если сервер вернул весь файл вместо диапазона
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start и length должны быть неотрицательными")
+        if not length:
+            return b""
+
+        def _attempt(client: yadisk.Client) -> bytes:
+            link = self.download_links.get(remote_path)
+            fresh = link is None
+            while True:
+                if link is None:
+                    link = self.scheduler.call(client.get_download_link, remote_path, operation="get_download_link")
+                    self.download_links.put(remote_path, link)
+                buffer = io.BytesIO()
+                try:
+                    self._fetch_range(client, link, start, start + length - 1, buffer.write)
+                    break
+                except RangeNotSupportedError:
+                    raise
+                except Exception:
+                    self.download_links.invalidate(remote_path)
+                    if fresh:
+                        raise
+                    # Ссылка из кэша могла устареть: повторяем с новой
+                    link, fresh = None, True
+            if buffer.tell() != length:
+                raise IOError(f"Диапазон {start}+{length} файла {remote_path} прочитан не полностью")
+            return buffer.getvalue()
+
+        with self._client_pool.client() as client:
+            data = self.scheduler.call(_attempt, client, operation="download")
+        add_bytes(len(data))
+        return data
+
+    @instrumented("download_fileobj")
+    def download_fileobj(self, remote_path: str, file_obj: BinaryIO) -> bool:
+        """
+        Скачивание файла с Яндекс.Диска в file-like объект без записи на диск.
+
+        Args:
+            remote_path: Путь к файлу на Яндекс.Диске
+            file_obj: Объект с методом write, например io.BytesIO или открытый файл
+
+        Returns:
+            True если скачивание успешно, иначе False
+        """
+        start = upload_position(file_obj)
+
+        def _attempt() -> None:
+            if start is not None:
+                # Повтор пишет данные заново с исходной позиции
+                file_obj.seek(start)
+                if hasattr(file_obj, "truncate"):
+                    file_obj.truncate()
+            self.client.download(remote_path, file_obj)
+
+        try:
+            self.scheduler.call(
+                _attempt, operation="download", retries=None if start is not None else 0
+            )
+            if start is not None:
+                add_bytes(file_obj.tell() - start)
+            return True
+        except Exception as e:
+            record_error(e)
+            return False
+
+    def _ensure_directory_exists(self, remote_path: str, client: Optional[yadisk.Client] = None) -> None:
         """
         Создает директорию на Яндекс.Диске, если она не существует.
 
+        Уже подтвержденные директории запоминаются и повторно не проверяются,
+        недостающие родители создаются сверху вниз (см. DirectoryCreator).
+
         Args:
             remote_path: Путь к директории на Яндекс.Диске
+            client: Клиент для выполнения запросов (по умолчанию self.client)
         """
+        client = client or self.client
         try:
-            if not self.client.exists(remote_path):
-                # Создаем родительские директории рекурсивно
-                parent = Path(remote_path).parent
-                if str(parent) != "/" and str(parent) != ".":
-                    self._ensure_directory_exists(str(parent))
-                self.client.mkdir(remote_path)
+            def _mkdir(path: str) -> None:
+                self.scheduler.call(client.mkdir, path, operation="mkdir")
+
+            for created in self._directories.ensure(remote_path, _mkdir):
+                self.metadata_cache.invalidate(created)
+                if self.index is not None:
+                    self.index.record(created, type="dir")
         except Exception as e:
-            print(f"Ошибка создания директории {remote_path}: {e}")
+            record_error(e)
 
-    def upload_file(self, local_path: Union[str, Path], remote_path: str) -> bool:
+    @instrumented("upload_file", path_arg=1)
+    def upload_file(
+        self,
+        local_path: Union[str, Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> bool:
         """
         Загрузка файла на Яндекс.Диск.
 
         Args:
-            local_path: Локальный путь к файлу
+            local_path: Локальный путь к файлу или данные в памяти: bytes,
+                bytearray, memoryview, file-like объект или итератор фрагментов.
+                Буферы отправляются фрагментами без копирования.
             remote_path: Путь на Яндекс.Диске
+            overwrite: Перезаписать существующий файл
 
         Returns:
             True если загрузка успешна, иначе False
         """
+        if not is_local_path(local_path):
+            try:
+                self._upload(self.client, local_path, remote_path, overwrite)
+                logger.debug(f"Данные загружены в {remote_path}")
+                return True
+            except Exception as e:
+                record_error(e)
+                return False
         try:
             local_path = Path(local_path)
             if not local_path.exists():
-                print(f"Локальный файл не найден: {local_path}")
+                record_error(f"Локальный файл не найден: {local_path}")
                 return False
 
-            # Создаем директорию на Яндекс.Диске, если ее нет
-            remote_dir = Path(remote_path).parent
-            if str(remote_dir) != "." and str(remote_dir) != "/":
-                self._ensure_directory_exists(str(remote_dir))
-
-            self.client.upload(str(local_path), remote_path)
-            print(f"Файл {local_path} загружен в {remote_path}")
+            self._upload(self.client, local_path, remote_path, overwrite)
+            logger.debug(f"Файл {local_path} загружен в {remote_path}")
             return True
         except Exception as e:
-            print(f"Ошибка загрузки файла {local_path}: {e}")
+            record_error(e)
             return False
 
+    @instrumented("download_many", path_arg=None)
+    def download_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+    ) -> List[TransferResult]:
+        """
+        Параллельное скачивание набора файлов в пуле потоков.
+
+        Args:
+            items: Пары (путь на Яндекс.Диске, локальный путь)
+            max_workers: Количество потоков-воркеров
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                with self._client_pool.client() as client:
+                    self._download(client, remote_path, local_path)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=local_path.stat().st_size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    @instrumented("upload_many", path_arg=None)
+    def upload_many(
+        self,
+        items: Iterable[Tuple[str, Union[str, Path]]],
+        max_workers: int = 8,
+        overwrite: bool = False,
+    ) -> List[TransferResult]:
+        """
+        Параллельная загрузка набора файлов в пуле потоков.
+
+        Args:
+            items: Пары (путь на Яндекс.Диске, локальный путь)
+            max_workers: Количество потоков-воркеров
+            overwrite: Перезаписывать существующие файлы
+
+        Returns:
+            Список TransferResult в порядке items
+        """
+        def _worker(item: Tuple[str, Union[str, Path]]) -> TransferResult:
+            remote_path, local_path = item[0], Path(item[1])
+            start = time.perf_counter()
+            try:
+                size = local_path.stat().st_size
+                with self._client_pool.client() as client:
+                    self._upload(client, local_path, remote_path, overwrite)
+                return TransferResult(
+                    remote_path, str(local_path), True,
+                    size=size, elapsed=time.perf_counter() - start,
+                )
+            except Exception as e:
+                return TransferResult(
+                    remote_path, str(local_path), False,
+                    elapsed=time.perf_counter() - start, error=str(e) or type(e).__name__,
+                )
+
+        return self._run_in_pool(_worker, items, max_workers)
+
+    def disconnect(self):
+        """Отключение от Яндекс.Диска и закрытие пула клиентов."""
+        # Общий клиент закрывается реестром, а не источником
+        self.operations.close()
+        if self.client and not self._shared_client:
+            self.client.close()
+        self._client_pool.close()
+        super().disconnect()
+
+    def _start_operation(
+        self,
+        func: Any,
+        *args: Any,
+        operation: str,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> "Future[bool]":
+        """
+        Запускает операцию на сервере, не дожидаясь ее завершения.
+
+        Returns:
+            Future, завершающийся вместе с операцией (сразу, если сервер выполнил ее синхронно)
+        """
+        link = self.scheduler.call(func, *args, wait=False, operation=operation, **kwargs)
+        if isinstance(link, yadisk.objects.OperationLinkObject):
+            return self.operations.add(link.href, timeout)
+        future: "Future[bool]" = Future()
+        future.set_result(True)
+        return future
+
+    def _operation_status(self, link: str) -> str:
+        with self._client_pool.client() as client:
+            return self.scheduler.call(client.get_operation_status, link, operation="operation_status")
+
+    def _run_operations(self, items, start, forget, max_workers: int) -> List[OperationResult]:
+        finished: Dict[int, float] = {}
+
+        def _worker(indexed: Tuple[int, Tuple[str, Optional[str]]]) -> Tuple[float, "Future[bool]"]:
+            index, (src, dst) = indexed
+            begin = time.perf_counter()
+            try:
+                with self._client_pool.client() as client:
+                    future = start(client, src, dst)
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(lambda _: finished.setdefault(index, time.perf_counter()))
+            return begin, future
+
+        started = self._run_in_pool(_worker, enumerate(items), max_workers)
+        results = []
+        for index, ((src, dst), (begin, future)) in enumerate(zip(items, started)):
+            error = future.exception()
+            if error is None:
+                forget(src, dst)
+            results.append(OperationResult(
+                src, dst, error is None,
+                elapsed=finished.get(index, time.perf_counter()) - begin,
+                error=None if error is None else str(error) or type(error).__name__,
+            ))
+        return results
+
+    @staticmethod
+    def _run_in_pool(worker, items, max_workers: int) -> List[TransferResult]:
+        if max_workers <= 0:
+            raise ValueError("max_workers должен быть положительным")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Контекст копируется, чтобы события воркеров учитывались в объемлющей операции
+            futures = [executor.submit(contextvars.copy_context().run, worker, item) for item in items]
+            return [future.result() for future in futures]
+
+    @instrumented("download", path_arg=1)
+    def _download(self, client: yadisk.Client, remote_path: str, local_path: Path) -> None:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.content_cache is None:
+            self.scheduler.call(client.download, remote_path, str(local_path), operation="download")
+            add_bytes(local_path.stat().st_size)
+            return
+        # Один запрос метаданных: при совпадении хэша файл берется из кэша
+        meta = self.scheduler.call(client.get_meta, remote_path, fields=["md5", "sha256"], operation="get_meta")
+        key = ContentCache.key(meta["md5"], meta["sha256"])
+        if key and self.content_cache.fetch(key, local_path):
+            return
+        tmp_path = local_path.with_name(local_path.name + ".download")
+        try:
+            self.scheduler.call(client.download, remote_path, str(tmp_path), operation="download")
+            os.replace(tmp_path, local_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        add_bytes(local_path.stat().st_size)
+        if key:
+            self.content_cache.store(key, local_path)
+
+    @instrumented("upload", path_arg=2)
+    def _upload(
+        self,
+        client: yadisk.Client,
+        source: Union[Path, UploadData],
+        remote_path: str,
+        overwrite: bool = False,
+    ) -> None:
+        # Создаем директорию на Яндекс.Диске, если ее нет
+        remote_dir = parent_path(remote_path)
+        if remote_dir != "/":
+            self._ensure_directory_exists(remote_dir, client)
+        if isinstance(source, Path):
+            self.scheduler.call(
+                client.upload, str(source), remote_path, overwrite=overwrite, operation="upload"
+            )
+            size = source.stat().st_size
+        else:
+            payload = sync_payload(source)
+            start = upload_position(source)
+
+            def _attempt() -> None:
+                if start is not None:
+                    source.seek(start)
+                client.upload(payload, remote_path, overwrite=overwrite)
+
+            # Одноразовые генераторы и потоки повторно не отправляются
+            self.scheduler.call(_attempt, operation="upload", retries=None if is_replayable(source) else 0)
+            size = payload_size(source)
+        add_bytes(size)
+        self.metadata_cache.invalidate(remote_path)
+        self.download_links.invalidate(remote_path)
+        if self.index is not None:
+            self.index.record(remote_path, size=size)
+
+    def _forget(self, remote_path: str) -> None:
+        """Сбрасывает все локальные сведения об удаленном ресурсе."""
+        self.metadata_cache.invalidate_tree(remote_path)
+        self._directories.forget(remote_path)
+        self.download_links.invalidate_tree(remote_path)
+        if self.index is not None:
+            self.index.remove(remote_path)
+
+    def _listdir(
+        self,
+        path: str,
+        client: Optional[yadisk.Client] = None,
+        fresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Содержимое директории с использованием кэша метаданных.
+
+        Args:
+            path: Путь к директории
+            client: Клиент для выполнения запроса (по умолчанию self.client)
+            fresh: Не использовать закэшированное значение
+
+        Returns:
+            Список ресурсов в виде словарей
+        """
+        items = None if fresh else self.metadata_cache.get(path)
+        if items is None:
+            client = client or self.client
+            items = self.scheduler.call(
+                lambda: [resource_to_dict(item) for item in client.listdir(path)], operation="listdir"
+            )
+            self.metadata_cache.put(path, items)
+        return items
+
 
 
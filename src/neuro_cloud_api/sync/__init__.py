@@ -0,0 +1,9 @@
+from .sync_engine import SyncAction, SyncEngine, SyncMode, SyncPlan, SyncReport
+
+__all__ = [
+    "SyncAction",
+    "SyncEngine",
+    "SyncMode",
+    "SyncPlan",
+    "SyncReport",
+]
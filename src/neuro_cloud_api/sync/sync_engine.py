@@ -0,0 +1,372 @@
+import asyncio
+import fnmatch
+import hashlib
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..sources.base_source import BaseSource
+from ..sources.path_utils import join_path, normalize_path
+from ..sources.transfer import TransferResult, run_bounded
+
+
+STATE_FILE_NAME = ".neuro_cloud_sync.json"
+
+
+class SyncMode(Enum):
+    UPLOAD = "upload"        # локальная папка -> облако
+    DOWNLOAD = "download"    # облако -> локальная папка
+    TWO_WAY = "two_way"      # изменения переносятся в обе стороны
+
+
+@dataclass
+class SyncAction:
+    """
+    Одно действие плана синхронизации.
+
+    kind: str - upload | download | delete_remote | delete_local
+    path: str - Путь относительно корней синхронизации (через "/")
+    reason: str - Причина действия
+    """
+    kind: str
+    path: str
+    reason: str
+
+
+@dataclass
+class SyncPlan:
+    """План синхронизации: минимальный набор действий."""
+    actions: List[SyncAction] = field(default_factory=list)
+
+    def by_kind(self, kind: str) -> List[SyncAction]:
+        """Действия указанного типа."""
+        return [action for action in self.actions if action.kind == kind]
+
+    def summary(self) -> Dict[str, int]:
+        """Количество действий каждого типа."""
+        result: Dict[str, int] = {}
+        for action in self.actions:
+            result[action.kind] = result.get(action.kind, 0) + 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+
+@dataclass
+class SyncReport:
+    """
+    Результат выполнения плана.
+
+    plan: SyncPlan - Выполненный план
+    transfers: List[TransferResult] - Результаты загрузок и скачиваний
+    deleted: List[str] - Успешно удаленные пути
+    failed: List[str] - Пути, для которых действие не удалось
+    """
+    plan: SyncPlan
+    transfers: List[TransferResult] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+class SyncEngine:
+    """
+    Инкрементальная синхронизация локальной папки с папкой в облаке.
+
+    Деревья сравниваются по размеру, времени изменения и MD5. MD5 локальных
+    файлов кэшируется в файле состояния по паре (размер, mtime), поэтому
+    повторная синхронизация неизмененного дерева не перечитывает файлы.
+    Там же хранится MD5 последней синхронизированной версии каждого файла,
+    по которому в двустороннем режиме определяется, какая сторона изменилась.
+
+    Работает с синхронными (plan/run) и асинхронными (plan_async/run_async)
+    источниками, которые реализуют list_files, upload_many, download_many
+    и remove (Яндекс.Диск, S3, Google Drive, BridgedSource, TieredSource); для остальных
+    источников синхронизация завершится NotImplementedError.
+    """
+
+    def __init__(
+        self,
+        source: BaseSource,
+        local_root: Union[str, Path],
+        remote_root: str,
+        mode: SyncMode = SyncMode.UPLOAD,
+        delete: bool = False,
+        exclude: Iterable[str] = (),
+        state_path: Optional[Union[str, Path]] = None,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            source: Источник облачного хранилища
+            local_root: Локальная папка
+            remote_root: Папка в облаке
+            mode: Направление синхронизации
+            delete: Удалять файлы, отсутствующие на стороне-источнике
+                (в двустороннем режиме - удаленные с момента прошлой синхронизации)
+            exclude: Glob-шаблоны исключаемых путей (сравниваются с относительным
+                путем и с именем файла), например "*.tmp" или "cache/*"
+            state_path: Файл состояния (по умолчанию .neuro_cloud_sync.json в local_root)
+            max_workers: Количество одновременных операций
+        """
+        self.source = source
+        self.local_root = Path(local_root)
+        self.remote_root = normalize_path(remote_root)
+        self.mode = mode
+        self.delete = delete
+        self.exclude = list(exclude)
+        self.state_path = Path(state_path) if state_path else self.local_root / STATE_FILE_NAME
+        self.max_workers = max_workers
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    def plan(self) -> SyncPlan:
+        """
+        Строит план для синхронного источника (ничего не изменяя).
+
+        Листинг облака запрашивается в строгом режиме: если хотя бы одну
+        директорию получить не удалось, исключение пробрасывается и план не
+        строится - иначе файлы из неполученных директорий выглядели бы
+        удаленными в облаке.
+        """
+        remote = self._remote_snapshot(
+            self.source.list_files(self.remote_root, recursive=True, strict=True)
+        )
+        return self._build_plan(self._local_snapshot(), remote)
+
+    async def plan_async(self) -> SyncPlan:
+        """Строит план для асинхронного источника (ничего не изменяя; ошибки листинга - как в plan)."""
+        files = await self.source.list_files(self.remote_root, recursive=True, strict=True)
+        local = await asyncio.get_running_loop().run_in_executor(None, self._local_snapshot)
+        return self._build_plan(local, self._remote_snapshot(files))
+
+    def run(self, dry_run: bool = False) -> SyncReport:
+        """
+        Синхронизация для синхронного источника.
+
+        Args:
+            dry_run: Только построить план
+
+        Returns:
+            SyncReport с планом и результатами
+        """
+        plan = self.plan()
+        report = SyncReport(plan)
+        if dry_run:
+            return report
+
+        uploads, downloads = self._transfer_pairs(plan)
+        if uploads:
+            report.transfers += self.source.upload_many(uploads, max_workers=self.max_workers, overwrite=True)
+        if downloads:
+            report.transfers += self.source.download_many(downloads, max_workers=self.max_workers)
+        remote_deletes = plan.by_kind("delete_remote")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            removed = list(executor.map(
+                lambda action: self.source.remove(self._remote_path(action.path)), remote_deletes
+            ))
+        self._finish(report, remote_deletes, removed)
+        return report
+
+    async def run_async(self, dry_run: bool = False) -> SyncReport:
+        """
+        Синхронизация для асинхронного источника.
+
+        Args:
+            dry_run: Только построить план
+
+        Returns:
+            SyncReport с планом и результатами
+        """
+        plan = await self.plan_async()
+        report = SyncReport(plan)
+        if dry_run:
+            return report
+
+        uploads, downloads = self._transfer_pairs(plan)
+        if uploads:
+            report.transfers += await self.source.upload_many(
+                uploads, max_concurrency=self.max_workers, overwrite=True
+            )
+        if downloads:
+            report.transfers += await self.source.download_many(downloads, max_concurrency=self.max_workers)
+        remote_deletes = plan.by_kind("delete_remote")
+        removed = await run_bounded(
+            remote_deletes,
+            lambda action: self.source.remove(self._remote_path(action.path)),
+            self.max_workers,
+        ) if remote_deletes else []
+        self._finish(report, remote_deletes, removed)
+        return report
+
+    def _build_plan(
+        self,
+        local: Dict[str, Tuple[int, int]],
+        remote: Dict[str, Dict[str, Any]],
+    ) -> SyncPlan:
+        self._load_state()
+        known = set(local) | set(remote)
+        # Файлы, исчезнувшие с обеих сторон, больше не нужны в состоянии
+        self._state = {rel: entry for rel, entry in self._state.items() if rel in known}
+        plan = SyncPlan()
+        for rel in sorted(known):
+            action = self._decide(rel, local.get(rel), remote.get(rel))
+            if action is not None:
+                plan.actions.append(action)
+        return plan
+
+    def _decide(
+        self,
+        rel: str,
+        local: Optional[Tuple[int, int]],
+        remote: Optional[Dict[str, Any]],
+    ) -> Optional[SyncAction]:
+        base = self._state.get(rel, {}).get("synced_md5")
+
+        if local is not None and remote is not None:
+            if self._same(rel, local, remote):
+                entry = self._state.setdefault(rel, {})
+                entry["synced_md5"] = remote["md5"] or entry.get("md5")
+                return None
+            if self.mode == SyncMode.UPLOAD:
+                return SyncAction("upload", rel, "изменен")
+            if self.mode == SyncMode.DOWNLOAD:
+                return SyncAction("download", rel, "изменен")
+            local_changed = self._local_md5(rel, local) != base
+            remote_changed = remote["md5"] is None or remote["md5"] != base
+            if local_changed and not remote_changed:
+                return SyncAction("upload", rel, "изменен локально")
+            if remote_changed and not local_changed:
+                return SyncAction("download", rel, "изменен в облаке")
+            # Конфликт: побеждает более новая версия
+            if local[1] / 1e9 >= _timestamp(remote["modified"]):
+                return SyncAction("upload", rel, "конфликт, локальная версия новее")
+            return SyncAction("download", rel, "конфликт, версия в облаке новее")
+
+        if local is not None:
+            if self.mode == SyncMode.DOWNLOAD:
+                return SyncAction("delete_local", rel, "нет в облаке") if self.delete else None
+            if self.mode == SyncMode.TWO_WAY and base is not None and self.delete:
+                return SyncAction("delete_local", rel, "удален в облаке")
+            return SyncAction("upload", rel, "нет в облаке")
+
+        if self.mode == SyncMode.UPLOAD:
+            return SyncAction("delete_remote", rel, "нет локально") if self.delete else None
+        if self.mode == SyncMode.TWO_WAY and base is not None and self.delete:
+            return SyncAction("delete_remote", rel, "удален локально")
+        return SyncAction("download", rel, "нет локально")
+
+    def _same(self, rel: str, local: Tuple[int, int], remote: Dict[str, Any]) -> bool:
+        if local[0] != remote["size"]:
+            return False
+        if remote["md5"]:
+            return self._local_md5(rel, local) == remote["md5"]
+        # Без MD5 считаем файл неизмененным, если локальная копия не новее
+        return local[1] / 1e9 <= _timestamp(remote["modified"])
+
+    def _local_md5(self, rel: str, local: Tuple[int, int]) -> str:
+        entry = self._state.setdefault(rel, {})
+        if entry.get("size") == local[0] and entry.get("mtime_ns") == local[1] and entry.get("md5"):
+            return entry["md5"]
+        digest = hashlib.md5()
+        with open(self.local_root / rel, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        entry.update(size=local[0], mtime_ns=local[1], md5=digest.hexdigest())
+        return entry["md5"]
+
+    def _local_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        result = {}
+        if not self.local_root.exists():
+            return result
+        for dirpath, _, filenames in os.walk(self.local_root):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if path == self.state_path:
+                    continue
+                rel = path.relative_to(self.local_root).as_posix()
+                if self._excluded(rel):
+                    continue
+                stat = path.stat()
+                result[rel] = (stat.st_size, stat.st_mtime_ns)
+        return result
+
+    def _remote_snapshot(self, files: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        prefix = self.remote_root.rstrip("/") + "/"
+        result = {}
+        for item in files:
+            path = normalize_path(item["path"])
+            if not path.startswith(prefix):
+                continue
+            rel = path[len(prefix):]
+            if not self._excluded(rel):
+                result[rel] = item
+        return result
+
+    def _excluded(self, rel: str) -> bool:
+        name = rel.rsplit("/", 1)[-1]
+        return any(fnmatch.fnmatch(rel, p) or fnmatch.fnmatch(name, p) for p in self.exclude)
+
+    def _remote_path(self, rel: str) -> str:
+        return join_path(self.remote_root, rel)
+
+    def _transfer_pairs(self, plan: SyncPlan) -> Tuple[List[Tuple[str, Path]], List[Tuple[str, Path]]]:
+        uploads = [(self._remote_path(a.path), self.local_root / a.path) for a in plan.by_kind("upload")]
+        downloads = [(self._remote_path(a.path), self.local_root / a.path) for a in plan.by_kind("download")]
+        return uploads, downloads
+
+    def _finish(self, report: SyncReport, remote_deletes: List[SyncAction], removed: List[bool]) -> None:
+        prefix = self.remote_root.rstrip("/") + "/"
+        for result in report.transfers:
+            rel = normalize_path(result.remote_path)[len(prefix):]
+            if not result.success:
+                report.failed.append(rel)
+                continue
+            stat = (self.local_root / rel).stat()
+            # После передачи обе стороны совпадают с локальным файлом
+            md5 = self._local_md5(rel, (stat.st_size, stat.st_mtime_ns))
+            self._state[rel]["synced_md5"] = md5
+
+        for action, ok in zip(remote_deletes, removed):
+            if ok:
+                report.deleted.append(action.path)
+                self._state.pop(action.path, None)
+            else:
+                report.failed.append(action.path)
+
+        for action in report.plan.by_kind("delete_local"):
+            try:
+                (self.local_root / action.path).unlink()
+                report.deleted.append(action.path)
+                self._state.pop(action.path, None)
+            except OSError:
+                report.failed.append(action.path)
+
+        self._save_state()
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self._state = json.load(f).get("files", {})
+        except (OSError, ValueError):
+            self._state = {}
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self._state}, f)
+        os.replace(tmp_path, self.state_path)
+
+
+def _timestamp(value: Any) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
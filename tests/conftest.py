@@ -0,0 +1,46 @@
+from typing import Iterator
+
+import pytest
+
+from benchmarks.fake_drive_server import FakeDriveServer
+from benchmarks.fake_s3_server import FakeS3Server
+from benchmarks.fake_yadisk_server import FakeServerSettings, FakeYadiskServer
+from src.neuro_cloud_api.sources.gdrive_client import create_drive_scheduler
+from src.neuro_cloud_api.sources.request_scheduler import RequestScheduler, RetryPolicy
+from src.neuro_cloud_api.sources.s3_client import create_s3_scheduler
+from src.neuro_cloud_api.sources.transport import create_scheduler
+
+
+TOKEN = "test-token"
+# Короткие паузы между повторами, чтобы внедренные отказы не замедляли тесты
+FAST_RETRIES = RetryPolicy(max_retries=2, base_delay=0.01, max_delay=0.05)
+
+
+@pytest.fixture
+def yadisk_server() -> Iterator[FakeYadiskServer]:
+    with FakeYadiskServer(FakeServerSettings(seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def s3_server() -> Iterator[FakeS3Server]:
+    with FakeS3Server(FakeServerSettings(seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def drive_server() -> Iterator[FakeDriveServer]:
+    with FakeDriveServer(FakeServerSettings(seed=1)) as server:
+        yield server
+
+
+def yadisk_scheduler() -> RequestScheduler:
+    return create_scheduler(policy=FAST_RETRIES)
+
+
+def s3_scheduler() -> RequestScheduler:
+    return create_s3_scheduler(policy=FAST_RETRIES)
+
+
+def drive_scheduler() -> RequestScheduler:
+    return create_drive_scheduler(policy=FAST_RETRIES)
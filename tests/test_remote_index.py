@@ -0,0 +1,80 @@
+from src.neuro_cloud_api import RemoteIndex, YadiskSource
+from src.neuro_cloud_api.sources.path_utils import normalize_path
+
+from .conftest import TOKEN, yadisk_scheduler
+
+
+def _populate(server) -> None:
+    server.put_file("/photos/a.jpg", b"a" * 10)
+    server.put_file("/photos/2024/b.jpg", b"b" * 200)
+    server.put_file("/docs/c.txt", b"c" * 30)
+    server.put_file("/docs/old/d.txt", b"d" * 40)
+
+
+def _paths(items: list) -> list:
+    return [normalize_path(item["path"]) for item in items]
+
+
+def _indexed_source() -> YadiskSource:
+    return YadiskSource(TOKEN, cache_ttl=0, index=RemoteIndex(), scheduler=yadisk_scheduler())
+
+
+def test_first_refresh_lists_every_directory(yadisk_server):
+    _populate(yadisk_server)
+    source = _indexed_source()
+
+    assert source.refresh_index() == 5
+
+    assert _paths(source.index.query(type="file")) == [
+        "/docs/c.txt", "/docs/old/d.txt", "/photos/2024/b.jpg", "/photos/a.jpg",
+    ]
+
+
+def test_unchanged_tree_is_refreshed_by_listing_root_only(yadisk_server):
+    _populate(yadisk_server)
+    source = _indexed_source()
+    source.refresh_index()
+    yadisk_server.reset_counts()
+
+    assert source.refresh_index() == 1
+    assert source.refresh_index(full=True) == 5
+
+
+def test_changed_directory_is_listed_again(yadisk_server):
+    _populate(yadisk_server)
+    source = _indexed_source()
+    source.refresh_index()
+
+    yadisk_server.put_file("/docs/e.txt", b"e")
+    # Сервер-заглушка не меняет время модификации родителя, как это делает Диск
+    yadisk_server._resources["/docs"].modified = "2100-01-01T00:00:00+00:00"
+
+    assert source.refresh_index() == 2
+    assert [item["name"] for item in source.index.children("/docs")] == ["c.txt", "e.txt", "old"]
+
+
+def test_removed_resources_are_dropped(yadisk_server):
+    _populate(yadisk_server)
+    source = _indexed_source()
+    source.refresh_index()
+
+    source.remove("/docs/old", permanently=True)
+    yadisk_server._resources["/docs"].modified = "2100-01-01T00:00:00+00:00"
+    source.refresh_index()
+
+    assert _paths(source.index.query(prefix="/docs")) == ["/docs/c.txt"]
+    assert not source.index.is_listed("/docs/old")
+
+
+def test_query_filters_without_requests(yadisk_server):
+    _populate(yadisk_server)
+    source = _indexed_source()
+    source.refresh_index()
+    yadisk_server.reset_counts()
+
+    assert _paths(source.index.query(name="*.JPG")) == ["/photos/2024/b.jpg", "/photos/a.jpg"]
+    assert _paths(source.index.query(min_size=35, type="file")) == [
+        "/docs/old/d.txt", "/photos/2024/b.jpg",
+    ]
+    assert _paths(source.index.query(prefix="/photos", type="dir")) == ["/photos/2024"]
+    assert yadisk_server.request_counts() == {}
@@ -0,0 +1,124 @@
+import asyncio
+import os
+
+from pathlib import Path
+
+from src.neuro_cloud_api import AsyncYadiskSource, YadiskSource
+from src.neuro_cloud_api.metrics import HistogramSink
+from src.neuro_cloud_api.sources.segmented_download import SegmentedDownload
+
+from .conftest import TOKEN, yadisk_scheduler
+
+
+SEGMENT = 64 * 1024
+DATA = os.urandom(10 * SEGMENT + 123)
+
+
+def _leftovers(path: Path) -> list:
+    return sorted(p.name for p in path.parent.glob(path.name + ".*"))
+
+
+def test_segments_are_assembled_into_the_file(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+    target = tmp_path / "big.bin"
+
+    assert source.download_large_file("/big.bin", target, segment_size=SEGMENT, threshold=1)
+
+    assert target.read_bytes() == DATA
+    assert _leftovers(target) == []
+    assert yadisk_server.request_counts()["download"] == 11
+
+
+def test_small_file_is_downloaded_in_one_request(yadisk_server, tmp_path):
+    yadisk_server.put_file("/small.bin", b"tiny")
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+
+    assert source.download_large_file("/small.bin", tmp_path / "small.bin", segment_size=SEGMENT)
+
+    assert (tmp_path / "small.bin").read_bytes() == b"tiny"
+    assert yadisk_server.request_counts()["download"] == 1
+
+
+def test_interrupted_download_resumes_with_missing_segments(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+    resource = yadisk_server._resources["/big.bin"]
+    target = tmp_path / "big.bin"
+    # Состояние прерванной попытки: скачаны сегменты 0, 3 и 7
+    previous = SegmentedDownload(target, len(DATA), resource.md5, resource.sha256, SEGMENT)
+    previous.prepare()
+    for index in (0, 3, 7):
+        start, end = previous.segment_range(index)
+        with previous.write_at(start) as writer:
+            writer.write(DATA[start:end + 1])
+        previous.mark_done(index)
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+
+    assert source.download_large_file("/big.bin", target, segment_size=SEGMENT, threshold=1)
+
+    assert target.read_bytes() == DATA
+    assert _leftovers(target) == []
+    assert yadisk_server.request_counts()["download"] == 8
+
+
+def test_progress_for_another_version_is_discarded(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+    target = tmp_path / "big.bin"
+    stale = SegmentedDownload(target, len(DATA), "0" * 32, "0" * 64, SEGMENT)
+    stale.prepare()
+    stale.mark_done(0)
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+
+    assert source.download_large_file("/big.bin", target, segment_size=SEGMENT, threshold=1)
+
+    assert target.read_bytes() == DATA
+    assert yadisk_server.request_counts()["download"] == 11
+
+
+def test_aborted_segments_are_retried(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+    yadisk_server.settings.download_abort_rate = 0.3
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+    target = tmp_path / "big.bin"
+
+    assert source.download_large_file("/big.bin", target, segment_size=SEGMENT, threshold=1)
+
+    assert target.read_bytes() == DATA
+    assert yadisk_server.request_counts().get("download_abort", 0) > 0
+
+
+def test_checksum_mismatch_is_reported_and_cleaned_up(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+    yadisk_server._resources["/big.bin"].sha256 = "0" * 64
+    source = YadiskSource(TOKEN, scheduler=yadisk_scheduler())
+    sink = HistogramSink()
+    source.add_sink(sink)
+    target = tmp_path / "big.bin"
+
+    assert not source.download_large_file("/big.bin", target, segment_size=SEGMENT, threshold=1)
+
+    assert not target.exists()
+    assert _leftovers(target) == []
+    assert sink.summary()["download_large_file"].errors == 1
+
+
+def test_async_download_and_checksum_mismatch(yadisk_server, tmp_path):
+    yadisk_server.put_file("/big.bin", DATA)
+
+    async def _download() -> tuple:
+        source = AsyncYadiskSource(TOKEN, scheduler=yadisk_scheduler())
+        sink = HistogramSink()
+        source.add_sink(sink)
+        try:
+            ok = await source.download_large_file("/big.bin", tmp_path / "a.bin", segment_size=SEGMENT, threshold=1)
+            yadisk_server._resources["/big.bin"].sha256 = "0" * 64
+            bad = await source.download_large_file("/big.bin", tmp_path / "b.bin", segment_size=SEGMENT, threshold=1)
+            return ok, bad, sink.summary()["download_large_file"].errors
+        finally:
+            await source.disconnect()
+
+    ok, bad, errors = asyncio.run(_download())
+
+    assert ok and (tmp_path / "a.bin").read_bytes() == DATA
+    assert not bad and not list(tmp_path.glob("b.bin*"))
+    assert errors == 1
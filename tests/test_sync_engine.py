@@ -0,0 +1,209 @@
+import asyncio
+import time
+
+from pathlib import Path
+
+import pytest
+
+from src.neuro_cloud_api import (
+    AsyncYadiskSource,
+    GoogleDriveSource,
+    S3Source,
+    TieredSource,
+    YadiskSource,
+)
+from src.neuro_cloud_api.sync import SyncEngine, SyncMode
+
+from .conftest import TOKEN, drive_scheduler, s3_scheduler, yadisk_scheduler
+
+
+REMOTE_FILES = {"/m/a.txt": b"alpha", "/m/d/b.txt": b"beta", "/m/d/e/c.txt": b"gamma"}
+
+
+def _local_files(root: Path) -> dict:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*.txt")
+    }
+
+
+def test_upload_creates_remote_tree_and_second_run_is_noop(yadisk_server, tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"one")
+    (tmp_path / "d").mkdir()
+    (tmp_path / "d" / "b.txt").write_bytes(b"two")
+    (tmp_path / "skip.tmp").write_bytes(b"temp")
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+
+    report = SyncEngine(source, tmp_path, "/up", exclude=["*.tmp"]).run()
+
+    assert report.plan.summary() == {"upload": 2}
+    assert not report.failed
+    assert yadisk_server.read_file("/up/a.txt") == b"one"
+    assert yadisk_server.read_file("/up/d/b.txt") == b"two"
+    assert len(SyncEngine(source, tmp_path, "/up", exclude=["*.tmp"]).plan()) == 0
+
+
+def test_upload_sends_only_changed_files(yadisk_server, tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"one")
+    (tmp_path / "b.txt").write_bytes(b"two")
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+    SyncEngine(source, tmp_path, "/up").run()
+
+    (tmp_path / "a.txt").write_bytes(b"one, changed")
+    report = SyncEngine(source, tmp_path, "/up").run()
+
+    assert [(action.kind, action.path) for action in report.plan.actions] == [("upload", "a.txt")]
+    assert yadisk_server.read_file("/up/a.txt") == b"one, changed"
+
+
+def test_download_with_delete_mirrors_remote(yadisk_server, tmp_path):
+    for path, data in REMOTE_FILES.items():
+        yadisk_server.put_file(path, data)
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+    engine = SyncEngine(source, tmp_path, "/m", mode=SyncMode.DOWNLOAD, delete=True)
+
+    assert engine.run().plan.summary() == {"download": 3}
+    assert _local_files(tmp_path) == {"a.txt": b"alpha", "d/b.txt": b"beta", "d/e/c.txt": b"gamma"}
+
+    source.remove("/m/d/b.txt", permanently=True)
+    report = engine.run()
+
+    assert report.plan.summary() == {"delete_local": 1}
+    assert report.deleted == ["d/b.txt"]
+    assert set(_local_files(tmp_path)) == {"a.txt", "d/e/c.txt"}
+
+
+def test_two_way_propagates_changes_from_both_sides(yadisk_server, tmp_path):
+    yadisk_server.put_file("/tw/remote.txt", b"from cloud")
+    (tmp_path / "local.txt").write_bytes(b"from disk")
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+    engine = SyncEngine(source, tmp_path, "/tw", mode=SyncMode.TWO_WAY, delete=True)
+
+    assert engine.run().plan.summary() == {"download": 1, "upload": 1}
+    assert (tmp_path / "remote.txt").read_bytes() == b"from cloud"
+    assert yadisk_server.read_file("/tw/local.txt") == b"from disk"
+
+    (tmp_path / "local.txt").unlink()
+    yadisk_server.put_file("/tw/remote.txt", b"changed in cloud")
+    report = engine.run()
+
+    assert report.plan.summary() == {"delete_remote": 1, "download": 1}
+    assert (tmp_path / "remote.txt").read_bytes() == b"changed in cloud"
+    assert source.list_files("/tw") and [item["name"] for item in source.list_files("/tw")] == ["remote.txt"]
+
+
+def test_listing_outage_aborts_instead_of_deleting_local_files(yadisk_server, tmp_path):
+    for path, data in REMOTE_FILES.items():
+        yadisk_server.put_file(path, data)
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+    engine = SyncEngine(source, tmp_path, "/m", mode=SyncMode.DOWNLOAD, delete=True)
+    engine.run()
+    state = engine.state_path.read_bytes()
+
+    yadisk_server.settings.error_rate = 1.0
+    with pytest.raises(Exception):
+        engine.run()
+
+    assert len(_local_files(tmp_path)) == 3
+    assert engine.state_path.read_bytes() == state
+
+
+def test_partial_listing_aborts_instead_of_deleting_local_files(yadisk_server, tmp_path):
+    for path, data in REMOTE_FILES.items():
+        yadisk_server.put_file(path, data)
+    # Корень берется из кэша метаданных, а поддиректория запрашивается и не получена
+    source = YadiskSource(TOKEN, cache_ttl=600, scheduler=yadisk_scheduler())
+    engine = SyncEngine(source, tmp_path, "/m", mode=SyncMode.DOWNLOAD, delete=True)
+    engine.run()
+    source.metadata_cache.invalidate("/m/d")
+
+    yadisk_server.settings.error_rate = 1.0
+    with pytest.raises(Exception):
+        engine.plan()
+
+    assert len(_local_files(tmp_path)) == 3
+
+
+def test_missing_remote_root_counts_as_empty(yadisk_server, tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"one")
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+
+    plan = SyncEngine(source, tmp_path, "/not/yet/created").plan()
+
+    assert plan.summary() == {"upload": 1}
+
+
+@pytest.mark.parametrize("backend", ["s3", "drive"])
+def test_listing_outage_aborts_on_other_backends(backend, request, tmp_path):
+    if backend == "s3":
+        server = request.getfixturevalue("s3_server")
+        for path, data in REMOTE_FILES.items():
+            server.put_object(path.lstrip("/"), data)
+        source = S3Source(server.bucket, "AK:SK", endpoint_url=server.url, scheduler=s3_scheduler())
+    else:
+        server = request.getfixturevalue("drive_server")
+        for path, data in REMOTE_FILES.items():
+            server.put_file(path, data)
+        source = GoogleDriveSource(server.token, api_url=server.url, scheduler=drive_scheduler())
+    engine = SyncEngine(source, tmp_path, "/m", mode=SyncMode.DOWNLOAD, delete=True)
+    assert engine.run().plan.summary() == {"download": 3}
+
+    server.settings.error_rate = 1.0
+    with pytest.raises(Exception):
+        engine.run()
+
+    assert len(_local_files(tmp_path)) == 3
+
+
+def test_run_async_with_async_source(yadisk_server, tmp_path):
+    for path, data in REMOTE_FILES.items():
+        yadisk_server.put_file(path, data)
+
+    async def _sync() -> dict:
+        source = AsyncYadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+        try:
+            engine = SyncEngine(source, tmp_path, "/m", mode=SyncMode.DOWNLOAD, delete=True)
+            first = await engine.run_async()
+            yadisk_server.settings.error_rate = 1.0
+            with pytest.raises(Exception):
+                await engine.run_async()
+            return first.plan.summary()
+        finally:
+            yadisk_server.settings.error_rate = 0.0
+            await source.disconnect()
+
+    assert asyncio.run(_sync()) == {"download": 3}
+    assert len(_local_files(tmp_path)) == 3
+
+
+def test_sync_through_tiered_source(yadisk_server, tmp_path):
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "a.txt").write_bytes(b"one")
+    source = TieredSource(YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler()), tmp_path / "tier")
+    try:
+        report = SyncEngine(source, local, "/tiered").run()
+        assert [result.success for result in report.transfers] == [True]
+        assert source.flush(10)
+        assert yadisk_server.read_file("/tiered/a.txt") == b"one"
+
+        mirror = tmp_path / "mirror"
+        SyncEngine(source, mirror, "/tiered", mode=SyncMode.DOWNLOAD).run()
+        assert (mirror / "a.txt").read_bytes() == b"one"
+    finally:
+        source.disconnect()
+
+
+def test_conflict_prefers_newer_side(yadisk_server, tmp_path):
+    (tmp_path / "c.txt").write_bytes(b"base")
+    source = YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler())
+    engine = SyncEngine(source, tmp_path, "/cf", mode=SyncMode.TWO_WAY)
+    engine.run()
+
+    (tmp_path / "c.txt").write_bytes(b"local edit")
+    time.sleep(1.1)
+    yadisk_server.put_file("/cf/c.txt", b"newer cloud edit")
+    report = engine.run()
+
+    assert [(action.kind, action.path) for action in report.plan.actions] == [("download", "c.txt")]
+    assert (tmp_path / "c.txt").read_bytes() == b"newer cloud edit"
@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from src.neuro_cloud_api import TieredSource, YadiskSource
+
+from .conftest import TOKEN, yadisk_scheduler
+
+
+@pytest.fixture
+def tier(yadisk_server, tmp_path):
+    source = TieredSource(YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler()), tmp_path / "tier")
+    yield source
+    yadisk_server.settings.error_rate = 0.0
+    source.disconnect(flush=False)
+
+
+def test_write_back_reaches_cloud_after_flush(yadisk_server, tier):
+    assert tier.upload_file(b"payload", "/w/a.bin", overwrite=True)
+
+    assert tier.flush(10)
+    assert tier.pending_writes() == []
+    assert yadisk_server.read_file("/w/a.bin") == b"payload"
+
+
+def test_repeated_writes_end_with_last_version(yadisk_server, tier):
+    for i in range(20):
+        assert tier.upload_file(bytes([i]) * 100, f"/w/f{i % 4}.bin", overwrite=True)
+
+    assert tier.flush(10)
+    assert [yadisk_server.read_file(f"/w/f{i}.bin")[:1] for i in range(4)] == [bytes([16 + i]) for i in range(4)]
+    # Запись, еще не отправленная в облако, не порождает второй загрузки
+    assert yadisk_server.request_counts()["upload"] <= 20
+
+
+def test_read_after_write_sees_local_data(yadisk_server, tier, tmp_path):
+    yadisk_server.put_file("/r/a.bin", b"old")
+    tier.download_file("/r/a.bin", tmp_path / "old.bin")
+
+    tier.upload_file(b"new", "/r/a.bin", overwrite=True)
+    assert tier.download_file("/r/a.bin", tmp_path / "new.bin")
+
+    assert (tmp_path / "new.bin").read_bytes() == b"new"
+
+
+def test_failed_write_is_retried_by_flush(yadisk_server, tier):
+    yadisk_server.settings.error_rate = 1.0
+    assert tier.upload_file(b"data", "/w/fail.bin", overwrite=True)
+
+    assert not tier.flush(10)
+    assert list(tier.failed_writes()) == ["/w/fail.bin"]
+
+    yadisk_server.settings.error_rate = 0.0
+    assert tier.flush(10)
+    assert tier.failed_writes() == {}
+    assert yadisk_server.read_file("/w/fail.bin") == b"data"
+
+
+def test_pending_writes_survive_restart(yadisk_server, tier, tmp_path):
+    yadisk_server.settings.error_rate = 1.0
+    tier.upload_file(b"unsent", "/w/later.bin", overwrite=True)
+    tier.flush(10)
+    tier.disconnect(flush=False)
+    yadisk_server.settings.error_rate = 0.0
+
+    restarted = TieredSource(YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler()), tmp_path / "tier")
+    try:
+        assert restarted.pending_writes() == ["/w/later.bin"]
+        assert restarted.flush(10)
+        assert yadisk_server.read_file("/w/later.bin") == b"unsent"
+    finally:
+        restarted.disconnect()
+
+
+def test_upload_without_overwrite_keeps_existing_file(yadisk_server, tier):
+    yadisk_server.put_file("/w/exists.bin", b"original")
+
+    assert not tier.upload_file(b"replacement", "/w/exists.bin")
+    assert tier.upload_file(b"created", "/w/new.bin")
+
+    assert yadisk_server.read_file("/w/exists.bin") == b"original"
+    assert yadisk_server.read_file("/w/new.bin") == b"created"
+    assert tier.pending_writes() == []
+
+
+def test_write_through_uploads_before_returning(yadisk_server, tmp_path):
+    source = TieredSource(
+        YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler()), tmp_path / "tier", write_through=True
+    )
+    try:
+        assert source.upload_file(b"now", "/w/now.bin", overwrite=True)
+        assert yadisk_server.read_file("/w/now.bin") == b"now"
+        assert source.pending_writes() == []
+    finally:
+        source.disconnect()
+
+
+def test_concurrent_reads_download_once(yadisk_server, tier, tmp_path):
+    yadisk_server.put_file("/r/a.bin", b"A" * 1000)
+    threads = [
+        threading.Thread(target=tier.download_file, args=("/r/a.bin", tmp_path / f"copy{i}.bin"))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all((tmp_path / f"copy{i}.bin").read_bytes() == b"A" * 1000 for i in range(8))
+    assert yadisk_server.request_counts()["download"] == 1
+
+
+def test_batch_transfers(yadisk_server, tier, tmp_path):
+    local = tmp_path / "local"
+    local.mkdir()
+    for i in range(3):
+        (local / f"f{i}.bin").write_bytes(bytes([i]) * 10)
+
+    uploaded = tier.upload_many([(f"/b/f{i}.bin", local / f"f{i}.bin") for i in range(3)], overwrite=True)
+    assert [result.success for result in uploaded] == [True] * 3
+    assert tier.flush(10)
+    assert yadisk_server.read_file("/b/f2.bin") == bytes([2]) * 10
+
+    downloaded = tier.download_many([(f"/b/f{i}.bin", tmp_path / "out" / f"f{i}.bin") for i in range(3)])
+    assert [result.remote_path for result in downloaded] == [f"/b/f{i}.bin" for i in range(3)]
+    assert all(result.success for result in downloaded)
+    assert (tmp_path / "out" / "f1.bin").read_bytes() == bytes([1]) * 10
+
+
+def test_shared_tier_keeps_other_instances_tmp_files(yadisk_server, tier, tmp_path):
+    in_flight = tier._tier_tmp_path()
+    in_flight.write_bytes(b"in flight")
+    stale = tier.tmp_dir / "999.dead"
+    stale.mkdir()
+    (stale / "x.tmp").write_bytes(b"x")
+    (tier.tmp_dir / "999.dead.lock").touch()
+
+    other = TieredSource(YadiskSource(TOKEN, cache_ttl=0, scheduler=yadisk_scheduler()), tmp_path / "tier")
+    try:
+        assert in_flight.exists()
+        assert not stale.exists()
+    finally:
+        other.disconnect()
+    assert in_flight.exists()